@@ -0,0 +1,286 @@
+"""
+만료 콘텐츠 월별 보관함 (tar.xz 번들 + 매니페스트)
+
+배경: cleanup_expired가 만료 과정의 PNG·TXT를 영구 삭제해, 지난 콘텐츠를 다시 올리거나
+감사용으로 확인해 달라는 요청에 답할 수 없었습니다. 그렇다고 output/에 남겨 두면
+체크아웃·클론이 계속 무거워짐.
+
+→ 만료 과정 파일을 시작월·실행별 번들 archive/YYYY-MM/<실행 시각>.tar.xz로 옮기고 output/에서는 지움
+  · 번들은 한 번 쓰면 바뀌지 않음 — 실행마다 새 파일을 만들 뿐 기존 번들에 이어 쓰지 않으므로
+    git은 번들마다 한 번만 저장 (월 번들 하나에 계속 이어 쓰면 실행마다 월 전체 사본이 쌓임)
+  · 파일 1개 = tar 1개를 xz 스트림 1개로 압축해 이번 실행의 번들 끝에 이어 붙임
+    (xz는 이어 붙인 스트림도 하나의 파일로 풀림 — 번들 전체는 그대로 유효한 .tar.xz)
+  · 보관 대상은 실제로 output/에서 지우는 파일만 (살아있는 기록이 쓰는 파일은 output/에 남으므로 제외)
+  · 같은 실행 안에서 파일 1개는 한 번만 저장 — 파일명 잘림으로 여러 만료 기록이 같은 파일을
+    가리키면 매니페스트 항목들이 같은 스트림을 함께 가리킴
+  · 매니페스트에 과정 키 → (번들, 파일별 [이름, 크기, 스트림 시작 바이트, 길이], 처리 기록)
+    → 파일 1개 조회는 해당 스트림만 읽어 풀므로 번들 전체를 풀지 않음
+  · 같은 과정을 다시 보관하면 매니페스트가 새 번들을 가리키고 이전 스트림은 이전 번들에 남음
+  · 번들을 쓰고 매니페스트를 저장한 뒤에야 원본을 지움 (중간에 죽으면 원본 유지)
+
+번들 전체 풀기 (파일마다 tar가 끝나므로 0 블록 무시 옵션 필요):
+  tar -xJf archive/2026-05/20261019-090000.tar.xz --ignore-zeros
+  python -c "import tarfile; tarfile.open('archive/2026-05/20261019-090000.tar.xz', 'r:xz', ignore_zeros=True).extractall('x')"
+
+설정 (환경변수):
+  ARCHIVE_DIR          보관함 폴더 (기본: archive)
+  ARCHIVE_XZ_PRESET    xz 압축 단계 0~9 (기본: 6)
+
+사용법:
+  python archive_bundle.py --list [YYYY-MM]                   # 보관된 과정 목록 (시작월로 거르기)
+  python archive_bundle.py --extract 과정키 [--member 파일명] [--to 폴더]
+                                                              # 과정 1건(또는 파일 1개) 꺼내기 (기본: restored/)
+"""
+
+import io
+import json
+import lzma
+import os
+import sys
+import tarfile
+from datetime import datetime
+
+ARCHIVE_DIR = os.environ.get("ARCHIVE_DIR", "archive") or "archive"
+ARCHIVE_XZ_PRESET = int(os.environ.get("ARCHIVE_XZ_PRESET", "6") or 6)
+RESTORE_DIR = "restored"
+
+
+def manifest_file():
+    return os.path.join(ARCHIVE_DIR, "manifest.json")
+
+
+def bundle_name(start, run_id):
+    """시작일 YYYYMMDD + 실행 ID → 번들 경로 YYYY-MM/<실행 ID>.tar.xz (ARCHIVE_DIR 기준)"""
+    return f"{start[:4]}-{start[4:6]}/{run_id}.tar.xz"
+
+
+def _new_run_id(starts):
+    """이번 실행의 번들이 기존 번들과 겹치지 않는 실행 ID (같은 초에 두 번 돌면 -2, -3 …)"""
+    base = datetime.now().strftime("%Y%m%d-%H%M%S")
+    run_id, n = base, 1
+    while any(os.path.exists(os.path.join(ARCHIVE_DIR, bundle_name(s, run_id))) for s in starts):
+        n += 1
+        run_id = f"{base}-{n}"
+    return run_id
+
+
+def load_manifest():
+    """매니페스트 로드 → {"courses": {과정 키: {bundle, offset, length, ...}}}"""
+    try:
+        with open(manifest_file(), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if isinstance(manifest.get("courses"), dict):
+            return manifest
+    except (OSError, ValueError, AttributeError):
+        pass
+    return {"courses": {}}
+
+
+def save_manifest(manifest):
+    """임시 파일에 쓰고 교체 (저장 중 중단돼도 이전 매니페스트 유지)"""
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    path = manifest_file()
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 보관 (파일 1개 = xz 스트림 1개)
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def _clean_tarinfo(info):
+    # 실행 환경의 사용자·권한이 번들에 섞이지 않게
+    info.uid = info.gid = 0
+    info.uname = info.gname = ""
+    info.mode = 0o644
+    return info
+
+
+def _pack(path):
+    """파일 1개 → (xz 스트림 바이트, 파일명)"""
+    buf = io.BytesIO()
+    name = os.path.basename(path)
+    with tarfile.open(fileobj=buf, mode="w", format=tarfile.PAX_FORMAT) as tar:
+        tar.add(path, arcname=name, recursive=False, filter=_clean_tarinfo)
+    return lzma.compress(buf.getvalue(), preset=ARCHIVE_XZ_PRESET), name
+
+
+def archive_courses(items, dry_run=False):
+    """
+    만료 과정 파일을 시작월별 번들에 보관합니다.
+
+    Args:
+        items: [(과정 키, 시작일 YYYYMMDD, 처리 기록, 보관할 파일 경로 목록)]
+               — 파일 목록은 이번에 output/에서 지울 파일만 (다른 기록과 겹쳐도 됨)
+        dry_run: True면 번들·매니페스트를 쓰지 않고 대상만 집계
+    Returns:
+        dict: {"archived": 보관한 과정 키 set, "failed": [(과정 키, 오류)],
+               "raw_bytes": 원본 합계, "packed_bytes": 압축 합계, "bundles": 번들별 과정 수}
+        (용량은 실제로 저장한 파일 기준 — 여러 과정이 함께 가리키는 파일은 1번만 셈)
+    """
+    result = {"archived": set(), "failed": [], "raw_bytes": 0, "packed_bytes": 0, "bundles": {}}
+    # 같은 과정 키가 두 번 오면 마지막 항목만 (용량·번들별 과정 수 중복 집계 방지)
+    items = list({item[0]: item for item in items}.values())
+    if not items:
+        return result
+    manifest = None if dry_run else load_manifest()
+    archived_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    run_id = _new_run_id({start for _, start, _, _ in items})
+    # 이번 실행에 저장한 파일: 경로 → (번들, 멤버 정보) — 같은 파일은 한 번만 씀
+    stored = {}
+
+    for course_key, start, entry, paths in items:
+        bundle = bundle_name(start, run_id)
+        members = []
+        try:
+            for path in dict.fromkeys(paths):
+                if path in stored:
+                    # 다른 과정이 이미 저장한 파일 → 그 스트림을 함께 가리킴 (다른 번들이어도 됨)
+                    stored_bundle, member = stored[path]
+                    members.append(dict(member, bundle=stored_bundle) if stored_bundle != bundle else member)
+                    continue
+                size = os.path.getsize(path)
+                if dry_run:
+                    member, packed = {"name": os.path.basename(path), "size": size}, 0
+                else:
+                    stream, name = _pack(path)
+                    bundle_path = os.path.join(ARCHIVE_DIR, bundle)
+                    os.makedirs(os.path.dirname(bundle_path), exist_ok=True)
+                    # 이번 실행에서 처음 만든 파일에만 이어 씀 (_new_run_id가 기존 번들과 겹치지 않게 고름)
+                    with open(bundle_path, "ab") as f:
+                        offset = f.tell()
+                        f.write(stream)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    packed = len(stream)
+                    member = {"name": name, "size": size, "offset": offset, "length": packed}
+                stored[path] = (bundle, member)
+                members.append(member)
+                result["raw_bytes"] += size
+                result["packed_bytes"] += packed
+        except OSError as e:
+            result["failed"].append((course_key, e))
+            continue
+        if not dry_run:
+            manifest["courses"][course_key] = {
+                "bundle": bundle,
+                "start": start,
+                "title": entry.get("title", ""),
+                "period": entry.get("period", ""),
+                "archived_at": archived_at,
+                "members": members,
+                "record": entry,
+            }
+        result["archived"].add(course_key)
+        result["bundles"][bundle] = result["bundles"].get(bundle, 0) + 1
+
+    if not dry_run and result["archived"]:
+        save_manifest(manifest)
+    return result
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 조회 (해당 파일의 스트림만 풀기)
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def find_course(manifest, query):
+    """과정 키 → 매니페스트 항목 (정확히 일치하지 않으면 키 앞부분이 유일하게 맞는 항목)"""
+    courses = manifest["courses"]
+    if query in courses:
+        return query, courses[query]
+    matches = [key for key in courses if key.startswith(query)]
+    if len(matches) == 1:
+        return matches[0], courses[matches[0]]
+    if matches:
+        raise KeyError(f"'{query}'에 해당하는 과정이 {len(matches)}건입니다: {', '.join(sorted(matches)[:5])}")
+    raise KeyError(f"보관된 과정이 없습니다: {query}")
+
+
+def _find_member(item, name):
+    for member in item["members"]:
+        if member["name"] == name:
+            return member
+    raise KeyError(f"번들에 없는 파일입니다: {name}")
+
+
+def _read_stream(item, member):
+    """멤버 1개의 스트림만 읽어 풀기 → bytes (멤버에 bundle이 있으면 그 번들)"""
+    with open(os.path.join(ARCHIVE_DIR, member.get("bundle", item["bundle"])), "rb") as f:
+        f.seek(member["offset"])
+        stream = f.read(member["length"])
+    with tarfile.open(fileobj=io.BytesIO(lzma.decompress(stream)), mode="r:") as tar:
+        try:
+            return tar.extractfile(member["name"]).read()
+        except KeyError:
+            raise KeyError(f"번들에 없는 파일입니다: {member['name']}") from None
+
+
+def read_member(course_key, member, manifest=None):
+    """보관된 과정의 파일 1개 → bytes"""
+    _, item = find_course(manifest or load_manifest(), course_key)
+    return _read_stream(item, _find_member(item, member))
+
+
+def extract_course(course_key, dest_dir=RESTORE_DIR, member=None, manifest=None):
+    """보관된 과정(또는 파일 1개)을 dest_dir에 꺼냄 → 꺼낸 파일 경로 목록"""
+    _, item = find_course(manifest or load_manifest(), course_key)
+    members = [_find_member(item, member)] if member else item["members"]
+    os.makedirs(dest_dir, exist_ok=True)
+    written = []
+    for m in members:
+        data = _read_stream(item, m)
+        path = os.path.join(dest_dir, os.path.basename(m["name"]))
+        with open(path, "wb") as f:
+            f.write(data)
+        written.append(path)
+    return written
+
+
+def _fmt_bytes(n):
+    if n >= 1024 * 1024:
+        return f"{n / (1024 * 1024):.1f}MB"
+    return f"{n / 1024:.1f}KB"
+
+
+def _arg(flag, default=None):
+    if flag in sys.argv:
+        i = sys.argv.index(flag) + 1
+        if i < len(sys.argv) and not sys.argv[i].startswith("--"):
+            return sys.argv[i]
+    return default
+
+
+if __name__ == "__main__":
+    if "--list" in sys.argv:
+        month = _arg("--list")
+        courses = load_manifest()["courses"]
+        shown = 0
+        for key, item in sorted(courses.items(), key=lambda kv: (kv[1].get("start", ""), kv[0])):
+            if month and not item["bundle"].startswith(month):
+                continue
+            raw = sum(m["size"] for m in item["members"])
+            packed = sum(m["length"] for m in item["members"])
+            print(f"  📦 {item['bundle']}  {key}")
+            print(f"      {item.get('title', '')[:40]} | 파일 {len(item['members'])}개, "
+                  f"{_fmt_bytes(raw)} → {_fmt_bytes(packed)}")
+            shown += 1
+        print(f"\n  보관된 과정: {shown}건")
+    elif "--extract" in sys.argv:
+        query = _arg("--extract")
+        if not query:
+            print("  ❌ --extract 뒤에 과정 키를 지정하세요.")
+            sys.exit(1)
+        try:
+            paths = extract_course(query, dest_dir=_arg("--to", RESTORE_DIR), member=_arg("--member"))
+        except KeyError as e:
+            print(f"  ❌ {e.args[0]}")
+            sys.exit(1)
+        except (OSError, lzma.LZMAError, tarfile.TarError) as e:
+            print(f"  ❌ 번들 읽기 실패: {e}")
+            sys.exit(1)
+        for path in paths:
+            print(f"  ✅ {path}")
+    else:
+        print(__doc__)
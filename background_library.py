@@ -0,0 +1,266 @@
+"""
+분야별 배경 이미지 라이브러리 (유사 과정 배경 재사용)
+
+배경: images/에는 훈련과정 사진이, .image_cache/에는 이전에 생성한 Grok 배경이
+쌓여 있지만 get_course_image()는 프롬프트가 조금만 달라도 매번 새로 생성했습니다.
+드론·제과제빵·조경처럼 반복 개설되는 과정은 거의 같은 장면을 10~60초씩 다시 기다린 셈.
+
+→ 두 출처를 하나의 인덱스로 묶고, 과정마다 '서명'을 비교해 충분히 가까운 배경을 재사용합니다.
+  서명 = 분야(detect_course_field) + 시각 가이드 장면(_get_field_visual_guide의 subject)
+        + 제목 키워드 집합
+  · 분야와 장면이 모두 같은 항목만 후보 (드론 촬영 ↔ 드론 방제처럼 장면이 다르면 제외)
+  · 과정 제목 키워드가 후보 서명에 얼마나 포함되는지(포함률)가 임계값 이상인 후보 중
+    가장 오래전에 쓴 것을 선택 (겹치는 키워드가 없으면 포함률 0 — 분야·장면만으로는 재사용 ❌)
+    → 같은 분야 과정이 연달아 올라와도 이웃 게시물의 배경이 겹치지 않음
+
+사용 기록: .image_cache/library_usage.json (항목별 마지막 사용 시각)
+
+설정 (환경변수):
+  BACKGROUND_MATCH_THRESHOLD  재사용 최소 유사도 0~1 (기본: 0.5, 1 초과면 재사용 끔)
+  BACKGROUND_MIN_SIDE         images/ 사진의 최소 짧은 변 px (기본: 600, 저해상도 제외)
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+LIBRARY_HTML = os.path.join(ROOT_DIR, "training-courses.html")
+BACKGROUND_MATCH_THRESHOLD = float(os.environ.get("BACKGROUND_MATCH_THRESHOLD", "0.5") or 0.5)
+BACKGROUND_MIN_SIDE = int(os.environ.get("BACKGROUND_MIN_SIDE", "600") or 600)
+# 부분 문자열 일치를 인정할 최소 키워드 길이 (그보다 짧으면 완전 일치만)
+PARTIAL_MATCH_MIN_LEN = 3
+
+# 서명에서 제외할 공통 어휘 (과정 유형·수식어 — 장면을 구분하지 못함)
+_STOPWORDS = {
+    "과정", "양성", "향상", "양성과정", "향상과정", "실무과정", "실무", "직무", "직무능력", "능력",
+    "교육", "훈련", "활용", "전문가", "전문", "기초", "심화", "실습", "취업", "산대특",
+    "제주", "제주형", "신규", "재직자", "특화", "기반", "역량", "강화",
+}
+
+_lock = threading.Lock()
+_index = None
+_usage = None
+
+
+def _usage_path():
+    from image_cache import IMAGE_CACHE_DIR
+    return os.path.join(IMAGE_CACHE_DIR, "library_usage.json")
+
+
+def title_tokens(text):
+    """제목·설명에서 장면 구분용 키워드 집합 추출 (한글 2자 이상, 영문 2자 이상)"""
+    text = text.replace("(산대특)", " ").lower()
+    tokens = set(re.findall(r"[가-힣]{2,}|[a-z][a-z0-9]+", text))
+    return {t for t in tokens if t not in _STOPWORDS}
+
+
+def make_signature(title, training_goal="", ncs_cd=None):
+    """
+    Returns:
+        dict: {field, visual, tokens}
+    """
+    from fetch_images import _get_field_visual_guide
+    from seo_helper import detect_course_field
+
+    clean_title = title.replace("(산대특)", "").replace("산대특", "").strip()
+    guide = _get_field_visual_guide(clean_title, training_goal or "")
+    return {
+        "field": detect_course_field(clean_title, ncs_cd) or "",
+        "visual": hashlib.sha1(guide["subject"].encode("utf-8")).hexdigest()[:10],
+        "tokens": sorted(title_tokens(clean_title)),
+    }
+
+
+def course_signature(course_data):
+    if isinstance(course_data, str):
+        return make_signature(course_data)
+    goal = (course_data.get("trainingGoal", "") or course_data.get("traingGoal", "")
+            or course_data.get("training_goal", ""))
+    return make_signature(course_data.get("title", ""), goal, course_data.get("ncsCd"))
+
+
+def _token_matches(token, entry_tokens):
+    """query 키워드 1개가 entry 서명에 있는지 — 완전 일치, 또는 PARTIAL_MATCH_MIN_LEN자 이상
+    키워드가 entry 키워드 안에 포함될 때만 (한쪽 방향)
+
+    반대 방향(entry 키워드 ⊂ query 키워드)은 보지 않음: "드론" 한 단어짜리 서명이
+    "드론방제"·"드론촬영" 과정 모두에 일치해 장면이 다른 배경이 재사용되던 원인.
+    """
+    if token in entry_tokens:
+        return True
+    if len(token) < PARTIAL_MATCH_MIN_LEN:
+        return False
+    return any(token in e for e in entry_tokens)
+
+
+def similarity(query, entry):
+    """분야·장면이 다르면 0, 같으면 query 제목 키워드 중 entry 서명에 포함된 비율
+
+    한글 복합어·조사 변형("골프캐디" → "골프캐디의")을 잡기 위해 긴 키워드는 부분 문자열도
+    일치로 봅니다. 키워드가 없거나 겹치는 키워드가 하나도 없으면 0
+    → 분야·장면만 같다고 임계값을 넘지 않음.
+    """
+    if query["field"] != entry["field"] or query["visual"] != entry["visual"]:
+        return 0.0
+    if not query["tokens"] or not entry["tokens"]:
+        return 0.0
+    entry_tokens = set(entry["tokens"])
+    matched = sum(1 for t in query["tokens"] if _token_matches(t, entry_tokens))
+    return matched / len(query["tokens"])
+
+
+# ── 인덱스 구성 ──
+
+def _library_entries():
+    """training-courses.html의 과정 카드(name·tagline·tags)와 images/ 사진 연결"""
+    from PIL import Image
+
+    try:
+        with open(LIBRARY_HTML, "r", encoding="utf-8") as f:
+            html = f.read()
+    except OSError:
+        return []
+
+    entries, seen = [], set()
+    for block in html.split("\n    id: ")[1:]:
+        image = re.search(r'image:\s*"(images/[^"]+)"', block)
+        name = re.search(r'name:\s*"([^"]+)"', block)
+        institution = re.search(r'institution:\s*"([^"]+)"', block)
+        if not (image and name) or image.group(1) in seen:
+            continue
+        path = os.path.join(ROOT_DIR, image.group(1))
+        try:
+            with Image.open(path) as im:
+                if min(im.size) < BACKGROUND_MIN_SIDE:
+                    continue
+        except OSError:
+            continue
+        seen.add(image.group(1))
+        sig = make_signature(name.group(1))
+        # tagline·태그 키워드도 서명에 보탬 (분야·장면 판정은 과정명 기준)
+        extra = " ".join(re.findall(r'(?:tagline:\s*"([^"]*)")', block)
+                         + re.findall(r'"#([^"]+)"', block))
+        sig["tokens"] = sorted(set(sig["tokens"]) | title_tokens(extra))
+        entries.append({
+            "id": f"lib:{image.group(1)}",
+            "path": path,
+            "title": name.group(1),
+            # 재사용 사진의 출처는 사진을 제공한 원래 과정·기관 (새 과정의 기관이 아님)
+            "credit": _library_credit(institution.group(1) if institution else "", name.group(1)),
+            **sig,
+        })
+    return entries
+
+
+def _library_credit(institution, title):
+    """라이브러리 사진 출처 — 커버에는 "Image: {source}"로 표시"""
+    source = f"{institution} · {title}" if institution else title
+    return {"photographer": institution or title, "source": source}
+
+
+def _grok_entry(key, meta):
+    sig = meta.get("signature") or make_signature(meta.get("title", ""))
+    return {
+        "id": f"grok:{key}",
+        "cache_key": key,
+        "title": meta.get("title", ""),
+        "credit": meta.get("credit"),
+        **sig,
+    }
+
+
+def _grok_entries():
+    """이미지 캐시에 저장된 Grok 배경 (메타의 title/signature로 서명)"""
+    from image_cache import IMAGE_CACHE_DIR, is_enabled
+
+    entries = []
+    if not (is_enabled() and os.path.isdir(IMAGE_CACHE_DIR)):
+        return entries
+    for name in os.listdir(IMAGE_CACHE_DIR):
+        key, ext = os.path.splitext(name)
+        if ext != ".json" or not os.path.exists(os.path.join(IMAGE_CACHE_DIR, f"{key}.png")):
+            continue
+        try:
+            with open(os.path.join(IMAGE_CACHE_DIR, name), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            continue
+        if "prompt" in meta:
+            entries.append(_grok_entry(key, meta))
+    return entries
+
+
+def _load():
+    global _index, _usage
+    if _index is None:
+        _index = _library_entries() + _grok_entries()
+        try:
+            with open(_usage_path(), "r", encoding="utf-8") as f:
+                _usage = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            _usage = {}
+    return _index
+
+
+def register_grok_image(key, meta):
+    """새로 생성·캐시한 Grok 배경을 인덱스에 추가 (같은 실행의 다음 과정부터 재사용 후보)"""
+    with _lock:
+        if _index is not None:
+            _index.append(_grok_entry(key, meta))
+
+
+def _mark_used(entry_id):
+    _usage[entry_id] = time.time()
+    try:
+        os.makedirs(os.path.dirname(_usage_path()), exist_ok=True)
+        with open(_usage_path(), "w", encoding="utf-8") as f:
+            json.dump(_usage, f, ensure_ascii=False, indent=2)
+    except OSError:
+        pass
+
+
+def find_background(course_data, threshold=None, mark_used=True):
+    """
+    가장 적합한 기존 배경을 골라 사용 기록을 남깁니다.
+
+    후보: 유사도 ≥ threshold. 그중 가장 오래전에 사용한 항목 → 동률이면 유사도 높은 항목.
+    mark_used=False면 조회만 (예산 스케줄링의 비용 판정용)
+
+    Returns:
+        tuple(dict, float) | (None, 0.0): (인덱스 항목, 유사도)
+    """
+    threshold = BACKGROUND_MATCH_THRESHOLD if threshold is None else threshold
+    if threshold > 1:
+        return None, 0.0
+    sig = course_signature(course_data)
+    with _lock:
+        candidates = []
+        for entry in _load():
+            score = similarity(sig, entry)
+            # 임계값을 0으로 낮춰도 겹치는 키워드가 없는 배경은 후보가 아님
+            if score > 0 and score >= threshold:
+                candidates.append((_usage.get(entry["id"], 0), -score, entry))
+        if not candidates:
+            return None, 0.0
+        _, neg_score, entry = min(candidates, key=lambda c: (c[0], c[1]))
+        if mark_used:
+            _mark_used(entry["id"])
+    return entry, -neg_score
+
+
+def load_entry_image(entry):
+    """인덱스 항목의 이미지 로드 (RGB, 크롭 전). 실패 시 None."""
+    if "cache_key" in entry:
+        from image_cache import get_cached_image
+        img, _ = get_cached_image(entry["cache_key"])
+        return img
+    try:
+        from PIL import Image
+        with Image.open(entry["path"]) as im:
+            return im.convert("RGB")
+    except OSError:
+        return None
@@ -114,9 +114,12 @@ def get_benefits_detail_lines(course_data):
       · get_cost_info_text()는 금액(원 단위)만 다루고 혜택을 재언급하지 않습니다.
       · _build_recommend_section()도 장려금 문구를 반복하지 않습니다.
     """
-    ctype = get_course_type(course_data)
-    hours = get_total_hours(course_data)
+    return get_benefits_detail_lines_by_type(get_course_type(course_data),
+                                             get_total_hours(course_data))
+
 
+def get_benefits_detail_lines_by_type(ctype, hours):
+    """get_benefits_detail_lines의 본체 — (유형, 시간)만으로 정해지므로 생성기가 메모이즈해 씀"""
     lines = ["- 최초 참여 시 자부담 10%로 배울 수 있어요"]
 
     if ctype == "long":
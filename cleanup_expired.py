@@ -3,12 +3,34 @@
 
 사용법:
   python cleanup_expired.py              # 실제 삭제 실행
-  python cleanup_expired.py --dry-run    # 삭제 대상만 미리보기 (실제 삭제 안 함)
+  python cleanup_expired.py --dry-run    # 삭제 대상·회수 용량만 미리보기 (실제 삭제 안 함)
   python cleanup_expired.py --grace 7    # 시작일 + 7일까지 유지 (기본: 0일)
+  python cleanup_expired.py --no-reconcile   # 고아 파일·빈 기록 점검 생략
+  python cleanup_expired.py --archive    # 만료 과정 파일을 삭제 대신 archive/YYYY-MM/<실행 시각>.tar.xz로 보관
 
 GitHub Actions에서 pipeline.py 실행 전에 호출하면 자동 정리됩니다.
+
+v2 (만료 색인 + 디렉토리 대조):
+  배경: 실행마다 처리 기록 전체를 돌며 정규식으로 날짜를 다시 파싱했고, 파일은 하나씩
+  존재 확인 후 삭제했습니다. 어떤 기록도 가리키지 않는 output 파일(파일명 트렁케이션 충돌,
+  중간에 죽은 실행)은 정리 대상에 오르지 않아 영영 남은 셈.
+  → 만료 색인: (시작일, 과정 키)를 시작일순으로 정렬해 output/.expiry_index.json에 보관
+     · 새 기록만 날짜를 파싱해 bisect로 끼워 넣고, 실행마다 앞쪽의 '새로 만료된' 구간만 꺼냄
+     · 날짜를 못 읽은 기록도 색인에 남겨 다시 파싱하지 않음 (유지)
+  → 디렉토리 대조: output/을 1회 나열해
+     · 어떤 기록도 가리키지 않는 콘텐츠 파일 = 고아 → 삭제
+     · 파일이 하나도 남지 않은 기록 = 빈 기록 → 제거 (다음 파이프라인 실행에서 신규로 재생성)
+  → 삭제는 대상 경로를 모두 모은 뒤 한 번에 처리, 처리 기록·색인 저장도 1회
+     (존재 확인·크기는 디렉토리 나열 결과를 그대로 사용 — 파일마다 stat 없음)
+
+보관 모드 (--archive):
+  만료 과정 파일을 시작월·실행별 번들(archive/YYYY-MM/<실행 시각>.tar.xz)로 옮긴 뒤 삭제 (archive_bundle.py 참고).
+  실제로 지우는 파일만 보관 — 살아있는 기록이 쓰는 파일은 output/에 남으므로 번들에 넣지 않음.
+  보관에 실패한 과정은 파일·기록을 그대로 두고 다음 실행에서 다시 시도합니다.
+  고아 파일은 과정 키가 없으므로 보관하지 않고 삭제.
 """
 
+import bisect
 import json
 import os
 import re
@@ -17,40 +39,45 @@ from datetime import datetime, timedelta
 
 OUTPUT_DIR = "output"
 PROCESSED_FILE = os.path.join(OUTPUT_DIR, ".processed_courses.json")
+EXPIRY_INDEX_FILE = os.path.join(OUTPUT_DIR, ".expiry_index.json")
+
+# 고아 판정 대상 (파이프라인이 만드는 콘텐츠 파일 확장자) — 점(.)으로 시작하는 상태 파일은 제외
+CONTENT_EXTENSIONS = (".txt", ".png", ".jpg", ".jpeg", ".webp", ".avif", ".mp4")
+
+# 시작일 패턴 (import 시 1회 컴파일)
+# period: "2025.06.01 ~ 2025.09.30" 또는 다회차 "1회: 2026.05.18 ~ ... | 2회: 2026.06.22 ~ ..."
+_PERIOD_START_RE = re.compile(r"(\d{4})\.(\d{2})\.(\d{2})\s*~")
+# course_key 조각: 20250601 또는 2025-06-01
+_KEY_DATE_RE = re.compile(r"^(\d{4})-?(\d{2})-?(\d{2})$")
 
 
 def parse_start_date(entry):
     """
     processed_courses 항목에서 훈련시작일을 추출합니다.
-    
-    시도 순서:
-    1. period 필드에서 "YYYY.MM.DD ~ ..." 파싱
-    2. course_key에서 날짜 패턴 추출 (YYYYMMDD)
-    """
-    # period 필드: "2025.06.01 ~ 2025.09.30"
-    period = entry.get("period", "")
-    if period:
-        match = re.match(r"(\d{4})\.(\d{2})\.(\d{2})", period)
-        if match:
-            try:
-                return datetime(int(match.group(1)), int(match.group(2)), int(match.group(3)))
-            except ValueError:
-                pass
 
-    return None
+    period 필드의 "YYYY.MM.DD ~" 시작일 — 다회차 통합이면 마지막 회차의 시작일
+    (앞 회차가 시작해도 뒤 회차 모집 안내로 콘텐츠가 계속 쓰임)
+    """
+    starts = []
+    for y, m, d in _PERIOD_START_RE.findall(entry.get("period", "") or ""):
+        try:
+            starts.append(datetime(int(y), int(m), int(d)))
+        except ValueError:
+            continue
+    return max(starts) if starts else None
 
 
 def parse_start_date_from_key(course_key):
     """course_key에서 훈련시작일 추출 (fallback)
-    
+
     키 형식: {trprId}_{trprDegr}_{traStartDate}_{traEndDate}
-    traStartDate는 보통 YYYYMMDD 형식
+    traStartDate는 YYYYMMDD 또는 YYYY-MM-DD 형식
     """
-    parts = course_key.split("_")
-    for part in parts:
-        if re.match(r"^\d{8}$", part):
+    for part in course_key.split("_"):
+        match = _KEY_DATE_RE.match(part)
+        if match:
             try:
-                return datetime.strptime(part, "%Y%m%d")
+                return datetime(int(match.group(1)), int(match.group(2)), int(match.group(3)))
             except ValueError:
                 continue
     return None
@@ -81,13 +108,120 @@ def collect_files_to_delete(entry):
     return files_to_delete
 
 
-def cleanup_expired(grace_days=0, dry_run=False):
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 만료 색인 (시작일순 정렬)
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def load_expiry_index():
+    """색인 로드 → {"entries": [(YYYYMMDD, 과정 키)] 정렬, "undated": {과정 키}}"""
+    try:
+        with open(EXPIRY_INDEX_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        entries = sorted((str(d), str(k)) for d, k in data.get("entries", []))
+        undated = set(data.get("undated", []))
+    except (OSError, ValueError, TypeError):
+        entries, undated = [], set()
+    return {"entries": entries, "undated": undated}
+
+
+def save_expiry_index(index):
+    with open(EXPIRY_INDEX_FILE, "w", encoding="utf-8") as f:
+        json.dump({"entries": [list(e) for e in index["entries"]],
+                   "undated": sorted(index["undated"])}, f, ensure_ascii=False, indent=2)
+
+
+def sync_expiry_index(index, processed):
+    """처리 기록과 색인을 맞춤 — 새 기록만 날짜 파싱, 없어진 기록은 색인에서 제거
+
+    Returns:
+        int: 이번에 날짜를 파싱한 기록 수
+    """
+    entries = index["entries"]
+    indexed = {key for _, key in entries} | index["undated"]
+    gone = indexed - processed.keys()
+    if gone:
+        index["entries"] = entries = [e for e in entries if e[1] not in gone]
+        index["undated"] -= gone
+
+    parsed = 0
+    for course_key in processed.keys() - indexed:
+        entry = processed[course_key]
+        start_date = parse_start_date(entry) if isinstance(entry, dict) else None
+        if start_date is None:
+            start_date = parse_start_date_from_key(course_key)
+        if start_date is None:
+            index["undated"].add(course_key)
+        else:
+            bisect.insort(entries, (start_date.strftime("%Y%m%d"), course_key))
+        parsed += 1
+    return parsed
+
+
+def pop_expired(index, cutoff):
+    """시작일이 cutoff 날짜 이하인 앞쪽 구간을 색인에서 꺼냄 → [(YYYYMMDD, 과정 키)]"""
+    entries = index["entries"]
+    i = bisect.bisect_right(entries, (cutoff.strftime("%Y%m%d"), "\U0010ffff"))
+    expired = entries[:i]
+    del entries[:i]
+    return expired
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 디렉토리 대조 + 일괄 삭제
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+def scan_output():
+    """output/ 1회 나열 → {정규화 경로: 바이트} (하위 폴더·점 파일 제외)"""
+    files = {}
+    if not os.path.isdir(OUTPUT_DIR):
+        return files
+    with os.scandir(OUTPUT_DIR) as it:
+        for de in it:
+            if de.name.startswith(".") or not de.is_file():
+                continue
+            files[os.path.normpath(de.path)] = de.stat().st_size
+    return files
+
+
+def _entry_paths(entry):
+    if not isinstance(entry, dict) or not isinstance(entry.get("files"), dict):
+        return []
+    return [os.path.normpath(p) for p in collect_files_to_delete(entry)]
+
+
+def delete_files(paths, dry_run=False):
+    """경로 묶음 일괄 삭제 → (삭제 수, 실패 목록)"""
+    if dry_run:
+        return 0, []
+    deleted, failed = 0, []
+    for path in paths:
+        try:
+            os.remove(path)
+            deleted += 1
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            failed.append((path, e))
+    return deleted, failed
+
+
+def _fmt_bytes(n):
+    if n >= 1024 * 1024:
+        return f"{n / (1024 * 1024):.1f}MB"
+    return f"{n / 1024:.1f}KB"
+
+
+def cleanup_expired(grace_days=0, dry_run=False, reconcile=True, archive=False):
     """
     훈련시작일이 지난 과정의 콘텐츠를 정리합니다.
-    
+
     Args:
         grace_days: 시작일 이후 며칠간 유지할지 (기본 0 = 시작일 당일부터 삭제)
-        dry_run: True면 삭제하지 않고 대상만 출력
+        dry_run: True면 삭제하지 않고 대상·회수 용량만 출력 (색인·처리 기록도 그대로)
+        reconcile: output/ 대조로 고아 파일·빈 기록도 정리
+        archive: True면 만료 과정 파일을 월별 번들에 보관한 뒤 삭제
+    Returns:
+        int: 만료 처리한 과정 수
     """
     processed = load_processed()
     if processed is None:
@@ -104,60 +238,107 @@ def cleanup_expired(grace_days=0, dry_run=False):
     else:
         print()
 
-    expired_keys = []
-    deleted_files = 0
-    kept_count = 0
+    # ── 1. 만료 색인: 새 기록만 파싱하고, 새로 만료된 구간만 꺼냄 ──
+    index = load_expiry_index()
+    parsed = sync_expiry_index(index, processed)
+    expired = pop_expired(index, cutoff)
+    if parsed:
+        print(f"  🗂️  만료 색인 갱신: 새 기록 {parsed}건 날짜 파싱")
 
+    on_disk = scan_output()
+    to_delete = set()
+    expired_keys = []
+    archive_items = []
+    expired_set = {course_key for _, course_key in expired}
+    # 파일명 잘림으로 두 과정이 같은 파일을 가리킬 수 있음 → 살아있는 기록이 쓰는 파일은 남김
+    referenced = set()
     for course_key, entry in processed.items():
-        # 시작일 파싱
-        start_date = parse_start_date(entry)
-        if start_date is None:
-            start_date = parse_start_date_from_key(course_key)
-
-        if start_date is None:
-            print(f"  ⚠️  날짜 파싱 실패 (유지): {entry.get('title', course_key)[:40]}")
-            kept_count += 1
-            continue
-
-        # 시작일이 cutoff 이전이면 만료
-        if start_date < cutoff:
-            title = entry.get("title", "제목 없음")[:40]
-            period = entry.get("period", "기간 없음")
-            files = collect_files_to_delete(entry)
-
-            print(f"  🗑️  만료: {title}")
-            print(f"      기간: {period} | 파일 {len(files)}개")
-
-            if not dry_run:
-                for fpath in files:
-                    if os.path.exists(fpath):
-                        try:
-                            os.remove(fpath)
-                            deleted_files += 1
-                        except OSError as e:
-                            print(f"      ❌ 삭제 실패: {fpath} ({e})")
-                    else:
-                        # 파일이 이미 없으면 카운트만
-                        pass
-
-            expired_keys.append(course_key)
-        else:
-            kept_count += 1
-
-    # processed에서 만료 항목 제거
-    if not dry_run and expired_keys:
-        for key in expired_keys:
+        if course_key not in expired_set:
+            referenced.update(_entry_paths(entry))
+    for start, course_key in expired:
+        entry = processed[course_key]
+        paths = _entry_paths(entry)
+        present = [p for p in paths if p in on_disk]
+        print(f"  🗑️  만료: {entry.get('title', '제목 없음')[:40]}")
+        print(f"      기간: {entry.get('period', '기간 없음')} | 파일 {len(present)}/{len(paths)}개")
+        own = [p for p in present if p not in referenced]
+        to_delete.update(own)
+        expired_keys.append(course_key)
+        # 만료 기록끼리 겹치는 파일은 archive_courses가 실행당 한 번만 저장
+        archive_items.append((course_key, start, entry, own))
+
+    # 보관 모드: 번들·매니페스트를 먼저 쓰고, 보관된 과정의 파일만 삭제
+    archived = None
+    if archive and archive_items:
+        import archive_bundle
+        archived = archive_bundle.archive_courses(archive_items, dry_run=dry_run)
+        for course_key, e in archived["failed"]:
+            print(f"      ❌ 보관 실패 (파일 유지): {processed[course_key].get('title', course_key)[:40]} ({e})")
+        for course_key, _, _, own in archive_items:
+            if course_key not in archived["archived"]:
+                to_delete.difference_update(own)
+        expired_keys = [k for k in expired_keys if k in archived["archived"]]
+
+    # ── 2. 디렉토리 대조: 고아 파일 + 빈 기록 ──
+    orphans, stale_keys = [], []
+    if reconcile:
+        for course_key, entry in processed.items():
+            if course_key in expired_set:
+                continue
+            if not any(p in on_disk for p in _entry_paths(entry)):
+                stale_keys.append(course_key)
+        orphans = sorted(p for p in on_disk
+                         if p not in referenced and p not in to_delete
+                         and p.lower().endswith(CONTENT_EXTENSIONS))
+        for p in orphans[:10]:
+            print(f"  👻 고아 파일: {os.path.basename(p)}")
+        if len(orphans) > 10:
+            print(f"      … 외 {len(orphans) - 10}개")
+        for course_key in stale_keys:
+            print(f"  🪦 빈 기록 (파일 없음): {processed[course_key].get('title', course_key)[:40]}")
+        to_delete.update(orphans)
+
+    # ── 3. 일괄 삭제 + 기록·색인 1회 저장 ──
+    kept_count = len(processed) - len(expired_keys) - len(stale_keys)
+    reclaimed = sum(on_disk[p] for p in to_delete)
+    deleted_files, failed = delete_files(sorted(to_delete), dry_run=dry_run)
+    for path, e in failed:
+        print(f"      ❌ 삭제 실패: {path} ({e})")
+    # 로컬에서 image_derivatives.py --output으로 만든 웹용 파생본도 원본과 함께 정리
+    if not dry_run and to_delete and os.path.exists(os.path.join(OUTPUT_DIR, "web", "srcset.json")):
+        from image_derivatives import drop_sources
+        dropped = drop_sources("output", sorted(to_delete))
+        if dropped:
+            print(f"  🖼️  웹용 파생본 {dropped}개 함께 삭제 ({OUTPUT_DIR}/web/)")
+
+    if not dry_run:
+        removed_keys = expired_keys + stale_keys
+        for key in removed_keys:
             del processed[key]
-        with open(PROCESSED_FILE, "w", encoding="utf-8") as f:
-            json.dump(processed, f, ensure_ascii=False, indent=2)
+        if removed_keys:
+            with open(PROCESSED_FILE, "w", encoding="utf-8") as f:
+                json.dump(processed, f, ensure_ascii=False, indent=2)
+        # 빈 기록도 색인에서 빼 둬야 다음 실행의 대조 결과와 맞음
+        sync_expiry_index(index, processed)
+        save_expiry_index(index)
 
     # 결과 요약
     print(f"\n  {'─' * 40}")
     if dry_run:
-        print(f"  [DRY RUN] 삭제 예정: {len(expired_keys)}개 과정")
+        print(f"  [DRY RUN] 삭제 예정: {len(expired_keys)}개 과정, 고아 파일 {len(orphans)}개, "
+              f"빈 기록 {len(stale_keys)}건")
+        print(f"  [DRY RUN] 회수 예정 용량: {_fmt_bytes(reclaimed)} (파일 {len(to_delete)}개)")
+        if archived:
+            print(f"  [DRY RUN] 보관 예정: {len(archived['archived'])}개 과정, "
+                  f"{_fmt_bytes(archived['raw_bytes'])} → {archive_bundle.ARCHIVE_DIR}/")
     else:
-        print(f"  ✅ 삭제 완료: {len(expired_keys)}개 과정, {deleted_files}개 파일")
-    print(f"  📌 유지 중: {kept_count}개 과정")
+        print(f"  ✅ 삭제 완료: {len(expired_keys)}개 과정, 고아 파일 {len(orphans)}개, "
+              f"빈 기록 {len(stale_keys)}건 — 파일 {deleted_files}개, {_fmt_bytes(reclaimed)} 회수")
+        if archived and archived["archived"]:
+            bundles = ", ".join(f"{name} +{n}" for name, n in sorted(archived["bundles"].items()))
+            print(f"  📦 보관: {len(archived['archived'])}개 과정, {_fmt_bytes(archived['raw_bytes'])} → "
+                  f"{_fmt_bytes(archived['packed_bytes'])} ({bundles})")
+    print(f"  📌 유지 중: {kept_count}개 과정 (날짜 미상 {len(index['undated'])}건)")
     print(f"  {'─' * 40}\n")
 
     return len(expired_keys)
@@ -175,4 +356,5 @@ if __name__ == "__main__":
             print("  ❌ --grace 뒤에 숫자(일)를 지정하세요. 예: --grace 7")
             sys.exit(1)
 
-    cleanup_expired(grace_days=grace_days, dry_run=dry_run)
+    cleanup_expired(grace_days=grace_days, dry_run=dry_run,
+                    reconcile="--no-reconcile" not in sys.argv, archive="--archive" in sys.argv)
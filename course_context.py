@@ -0,0 +1,159 @@
+"""
+과정 분석 컨텍스트 (과정당 1회 계산, 모든 생성기가 공유)
+
+배경: 과정 1건을 처리하는 동안 detect_course_field·get_course_type·get_total_hours·
+summarize_training_goal·_clean_title이 생성기마다 다시 계산됐습니다.
+블로그 본문·SEO 제목·도입부·해시태그 2종·인스타 캡션·게시 가이드·카드뉴스 슬라이드가
+같은 제목을 각자 분석하고, 리서치 서브필드 조회도 섹션마다 반복된 셈.
+
+→ CourseContext가 분야·NCS 세분류·유형·시간·훈련목표 키워드·정제 과정명·리서치 항목을
+  생성 시 1회 계산해 읽기 전용으로 보관합니다.
+  · 생성기는 course dict와 CourseContext를 모두 받음 (course_context()로 통일)
+    → pipeline은 과정마다 1개 만들어 전달, 단독 호출하는 기존 코드는 그대로 동작
+  · 새 파생 정보는 __slots__와 __init__에 한 줄씩 추가
+
+과정 시드 (결정적 생성):
+  배경: 도입부 훅·해시태그는 시드 없는 random으로, 소제목·마무리 변형은 abs(hash(title))로
+  골랐습니다. hash()는 프로세스마다 달라지므로(해시 무작위화) 같은 과정도 실행할 때마다
+  다른 바이트가 나와, 재생성할 때마다 output/에 불필요한 변경이 커밋된 셈.
+  → 모든 무작위 선택은 과정 시드(과정 ID·회차·과정명 + 솔트의 sha256)에서 나옵니다.
+    · course_rng(ctx, 용도): 용도별로 독립된 random.Random — 한 곳에 선택이 늘어도
+      다른 곳의 결과는 그대로
+    · 입력이 같으면 파일도 같음 → content_fingerprint()로 재생성 생략 판단
+    · 다시 뽑기: CONTENT_SEED_SALT(또는 pipeline.py --reroll)로 솔트를 바꿈
+    · 지문에는 과정 입력 외에 텍스트에 들어가는 다른 입력도 포함:
+      field_research.json 내용 해시, 올해 연도(본문·캡션의 "○○○○년" 문구), TEXT_GENERATOR_VERSION
+      → 생성기 문구·템플릿을 고치면 TEXT_GENERATOR_VERSION을 올려 기존 텍스트 재사용을 끊음
+"""
+
+import hashlib
+import json
+import os
+import random
+from datetime import datetime
+
+CONTENT_SEED_SALT = os.environ.get("CONTENT_SEED_SALT", "")
+
+# 블로그·캡션·게시 가이드 생성기 버전 — 같은 입력에서 나오는 텍스트가 달라지는 수정이면 올림
+TEXT_GENERATOR_VERSION = 2
+
+
+class CourseContext:
+    """과정 1건의 파생 정보 (읽기 전용)
+
+    Attributes:
+        course: 원본 과정 dict
+        title / clean_title: 과정명 / (산대특) 제거 과정명
+        ncs_cd / ncs_sub: NCS 코드 / 세분류 키워드
+        field: detect_course_field 결과
+        ctype / hours: get_course_type / get_total_hours 결과
+        training_goal / goal_keywords: 훈련목표 원문 / summarize_training_goal 결과
+        research: field_research.json 항목 (서브필드 우선, 없으면 None)
+        seed: 과정 시드 (course_seed 결과, 무작위 선택용)
+    """
+
+    __slots__ = ("course", "title", "clean_title", "ncs_cd", "ncs_sub", "field",
+                 "ctype", "hours", "training_goal", "goal_keywords", "research", "seed")
+
+    def __init__(self, course):
+        from benefits_helper import get_course_type, get_total_hours
+        from seo_helper import (
+            _clean_title, _get_ncs_sub_keyword, detect_course_field, summarize_training_goal,
+        )
+
+        title = course.get("title", "")
+        ncs_cd = course.get("ncsCd")
+        field = detect_course_field(title, ncs_cd)
+        training_goal = (course.get("trainingGoal", "")
+                         or course.get("traingGoal", "")
+                         or course.get("training_goal", ""))
+        try:
+            from field_research_helper import get_field_research
+            research = get_field_research(field, title)
+        except ImportError:
+            research = None
+
+        values = {
+            "course": course,
+            "title": title,
+            "clean_title": _clean_title(title),
+            "ncs_cd": ncs_cd,
+            "ncs_sub": _get_ncs_sub_keyword(ncs_cd),
+            "field": field,
+            "ctype": get_course_type(course),
+            "hours": get_total_hours(course),
+            "training_goal": training_goal,
+            "goal_keywords": summarize_training_goal(training_goal),
+            "research": research,
+            "seed": course_seed(course),
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"CourseContext는 읽기 전용입니다: {name}")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"CourseContext는 읽기 전용입니다: {name}")
+
+    def __repr__(self):
+        return f"CourseContext({self.title!r}, field={self.field!r}, ctype={self.ctype!r})"
+
+
+def course_context(course_data):
+    """course dict → CourseContext (이미 CourseContext면 그대로 반환)"""
+    if isinstance(course_data, CourseContext):
+        return course_data
+    return CourseContext(course_data)
+
+
+def set_seed_salt(salt):
+    """시드 솔트 변경 (pipeline.py --reroll) — 이후 만드는 CourseContext부터 적용"""
+    global CONTENT_SEED_SALT
+    CONTENT_SEED_SALT = str(salt)
+
+
+def stable_hash(text):
+    """프로세스가 바뀌어도 같은 64비트 해시 (hash()는 실행마다 달라짐)"""
+    return int.from_bytes(hashlib.sha256(str(text).encode("utf-8")).digest()[:8], "big")
+
+
+def course_seed(course):
+    """과정 ID·회차·과정명 + 솔트 → 과정 시드"""
+    degr = course.get("_merged_degrs") or course.get("trprDegr", "")
+    parts = [course.get("trprId", course.get("id", "")), degr, course.get("title", ""), CONTENT_SEED_SALT]
+    return stable_hash("|".join(str(p) for p in parts))
+
+
+def course_rng(course_data, purpose, variant=0):
+    """과정 시드에서 용도별 난수 생성기 (variant: 유사 글 재생성 회차)"""
+    return random.Random(f"{course_context(course_data).seed}:{purpose}:{variant}")
+
+
+def research_version():
+    """field_research.json 내용 해시 (없거나 읽을 수 없으면 빈 문자열)
+
+    research=None으로 전역 리서치 저장소를 조회하는 @section 빌더는 이 값을 인자로 받아,
+    리서치 파일이 바뀌면(핫 리로드) 이전 메모를 재사용하지 않습니다.
+    """
+    try:
+        from field_research_helper import research_digest
+        return research_digest()
+    except (ImportError, OSError):
+        return ""
+
+
+def content_fingerprint(course):
+    """
+    텍스트 입력 전체의 지문 — 같으면 블로그·캡션·가이드가 같은 바이트로 나옴 (최종 수정일·D-day 제외)
+
+    과정 입력 + 솔트 + 리서치 파일 내용 해시 + 올해 연도 + TEXT_GENERATOR_VERSION
+    """
+    parts = [
+        json.dumps(course, ensure_ascii=False, sort_keys=True, default=str),
+        CONTENT_SEED_SALT,
+        research_version(),
+        str(datetime.now().year),
+        f"v{TEXT_GENERATOR_VERSION}",
+    ]
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()[:16]
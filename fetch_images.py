@@ -2,7 +2,7 @@
 Grok (xAI) 이미지 생성 모듈
 
 환경변수: XAI_API_KEY
-모델: grok-imagine-image
+모델: grok-imagine-image (GROK_IMAGE_MODEL)
 엔드포인트: https://api.x.ai/v1/images/generations
 훈련과정명을 기반으로 배경 이미지를 AI 생성합니다.
 """
@@ -11,11 +11,57 @@ import os
 import re
 from io import BytesIO
 
+from keyword_matcher import compile_keywords, matched_groups
+
+GROK_IMAGE_MODEL = "grok-imagine-image"
+
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # 분야별 시각 가이드 (v4)
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
+# 시각 가이드 분야 플래그 → 키워드 (소문자 haystack 부분 문자열 매칭)
+# 영문 약어(ai·llm·uav·cad·bim·canva 등)는 토큰 단위 비교라 여기 없이 eng_tokens로 판정
+_VISUAL_KEYWORDS = {
+    "drone": ["드론", "무인기", "무인항공"],
+    "video": ["영상", "촬영", "편집", "비디오", "유튜브", "크리에이터"],
+    "delivery": ["배송", "택배", "물류"],
+    "ai": ["인공지능", "머신러닝", "딥러닝", "chatgpt", "생성형", "프롬프트엔지니어"],
+    "3d": ["블렌더", "3d 모델링", "3d모델링", "마야", "지브러시", "캐릭터 모델링"],
+    "arch": ["건축", "도면", "건축설계", "구조설계", "환경설계", "공간설계",
+             "인테리어설계", "도시설계", "주택설계", "건물설계"],
+    "creator": ["유튜브", "크리에이터", "vlog", "shorts"],
+    "marketing": ["마케팅", "광고", "퍼포먼스마케팅", "콘텐츠마케팅", "디지털마케팅", "sns 마케팅"],
+    "ecommerce": ["이커머스", "쇼핑몰", "스마트스토어", "온라인판매", "오픈마켓", "셀러", "온라인 판매"],
+    # 제과제빵/디저트
+    "bakery": ["제과", "제빵", "디저트", "베이커리", "파티시에", "페이스트리", "케이크", "호텔디저트"],
+    # 드론 정비 (조종·촬영·배송과 구분)
+    "maintenance": ["정비", "유지보수", "전후점검", "점검", "수리"],
+    # AI 커머스 (브랜드 기획 + 판매페이지 제작)
+    "detailpage": ["판매페이지", "판매 페이지", "상세페이지", "상세 페이지", "상품기획", "브랜드 상품기획"],
+    # 디지털콘텐츠 (Canva·Figma 기반 비디자이너 콘텐츠 제작)
+    "digital_content": ["디지털콘텐츠", "디지털 콘텐츠", "칸바", "캔바", "카드뉴스", "ai worker", "ai워커"],
+    # 관광 데이터 분석·시각화 (tourism_data 단독, 또는 data + tourism_context)
+    "tourism_data": ["관광데이터", "관광 데이터", "관광빅데이터"],
+    "data": ["데이터", "빅데이터"],
+    "tourism_context": ["관광", "시각화", "대시보드"],
+    "logistics": ["지게차", "포크리프트", "물류", "창고", "운송", "하역"],
+    "landscape": ["조경", "정원", "원예", "가드닝", "식재"],
+    "energy": ["에너지", "시설관리", "보일러", "냉난방", "공조", "전기설비"],
+    "editing": ["편집"],
+    "filming": ["촬영"],
+    "coding": ["코딩", "개발", "프로그래밍", "웹개발", "앱개발", "파이썬", "자바",
+               "백엔드", "프론트엔드"],
+    "design": ["디자인", "그래픽", "ui", "ux", "포토샵", "일러스트", "브랜딩"],
+    "safety": ["산업안전", "안전관리", "안전보건"],
+}
+
+_VISUAL_MATCHER = compile_keywords(
+    [(kw, flag, flag, 0) for flag, keywords in _VISUAL_KEYWORDS.items() for kw in keywords],
+    fold=str.lower,
+)
+
+
 def _get_field_visual_guide(clean_title, training_goal=""):
     """과정명·훈련목표에서 분야를 감지해 시각 가이드를 반환합니다.
 
@@ -36,65 +82,34 @@ def _get_field_visual_guide(clean_title, training_goal=""):
     # 예: "AI마케팅" → ['ai', '마케팅'], "건축CAD AI융합" → ['cad', 'ai']
     eng_tokens = set(re.findall(r'[a-z]+', haystack))
 
-    has_drone = any(k in haystack for k in ["드론", "무인기", "무인항공"]) or 'uav' in eng_tokens
+    # 분야 키워드 1회 스캔 → 매칭된 플래그 집합 (_VISUAL_KEYWORDS)
+    hits = matched_groups(_VISUAL_MATCHER, haystack)
+
+    has_drone = "drone" in hits or 'uav' in eng_tokens
     # 영상은 명백한 영상 작업 키워드만 (콘텐츠는 광범위해서 제외 — 마케팅·디자인 콘텐츠도 있음)
-    has_video = any(k in haystack for k in [
-        "영상", "촬영", "편집", "비디오", "유튜브", "크리에이터"
-    ])
-    has_delivery = any(k in haystack for k in ["배송", "택배", "물류"])
-    has_ai = ('ai' in eng_tokens) or ('llm' in eng_tokens) or any(k in haystack for k in [
-        "인공지능", "머신러닝", "딥러닝", "chatgpt", "생성형", "프롬프트엔지니어"
-    ])
-    has_3d = any(k in haystack for k in [
-        "블렌더", "3d 모델링", "3d모델링", "마야", "지브러시", "캐릭터 모델링"
-    ]) or any(t in eng_tokens for t in ["blender", "maya", "zbrush"])
+    has_video = "video" in hits
+    has_delivery = "delivery" in hits
+    has_ai = ('ai' in eng_tokens) or ('llm' in eng_tokens) or "ai" in hits
+    has_3d = "3d" in hits or any(t in eng_tokens for t in ["blender", "maya", "zbrush"])
     # has_arch (v10 정밀화):
     # "설계" 단독은 너무 광범위 (프롬프트설계·시스템설계·콘텐츠설계·수익구조설계 등
     # 모든 분야에 등장) → 건축 도메인 복합어로만 매칭
     # 추가 보호: 유튜브/크리에이터 키워드가 있으면 절대 건축으로 매칭 안 함
     has_arch = (
-        (
-            "건축" in haystack
-            or "도면" in haystack
-            or any(k in haystack for k in [
-                "건축설계", "구조설계", "환경설계", "공간설계",
-                "인테리어설계", "도시설계", "주택설계", "건물설계"
-            ])
-            or any(t in eng_tokens for t in ["cad", "bim"])
-        )
-        and not any(k in haystack for k in ["유튜브", "크리에이터", "vlog", "shorts"])
+        ("arch" in hits or any(t in eng_tokens for t in ["cad", "bim"]))
+        and "creator" not in hits
     )
-    has_marketing = any(k in haystack for k in [
-        "마케팅", "광고", "퍼포먼스마케팅", "콘텐츠마케팅", "디지털마케팅", "sns 마케팅"
-    ])
-    has_ecommerce = any(k in haystack for k in [
-        "이커머스", "쇼핑몰", "스마트스토어", "온라인판매", "오픈마켓", "셀러", "온라인 판매"
-    ])
+    has_marketing = "marketing" in hits
+    has_ecommerce = "ecommerce" in hits
 
     # ── 신규 분야 플래그 (v11) ──
-    # 제과제빵/디저트
-    has_bakery = any(k in haystack for k in [
-        "제과", "제빵", "디저트", "베이커리", "파티시에", "페이스트리", "케이크", "호텔디저트"
-    ])
-    # 드론 정비 (조종·촬영·배송과 구분)
-    has_maintenance = any(k in haystack for k in [
-        "정비", "유지보수", "전후점검", "점검", "수리"
-    ])
-    # AI 커머스 (브랜드 기획 + 판매페이지 제작)
-    has_detailpage = any(k in haystack for k in [
-        "판매페이지", "판매 페이지", "상세페이지", "상세 페이지", "상품기획", "브랜드 상품기획"
-    ])
-    # 디지털콘텐츠 (Canva·Figma 기반 비디자이너 콘텐츠 제작)
-    has_digital_content = any(k in haystack for k in [
-        "디지털콘텐츠", "디지털 콘텐츠", "칸바", "캔바", "카드뉴스", "ai worker", "ai워커"
-    ]) or 'canva' in eng_tokens
-    # 관광 데이터 분석·시각화
+    has_bakery = "bakery" in hits
+    has_maintenance = "maintenance" in hits
+    has_detailpage = "detailpage" in hits
+    has_digital_content = "digital_content" in hits or 'canva' in eng_tokens
     has_tourism_data = (
-        any(k in haystack for k in ["관광데이터", "관광 데이터", "관광빅데이터"])
-        or (
-            any(k in haystack for k in ["데이터", "빅데이터"])
-            and any(k in haystack for k in ["관광", "시각화", "대시보드"])
-        )
+        "tourism_data" in hits
+        or ("data" in hits and "tourism_context" in hits)
     )
 
     # ──────────────────────────────────────────────────────────────────
@@ -358,7 +373,7 @@ def _get_field_visual_guide(clean_title, training_goal=""):
             ),
         }
 
-    if any(k in haystack for k in ["지게차", "포크리프트", "물류", "창고", "운송", "하역"]):
+    if "logistics" in hits:
         return {
             "subject": (
                 "An industrial warehouse interior: a forklift mid-operation lifting "
@@ -373,7 +388,7 @@ def _get_field_visual_guide(clean_title, training_goal=""):
             "monitor_content": "",
         }
 
-    if any(k in haystack for k in ["조경", "정원", "원예", "가드닝", "식재"]):
+    if "landscape" in hits:
         return {
             "subject": (
                 "A beautifully designed Jeju garden landscape: volcanic basalt stone "
@@ -385,7 +400,7 @@ def _get_field_visual_guide(clean_title, training_goal=""):
             "monitor_content": "",
         }
 
-    if any(k in haystack for k in ["에너지", "시설관리", "보일러", "냉난방", "공조", "전기설비"]):
+    if "energy" in hits:
         return {
             "subject": (
                 "A clean mechanical room interior: industrial boiler systems, pressure "
@@ -451,11 +466,9 @@ def _get_field_visual_guide(clean_title, training_goal=""):
     # ④ 전통 촬영 → 촬영 스튜디오
     # ⑤ 디폴트 → 워크스테이션
     if has_video:
-        has_editing_explicit = "편집" in haystack
-        has_creator_modern = any(k in haystack for k in [
-            "유튜브", "크리에이터", "vlog", "shorts"
-        ])
-        has_traditional_filming = ("촬영" in haystack
+        has_editing_explicit = "editing" in hits
+        has_creator_modern = "creator" in hits
+        has_traditional_filming = ("filming" in hits
                                    and not has_creator_modern
                                    and not has_editing_explicit)
 
@@ -561,10 +574,7 @@ def _get_field_visual_guide(clean_title, training_goal=""):
             ),
         }
 
-    if any(k in haystack for k in [
-        "코딩", "개발", "프로그래밍", "웹개발", "앱개발", "파이썬", "자바",
-        "백엔드", "프론트엔드"
-    ]):
+    if "coding" in hits:
         return {
             "subject": (
                 "A developer's workstation: a wide curved monitor and mechanical "
@@ -581,9 +591,7 @@ def _get_field_visual_guide(clean_title, training_goal=""):
             ),
         }
 
-    if any(k in haystack for k in [
-        "디자인", "그래픽", "ui", "ux", "포토샵", "일러스트", "브랜딩"
-    ]):
+    if "design" in hits:
         return {
             "subject": (
                 "A designer's clean studio: a large monitor showing a design canvas, "
@@ -599,7 +607,7 @@ def _get_field_visual_guide(clean_title, training_goal=""):
             ),
         }
 
-    if any(k in haystack for k in ["산업안전", "안전관리", "안전보건"]):
+    if "safety" in hits:
         return {
             "subject": (
                 "An industrial work site with safety equipment as the focus: a hard "
@@ -742,10 +750,13 @@ def _build_image_prompt(course_data):
 # Grok API 호출
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-def generate_image_with_grok(course_data):
+def generate_image_with_grok(course_data, prompt=None):
     """
     Grok API (grok-imagine-image)로 배경 이미지를 생성합니다.
 
+    Args:
+        prompt: 이미 만든 프롬프트 (None이면 _build_image_prompt로 생성)
+
     Returns:
         tuple(PIL.Image, dict|None) - (이미지, 크레딧 정보)
     """
@@ -757,7 +768,7 @@ def generate_image_with_grok(course_data):
         print("  ⚠️  XAI_API_KEY가 설정되지 않았습니다. 그라데이션 배경을 사용합니다.")
         return None, None
 
-    prompt = _build_image_prompt(course_data)
+    prompt = prompt or _build_image_prompt(course_data)
     title = course_data.get("title", "") if isinstance(course_data, dict) else str(course_data)
     print(f"  🎨 Grok 이미지 생성 중... ({title[:30]})")
 
@@ -769,7 +780,7 @@ def generate_image_with_grok(course_data):
                 "Authorization": f"Bearer {api_key}",
             },
             json={
-                "model": "grok-imagine-image",
+                "model": GROK_IMAGE_MODEL,
                 "prompt": prompt,
                 "response_format": "b64_json",
                 "n": 1,
@@ -886,19 +897,145 @@ def generate_gradient_background(course_data, size=(1080, 1080)):
     return img
 
 
-def get_course_image(course_data, target_size=(1080, 1080)):
+def is_course_image_cached(course_data, target_size=(1080, 1080)):
+    """캐시 적중 또는 라이브러리 재사용 가능 여부 (둘 다 Grok 예산을 쓰지 않음)"""
+    from background_library import find_background
+    from image_cache import cache_key, has_cached_image
+    if has_cached_image(cache_key(_build_image_prompt(course_data), GROK_IMAGE_MODEL, target_size)):
+        return True
+    return find_background(course_data, mark_used=False)[0] is not None
+
+
+def get_course_image(course_data, target_size=(1080, 1080), cancel=None, denied=None):
     """
     과정 데이터에 맞는 배경 이미지를 Grok으로 생성합니다.
-    Grok 실패 시 그라데이션으로 폴백합니다.
+    같은 프롬프트·모델·크기로 이미 생성한 이미지는 로컬 캐시(image_cache)에서,
+    분야·장면이 같은 유사 과정의 배경은 라이브러리(background_library)에서 재사용하고,
+    Grok 실패 또는 이미지 예산 소진(image_budget) 시 그라데이션으로 폴백합니다.
+
+    Args:
+        cancel: threading.Event — 설정되면 Grok 슬롯을 잡기 전에 멈춤 (선행 요청 대기 시간 초과)
+        denied: threading.Event — 슬롯을 못 잡았으면(예산 소진·취소) 설정 → 다음 실행 대기열 판단용
     """
-    from PIL import Image
+    from background_library import find_background, load_entry_image, register_grok_image
+    from image_budget import acquire_image_slot
+    from image_cache import cache_key, get_cached_image, put_cached_image
 
-    img, credit = generate_image_with_grok(course_data)
+    prompt = _build_image_prompt(course_data)
+    key = cache_key(prompt, GROK_IMAGE_MODEL, target_size)
+    img, meta = get_cached_image(key)
+    if img is not None:
+        print(f"  ♻️  캐시된 배경 이미지 사용 ({key[:12]})")
+        return img, meta.get("credit")
+
+    entry, score = find_background(course_data)
+    if entry is not None:
+        img = load_entry_image(entry)
+        if img is not None:
+            print(f"  ♻️  유사 과정 배경 재사용 (유사도 {score:.2f}): {entry['title'][:30]}")
+            return crop_center(img, target_size), entry["credit"]
+
+    # 취소 플래그는 슬롯을 잡기 전(분당 제한 대기 포함)에만 확인 — 이미 보낸 요청은 끝까지 받음
+    if acquire_image_slot(cancel=cancel):
+        img, credit = generate_image_with_grok(course_data, prompt=prompt)
+    else:
+        if denied is not None:
+            denied.set()
+        if cancel is not None and cancel.is_set():
+            print("  ⏹️  선행 요청 취소됨 → Grok 요청 생략")
+        else:
+            print("  💰 이미지 예산 소진 → Grok 요청 생략")
+        img, credit = None, None
 
     if img:
-        img = crop_center(img, target_size)
+        from background_library import course_signature
+        img = crop_center(img.convert("RGB"), target_size)
+        meta = {
+            "prompt": prompt,
+            "model": GROK_IMAGE_MODEL,
+            "size": list(target_size),
+            "credit": credit,
+            "title": course_data.get("title", "") if isinstance(course_data, dict) else str(course_data),
+            "signature": course_signature(course_data),
+        }
+        put_cached_image(key, img, meta)
+        register_grok_image(key, meta)
         return img, credit
 
     print("  🔄 그라데이션 배경으로 폴백")
     img = generate_gradient_background(course_data, target_size)
     return img, None
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 신규 과정 배경 이미지 선행 요청 (prefetch)
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 배경: 이미지 생성이 과정별 generate_cardnews_v2 안에서 순차 실행돼
+# N개 과정이면 10~60초짜리 Grok 요청을 N번 기다려야 했습니다.
+# → run_pipeline이 시작할 때 모든 신규 과정의 요청을 동시성 상한 안에서 미리 보내고,
+#   슬라이드 생성 단계는 도착한 결과를 순서대로 소비합니다.
+#   대기 시간이 지나면 아직 시작 안 한 작업은 취소하고, 실행 중인 작업은 취소 플래그로
+#   Grok 슬롯을 잡기 전에 멈춤 (폴백한 과정에 예산을 쓰지 않음)
+
+IMAGE_PREFETCH_WORKERS = int(os.environ.get("IMAGE_PREFETCH_WORKERS", "3") or 3)
+IMAGE_PREFETCH_TIMEOUT = int(os.environ.get("IMAGE_PREFETCH_TIMEOUT", "120") or 120)
+
+
+def prefetch_course_images(courses, max_workers=None, target_size=(1080, 1080)):
+    """
+    과정 목록의 배경 이미지를 스레드 풀에서 동시에 요청합니다.
+
+    Args:
+        courses: [(course_key, course_data), ...]
+    Returns:
+        dict: {course_key: Future[(img, credit)]}
+    """
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    workers = max_workers or IMAGE_PREFETCH_WORKERS
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="grok-prefetch")
+    futures = {}
+    for course_key, course_data in courses:
+        cancel, denied = threading.Event(), threading.Event()
+        future = executor.submit(get_course_image, course_data, target_size, cancel, denied)
+        future.cancel_event, future.denied_event = cancel, denied
+        futures[course_key] = future
+    # 제출된 작업은 계속 실행되며, 풀은 마지막 작업이 끝나면 정리됨
+    executor.shutdown(wait=False)
+    print(f"  🚀 배경 이미지 {len(futures)}건 선행 요청 (동시 {workers}건)")
+    return futures
+
+
+def resolve_prefetched_image(future, course_data, timeout=None, target_size=(1080, 1080)):
+    """
+    선행 요청 결과를 꺼냅니다. 실패·타임아웃이면 그라데이션 배경으로 폴백해
+    다른 과정의 진행을 막지 않습니다. 타임아웃이면 작업을 취소해 Grok 슬롯을 쓰지 않게 합니다.
+
+    Returns:
+        tuple(PIL.Image, dict|None)
+    """
+    from concurrent.futures import TimeoutError as FutureTimeout
+
+    timeout = IMAGE_PREFETCH_TIMEOUT if timeout is None else timeout
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeout:
+        # 대기 중이면 취소, 실행 중이면 슬롯을 잡기 전에 멈추도록 플래그 설정
+        future.cancel()
+        cancel = getattr(future, "cancel_event", None)
+        if cancel is not None:
+            cancel.set()
+        print(f"  ⚠️  배경 이미지 대기 시간 초과 ({timeout}초) → 그라데이션 배경으로 폴백")
+    except Exception as e:
+        print(f"  ⚠️  배경 이미지 선행 요청 실패: {e} → 그라데이션 배경으로 폴백")
+    return generate_gradient_background(course_data, target_size), None
+
+
+def prefetch_slot_denied(future):
+    """
+    선행 요청이 Grok 슬롯을 못 잡았는지 (예산 소진·취소, 시작 전 취소 포함).
+    이미 보낸 요청이 대기 시간을 넘긴 경우도 포함 — 늦게 도착한 이미지는 캐시에 남으므로
+    다음 실행의 재시도는 예산을 쓰지 않음.
+    """
+    return future.cancelled() or future.denied_event.is_set() or future.cancel_event.is_set()
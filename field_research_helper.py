@@ -19,31 +19,231 @@
 리서치 갱신:
   field_research.json 파일을 직접 편집하거나,
   심층연구 결과를 update_field_research() 함수로 반영하세요.
+  파일이 바뀌면(mtime·크기) 다음 조회 때 자동으로 다시 읽으므로 워커 재시작이 필요 없습니다.
+
+스냅샷 (콜드 스타트용):
+  python field_research_helper.py --build-snapshot   # 스키마 검증 + 스냅샷 생성 (오류 시 종료 코드 1)
+  검증을 통과한 리서치를 역색인까지 계산된 상태로 pickle해 field_research.snapshot에 저장합니다.
+  스냅샷에는 원본 JSON의 mtime·크기가 기록되어, JSON이 바뀌면 무시되고 다음 로드에서
+  JSON을 다시 읽어 새 스냅샷을 씁니다 (스키마 오류가 있으면 경고만 출력하고 쓰지 않음).
+  FIELD_RESEARCH_SNAPSHOT 환경변수로 경로 변경.
 """
 
 import json
 import os
+import pickle
+import sys
 from datetime import datetime
 
+from keyword_matcher import compile_keywords, keyword_hits
+
 RESEARCH_FILE = os.path.join(os.path.dirname(__file__), "field_research.json")
+RESEARCH_SNAPSHOT = (os.environ.get("FIELD_RESEARCH_SNAPSHOT")
+                     or os.path.join(os.path.dirname(__file__), "field_research.snapshot"))
+SNAPSHOT_VERSION = 1   # 저장소 구조가 바뀌면 올림 → 기존 스냅샷 무시
+
+# 엔트리 스키마: 키 → (형식, 필수 여부)
+#   str · list[str] · dict[str](값이 모두 문자열) · trends(education_trends)
+RESEARCH_SCHEMA = {
+    "updated_at": ("str", True),
+    "empathy_hooks": ("list[str]", True),
+    "seo_section_body": ("str", True),
+    "instagram_keyword_sentence": ("str", True),
+    "intro_context": ("str", False),
+    "training_need_body": ("str", False),
+    "skill_explanations": ("dict[str]", False),
+    "market_data": ("dict[str]", False),
+    "jeju_data": ("dict[str]", False),
+    "education_trends": ("trends", False),
+    "parent_field": ("str", False),
+    "title_keywords": ("list[str]", False),
+}
+_TRENDS_SCHEMA = {
+    "key_skills": "list[str]",
+    "career_paths": "list[str]",
+    "certification_note": "str",
+    "policy_note": "str",
+}
+
+# 리서치 저장소: 파일 서명(mtime·크기)이 바뀌면 다음 조회 때 다시 읽음
+#   data       field_research.json 전체
+#   subfields  서브필드 역색인 (정규화 키워드 → (parent_field, 엔트리 키)) — 제목 1회 스캔
+#   subfield_parents  서브필드를 가진 분야 (없는 분야는 제목을 훑지 않음)
+_store = None
+
+
+def _fold_title(text):
+    """대문자 + 공백·괄호 제거 (seo_helper._fold_title과 같은 정규화)"""
+    return text.upper().replace(" ", "").replace("(", "").replace(")", "")
+
+
+def _file_signature():
+    try:
+        st = os.stat(RESEARCH_FILE)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
 
-_cache = None
 
+_digest = None  # (파일 서명, 내용 sha256) — research_digest() 캐시
 
-def _load_cache():
-    """리서치 캐시를 로드합니다. 파일이 없으면 빈 dict 반환."""
-    global _cache
-    if _cache is not None:
-        return _cache
-    if os.path.exists(RESEARCH_FILE):
+
+def research_digest():
+    """field_research.json 내용의 sha256 앞 16자리 (파일이 없으면 빈 문자열)
+
+    mtime은 체크아웃마다 바뀌므로 재생성 판단(content_fingerprint)에는 내용 해시를 씁니다.
+    파일 서명이 같으면 다시 해시하지 않음.
+    """
+    global _digest
+    signature = _file_signature()
+    if signature is None:
+        return ""
+    if _digest is None or _digest[0] != signature:
+        import hashlib
+        with open(RESEARCH_FILE, "rb") as f:
+            _digest = (signature, hashlib.sha256(f.read()).hexdigest()[:16])
+    return _digest[1]
+
+
+def _build_store(data, signature):
+    """리서치 dict → 저장소 (title_keywords 역색인을 로드 시 1회 구축)"""
+    entries, parents = [], set()
+    for order, (key, entry) in enumerate(data.items()):
+        if key.startswith("_") or not isinstance(entry, dict):
+            continue
+        parent = entry.get("parent_field", "")
+        keywords = entry.get("title_keywords") or []
+        if keywords:
+            parents.add(parent)
+        for kw in keywords:
+            # priority = 파일 순서 → 같은 분야에 여러 서브필드가 걸리면 먼저 나온 엔트리
+            entries.append((kw, parent, key, order))
+    return {
+        "signature": signature,
+        "data": data,
+        "subfields": compile_keywords(entries, fold=_fold_title),
+        "subfield_parents": parents,
+    }
+
+
+def _matches(value, kind):
+    if kind == "str":
+        return isinstance(value, str)
+    if kind == "list[str]":
+        return isinstance(value, list) and all(isinstance(v, str) for v in value)
+    if kind == "dict[str]":
+        return isinstance(value, dict) and all(isinstance(v, str) for v in value.values())
+    if kind == "trends":
+        return isinstance(value, dict) and all(
+            _matches(value[k], sub) for k, sub in _TRENDS_SCHEMA.items() if k in value)
+    return False
+
+
+def validate_research(data):
+    """리서치 dict를 RESEARCH_SCHEMA로 검증합니다.
+
+    Returns:
+        list: 오류 메시지 (비어 있으면 통과). 스키마에 없는 키는 허용.
+    """
+    if not isinstance(data, dict):
+        return ["최상위가 객체(dict)가 아닙니다"]
+    errors = []
+    for key, entry in data.items():
+        if key.startswith("_"):
+            continue
+        if not isinstance(entry, dict):
+            errors.append(f"{key}: 객체(dict)가 아닙니다")
+            continue
+        for name, (kind, required) in RESEARCH_SCHEMA.items():
+            if name not in entry:
+                if required:
+                    errors.append(f"{key}.{name}: 필수 항목 누락")
+            elif not _matches(entry[name], kind):
+                errors.append(f"{key}.{name}: {kind} 형식이 아닙니다")
+        # 서브필드는 parent_field와 title_keywords가 함께 있어야 매칭됨
+        if bool(entry.get("parent_field")) != bool(entry.get("title_keywords")):
+            errors.append(f"{key}: parent_field와 title_keywords는 함께 지정해야 합니다")
+    return errors
+
+
+def _read_snapshot(signature):
+    """스냅샷이 현재 JSON(signature)으로 만든 것이면 저장소 반환, 아니면 None"""
+    try:
+        with open(RESEARCH_SNAPSHOT, "rb") as f:
+            snapshot = pickle.load(f)
+    except (OSError, EOFError, pickle.PickleError, AttributeError, ValueError):
+        return None
+    if (not isinstance(snapshot, dict) or snapshot.get("version") != SNAPSHOT_VERSION
+            or snapshot.get("signature") != signature):
+        return None
+    store = snapshot["store"]
+    store["subfields"]["fold"] = _fold_title
+    return store
+
+
+def _write_snapshot(store):
+    """저장소를 스냅샷으로 저장 (임시 파일 → 교체라 동시에 읽는 워커는 이전/새 파일 중 하나만 봄)"""
+    # 정규화 함수는 pickle하지 않고 로드 시 다시 연결 (__main__ 실행에서도 같은 스냅샷)
+    subfields = {k: v for k, v in store["subfields"].items() if k != "fold"}
+    snapshot = {
+        "version": SNAPSHOT_VERSION,
+        "signature": store["signature"],
+        "store": dict(store, subfields=subfields),
+    }
+    tmp_path = f"{RESEARCH_SNAPSHOT}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, RESEARCH_SNAPSHOT)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+    return True
+
+
+def _load_store():
+    """리서치 저장소를 반환합니다. 파일이 바뀌었으면 다시 읽습니다 (장기 실행 워커용).
+
+    순서: 메모리 저장소 → 스냅샷(JSON 서명 일치 시) → JSON 파싱·검증 후 스냅샷 갱신
+    파일이 없으면 빈 저장소. 편집 도중 저장된 깨진 JSON은 직전 저장소를 유지하고,
+    파일이 다시 바뀔 때 재시도합니다.
+    """
+    global _store
+    signature = _file_signature()
+    if _store is not None and _store["signature"] == signature:
+        return _store
+
+    data, errors = {}, []
+    if signature is not None:
+        store = _read_snapshot(signature)
+        if store is not None:
+            _store = store
+            return _store
         try:
             with open(RESEARCH_FILE, "r", encoding="utf-8") as f:
-                _cache = json.load(f)
-        except (json.JSONDecodeError, IOError):
-            _cache = {}
-    else:
-        _cache = {}
-    return _cache
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            if _store is not None:
+                print(f"  ⚠️ field_research.json 재로드 실패 — 이전 데이터 유지: {e}")
+                _store = dict(_store, signature=signature)
+                return _store
+            print(f"  ⚠️ field_research.json 로드 실패 — 리서치 없이 진행: {e}")
+            data = {}
+        errors = validate_research(data)
+        if errors:
+            print(f"  ⚠️ field_research.json 스키마 오류 {len(errors)}건 (스냅샷 미생성): {errors[0]}")
+            if not isinstance(data, dict):
+                data = {}
+    _store = _build_store(data, signature)
+    if signature is not None and not errors:
+        _write_snapshot(_store)
+    return _store
+
+
+def _load_cache():
+    """리서치 dict를 반환합니다. 파일이 없으면 빈 dict 반환."""
+    return _load_store()["data"]
 
 
 def get_field_research(field, title=None):
@@ -60,75 +260,71 @@ def get_field_research(field, title=None):
     Returns:
         dict 또는 None (데이터가 없으면)
     """
-    cache = _load_cache()
+    store = _load_store()
     
     # 서브필드 매칭: title에서 키워드를 찾아 더 구체적인 분야 데이터 사용
     if title:
-        resolved = _resolve_subfield(cache, field, title)
+        resolved = _resolve_subfield(store, field, title)
         if resolved:
             return resolved
     
-    return cache.get(field)
+    return store["data"].get(field)
 
 
-def _resolve_subfield(cache, field, title):
+def _resolve_subfield(store, field, title):
     """
     과정 제목의 키워드로 서브필드를 매칭합니다.
     
     field_research.json에서 title_keywords를 가진 엔트리 중
     parent_field가 일치하고 title에 키워드가 포함된 것을 찾습니다.
     
-    매칭 정책 (v2):
+    매칭 정책 (v3):
       · 제목과 키워드 모두 공백·괄호 제거 후 비교하여
         "에너지 관리", "냉동 공조" 같은 공백 변형도 자동 매칭
-      · 원본 제목에 대한 매칭도 함께 시도하여 기존 동작 보존
+        (정규화본 매칭이 원본 매칭을 포함하므로 정규화본 1회 스캔으로 충분)
+      · 로드 시 만든 역색인으로 제목을 1회 스캔 — 엔트리·키워드 루프 없음
     """
-    if not title:
+    if not title or field not in store["subfield_parents"]:
         return None
-    title_upper = title.upper()
-    title_normalized = title_upper.replace(" ", "").replace("(", "").replace(")", "")
-    for key, data in cache.items():
-        if key.startswith("_"):
-            continue
-        if not isinstance(data, dict):
-            continue
-        parent = data.get("parent_field", "")
-        keywords = data.get("title_keywords", [])
-        if parent == field and keywords:
-            for kw in keywords:
-                kw_upper = kw.upper()
-                kw_normalized = kw_upper.replace(" ", "")
-                if (kw_upper in title_upper) or (kw_normalized in title_normalized):
-                    return data
+    for _, parent, key in keyword_hits(store["subfields"], title):
+        if parent == field:
+            return store["data"][key]
     return None
 
 
-def get_empathy_hooks(field, title=None):
+def _resolve(field, title, research):
+    """research(CourseContext.research — 과정당 1회 조회한 항목)가 있으면 재사용"""
+    if research is not None:
+        return research
+    return get_field_research(field, title)
+
+
+def get_empathy_hooks(field, title=None, research=None):
     """
     분야별 공감형 도입부 후보 목록을 반환합니다.
     title이 주어지면 서브필드(예: "드론영상")를 먼저 찾습니다.
     """
-    data = get_field_research(field, title)
+    data = _resolve(field, title, research)
     if data and "empathy_hooks" in data:
         return data["empathy_hooks"]
     return None
 
 
-def get_seo_section(field, year=None, title=None):
+def get_seo_section(field, year=None, title=None, research=None):
     """
     분야별 SEO 섹션 본문을 반환합니다.
     title이 주어지면 서브필드를 먼저 찾습니다.
     """
     if year is None:
         year = datetime.now().year
-    data = get_field_research(field, title)
+    data = _resolve(field, title, research)
     if data and "seo_section_body" in data:
         body = data["seo_section_body"]
         return body.replace("{year}", str(year))
     return None
 
 
-def get_intro_context(field, year=None, title=None):
+def get_intro_context(field, year=None, title=None, research=None):
     """
     도입부(들어가며) 확장 단락을 반환합니다.
 
@@ -139,13 +335,13 @@ def get_intro_context(field, year=None, title=None):
     """
     if year is None:
         year = datetime.now().year
-    data = get_field_research(field, title)
+    data = _resolve(field, title, research)
     if data and "intro_context" in data:
         return data["intro_context"].replace("{year}", str(year))
     return None
 
 
-def get_training_need(field, year=None, title=None):
+def get_training_need(field, year=None, title=None, research=None):
     """
     '왜 배워야 할까요?' 섹션의 두 번째 블록(훈련 필요성)을 반환합니다.
 
@@ -154,13 +350,13 @@ def get_training_need(field, year=None, title=None):
     """
     if year is None:
         year = datetime.now().year
-    data = get_field_research(field, title)
+    data = _resolve(field, title, research)
     if data and "training_need_body" in data:
         return data["training_need_body"].replace("{year}", str(year))
     return None
 
 
-def get_skill_explanations(field, title=None):
+def get_skill_explanations(field, title=None, research=None):
     """
     훈련목표 키워드 → 해설 문장 매핑을 반환합니다.
 
@@ -170,13 +366,13 @@ def get_skill_explanations(field, title=None):
     Returns:
         dict {키워드: 해설문장} 또는 None
     """
-    data = get_field_research(field, title)
+    data = _resolve(field, title, research)
     if data and "skill_explanations" in data:
         return data["skill_explanations"]
     return None
 
 
-def get_education_trends(field, key=None, title=None):
+def get_education_trends(field, key=None, title=None, research=None):
     """
     분야별 교육 트렌드를 반환합니다.
 
@@ -185,7 +381,7 @@ def get_education_trends(field, key=None, title=None):
         key: "key_skills" | "career_paths" | "certification_note" (None이면 전체)
         title: 서브필드 매칭용 과정 제목
     """
-    data = get_field_research(field, title)
+    data = _resolve(field, title, research)
     if not data or "education_trends" not in data:
         return None
     if key:
@@ -193,14 +389,14 @@ def get_education_trends(field, key=None, title=None):
     return data["education_trends"]
 
 
-def get_instagram_keyword_sentence(field, year=None, title=None):
+def get_instagram_keyword_sentence(field, year=None, title=None, research=None):
     """
     인스타그램 캡션에 삽입할 키워드 문장을 반환합니다.
     title이 주어지면 서브필드를 먼저 찾습니다.
     """
     if year is None:
         year = datetime.now().year
-    data = get_field_research(field, title)
+    data = _resolve(field, title, research)
     if data and "instagram_keyword_sentence" in data:
         return data["instagram_keyword_sentence"].replace("{year}", str(year))
     return None
@@ -247,6 +443,45 @@ def list_researched_fields():
 
 
 def invalidate_cache():
-    """메모리 캐시를 무효화합니다. 파일 갱신 후 호출."""
-    global _cache
-    _cache = None
+    """메모리 캐시를 무효화합니다.
+
+    파일 변경은 조회 시 mtime·크기로 자동 감지하므로, mtime 해상도가 낮은 파일시스템에서
+    크기까지 같은 편집처럼 서명으로 구분되지 않는 경우에만 호출하면 됩니다.
+    """
+    global _store
+    _store = None
+
+
+def build_snapshot():
+    """field_research.json을 검증하고 스냅샷을 만듭니다.
+
+    Returns:
+        list: 오류 메시지 (비어 있으면 스냅샷 생성 완료)
+    """
+    signature = _file_signature()
+    if signature is None:
+        return [f"파일 없음: {RESEARCH_FILE}"]
+    try:
+        with open(RESEARCH_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except json.JSONDecodeError as e:
+        return [f"JSON 파싱 실패: {e}"]
+    errors = validate_research(data)
+    if errors:
+        return errors
+    if not _write_snapshot(_build_store(data, signature)):
+        return [f"스냅샷 저장 실패: {RESEARCH_SNAPSHOT}"]
+    return []
+
+
+if __name__ == "__main__":
+    if "--build-snapshot" in sys.argv:
+        errors = build_snapshot()
+        if errors:
+            print(f"  ❌ 스키마 검증 실패 ({len(errors)}건)")
+            for err in errors:
+                print(f"     - {err}")
+            sys.exit(1)
+        print(f"  ✅ 스냅샷 생성: {RESEARCH_SNAPSHOT}")
+    else:
+        print("사용법: python field_research_helper.py --build-snapshot")
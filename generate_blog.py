@@ -17,11 +17,12 @@ import os
 import re
 from datetime import datetime
 from benefits_helper import (
-    get_course_type,
-    get_total_hours,
-    get_benefits_detail_lines,
+    get_benefits_detail_lines_by_type,
     get_cost_info_text,
 )
+from course_context import course_context, research_version
+from near_duplicate import NEAR_DUP_REROLLS, add_document, find_similar, get_index, save_index, similarity_report
+from text_template import compile_template, render, render_spans, section
 from seo_helper import (
     generate_seo_title,
     generate_empathy_intro,
@@ -30,96 +31,16 @@ from seo_helper import (
     generate_instagram_hashtags,
     generate_posting_guide,
     extract_seo_keywords,
-    detect_course_field,
     get_varied_section_title,
     get_varied_closing,
-    estimate_char_count,
-    get_keyword_density_report,
-    get_overlap_report,
+    analyze_post,
+    density_report_from,
+    overlap_report_from,
 )
 
 
-def generate_blog_post(course_data, output_dir="output"):
-    """
-    과정 데이터를 받아 네이버 스마트에디터용 텍스트를 생성합니다.
-    SEO 최적화 + 인스타그램 캡션 + 릴스 대본 + 게시 가이드를 함께 출력합니다.
-
-    Returns:
-        (blog_txt_path, None) - HTML은 더 이상 생성하지 않으므로 None 반환
-    """
-    os.makedirs(output_dir, exist_ok=True)
-
-    title = course_data["title"]
-    institution = course_data.get("institution", "")
-    period = course_data.get("period", "")
-    time_info = course_data.get("time", "")
-    capacity = course_data.get("capacity", "")
-    target = course_data.get("target", "내일배움카드 있으면 누구나")
-    curriculum = course_data.get("curriculum", [])
-    outcome = course_data.get("outcome", "")
-    # outcome이 비어있으면 훈련목표를 활용
-    if not outcome:
-        training_goal_for_outcome = course_data.get("trainingGoal", "")
-        if training_goal_for_outcome:
-            outcome = (
-                f"이 과정을 수료하면 다음과 같은 역량을 갖출 수 있어요.\n\n"
-                f"> {training_goal_for_outcome}"
-            )
-    contact = course_data.get("contact", "")
-    hrd_url = course_data.get("hrd_url", "https://www.hrd.go.kr")
-
-    # ── 혜택 문구 (과정 시간 기반 자동 결정) ──
-    benefit_lines = get_benefits_detail_lines(course_data)
-    benefit_text = "\n".join(line.replace("- ", "✔ ") for line in benefit_lines)
-    cost_info = get_cost_info_text(course_data)
-    hours = get_total_hours(course_data)
-    ctype = get_course_type(course_data)
-
-    # ── SEO 최적화 ──
-    blog_title = generate_seo_title(course_data)
-    empathy_intro = generate_empathy_intro(course_data)
-    seo_keywords = extract_seo_keywords(course_data)
-    field = detect_course_field(title, course_data.get("ncsCd"))
-    hashtags_raw = generate_blog_hashtags(course_data)
-    year = datetime.now().year
-    today = datetime.now().strftime("%Y년 %m월 %d일")
-
-    # 해시태그에서 마크다운 볼드(**) 제거
-    hashtags = hashtags_raw.replace("**", "")
-
-    # ── STEP3 문구 (중복 제거 v2: 금액은 '혜택' 섹션이 전담) ──
-    if ctype in ("general", "long"):
-        allowance_step3 = "출석률(80% 이상)만 지키면 훈련장려금이 매달 들어와요. 위에서 안내한 금액 그대로예요."
-    else:
-        allowance_step3 = "부담 없는 자부담으로 새로운 기술을 배울 수 있어요."
-
-    # ── '왜 배워야 할까요?' 섹션 (산업동향 + 훈련필요성) ──
-    seo_section = _build_seo_section(course_data, field, year).strip()
-
-    # ── 누구에게 추천하나요 섹션 ──
-    recommend_section = _build_recommend_section(field, ctype).strip()
-
-    # ── 공감형 도입부에서 마크다운 볼드(**) 제거 ──
-    empathy_clean = empathy_intro.replace("**", "")
-
-    # ── 구조 다양화를 위한 해시 (과정별 미세 변형) ──
-    title_hash = abs(hash(title))
-    sec_intro = get_varied_section_title("intro", title_hash + 1)
-    sec_overview = get_varied_section_title("overview", title_hash)
-    sec_benefits = get_varied_section_title("benefits", title_hash)
-    sec_curriculum = get_varied_section_title("curriculum", title_hash + 2)
-    sec_apply = get_varied_section_title("apply", title_hash + 3)
-    closing = get_varied_closing(title_hash)
-
-    # ── 무엇을 배울 수 있나요 섹션 (v5: 훈련목표 × 리서치 자체 해설) ──
-    # sec_curriculum이 정의된 뒤에 호출해야 합니다.
-    curriculum_section = _build_curriculum_section(course_data, field, sec_curriculum).strip()
-
-    # ════════════════════════════════════════
-    #  스마트에디터용 본문 텍스트 생성 (SEO v4)
-    # ════════════════════════════════════════
-
-    post_content = f"""[제목] {blog_title}
+# ── 본문 템플릿 (import 시 1회 컴파일, 과정마다 render로 조립) ──
+_POST_TEMPLATE = compile_template("""[제목] {blog_title}
 
 [이미지 삽입] 직접 촬영한 대표 이미지 또는 카드뉴스 커버 (1번)
 
@@ -187,8 +108,8 @@ STEP 3. 배우면서 혜택도 받기
 
 [구분선]
 
-{institution + chr(10) if institution and institution not in contact else ''}{contact}
-{('📍 ' + course_data.get('address', '')) if course_data.get('address') else ''}
+{contact_block}
+{address_line}
 
 [✍️ 직접 작성] 교육기관까지 가는 방법, 주변 환경 등 제주 현지 정보를 추가하세요.
 예시: "제주시에서 버스 ○○번 타면 ○○ 정류장에서 도보 5분이에요. 근처에 주차장도 있어요."
@@ -212,64 +133,267 @@ STEP 3. 배우면서 혜택도 받기
 최종 수정일: {today}
 
 {hashtags}
-"""
+""")
 
-    # ── 글자 수 측정 및 키워드 밀도 리포트 ──
-    char_count = estimate_char_count(post_content)
-    keyword_report = get_keyword_density_report(
-        post_content, "제주",
-        ["국비지원", "내일배움카드", field if field != "default" else "직업훈련"],
-    )
+# 본문 분석 시 슬롯 → 작업 가이드에 표시할 구간 이름 (키워드 과다 위치 안내용)
+# 과정 데이터가 들어가는 슬롯은 모두 라벨을 붙여야 '템플릿 고정 문구'와 구분됨
+_SECTION_LABELS = {
+    "blog_title": "제목",
+    "sec_intro": "소제목",
+    "empathy_clean": "도입부",
+    "seo_section": "왜 배워야 할까요",
+    "sec_overview": "소제목",
+    "title": "과정명",
+    "institution": "교육기관",
+    "period": "과정 요약",
+    "time_info": "과정 요약",
+    "capacity": "과정 요약",
+    "target": "과정 요약",
+    "sec_benefits": "소제목",
+    "benefit_text": "혜택",
+    "cost_info": "혜택",
+    "recommend_section": "추천 대상",
+    "curriculum_section": "커리큘럼",
+    "sec_apply": "소제목",
+    "allowance_step3": "신청 방법",
+    "contact_block": "문의처",
+    "address_line": "주소",
+    "closing": "마무리",
+    "hashtags": "해시태그",
+}
 
-    # ── 작업 가이드 (파일 상단에 추가) ──
-    # ── 도입부 ↔ SEO 섹션 중복 진단 (v5) ──
-    overlap_report = get_overlap_report(empathy_clean, seo_section)
 
-    work_guide = _build_work_guide(blog_title, char_count, keyword_report, overlap_report)
+def generate_blog_post(course_data, output_dir="output"):
+    """
+    과정 데이터를 받아 네이버 스마트에디터용 텍스트를 생성합니다.
+    SEO 최적화 + 인스타그램 캡션 + 릴스 대본 + 게시 가이드를 함께 출력합니다.
 
-    final_content = work_guide + "\n" + post_content
+    course_data: 과정 dict 또는 CourseContext (하위 생성기에 같은 컨텍스트를 전달)
+
+    Returns:
+        (blog_txt_path, None) - HTML은 더 이상 생성하지 않으므로 None 반환
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    ctx = course_context(course_data)
+    title = ctx.title
 
-    # ── 파일 저장 ──
     # NTFS 금지 문자(< > : " / \ | ? * 줄바꿈) 모두 제거
     # 다른 파일(pipeline.py, generate_cardnews.py, generate_cardnews_v2.py)과
     # 동일한 re.sub 방식으로 통일하여 같은 과정의 산출물 파일명 일치 보장
     # → 카드뉴스·블로그·인스타·가이드 모두 동일한 safe_name prefix 사용
     safe_name = re.sub(r'[<>:"/\\|?*\r\n\t]', "_", title[:30]).replace(" ", "_")
     filepath = os.path.join(output_dir, f"{safe_name}_blog_naver.txt")
+    caption_filepath = os.path.join(output_dir, f"{safe_name}_instagram_caption.txt")
 
-    with open(filepath, "w", encoding="utf-8") as f:
-        f.write(final_content)
+    # ── 유사문서 진단 (기존 글 색인과 비교, NEAR_DUP_REROLLS > 0이면 가변 섹션 재생성) ──
+    # 같은 과정을 다시 생성할 때는 자기 자신의 이전 글을 비교 대상에서 뺌
+    dup_index = get_index(output_dir)
+    own_ids = {"blog": os.path.basename(filepath), "caption": os.path.basename(caption_filepath)}
+    hits = []
+
+    def similar(kind, text):
+        found = find_similar(dup_index, text, kind, exclude=own_ids[kind])
+        # 재생성 판단은 블로그 본문만: 캡션은 variant와 무관하게 같은 글이 나와
+        # 다시 뽑아도 유사도가 그대로 (진단 결과는 작업 가이드에 그대로 표시)
+        if kind == "blog":
+            hits.extend(found)
+        return found
+
+    best = None
+    for variant in range(NEAR_DUP_REROLLS + 1):
+        del hits[:]
+        texts = generate_blog_texts(ctx, variant=variant, similar=similar)
+        top = max((score for _, score in hits), default=0.0)
+        if best is None or top < best[0]:
+            best = (top, texts)
+        if not hits:
+            break
+        if variant < NEAR_DUP_REROLLS:
+            print(f"  🔁 유사 글 감지 (최대 {top:.0%}) → 가변 섹션 재생성 {variant + 1}/{NEAR_DUP_REROLLS}")
+    final_content, caption, guide = best[1]
+    if best[0]:
+        print(f"  ⚠️ 기존 블로그 글과 유사도 {best[0]:.0%} — 작업 가이드의 유사문서 진단을 확인하세요")
+
+    # ── 파일 저장 (내용이 같으면 다시 쓰지 않음) ──
+    _write_text(filepath, final_content)
 
     print(f"  📝 네이버 블로그용 텍스트 생성: {filepath}")
 
     # ── 인스타그램 캡션 생성 ──
-    caption_filepath = os.path.join(output_dir, f"{safe_name}_instagram_caption.txt")
-    caption = generate_instagram_caption(course_data)
-    with open(caption_filepath, "w", encoding="utf-8") as f:
-        f.write(caption)
+    _write_text(caption_filepath, caption)
 
     print(f"  📸 인스타그램 캡션 생성: {caption_filepath}")
 
     # ── 게시 가이드 생성 ──
     guide_filepath = os.path.join(output_dir, f"{safe_name}_posting_guide.txt")
-    guide = generate_posting_guide(course_data)
-    with open(guide_filepath, "w", encoding="utf-8") as f:
-        f.write(guide)
+    _write_text(guide_filepath, guide)
 
     print(f"  📋 게시 가이드 생성: {guide_filepath}")
 
+    # ── 유사문서 색인 갱신 (다음 과정부터 이 글과도 비교) ──
+    add_document(dup_index, filepath, final_content)
+    add_document(dup_index, caption_filepath, caption)
+    save_index(dup_index)
+
     # HTML은 더 이상 생성하지 않음 (None 반환으로 pipeline 호환성 유지)
     return filepath, None
 
 
-def _build_work_guide(blog_title, char_count=0, keyword_report="", overlap_report=""):
-    """
-    파일 상단에 포함할 스마트에디터 작업 가이드 (SEO v4).
-    인간화 편집 체크리스트, 키워드 밀도 리포트, 저품질 방지 가이드 포함.
+def _write_text(path, text):
+    """파일 저장 — 기존 내용과 같으면 건너뜀 (mtime 유지, 결정적 생성과 함께 불필요한 변경 방지)"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            if f.read() == text:
+                return False
+    except (OSError, UnicodeDecodeError):
+        pass
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    return True
+
+
+def generate_blog_texts(course_data, variant=0, similar=None):
+    """블로그 본문(작업 가이드 포함)·인스타 캡션·게시 가이드 텍스트를 만듭니다 (파일 저장 없음).
+
+    variant: 소제목·마무리·도입부 훅 선택을 바꾸는 오프셋 (유사 글 재생성 시 1, 2, ...)
+    similar: similar(kind, text) → [(문서 ID, 유사도)] — 있으면 작업 가이드에 유사문서 진단 포함
+
+    Returns:
+        (blog_text, caption, guide)
     """
-    return f"""{'=' * 60}
+    ctx = course_context(course_data)
+    course_data = ctx.course
+    title = course_data["title"]
+    institution = course_data.get("institution", "")
+    period = course_data.get("period", "")
+    time_info = course_data.get("time", "")
+    capacity = course_data.get("capacity", "")
+    target = course_data.get("target", "내일배움카드 있으면 누구나")
+    curriculum = course_data.get("curriculum", [])
+    outcome = course_data.get("outcome", "")
+    # outcome이 비어있으면 훈련목표를 활용
+    if not outcome:
+        training_goal_for_outcome = course_data.get("trainingGoal", "")
+        if training_goal_for_outcome:
+            outcome = (
+                f"이 과정을 수료하면 다음과 같은 역량을 갖출 수 있어요.\n\n"
+                f"> {training_goal_for_outcome}"
+            )
+    contact = course_data.get("contact", "")
+    hrd_url = course_data.get("hrd_url", "https://www.hrd.go.kr")
+
+    # ── 혜택 문구 (과정 시간 기반 자동 결정) ──
+    hours = ctx.hours
+    ctype = ctx.ctype
+    benefit_text = _build_benefit_text(ctype, hours)
+    cost_info = get_cost_info_text(course_data)
+
+    # ── SEO 최적화 ──
+    blog_title = generate_seo_title(ctx)
+    empathy_intro = generate_empathy_intro(ctx, variant)
+    seo_keywords = extract_seo_keywords(ctx)
+    field = ctx.field
+    hashtags_raw = generate_blog_hashtags(ctx)
+    year = datetime.now().year
+    today = datetime.now().strftime("%Y년 %m월 %d일")
+
+    # 해시태그에서 마크다운 볼드(**) 제거
+    hashtags = hashtags_raw.replace("**", "")
+
+    # ── STEP3 문구 (중복 제거 v2: 금액은 '혜택' 섹션이 전담) ──
+    if ctype in ("general", "long"):
+        allowance_step3 = "출석률(80% 이상)만 지키면 훈련장려금이 매달 들어와요. 위에서 안내한 금액 그대로예요."
+    else:
+        allowance_step3 = "부담 없는 자부담으로 새로운 기술을 배울 수 있어요."
+
+    # ── '왜 배워야 할까요?' 섹션 (산업동향 + 훈련필요성) ──
+    seo_section = _build_seo_section(field, year, ctx.research, research_version()).strip()
+
+    # ── 누구에게 추천하나요 섹션 ──
+    recommend_section = _build_recommend_section(field, ctype).strip()
+
+    # ── 공감형 도입부에서 마크다운 볼드(**) 제거 ──
+    empathy_clean = empathy_intro.replace("**", "")
+
+    # ── 구조 다양화를 위한 해시 (과정별 미세 변형, 과정 시드라 실행마다 같음) ──
+    title_hash = ctx.seed + variant
+    sec_intro = get_varied_section_title("intro", title_hash + 1)
+    sec_overview = get_varied_section_title("overview", title_hash)
+    sec_benefits = get_varied_section_title("benefits", title_hash)
+    sec_curriculum = get_varied_section_title("curriculum", title_hash + 2)
+    sec_apply = get_varied_section_title("apply", title_hash + 3)
+    closing = get_varied_closing(title_hash)
+
+    # ── 무엇을 배울 수 있나요 섹션 (v5: 훈련목표 × 리서치 자체 해설) ──
+    # sec_curriculum이 정의된 뒤에 호출해야 합니다.
+    curriculum_section = _build_curriculum_section(ctx, sec_curriculum).strip()
+
+    # ════════════════════════════════════════
+    #  스마트에디터용 본문 텍스트 생성 (SEO v4)
+    # ════════════════════════════════════════
+
+    address = course_data.get("address")
+    post_content, slot_spans = render_spans(_POST_TEMPLATE, {
+        "blog_title": blog_title,
+        "sec_intro": sec_intro,
+        "empathy_clean": empathy_clean,
+        "seo_section": seo_section,
+        "sec_overview": sec_overview,
+        "title": title,
+        "institution": institution,
+        "period": period,
+        "time_info": time_info,
+        "capacity": capacity,
+        "target": target,
+        "sec_benefits": sec_benefits,
+        "benefit_text": benefit_text,
+        "cost_info": cost_info,
+        "recommend_section": recommend_section,
+        "curriculum_section": curriculum_section,
+        "sec_apply": sec_apply,
+        "hrd_url": hrd_url,
+        "allowance_step3": allowance_step3,
+        "contact_block": (institution + "\n" if institution and institution not in contact else "") + contact,
+        "address_line": ("📍 " + address) if address else "",
+        "closing": closing,
+        "year": year,
+        "today": today,
+        "hashtags": hashtags,
+    })
+
+    # ── 글자 수·키워드 밀도·도입부 ↔ SEO 섹션 수치 중복 (본문 1회 분석) ──
+    field_keywords = ["국비지원", "내일배움카드", field if field != "default" else "직업훈련"]
+    analysis = analyze_post(
+        post_content, ["제주"] + field_keywords,
+        [(_SECTION_LABELS[name], start, end) for name, start, end in slot_spans
+         if name in _SECTION_LABELS],
+    )
+    char_count = analysis["char_count"]
+    keyword_report = density_report_from(analysis, "제주", field_keywords)
+    overlap_report = overlap_report_from(analysis, "도입부", "왜 배워야 할까요")
+
+    caption = generate_instagram_caption(ctx)
+
+    # ── 기존 글과의 유사문서 진단 ──
+    duplicate_report = ""
+    if similar is not None:
+        duplicate_report = (similarity_report(similar("blog", post_content), "블로그 본문") + "\n"
+                           + similarity_report(similar("caption", caption), "인스타 캡션"))
+
+    # ── 작업 가이드 (파일 상단에 추가) ──
+    work_guide = _build_work_guide(blog_title, char_count, keyword_report, overlap_report,
+                                   duplicate_report)
+
+    final_content = work_guide + "\n" + post_content
+    guide = generate_posting_guide(ctx)
+    return final_content, caption, guide
+
+
+# 작업 가이드 템플릿 (구분선은 컴파일 시 채움)
+_WORK_GUIDE_TEMPLATE = compile_template("""{rule}
 📋 네이버 블로그 포스팅 작업 가이드 (SEO v4)
-{'=' * 60}
+{rule}
 
 ⚠️ 중요: AI 생성 콘텐츠를 그대로 게시하지 마세요!
 아래 인간화 편집을 반드시 거쳐야 네이버 저품질을 피할 수 있습니다.
@@ -293,7 +417,7 @@ def _build_work_guide(blog_title, char_count=0, keyword_report="", overlap_repor
 ✅ SEO 체크리스트
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-  □ 제목 15~25자 (현재: {len(blog_title)}자) → {blog_title}
+  □ 제목 15~25자 (현재: {title_len}자) → {blog_title}
   □ 본문 공백 제외 2,000자 이상 (현재: 약 {char_count}자)
     → 2,000자 미만이면 제주 현지 정보, 경험담을 추가하세요
   □ 첫 200자 안에 핵심 키워드 포함 확인
@@ -302,18 +426,24 @@ def _build_work_guide(blog_title, char_count=0, keyword_report="", overlap_repor
   □ 3~4줄마다 줄바꿈으로 가독성 확보
 
 📊 키워드 밀도 (본문 5~6회가 안전선):
-{keyword_report if keyword_report else "  (생성 후 자동 측정됩니다)"}
+{keyword_report}
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 🔁 도입부 ↔ '왜 배워야 할까요?' 중복 진단
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-{overlap_report if overlap_report else "  (측정 생략)"}
+{overlap_report}
 
   ※ 역할 분리 원칙
      · 들어가며      → 독자의 상황·경험에 공감 (수치·기관명 금지)
      · 왜 배워야 할까요 → 산업 통계·정책·기업사례로 근거 제시
 
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+🧬 기존 글과의 유사문서 진단
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+{duplicate_report}
+
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 ⛔ 저품질 방지 주의사항
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -345,10 +475,26 @@ def _build_work_guide(blog_title, char_count=0, keyword_report="", overlap_repor
   6. 미리보기로 확인 후 발행
   7. 발행 후 1~2시간 뒤 whereispost.com에서 색인 확인
 
-{'=' * 60}
+{rule}
 ===== 여기부터 본문 =====
-{'=' * 60}
-"""
+{rule}
+""", rule="=" * 60)
+
+
+def _build_work_guide(blog_title, char_count=0, keyword_report="", overlap_report="",
+                      duplicate_report=""):
+    """
+    파일 상단에 포함할 스마트에디터 작업 가이드 (SEO v4).
+    인간화 편집 체크리스트, 키워드 밀도 리포트, 저품질 방지 가이드 포함.
+    """
+    return render(_WORK_GUIDE_TEMPLATE, {
+        "title_len": len(blog_title),
+        "blog_title": blog_title,
+        "char_count": char_count,
+        "keyword_report": keyword_report if keyword_report else "  (생성 후 자동 측정됩니다)",
+        "overlap_report": overlap_report if overlap_report else "  (측정 생략)",
+        "duplicate_report": duplicate_report if duplicate_report else "  (측정 생략)",
+    })
 
 
 def _get_seo_section_title(field, year):
@@ -376,7 +522,8 @@ def _get_seo_section_title(field, year):
     return titles.get(field, "왜 이 과정을 추천할까요?")
 
 
-def _build_seo_section(course_data, field, year):
+@section
+def _build_seo_section(field, year, research, research_file_version):
     """
     '왜 OOO를 배워야 할까요?' 섹션을 생성합니다.
 
@@ -384,19 +531,22 @@ def _build_seo_section(course_data, field, year):
       · 도입부(들어가며)는 공감·문제의식만 담당
       · 이 섹션은 [산업 동향] + [훈련 필요성] 두 블록으로 구성해 분량을 확대
       · training_need_body가 있으면 소제목을 나눠 두 번째 블록으로 붙입니다.
-    """
-    title = course_data.get("title", "")
 
+    입력 (field, year, research, research_file_version)이 같으면 메모이즈된 결과를 재사용합니다.
+    research는 CourseContext.research (과정 제목으로 이미 서브필드까지 조회한 항목).
+    research가 None이면 전역 리서치 저장소를 조회하므로, research_file_version
+    (course_context.research_version())으로 리서치 파일이 바뀐 뒤의 메모 재사용을 막습니다.
+    """
     # 1순위: field_research.json 캐시에서 연구 기반 섹션 로드
     try:
         from field_research_helper import get_seo_section, get_training_need
-        cached_section = get_seo_section(field, year, title=title)
+        cached_section = get_seo_section(field, year, research=research)
         if cached_section:
             section_title = _get_seo_section_title(field, year)
             block = f"\n[소제목] {section_title}\n\n{cached_section}\n"
 
             # 훈련 필요성 블록 (있는 분야만) — 섹션 분량 확대
-            need = get_training_need(field, year, title=title)
+            need = get_training_need(field, year, research=research)
             if need:
                 block += (
                     f"\n[소제목] 그래서 왜 이 훈련일까요?\n\n{need}\n"
@@ -476,7 +626,7 @@ def _build_seo_section(course_data, field, year):
 """)
 
 
-def _build_goal_explanation(training_goal, field, title):
+def _build_goal_explanation(training_goal, field, title, research=None):
     """훈련목표 원문에서 키워드를 뽑아 리서치 기반 자체 해설을 생성합니다.
 
     동작 (v5):
@@ -498,7 +648,7 @@ def _build_goal_explanation(training_goal, field, title):
     except ImportError:
         return ""
 
-    expl_map = get_skill_explanations(field, title=title) or {}
+    expl_map = get_skill_explanations(field, title=title, research=research) or {}
 
     matched = []
     # 긴 키워드 우선 매칭 (부분 문자열 충돌 방지)
@@ -514,7 +664,7 @@ def _build_goal_explanation(training_goal, field, title):
         return "\n\n".join(matched)
 
     # 폴백: key_skills 상위 3개로 일반 해설 구성
-    skills = get_education_trends(field, "key_skills", title=title)
+    skills = get_education_trends(field, "key_skills", title=title, research=research)
     if skills:
         top = "、 ".join(skills[:3])
         return (
@@ -525,7 +675,7 @@ def _build_goal_explanation(training_goal, field, title):
     return ""
 
 
-def _build_curriculum_section(course_data, field, sec_title):
+def _build_curriculum_section(ctx, sec_title):
     """'무엇을 배울 수 있나요' 섹션을 생성합니다 (v5 신설).
 
     구조:
@@ -537,7 +687,9 @@ def _build_curriculum_section(course_data, field, sec_title):
       ▸ 수료 후 이런 길이 열려요      ← career_paths
       certification_note
     """
-    title = course_data.get("title", "")
+    course_data = ctx.course
+    title = ctx.title
+    field = ctx.field
     goal = (course_data.get("trainingGoal", "") or "").strip()
     outcome = (course_data.get("outcome", "") or "").strip()
 
@@ -552,7 +704,7 @@ def _build_curriculum_section(course_data, field, sec_title):
         block += f"{outcome}\n\n"
 
     # ── ② 자체 해설 (훈련목표 × 리서치 연계) ──
-    explanation = _build_goal_explanation(goal or outcome, field, title)
+    explanation = _build_goal_explanation(goal or outcome, field, title, ctx.research)
     if explanation:
         block += "▸ 풀어서 설명하면 이런 거예요\n\n"
         block += f"{explanation}\n\n"
@@ -564,7 +716,7 @@ def _build_curriculum_section(course_data, field, sec_title):
 
     if get_education_trends:
         # ── ③ 구체적으로 배우는 것들 ──
-        skills = get_education_trends(field, "key_skills", title=title)
+        skills = get_education_trends(field, "key_skills", title=title, research=ctx.research)
         if skills:
             hay = (goal + " " + outcome).upper().replace(" ", "")
             # 훈련목표에 언급된 스킬을 상단으로 끌어올림
@@ -583,7 +735,7 @@ def _build_curriculum_section(course_data, field, sec_title):
             block += "\n"
 
         # ── ④ 수료 후 진로 ──
-        paths = get_education_trends(field, "career_paths", title=title)
+        paths = get_education_trends(field, "career_paths", title=title, research=ctx.research)
         if paths:
             block += "▸ 수료 후 이런 길이 열려요\n\n"
             for p in paths[:6]:
@@ -591,7 +743,8 @@ def _build_curriculum_section(course_data, field, sec_title):
             block += "\n"
 
         # ── ⑤ 자격 관련 메모 ──
-        note = get_education_trends(field, "certification_note", title=title)
+        note = get_education_trends(field, "certification_note", title=title,
+                                    research=ctx.research)
         if note:
             block += f"💡 {note}\n\n"
 
@@ -605,6 +758,14 @@ def _build_curriculum_section(course_data, field, sec_title):
     return block
 
 
+@section
+def _build_benefit_text(ctype, hours):
+    """'혜택' 섹션 본문 (get_benefits_detail_lines_by_type의 "- " 글머리를 ✔로)"""
+    return "\n".join(line.replace("- ", "✔ ")
+                     for line in get_benefits_detail_lines_by_type(ctype, hours))
+
+
+@section
 def _build_recommend_section(field, ctype):
     """
     '이런 분에게 추천해요' 섹션을 생성합니다.
@@ -1,13 +1,17 @@
 """
 카드뉴스 자동 생성기 - 제주지역인적자원개발위원회 특화훈련 홍보용
 Instagram용 1080x1080 이미지를 생성합니다.
+슬라이드마다 CARDNEWS_FORMATS 설정에 따라 세로(1080x1350)·스토리(1080x1920)·썸네일도 함께 생성합니다.
 """
 
 from PIL import Image, ImageDraw, ImageFont
 import textwrap
 import os
 import math
-from benefits_helper import get_badge_text, get_benefits_text, get_benefits_footnote, get_step3_text, get_total_hours
+from benefits_helper import get_badge_text, get_benefits_text, get_benefits_footnote, get_step3_text
+from course_context import course_context
+from image_encoder import save_slide, encoding_pool
+from text_fit import fit_text
 
 # ── 브랜드 컬러 ──
 COLORS = {
@@ -81,56 +85,172 @@ def wrap_text_to_lines(text, font, max_width, draw):
     return lines
 
 
-def generate_slide_cover(course_data, output_path):
+# ── 출력 포맷 (가로 1080 고정 → 텍스트 측정 결과를 모든 포맷이 공유) ──
+# thumbnail은 feed 결과를 축소해 만들므로 별도 레이아웃 계산이 없습니다.
+ASPECT_FORMATS = {
+    "feed": (1080, 1080),       # 인스타그램 정사각 피드
+    "portrait": (1080, 1350),   # 인스타그램 4:5 세로 피드
+    "story": (1080, 1920),      # 스토리/릴스 9:16
+    "thumbnail": (540, 540),    # 블로그·목록용 썸네일
+}
+FORMAT_SUFFIX = {"feed": "", "portrait": "_portrait", "story": "_story", "thumbnail": "_thumb"}
+
+# 파이프라인이 기본으로 렌더링할 포맷 (쉼표 구분, 기본: feed만)
+CARDNEWS_FORMATS = [f.strip() for f in os.environ.get("CARDNEWS_FORMATS", "feed").split(",")
+                    if f.strip() in ASPECT_FORMATS] or ["feed"]
+
+
+def format_output_path(output_path, fmt):
+    """feed 경로(…_1_cover.png) → 포맷별 경로(…_1_cover_story.png)"""
+    base, ext = os.path.splitext(output_path)
+    return base + FORMAT_SUFFIX[fmt] + ext
+
+
+def _measure_cover(ctx):
     """
-    슬라이드 1: 커버 이미지 (주목 유도)
-    개선: 아이콘 정보카드 + 비용 임팩트 강조 + 혜택 배너 + 섹션 여백 확보
+    커버 슬라이드의 해상도 독립 레이아웃 (텍스트 측정 1회)
+
+    폰트 로드·줄바꿈·textbbox 측정처럼 비용이 큰 작업은 여기서 한 번만 하고,
+    실제 좌표는 _paint_cover()가 캔버스 높이에 맞춰 결정합니다.
     """
-    W, H = 1080, 1080
+    course_data = ctx.course
+    W = 1080
+    draw = ImageDraw.Draw(Image.new('RGB', (1, 1)))
+    lay = {"W": W}
+
+    # ── 상단 태그 / 뱃지 / NCS ──
+    lay["font_tag"] = get_font(FONT_BOLD, 31)
+    lay["tag_text"] = "제주지역 특화훈련"
+    tag_bbox = draw.textbbox((0, 0), lay["tag_text"], font=lay["font_tag"])
+    lay["tag_w"] = tag_bbox[2] - tag_bbox[0] + 44
+    lay["tag_h"] = tag_bbox[3] - tag_bbox[1] + 24
+
+    lay["font_badge"] = get_font(FONT_BOLD, 29)
+    lay["badge_text"] = get_badge_text(course_data)
+    badge_bbox = draw.textbbox((0, 0), lay["badge_text"], font=lay["font_badge"])
+    lay["badge_w"] = badge_bbox[2] - badge_bbox[0] + 44
+    lay["badge_h"] = badge_bbox[3] - badge_bbox[1] + 24
+
+    ncs_name = course_data.get("ncsName", "")
+    lay["ncs_label"] = f"NCS {ncs_name}" if ncs_name else ""
+    if ncs_name:
+        lay["font_ncs"] = get_font(FONT_BOLD, 33)
+        ncs_bbox = draw.textbbox((0, 0), lay["ncs_label"], font=lay["font_ncs"])
+        lay["ncs_text_w"] = ncs_bbox[2] - ncs_bbox[0]
+        lay["ncs_text_h"] = ncs_bbox[3] - ncs_bbox[1]
+
+    # ── 과정명 (메인 타이틀) ──
+    # 55px·3줄(줄 간격 75) 상자에 들어가는 가장 큰 크기 (긴 제목은 최소 40px까지 축소)
+    lay["font_title"], lay["title_lines"], lay["title_line_h"] = fit_text(
+        course_data["title"], FONT_BLACK, W - 140, 3 * 75,
+        min_size=40, max_size=55, line_ratio=75 / 55, max_lines=3)
+    lay["font_inst"] = get_font(FONT_REGULAR, 33)
+    lay["institution"] = f"{course_data['institution']}"
+
+    # ── 정보 아이콘 카드 ──
+    # 다회차 과정: period의 " | " 구분자를 줄바꿈으로 변환
+    period_val = course_data.get("period", "").replace(" | ", "\n")
+    info_items = []
+    if period_val:
+        info_items.append(("배움 기간", period_val, 1.4))
+    hours = ctx.hours
+    if hours > 0:
+        info_items.append(("배움 시간", f"{hours}시간", 0.8))
+    if course_data.get("capacity"):
+        info_items.append(("모집 인원", course_data["capacity"], 0.8))
+    lay["info_items"] = info_items
+
+    # 다회차 줄바꿈 → 카드 높이 동적 확장 (회차당 +32px)
+    card_h = 105
+    for _, value, _ in info_items:
+        extra_lines = value.count("\n")
+        if extra_lines > 0:
+            card_h = max(card_h, 105 + extra_lines * 32)
+    lay["card_h"] = card_h
+    lay["font_info_label"] = get_font(FONT_BOLD, 25)
+    lay["font_info_value"] = get_font(FONT_BOLD, 27)
+
+    # ── 비용 강조 ──
+    lay["self_cost"] = course_data.get("selfCost", "")
+    lay["course_cost"] = course_data.get("courseCost", "")
+    if lay["self_cost"] or lay["course_cost"]:
+        lay["font_cost_label"] = get_font(FONT_BOLD, 25)
+        lay["font_cost_prefix"] = get_font(FONT_BOLD, 31)
+        lay["font_cost_big"] = get_font(FONT_BLACK, 48)
+        lay["font_cost_small"] = get_font(FONT_REGULAR, 21)
+        lay["cost_label_text"] = "■ 훈련에 참여할 때 내는 자부담금"
+        label_bbox = draw.textbbox((0, 0), lay["cost_label_text"], font=lay["font_cost_label"])
+        lay["cost_label_h"] = label_bbox[3] - label_bbox[1]
+        cost_line_bbox = draw.textbbox((0, 0), "단, 000,000원", font=lay["font_cost_big"])
+        lay["cost_line_h"] = cost_line_bbox[3] - cost_line_bbox[1]
+        prefix_bbox = draw.textbbox((0, 0), "단,", font=lay["font_cost_prefix"])
+        lay["cost_prefix_w"] = prefix_bbox[2] - prefix_bbox[0]
+        if lay["self_cost"]:
+            cost_bbox = draw.textbbox((0, 0), lay["self_cost"], font=lay["font_cost_big"])
+            lay["self_cost_w"] = cost_bbox[2] - cost_bbox[0]
+
+    # ── 혜택 배너 ──
+    benefits = course_data.get("benefits", "") or get_benefits_text(course_data)
+    lay["benefit_lines"] = [l.strip() for l in benefits.split('\n') if l.strip()][:3]
+    lay["font_benefit_icon"] = get_font(FONT_BOLD, 27)
+    lay["font_benefit"] = get_font(FONT_REGULAR, 24)
+
+    # ── 주석 / 하단 바 ──
+    lay["font_footnote"] = get_font(FONT_REGULAR, 23)
+    lay["footnote"] = get_benefits_footnote(course_data)
+    lay["font_footer"] = get_font(FONT_REGULAR, 23)
+    lay["font_cta"] = get_font(FONT_BOLD, 25)
+    lay["org_text"] = "제주지역인적자원개발위원회"
+    org_bbox = draw.textbbox((0, 0), lay["org_text"], font=lay["font_footer"])
+    lay["org_h"] = org_bbox[3] - org_bbox[1]
+    lay["cta_text"] = "신청 ▸ work24.go.kr"
+    cta_bbox = draw.textbbox((0, 0), lay["cta_text"], font=lay["font_cta"])
+    lay["cta_w"] = cta_bbox[2] - cta_bbox[0]
+    lay["cta_h"] = cta_bbox[3] - cta_bbox[1]
+    return lay
+
+
+def _paint_cover(lay, H=1080):
+    """
+    측정된 레이아웃을 높이 H 캔버스에 그립니다.
+
+    feed(1080) 기준 좌표를 그대로 쓰고, 세로로 늘어난 만큼(extra)의 2/5는
+    상단 타이틀 블록에, 나머지는 하단 정보 영역 위·아래 여백으로 배분합니다.
+    """
+    W = lay["W"]
+    extra = max(0, H - 1080)
+    hero_grow = extra * 2 // 5
+    hero_h = 520 + hero_grow
     img = Image.new('RGB', (W, H), hex_to_rgb(COLORS["white"]))
     draw = ImageDraw.Draw(img)
 
     # ── 상단 배경 블록 ──
-    draw_rounded_rect(draw, (0, 0, W, 520), radius=0, fill=hex_to_rgb(COLORS["primary"]))
+    draw_rounded_rect(draw, (0, 0, W, hero_h), radius=0, fill=hex_to_rgb(COLORS["primary"]))
 
     # 상단 장식 라인
     draw.rectangle((0, 0, W, 8), fill=hex_to_rgb(COLORS["accent"]))
 
     # ── 상단 태그 ──
-    font_tag = get_font(FONT_BOLD, 31)
-    tag_text = "제주지역 특화훈련"
-    tag_bbox = draw.textbbox((0, 0), tag_text, font=font_tag)
-    tag_w = tag_bbox[2] - tag_bbox[0] + 44
-    tag_h = tag_bbox[3] - tag_bbox[1] + 24
+    tag_w, tag_h = lay["tag_w"], lay["tag_h"]
     tag_x = 60
     tag_y = 45
     draw_rounded_rect(draw, (tag_x, tag_y, tag_x + tag_w, tag_y + tag_h),
                        radius=22, fill=hex_to_rgb(COLORS["accent"]))
-    draw.text((tag_x + 22, tag_y + 8), tag_text, font=font_tag, fill=hex_to_rgb(COLORS["white"]))
+    draw.text((tag_x + 22, tag_y + 8), lay["tag_text"], font=lay["font_tag"], fill=hex_to_rgb(COLORS["white"]))
 
     # ── "자부담 10%" 뱃지 ──
-    font_badge = get_font(FONT_BOLD, 29)
-    badge_text = get_badge_text(course_data)
-    badge_bbox = draw.textbbox((0, 0), badge_text, font=font_badge)
-    badge_w = badge_bbox[2] - badge_bbox[0] + 44
-    badge_h = badge_bbox[3] - badge_bbox[1] + 24
+    badge_w, badge_h = lay["badge_w"], lay["badge_h"]
     badge_x = W - badge_w - 60
     badge_y = 45
     draw_rounded_rect(draw, (badge_x, badge_y, badge_x + badge_w, badge_y + badge_h),
                        radius=22, fill=hex_to_rgb(COLORS["success"]))
-    draw.text((badge_x + 22, badge_y + 8), badge_text, font=font_badge, fill=hex_to_rgb(COLORS["white"]))
+    draw.text((badge_x + 22, badge_y + 8), lay["badge_text"], font=lay["font_badge"], fill=hex_to_rgb(COLORS["white"]))
 
     # ── NCS직종명 (태그-뱃지 사이 중앙) ──
-    ncs_name = course_data.get("ncsName", "")
-    if ncs_name:
-        font_ncs = get_font(FONT_BOLD, 33)
-        ncs_label = f"NCS {ncs_name}"
-        ncs_bbox = draw.textbbox((0, 0), ncs_label, font=font_ncs)
-        ncs_text_w = ncs_bbox[2] - ncs_bbox[0]
-        ncs_text_h = ncs_bbox[3] - ncs_bbox[1]
+    if lay["ncs_label"]:
         ncs_pad_x, ncs_pad_y = 24, 15
-        ncs_pill_w = ncs_text_w + ncs_pad_x * 2
-        ncs_pill_h = ncs_text_h + ncs_pad_y * 2
+        ncs_pill_w = lay["ncs_text_w"] + ncs_pad_x * 2
+        ncs_pill_h = lay["ncs_text_h"] + ncs_pad_y * 2
         gap_left = tag_x + tag_w
         gap_right = badge_x
         ncs_pill_x = gap_left + (gap_right - gap_left - ncs_pill_w) // 2
@@ -139,48 +259,32 @@ def generate_slide_cover(course_data, output_path):
                            (ncs_pill_x, ncs_pill_y,
                             ncs_pill_x + ncs_pill_w, ncs_pill_y + ncs_pill_h),
                            radius=20, fill=hex_to_rgb("#1A3A5C"), outline=hex_to_rgb("#FFFFFF"), width=2)
-        draw.text((ncs_pill_x + ncs_pad_x, ncs_pill_y + ncs_pad_y), ncs_label,
-                  font=font_ncs, fill=hex_to_rgb("#FFFFFF"))
+        draw.text((ncs_pill_x + ncs_pad_x, ncs_pill_y + ncs_pad_y), lay["ncs_label"],
+                  font=lay["font_ncs"], fill=hex_to_rgb("#FFFFFF"))
 
-    # ── 과정명 (메인 타이틀) ──
-    font_title = get_font(FONT_BLACK, 55)
-    title_lines = wrap_text_to_lines(course_data["title"], font_title, W - 140, draw)
-    if len(title_lines) > 3:
-        title_lines = title_lines[:3]
-        title_lines[-1] = title_lines[-1][:-1] + "…"
-
-    title_y_start = 145
-    line_height = 75
+    # ── 과정명 (메인 타이틀) — 늘어난 상단 블록 안에서 아래쪽으로 이동 ──
+    title_lines = lay["title_lines"]
+    title_y_start = 145 + hero_grow * 2 // 3
+    line_height = lay["title_line_h"]
     for i, line in enumerate(title_lines):
         draw.text((70, title_y_start + i * line_height), line,
-                  font=font_title, fill=hex_to_rgb(COLORS["white"]))
+                  font=lay["font_title"], fill=hex_to_rgb(COLORS["white"]))
 
     # ── 훈련기관명 ──
-    font_inst = get_font(FONT_REGULAR, 33)
     inst_y = title_y_start + len(title_lines) * line_height + 15
-    draw.text((70, inst_y), f"{course_data['institution']}",
-              font=font_inst, fill=hex_to_rgb("#AED6F1"))
+    draw.text((70, inst_y), lay["institution"],
+              font=lay["font_inst"], fill=hex_to_rgb("#AED6F1"))
 
     # ── 좌측 액센트 라인 ──
-    draw.rectangle((0, 520, 6, H - 100), fill=hex_to_rgb(COLORS["accent"]))
+    draw.rectangle((0, hero_h, 6, H - 100), fill=hex_to_rgb(COLORS["accent"]))
 
     # ══════════════════════════════════════════════════
     # 하단 정보 영역 (아이콘 카드 + 비용 강조 + 혜택 배너)
     # ══════════════════════════════════════════════════
 
     # ── 정보 아이콘 카드 (가로 배치, 배움기간 넓게) ──
-    # 다회차 과정: period의 " | " 구분자를 줄바꿈으로 변환
-    period_val = course_data.get("period", "").replace(" | ", "\n")
-    info_items = []
-    if period_val:
-        info_items.append(("배움 기간", period_val, 1.4))
-    hours = get_total_hours(course_data)
-    if hours > 0:
-        info_items.append(("배움 시간", f"{hours}시간", 0.8))
-    if course_data.get("capacity"):
-        info_items.append(("모집 인원", course_data["capacity"], 0.8))
-
-    card_top = 540
+    info_items = lay["info_items"]
+    card_top = hero_h + 20 + (extra - hero_grow) // 3
     card_margin = 50
     n_items = len(info_items)
 
@@ -189,16 +293,9 @@ def generate_slide_cover(course_data, output_path):
         total_gap = gap * (n_items - 1)
         usable_w = W - card_margin * 2 - total_gap
         total_weight = sum(item[2] for item in info_items)
-
-        # 다회차 줄바꿈 → 카드 높이 동적 확장 (회차당 +32px)
-        card_h = 105
-        for _, value, _ in info_items:
-            extra_lines = value.count("\n")
-            if extra_lines > 0:
-                card_h = max(card_h, 105 + extra_lines * 32)
-
-        font_info_label = get_font(FONT_BOLD, 25)
-        font_info_value = get_font(FONT_BOLD, 27)
+        card_h = lay["card_h"]
+        font_info_label = lay["font_info_label"]
+        font_info_value = lay["font_info_value"]
 
         cx = card_margin
         for i, (label, value, weight) in enumerate(info_items):
@@ -233,8 +330,8 @@ def generate_slide_cover(course_data, output_path):
         next_y = card_top + 10
 
     # ── 비용 강조 영역 (박스 확대 + 세로 중앙 정렬) ──
-    self_cost = course_data.get("selfCost", "")
-    course_cost = course_data.get("courseCost", "")
+    self_cost = lay["self_cost"]
+    course_cost = lay["course_cost"]
     if self_cost or course_cost:
         cost_box_h = 120
         cost_box_top = next_y
@@ -243,54 +340,38 @@ def generate_slide_cover(course_data, output_path):
                            (card_margin, cost_box_top, W - card_margin, cost_box_bottom),
                            radius=15, fill=hex_to_rgb("#EBF5FB"))
 
-        font_cost_label = get_font(FONT_BOLD, 25)
-        font_cost_prefix = get_font(FONT_BOLD, 31)
-        font_cost_big = get_font(FONT_BLACK, 48)
-        font_cost_small = get_font(FONT_REGULAR, 21)
-
         # 콘텐츠 높이 계산 (라벨 + 금액행)
-        label_text = "■ 훈련에 참여할 때 내는 자부담금"
-        label_bbox = draw.textbbox((0, 0), label_text, font=font_cost_label)
-        label_h = label_bbox[3] - label_bbox[1]
-        cost_line_bbox = draw.textbbox((0, 0), "단, 000,000원", font=font_cost_big)
-        cost_line_h = cost_line_bbox[3] - cost_line_bbox[1]
+        label_h = lay["cost_label_h"]
         content_gap = 12
-        total_content_h = label_h + content_gap + cost_line_h
+        total_content_h = label_h + content_gap + lay["cost_line_h"]
         content_top = cost_box_top + (cost_box_h - total_content_h) // 2
 
         # 라벨
-        draw.text((card_margin + 22, content_top), label_text,
-                  font=font_cost_label, fill=hex_to_rgb(COLORS["primary"]))
+        draw.text((card_margin + 22, content_top), lay["cost_label_text"],
+                  font=lay["font_cost_label"], fill=hex_to_rgb(COLORS["primary"]))
 
         cost_row_y = content_top + label_h + content_gap
         if self_cost:
-            prefix_text = "단,"
-            draw.text((card_margin + 22, cost_row_y), prefix_text,
-                      font=font_cost_prefix, fill=hex_to_rgb(COLORS["text_dark"]))
-            prefix_bbox = draw.textbbox((0, 0), prefix_text, font=font_cost_prefix)
-            prefix_w = prefix_bbox[2] - prefix_bbox[0]
+            draw.text((card_margin + 22, cost_row_y), "단,",
+                      font=lay["font_cost_prefix"], fill=hex_to_rgb(COLORS["text_dark"]))
+            prefix_w = lay["cost_prefix_w"]
 
             draw.text((card_margin + 22 + prefix_w + 12, cost_row_y - 6), self_cost,
-                      font=font_cost_big, fill=hex_to_rgb(COLORS["accent"]))
+                      font=lay["font_cost_big"], fill=hex_to_rgb(COLORS["accent"]))
 
             if course_cost:
-                cost_bbox = draw.textbbox((0, 0), self_cost, font=font_cost_big)
-                cost_w = cost_bbox[2] - cost_bbox[0]
-                small_x = card_margin + 22 + prefix_w + 12 + cost_w + 14
+                small_x = card_margin + 22 + prefix_w + 12 + lay["self_cost_w"] + 14
                 draw.text((small_x, cost_row_y + 8),
                           f"(원래 수강료 {course_cost})",
-                          font=font_cost_small, fill=hex_to_rgb("#888888"))
+                          font=lay["font_cost_small"], fill=hex_to_rgb("#888888"))
         elif course_cost:
             draw.text((card_margin + 22, cost_row_y), course_cost,
-                      font=font_cost_big, fill=hex_to_rgb(COLORS["accent"]))
+                      font=lay["font_cost_big"], fill=hex_to_rgb(COLORS["accent"]))
         next_y += cost_box_h + 12
 
     # ── 혜택 배너 (세로 중앙 정렬) ──
-    benefits = course_data.get("benefits", "") or get_benefits_text(course_data)
-    benefit_lines = [l.strip() for l in benefits.split('\n') if l.strip()]
-
-    if benefit_lines:
-        visible_lines = benefit_lines[:3]
+    visible_lines = lay["benefit_lines"]
+    if visible_lines:
         line_h = 34
         banner_h = max(60, len(visible_lines) * line_h + 24)
         banner_top = next_y
@@ -298,120 +379,109 @@ def generate_slide_cover(course_data, output_path):
                            (card_margin, banner_top, W - card_margin, banner_top + banner_h),
                            radius=15, fill=hex_to_rgb("#FEF9E7"))
 
-        font_benefit_icon = get_font(FONT_BOLD, 27)
-        font_benefit = get_font(FONT_REGULAR, 24)
-
         # 텍스트 영역 세로 중앙
         total_text_h = len(visible_lines) * line_h
         text_start_y = banner_top + (banner_h - total_text_h) // 2
 
         draw.text((card_margin + 18, text_start_y), "★",
-                  font=font_benefit_icon, fill=hex_to_rgb(COLORS["accent"]))
+                  font=lay["font_benefit_icon"], fill=hex_to_rgb(COLORS["accent"]))
         for bi, bline in enumerate(visible_lines):
             draw.text((card_margin + 52, text_start_y + bi * line_h), bline,
-                      font=font_benefit, fill=hex_to_rgb(COLORS["text_dark"]))
+                      font=lay["font_benefit"], fill=hex_to_rgb(COLORS["text_dark"]))
 
         next_y += banner_h + 8
 
     # ── 하단 ※ 주석 ──
-    font_footnote = get_font(FONT_REGULAR, 23)
-    footnote = get_benefits_footnote(course_data)
-    draw.text((60, next_y), footnote,
-              font=font_footnote, fill=hex_to_rgb(COLORS["text_dark"]))
+    draw.text((60, next_y), lay["footnote"],
+              font=lay["font_footnote"], fill=hex_to_rgb(COLORS["text_dark"]))
 
     # ── 하단 바 ──
     footer_y = H - 80
     footer_bar_h = H - footer_y
     draw.rectangle((0, footer_y, W, H), fill=hex_to_rgb(COLORS["primary"]))
-    font_footer = get_font(FONT_REGULAR, 23)
-    font_cta = get_font(FONT_BOLD, 25)
-
-    org_text = "제주지역인적자원개발위원회"
-    org_bbox = draw.textbbox((0, 0), org_text, font=font_footer)
-    org_h = org_bbox[3] - org_bbox[1]
-    org_text_y = footer_y + (footer_bar_h - org_h) // 2
-    draw.text((60, org_text_y), org_text,
-              font=font_footer, fill=hex_to_rgb("#AED6F1"))
-
-    cta_text = "신청 ▸ work24.go.kr"
-    cta_bbox = draw.textbbox((0, 0), cta_text, font=font_cta)
-    cta_w = cta_bbox[2] - cta_bbox[0]
-    cta_h = cta_bbox[3] - cta_bbox[1]
-    cta_text_y = footer_y + (footer_bar_h - cta_h) // 2
-    draw.text((W - cta_w - 60, cta_text_y), cta_text,
-              font=font_cta, fill=hex_to_rgb(COLORS["accent_bright"]))
-
-    img.save(output_path, quality=95)
-    return output_path
 
+    org_text_y = footer_y + (footer_bar_h - lay["org_h"]) // 2
+    draw.text((60, org_text_y), lay["org_text"],
+              font=lay["font_footer"], fill=hex_to_rgb("#AED6F1"))
 
-def generate_slide_detail(course_data, output_path):
-    """
-    슬라이드 2: 과정 상세 정보
+    cta_text_y = footer_y + (footer_bar_h - lay["cta_h"]) // 2
+    draw.text((W - lay["cta_w"] - 60, cta_text_y), lay["cta_text"],
+              font=lay["font_cta"], fill=hex_to_rgb(COLORS["accent_bright"]))
 
-    데이터 우선순위:
-    1. trainingGoal(훈련목표)이 있으면 → 훈련목표 중심 레이아웃
-    2. curriculum이 있으면 → 커리큘럼 리스트 레이아웃
-    3. 둘 다 없으면 → 과정 기본정보 요약 레이아웃
+    return img
+
+
+def render_formats(measure, paint, formats):
     """
-    W, H = 1080, 1080
-    img = Image.new('RGB', (W, H), hex_to_rgb(COLORS["bg_light"]))
-    draw = ImageDraw.Draw(img)
+    레이아웃 측정 1회 → 포맷별 페인트 (v1/v2 전 슬라이드 공용)
+
+    Args:
+        measure: () → layout
+        paint: (layout, H) → Image (가로 1080)
+        formats: ASPECT_FORMATS 키 목록
+    Returns:
+        dict: {포맷: Image}
+    """
+    layout = measure()
+    images = {}
+    # thumbnail은 feed 결과를 재사용하므로 마지막에 처리
+    for fmt in sorted(formats, key=lambda f: f == "thumbnail"):
+        w, h = ASPECT_FORMATS[fmt]
+        if fmt == "thumbnail":
+            # feed 결과를 재사용해 축소 (feed를 안 그렸으면 이때 한 번 그림)
+            feed = images["feed"] if "feed" in images else paint(layout, ASPECT_FORMATS["feed"][1])
+            thumb = feed.copy()
+            thumb.thumbnail((w, h), Image.LANCZOS)
+            images[fmt] = thumb
+        else:
+            images[fmt] = paint(layout, h)
+    return images
 
-    # 상단 컬러 바
-    draw.rectangle((0, 0, W, 8), fill=hex_to_rgb(COLORS["accent"]))
-    draw.rectangle((0, 8, W, 12), fill=hex_to_rgb(COLORS["primary"]))
 
-    training_goal = course_data.get("trainingGoal", "")
-    curriculum = course_data.get("curriculum", [])
+def save_formats(images, output_path, flat=False):
+    """render_formats() 결과 저장 → {포맷: 저장 경로} (feed 경로에 포맷 접미사)"""
+    paths = {}
+    for fmt, img in images.items():
+        path = format_output_path(output_path, fmt)
+        save_slide(img, path, flat=flat)
+        paths[fmt] = path
+    return paths
 
-    if training_goal:
-        _draw_slide_detail_goal(draw, W, H, course_data, training_goal)
-    elif curriculum:
-        _draw_slide_detail_curriculum(draw, W, H, course_data, curriculum)
-    else:
-        _draw_slide_detail_fallback(draw, W, H, course_data)
 
-    # ── 하단 바 ──
-    footer_y = H - 80
-    footer_bar_h = H - footer_y
-    draw.rectangle((0, footer_y, W, H), fill=hex_to_rgb(COLORS["primary"]))
-    font_footer = get_font(FONT_REGULAR, 23)
-    ft_text = "제주지역인적자원개발위원회  |  신청: work24.go.kr"
-    ft_bbox = draw.textbbox((0, 0), ft_text, font=font_footer)
-    ft_h = ft_bbox[3] - ft_bbox[1]
-    ft_text_y = footer_y + (footer_bar_h - ft_h) // 2
-    draw.text((60, ft_text_y), ft_text,
-              font=font_footer, fill=hex_to_rgb("#AED6F1"))
-
-    img.save(output_path, quality=95)
+def generate_slide_cover(course_data, output_path):
+    """
+    슬라이드 1: 커버 이미지 (주목 유도)
+    개선: 아이콘 정보카드 + 비용 임팩트 강조 + 혜택 배너 + 섹션 여백 확보
+    """
+    img = _paint_cover(_measure_cover(course_context(course_data)))
+    save_slide(img, output_path, flat=True)
     return output_path
 
 
-def _draw_slide_detail_goal(draw, W, H, course_data, training_goal):
-    """훈련목표가 있을 때의 상세 슬라이드 레이아웃 (카드 UI + 과정정보 태그)"""
-    from benefits_helper import get_total_hours, get_course_type
+def generate_cover_formats(course_data, output_path, formats=None):
+    """
+    커버를 여러 화면비로 한 번에 렌더링 (feed/portrait/story/thumbnail)
 
-    footer_y = H - 80  # 하단 footer 시작점
+    텍스트 측정은 1회만 수행하고 포맷별로 페인트만 다시 합니다.
+    output_path는 feed 기준 경로이며, 나머지는 접미사(_story 등)가 붙습니다.
 
-    # ── 헤더 영역 ──
-    font_header = get_font(FONT_BOLD, 39)
-    draw.text((60, 45), "이런 걸 배워요", font=font_header, fill=hex_to_rgb(COLORS["primary"]))
-
-    font_subtitle = get_font(FONT_REGULAR, 25)
-    title_short = course_data["title"][:38] + ("…" if len(course_data["title"]) > 38 else "")
-    draw.text((60, 95), title_short, font=font_subtitle, fill=hex_to_rgb(COLORS["text_gray"]))
+    Returns:
+        dict: {포맷: 저장 경로}
+    """
+    formats = formats or CARDNEWS_FORMATS
+    ctx = course_context(course_data)
+    images = render_formats(lambda: _measure_cover(ctx), _paint_cover, formats)
+    return save_formats(images, output_path, flat=True)
 
-    # 구분선
-    draw.line((60, 138, W - 60, 138), fill=hex_to_rgb("#D5D8DC"), width=2)
 
-    # ── 하단 과정정보 태그 영역 (먼저 계산하여 카드 영역 확보) ──
-    hours = get_total_hours(course_data)
+def _detail_info_tags(ctx):
+    """훈련목표 레이아웃 하단 과정정보 태그 (기관 / 총 시간 / NCS / 과정 유형)"""
+    course_data = ctx.course
+    hours = ctx.hours
     institution = course_data.get("institution", "")
     ncs_name = course_data.get("ncsName", "")
-    ctype = get_course_type(course_data)
+    ctype = ctx.ctype
 
-    # 태그 데이터 수집
     info_tags = []
     if institution:
         info_tags.append(institution[:20])
@@ -422,18 +492,141 @@ def _draw_slide_detail_goal(draw, W, H, course_data, training_goal):
     ctype_labels = {"short": "단기과정", "general": "일반과정", "long": "장기과정"}
     if ctype in ctype_labels:
         info_tags.append(ctype_labels[ctype])
+    return info_tags
+
+
+def _measure_detail(ctx):
+    """
+    상세 슬라이드의 해상도 독립 레이아웃 (텍스트 측정 1회)
+
+    훈련목표 본문 폰트 크기는 feed(1080) 카드 높이로 맞추고, 더 긴 포맷에서는
+    같은 폰트·줄바꿈을 늘어난 카드 안에 수직 중앙 정렬만 다시 합니다.
+    """
+    course_data = ctx.course
+    W = 1080
+    draw = ImageDraw.Draw(Image.new('RGB', (1, 1)))
+    lay = {"W": W}
+
+    training_goal = course_data.get("trainingGoal", "")
+    curriculum = course_data.get("curriculum", [])
+
+    if training_goal:
+        lay["mode"] = "goal"
+        lay["body"] = _measure_detail_goal(draw, W, ctx, training_goal)
+    elif curriculum:
+        lay["mode"] = "curriculum"
+        lay["body"] = _measure_detail_curriculum(draw, W, course_data, curriculum)
+    else:
+        lay["mode"] = "fallback"
+        lay["body"] = _measure_detail_fallback(draw, W, course_data)
+
+    # ── 하단 바 ──
+    lay["font_footer"] = get_font(FONT_REGULAR, 23)
+    lay["ft_text"] = "제주지역인적자원개발위원회  |  신청: work24.go.kr"
+    ft_bbox = draw.textbbox((0, 0), lay["ft_text"], font=lay["font_footer"])
+    lay["ft_h"] = ft_bbox[3] - ft_bbox[1]
+    return lay
+
+
+def _paint_detail(lay, H=1080):
+    """측정된 상세 슬라이드 레이아웃을 높이 H 캔버스에 그립니다."""
+    W = lay["W"]
+    img = Image.new('RGB', (W, H), hex_to_rgb(COLORS["bg_light"]))
+    draw = ImageDraw.Draw(img)
+
+    # 상단 컬러 바
+    draw.rectangle((0, 0, W, 8), fill=hex_to_rgb(COLORS["accent"]))
+    draw.rectangle((0, 8, W, 12), fill=hex_to_rgb(COLORS["primary"]))
+
+    if lay["mode"] == "goal":
+        _paint_detail_goal(draw, W, H, lay["body"])
+    elif lay["mode"] == "curriculum":
+        _paint_detail_curriculum(draw, W, H, lay["body"])
+    else:
+        _paint_detail_fallback(draw, W, H, lay["body"])
+
+    # ── 하단 바 ──
+    footer_y = H - 80
+    footer_bar_h = H - footer_y
+    draw.rectangle((0, footer_y, W, H), fill=hex_to_rgb(COLORS["primary"]))
+    ft_text_y = footer_y + (footer_bar_h - lay["ft_h"]) // 2
+    draw.text((60, ft_text_y), lay["ft_text"],
+              font=lay["font_footer"], fill=hex_to_rgb("#AED6F1"))
+
+    return img
+
+
+def generate_slide_detail(course_data, output_path):
+    """
+    슬라이드 2: 과정 상세 정보
+
+    데이터 우선순위:
+    1. trainingGoal(훈련목표)이 있으면 → 훈련목표 중심 레이아웃
+    2. curriculum이 있으면 → 커리큘럼 리스트 레이아웃
+    3. 둘 다 없으면 → 과정 기본정보 요약 레이아웃
+    """
+    img = _paint_detail(_measure_detail(course_context(course_data)))
+    save_slide(img, output_path, flat=True)
+    return output_path
+
+
+def generate_detail_formats(course_data, output_path, formats=None):
+    """상세 슬라이드를 여러 화면비로 한 번에 렌더링 → {포맷: 저장 경로}"""
+    formats = formats or CARDNEWS_FORMATS
+    ctx = course_context(course_data)
+    images = render_formats(lambda: _measure_detail(ctx), _paint_detail, formats)
+    return save_formats(images, output_path, flat=True)
+
 
-    # 태그 영역 높이 계산
-    info_area_h = 0
-    if info_tags:
-        info_area_h = 110  # 태그 2줄 + 여백
+def _measure_detail_goal(draw, W, ctx, training_goal):
+    """훈련목표 레이아웃 측정 — 본문 폰트는 feed(H=1080) 카드 높이 기준으로 맞춤"""
+    course_data = ctx.course
+    lay = {}
+    lay["font_header"] = get_font(FONT_BOLD, 39)
+    lay["font_subtitle"] = get_font(FONT_REGULAR, 25)
+    lay["title_short"] = course_data["title"][:38] + ("…" if len(course_data["title"]) > 38 else "")
+
+    # ── 하단 과정정보 태그 (먼저 계산하여 카드 영역 확보) ──
+    info_tags = _detail_info_tags(ctx)
+    lay["info_area_h"] = 110 if info_tags else 0  # 태그 2줄 + 여백
+    lay["font_tag"] = get_font(FONT_BOLD, 27)
+    lay["tags"] = [(tag_label, draw.textbbox((0, 0), tag_label, font=lay["font_tag"]))
+                   for tag_label in info_tags]
+
+    lay["font_goal_label"] = get_font(FONT_BOLD, 30)
+
+    # ── 훈련목표 본문 (자동 폰트 크기 조정: 21~32px 이진 탐색) ──
+    card_inner_w = (W - 45) - 45 - 80  # 좌우 패딩 40씩
+    lay["font_goal_body"], lay["lines"], lay["line_spacing"] = fit_text(
+        training_goal, FONT_REGULAR, card_inner_w, _detail_goal_text_box(1080, lay)[1],
+        min_size=21, max_size=32, line_ratio=1.75)
+    return lay
+
+
+def _detail_goal_text_box(H, lay):
+    """훈련목표 카드 본문 영역 → (text_top, available_h)"""
+    footer_y = H - 80  # 하단 footer 시작점
+    card_bottom = footer_y - lay["info_area_h"] - 20
+    text_top = 158 + 22 + 46 + 16  # card_top + 라벨 + 구분선 + 여백
+    return text_top, (card_bottom - 22) - text_top
+
+
+def _paint_detail_goal(draw, W, H, lay):
+    """훈련목표가 있을 때의 상세 슬라이드 레이아웃 (카드 UI + 과정정보 태그)"""
+    footer_y = H - 80  # 하단 footer 시작점
+
+    # ── 헤더 영역 ──
+    draw.text((60, 45), "이런 걸 배워요", font=lay["font_header"], fill=hex_to_rgb(COLORS["primary"]))
+    draw.text((60, 95), lay["title_short"], font=lay["font_subtitle"], fill=hex_to_rgb(COLORS["text_gray"]))
+
+    # 구분선
+    draw.line((60, 138, W - 60, 138), fill=hex_to_rgb("#D5D8DC"), width=2)
 
     # ── 훈련목표 카드 영역 ──
     card_top = 158
-    card_bottom = footer_y - info_area_h - 20
+    card_bottom = footer_y - lay["info_area_h"] - 20
     card_left = 45
     card_right = W - 45
-    card_inner_w = card_right - card_left - 80  # 좌우 패딩 40씩
 
     # 카드 배경 (흰색 라운드 + 그림자 효과)
     # 그림자
@@ -452,62 +645,34 @@ def _draw_slide_detail_goal(draw, W, H, course_data, training_goal):
 
     # 카드 내부 라벨
     label_y = card_top + 22
-    font_goal_label = get_font(FONT_BOLD, 30)
     draw.text((card_left + 30, label_y), "■  훈련목표",
-              font=font_goal_label, fill=hex_to_rgb(COLORS["primary"]))
+              font=lay["font_goal_label"], fill=hex_to_rgb(COLORS["primary"]))
 
     # 라벨 아래 얇은 구분선
     sep_y = label_y + 46
     draw.line((card_left + 30, sep_y, card_right - 30, sep_y),
               fill=hex_to_rgb("#EBF5FB"), width=2)
 
-    # ── 훈련목표 본문 (자동 폰트 크기 조정) ──
-    text_top = sep_y + 16
-    text_bottom = card_bottom - 22
-    available_h = text_bottom - text_top
-
-    font_sizes = [32, 29, 26, 24, 21]
-    line_spacings = [56, 52, 48, 44, 40]
-
-    chosen_idx = 0
-    for idx, (fsize, lspace) in enumerate(zip(font_sizes, line_spacings)):
-        test_font = get_font(FONT_REGULAR, fsize)
-        test_lines = wrap_text_to_lines(training_goal, test_font, card_inner_w, draw)
-        total_h = len(test_lines) * lspace
-        if total_h <= available_h:
-            chosen_idx = idx
-            break
-        chosen_idx = idx
-
-    font_size = font_sizes[chosen_idx]
-    line_spacing = line_spacings[chosen_idx]
-    font_goal_body = get_font(FONT_REGULAR, font_size)
-    goal_lines = wrap_text_to_lines(training_goal, font_goal_body, card_inner_w, draw)
-
-    # 텍스트 수직 중앙 정렬 (내용이 짧을 때 빈 공간 방지)
-    max_visible = int(available_h / line_spacing)
-    visible_lines = goal_lines[:max_visible]
-    total_text_h = len(visible_lines) * line_spacing
+    # 텍스트 수직 중앙 정렬 (내용이 짧거나 카드가 길어졌을 때 빈 공간 방지)
+    text_top, available_h = _detail_goal_text_box(H, lay)
+    line_spacing = lay["line_spacing"]
+    total_text_h = len(lay["lines"]) * line_spacing
     y = text_top + max(0, (available_h - total_text_h) // 2)
 
-    for line in visible_lines:
-        if y + line_spacing > text_bottom + 5:
-            break
+    for line in lay["lines"]:
         draw.text((card_left + 40, y), line,
-                  font=font_goal_body, fill=hex_to_rgb(COLORS["text_dark"]))
+                  font=lay["font_goal_body"], fill=hex_to_rgb(COLORS["text_dark"]))
         y += line_spacing
 
     # ── 하단 과정정보 태그 (카드 아래) ──
-    if info_tags:
+    if lay["tags"]:
         tag_y = card_bottom + 18
-        font_tag = get_font(FONT_BOLD, 27)
         tag_x = card_left
         tag_h = 42
         tag_gap = 12
         tag_pad_x = 18
 
-        for tag_label in info_tags:
-            bbox = draw.textbbox((0, 0), tag_label, font=font_tag)
+        for tag_label, bbox in lay["tags"]:
             tw = bbox[2] - bbox[0]
             tag_w = tw + tag_pad_x * 2
 
@@ -524,29 +689,58 @@ def _draw_slide_detail_goal(draw, W, H, course_data, training_goal):
             # 태그 텍스트
             text_y = tag_y + (tag_h - (bbox[3] - bbox[1])) // 2
             draw.text((tag_x + tag_pad_x, text_y), tag_label,
-                      font=font_tag, fill=hex_to_rgb(COLORS["primary"]))
+                      font=lay["font_tag"], fill=hex_to_rgb(COLORS["primary"]))
 
             tag_x += tag_w + tag_gap
 
 
-def _draw_slide_detail_curriculum(draw, W, H, course_data, curriculum):
+def _measure_detail_curriculum(draw, W, course_data, curriculum):
+    """커리큘럼 레이아웃 측정 (항목별 번호 폭·설명 줄바꿈, 수료 후 문구)"""
+    lay = {}
+    lay["font_header"] = get_font(FONT_BOLD, 39)
+    lay["font_subtitle"] = get_font(FONT_REGULAR, 27)
+    lay["title_short"] = course_data["title"][:35] + ("…" if len(course_data["title"]) > 35 else "")
+
+    lay["font_item_title"] = get_font(FONT_BOLD, 29)
+    font_item_desc = lay["font_item_desc"] = get_font(FONT_REGULAR, 25)
+    font_num = lay["font_num"] = get_font(FONT_BOLD, 23)
+
+    items = []
+    for i, item in enumerate(curriculum[:6]):
+        num_text = str(i + 1)
+        num_bbox = draw.textbbox((0, 0), num_text, font=font_num)
+
+        if isinstance(item, dict):
+            title_text = item.get("title", "")
+            desc_text = item.get("desc", "")
+        else:
+            title_text = str(item)
+            desc_text = ""
+
+        desc_lines = wrap_text_to_lines(desc_text, font_item_desc, W - 200, draw) if desc_text else None
+        items.append({"num": num_text, "num_w": num_bbox[2] - num_bbox[0],
+                      "title": title_text, "desc_lines": desc_lines})
+    lay["items"] = items
+
+    lay["font_outcome_title"] = get_font(FONT_BOLD, 27)
+    lay["font_outcome"] = get_font(FONT_REGULAR, 25)
+    outcome_text = course_data.get("outcome", "관련 분야 취업 연계 | 자격증 취득 지원")
+    lay["outcome_lines"] = wrap_text_to_lines(outcome_text, lay["font_outcome"], W - 160, draw)
+    return lay
+
+
+def _paint_detail_curriculum(draw, W, H, lay):
     """커리큘럼이 있을 때의 상세 슬라이드 레이아웃 (기존 로직)"""
     # ── 헤더 ──
-    font_header = get_font(FONT_BOLD, 39)
-    draw.text((60, 45), "이런 걸 배워요", font=font_header, fill=hex_to_rgb(COLORS["primary"]))
-
-    font_subtitle = get_font(FONT_REGULAR, 27)
-    title_short = course_data["title"][:35] + ("…" if len(course_data["title"]) > 35 else "")
-    draw.text((60, 95), title_short, font=font_subtitle, fill=hex_to_rgb(COLORS["text_gray"]))
+    draw.text((60, 45), "이런 걸 배워요", font=lay["font_header"], fill=hex_to_rgb(COLORS["primary"]))
+    draw.text((60, 95), lay["title_short"], font=lay["font_subtitle"], fill=hex_to_rgb(COLORS["text_gray"]))
 
     draw.line((60, 142, W - 60, 142), fill=hex_to_rgb("#D5D8DC"), width=2)
 
     # ── 커리큘럼 항목 ──
-    font_item_title = get_font(FONT_BOLD, 29)
-    font_item_desc = get_font(FONT_REGULAR, 25)
-
+    items = lay["items"]
     y = 170
-    for i, item in enumerate(curriculum[:6]):
+    for i, item in enumerate(items):
         circle_x, circle_y = 80, y + 18
         circle_r = 22
         draw_rounded_rect(draw,
@@ -554,30 +748,19 @@ def _draw_slide_detail_curriculum(draw, W, H, course_data, curriculum):
                             circle_x + circle_r, circle_y + circle_r),
                            radius=circle_r, fill=hex_to_rgb(COLORS["primary"]))
 
-        font_num = get_font(FONT_BOLD, 23)
-        num_text = str(i + 1)
-        num_bbox = draw.textbbox((0, 0), num_text, font=font_num)
-        num_w = num_bbox[2] - num_bbox[0]
-        draw.text((circle_x - num_w // 2, circle_y - 13), num_text,
-                  font=font_num, fill=hex_to_rgb(COLORS["white"]))
+        draw.text((circle_x - item["num_w"] // 2, circle_y - 13), item["num"],
+                  font=lay["font_num"], fill=hex_to_rgb(COLORS["white"]))
 
-        if isinstance(item, dict):
-            title_text = item.get("title", "")
-            desc_text = item.get("desc", "")
-        else:
-            title_text = str(item)
-            desc_text = ""
-
-        draw.text((120, y), title_text, font=font_item_title, fill=hex_to_rgb(COLORS["text_dark"]))
-        if desc_text:
-            desc_lines = wrap_text_to_lines(desc_text, font_item_desc, W - 200, draw)
+        draw.text((120, y), item["title"], font=lay["font_item_title"], fill=hex_to_rgb(COLORS["text_dark"]))
+        desc_lines = item["desc_lines"]
+        if desc_lines is not None:
             for j, dl in enumerate(desc_lines[:2]):
                 draw.text((120, y + 42 + j * 34), dl,
-                          font=font_item_desc, fill=hex_to_rgb(COLORS["text_gray"]))
+                          font=lay["font_item_desc"], fill=hex_to_rgb(COLORS["text_gray"]))
             y += 42 + min(len(desc_lines), 2) * 34
         y += 72
 
-        if i < len(curriculum[:6]) - 1:
+        if i < len(items) - 1:
             draw.line((120, y - 25, W - 60, y - 25), fill=hex_to_rgb("#EAECEE"), width=1)
 
     # ── 하단: 수료 후 혜택 ──
@@ -585,77 +768,70 @@ def _draw_slide_detail_curriculum(draw, W, H, course_data, curriculum):
     draw_rounded_rect(draw, (40, outcome_y, W - 40, outcome_y + 130),
                        radius=15, fill=hex_to_rgb(COLORS["primary"]))
 
-    font_outcome_title = get_font(FONT_BOLD, 27)
-    font_outcome = get_font(FONT_REGULAR, 25)
-
     draw.text((70, outcome_y + 15), "배우고 나면",
-              font=font_outcome_title, fill=hex_to_rgb(COLORS["accent_bright"]))
+              font=lay["font_outcome_title"], fill=hex_to_rgb(COLORS["accent_bright"]))
 
-    outcome_text = course_data.get("outcome", "관련 분야 취업 연계 | 자격증 취득 지원")
-    outcome_lines = wrap_text_to_lines(outcome_text, font_outcome, W - 160, draw)
-    for i, line in enumerate(outcome_lines[:2]):
+    for i, line in enumerate(lay["outcome_lines"][:2]):
         draw.text((70, outcome_y + 55 + i * 36), line,
-                  font=font_outcome, fill=hex_to_rgb(COLORS["white"]))
+                  font=lay["font_outcome"], fill=hex_to_rgb(COLORS["white"]))
+
 
+def _measure_detail_fallback(draw, W, course_data):
+    """안내 레이아웃 측정 (가운데 정렬 문구 폭)"""
+    lay = {}
+    lay["font_header"] = get_font(FONT_BOLD, 39)
+    lay["font_subtitle"] = get_font(FONT_REGULAR, 27)
+    lay["title_short"] = course_data["title"][:35] + ("…" if len(course_data["title"]) > 35 else "")
 
-def _draw_slide_detail_fallback(draw, W, H, course_data):
+    lay["font_msg"] = get_font(FONT_REGULAR, 30)
+    lay["font_url"] = get_font(FONT_BOLD, 28)
+    msg_lines = [
+        "훈련과정의 상세 내용은",
+        "고용24에서 확인할 수 있어요.",
+    ]
+    lay["msg_lines"] = []
+    for line in msg_lines:
+        bbox = draw.textbbox((0, 0), line, font=lay["font_msg"])
+        lay["msg_lines"].append((line, bbox[2] - bbox[0]))
+    lay["url_text"] = "work24.go.kr"
+    url_bbox = draw.textbbox((0, 0), lay["url_text"], font=lay["font_url"])
+    lay["url_w"] = url_bbox[2] - url_bbox[0]
+    return lay
+
+
+def _paint_detail_fallback(draw, W, H, lay):
     """훈련목표/커리큘럼 모두 없을 때 — 간결한 안내 레이아웃"""
 
     # ── 헤더 ──
-    font_header = get_font(FONT_BOLD, 39)
-    draw.text((60, 45), "이런 걸 배워요", font=font_header, fill=hex_to_rgb(COLORS["primary"]))
-
-    font_subtitle = get_font(FONT_REGULAR, 27)
-    title_short = course_data["title"][:35] + ("…" if len(course_data["title"]) > 35 else "")
-    draw.text((60, 95), title_short, font=font_subtitle, fill=hex_to_rgb(COLORS["text_gray"]))
+    draw.text((60, 45), "이런 걸 배워요", font=lay["font_header"], fill=hex_to_rgb(COLORS["primary"]))
+    draw.text((60, 95), lay["title_short"], font=lay["font_subtitle"], fill=hex_to_rgb(COLORS["text_gray"]))
 
     draw.line((60, 142, W - 60, 142), fill=hex_to_rgb("#D5D8DC"), width=2)
 
     # ── 중앙: 상세 정보 안내 ──
-    font_msg = get_font(FONT_REGULAR, 30)
-    font_url = get_font(FONT_BOLD, 28)
-
     msg_y = H // 2 - 80
-    msg_lines = [
-        "훈련과정의 상세 내용은",
-        "고용24에서 확인할 수 있어요.",
-    ]
-    for line in msg_lines:
-        bbox = draw.textbbox((0, 0), line, font=font_msg)
-        lw = bbox[2] - bbox[0]
+    for line, lw in lay["msg_lines"]:
         draw.text(((W - lw) // 2, msg_y), line,
-                  font=font_msg, fill=hex_to_rgb(COLORS["text_gray"]))
+                  font=lay["font_msg"], fill=hex_to_rgb(COLORS["text_gray"]))
         msg_y += 48
 
     msg_y += 20
-    url_text = "work24.go.kr"
-    url_bbox = draw.textbbox((0, 0), url_text, font=font_url)
-    url_w = url_bbox[2] - url_bbox[0]
-    draw.text(((W - url_w) // 2, msg_y), url_text,
-              font=font_url, fill=hex_to_rgb(COLORS["accent"]))
+    draw.text(((W - lay["url_w"]) // 2, msg_y), lay["url_text"],
+              font=lay["font_url"], fill=hex_to_rgb(COLORS["accent"]))
 
 
-def generate_slide_howto(course_data, output_path):
-    """
-    슬라이드 3: 신청 방법 안내
-    개선: 타임라인 레이아웃 + 원형 넘버 뱃지 + 연결선 + 문의 정보 강화
-    """
-    W, H = 1080, 1080
-    img = Image.new('RGB', (W, H), hex_to_rgb(COLORS["white"]))
-    draw = ImageDraw.Draw(img)
+def _measure_howto(ctx):
+    """신청 방법 슬라이드 레이아웃 측정 (단계별 줄바꿈·라벨 폭, 문의 정보, 주석)"""
+    course_data = ctx.course
+    W = 1080
+    draw = ImageDraw.Draw(Image.new('RGB', (1, 1)))
+    lay = {"W": W}
 
-    # 상단 컬러 바
-    draw.rectangle((0, 0, W, 8), fill=hex_to_rgb(COLORS["accent"]))
-    draw.rectangle((0, 8, W, 12), fill=hex_to_rgb(COLORS["primary"]))
-
-    # ── 헤더 ──
-    font_header = get_font(FONT_BOLD, 43)
-    draw.text((60, 45), "이렇게 신청하세요", font=font_header, fill=hex_to_rgb(COLORS["primary"]))
-    draw.line((60, 108, W - 60, 108), fill=hex_to_rgb("#D5D8DC"), width=2)
+    lay["font_header"] = get_font(FONT_BOLD, 43)
 
     # ── 3단계 프로세스 ──
     step3_title, step3_desc = get_step3_text(course_data)
-    title = course_data.get("title", "")
+    title = ctx.title
 
     steps = [
         {
@@ -675,9 +851,72 @@ def generate_slide_howto(course_data, output_path):
         }
     ]
 
-    font_step_title = get_font(FONT_BOLD, 31)
-    font_step_desc = get_font(FONT_REGULAR, 24)
-    font_num = get_font(FONT_BLACK, 28)
+    font_step_title = lay["font_step_title"] = get_font(FONT_BOLD, 31)
+    font_step_desc = lay["font_step_desc"] = get_font(FONT_REGULAR, 24)
+    font_num = lay["font_num"] = get_font(FONT_BLACK, 28)
+    font_step_label = lay["font_step_label"] = get_font(FONT_BOLD, 19)
+
+    # desc 줄바꿈 처리 (카드 폭에 맞게)
+    desc_max_w = (W - 55) - 155 - 48
+    for step in steps:
+        step["num_bbox"] = draw.textbbox((0, 0), step["num"], font=font_num)
+        desc_lines = []
+        for raw_line in step["desc"].split('\n'):
+            wrapped = wrap_text_to_lines(raw_line, font_step_desc, desc_max_w, draw)
+            desc_lines.extend(wrapped if wrapped else [""])
+        step["desc_lines"] = desc_lines
+        title_bbox = draw.textbbox((0, 0), step["title"], font=font_step_title)
+        step["title_h"] = title_bbox[3] - title_bbox[1]
+        step["label"] = f"STEP {step['num']}"
+        label_bbox = draw.textbbox((0, 0), step["label"], font=font_step_label)
+        step["label_w"] = label_bbox[2] - label_bbox[0]
+    lay["steps"] = steps
+
+    # ── 문의 정보 ──
+    lay["font_info_title"] = get_font(FONT_BOLD, 27)
+    lay["font_info_line"] = get_font(FONT_BOLD, 24)
+    institution = course_data.get("institution", "")
+    contact = course_data.get("contact", "제주고용센터 064-728-7201")
+    contact = contact.replace("☎", "").replace("📞", "").replace("Tel:", "").replace("  ", " ").strip()
+    # 연락처에 기관명이 포함되어 있으면 연락처만 표시
+    if institution and institution not in contact:
+        lay["contact_line"] = f"{institution} {contact}"
+    else:
+        lay["contact_line"] = contact
+    address = course_data.get("address", "")
+    lay["addr_short"] = (address[:40] + ("..." if len(address) > 40 else "")) if address else ""
+
+    lay["font_footnote"] = get_font(FONT_REGULAR, 23)
+    lay["footnote"] = get_benefits_footnote(course_data)
+
+    lay["font_footer"] = get_font(FONT_REGULAR, 23)
+    lay["ft_text"] = "제주지역인적자원개발위원회  |  국민내일배움카드 있으면 누구나 참여할 수 있어요"
+    ft_bbox = draw.textbbox((0, 0), lay["ft_text"], font=lay["font_footer"])
+    lay["ft_h"] = ft_bbox[3] - ft_bbox[1]
+    return lay
+
+
+def _paint_howto(lay, H=1080):
+    """
+    측정된 신청 방법 레이아웃을 높이 H 캔버스에 그립니다.
+
+    늘어난 높이(extra)의 1/4은 타임라인 위, 카드 사이·문의 박스 위 간격에 1/6씩
+    나눠 주고, 주석·하단 바는 캔버스 하단에 고정합니다.
+    """
+    W = lay["W"]
+    extra = max(0, H - 1080)
+    img = Image.new('RGB', (W, H), hex_to_rgb(COLORS["white"]))
+    draw = ImageDraw.Draw(img)
+
+    # 상단 컬러 바
+    draw.rectangle((0, 0, W, 8), fill=hex_to_rgb(COLORS["accent"]))
+    draw.rectangle((0, 8, W, 12), fill=hex_to_rgb(COLORS["primary"]))
+
+    # ── 헤더 ──
+    draw.text((60, 45), "이렇게 신청하세요", font=lay["font_header"], fill=hex_to_rgb(COLORS["primary"]))
+    draw.line((60, 108, W - 60, 108), fill=hex_to_rgb("#D5D8DC"), width=2)
+
+    steps = lay["steps"]
 
     # 타임라인 레이아웃 설정
     timeline_x = 105  # 타임라인 세로선 x좌표
@@ -685,9 +924,9 @@ def generate_slide_howto(course_data, output_path):
     card_left = 155    # 카드 시작 x
     card_right = W - 55
     card_h = 175
-    gap = 30
+    gap = 30 + extra // 6
 
-    step_y = 135
+    step_y = 135 + extra // 4
 
     for i, step in enumerate(steps):
         card_top = step_y
@@ -712,13 +951,13 @@ def generate_slide_howto(course_data, output_path):
                             timeline_x + circle_r, circle_cy + circle_r),
                            radius=circle_r, fill=hex_to_rgb(COLORS["primary"]))
         # 원 안의 숫자 중앙 정렬
-        num_bbox = draw.textbbox((0, 0), step["num"], font=font_num)
+        num_bbox = step["num_bbox"]
         num_w = num_bbox[2] - num_bbox[0]
         num_h = num_bbox[3] - num_bbox[1]
         num_x = timeline_x - num_w // 2
         num_y = circle_cy - num_h // 2 - num_bbox[1]  # baseline 보정
         draw.text((num_x, num_y),
-                  step["num"], font=font_num, fill=hex_to_rgb(COLORS["white"]))
+                  step["num"], font=lay["font_num"], fill=hex_to_rgb(COLORS["white"]))
 
         # ── 카드 배경 (그림자 + 본체) ──
         draw_rounded_rect(draw,
@@ -729,37 +968,25 @@ def generate_slide_howto(course_data, output_path):
                            radius=14, fill=hex_to_rgb(COLORS["bg_light"]))
 
         # ── 카드 내 콘텐츠 (수직 중앙) ──
-        # desc 줄바꿈 처리 (카드 폭에 맞게)
-        desc_max_w = card_right - card_left - 48
-        raw_desc_lines = step["desc"].split('\n')
-        desc_lines = []
-        for raw_line in raw_desc_lines:
-            wrapped = wrap_text_to_lines(raw_line, font_step_desc, desc_max_w, draw)
-            desc_lines.extend(wrapped if wrapped else [""])
-
-        title_bbox = draw.textbbox((0, 0), step["title"], font=font_step_title)
-        title_h = title_bbox[3] - title_bbox[1]
+        desc_lines = step["desc_lines"]
+        title_h = step["title_h"]
         desc_line_h = 35
         desc_total_h = len(desc_lines) * desc_line_h
         content_h = title_h + 14 + desc_total_h
         content_start = card_top + (card_h - content_h) // 2
 
         # STEP 라벨 + 제목 (한 줄)
-        font_step_label = get_font(FONT_BOLD, 19)
-        step_label = f"STEP {step['num']}"
-        draw.text((card_left + 24, content_start - 2), step_label,
-                  font=font_step_label, fill=hex_to_rgb(COLORS["accent"]))
-        label_bbox = draw.textbbox((0, 0), step_label, font=font_step_label)
-        label_w = label_bbox[2] - label_bbox[0]
+        draw.text((card_left + 24, content_start - 2), step["label"],
+                  font=lay["font_step_label"], fill=hex_to_rgb(COLORS["accent"]))
 
-        draw.text((card_left + 24 + label_w + 12, content_start - 5), step["title"],
-                  font=font_step_title, fill=hex_to_rgb(COLORS["text_dark"]))
+        draw.text((card_left + 24 + step["label_w"] + 12, content_start - 5), step["title"],
+                  font=lay["font_step_title"], fill=hex_to_rgb(COLORS["text_dark"]))
 
         # 설명
         desc_start_y = content_start + title_h + 14
         for j, line in enumerate(desc_lines):
             draw.text((card_left + 24, desc_start_y + j * desc_line_h), line,
-                      font=font_step_desc, fill=hex_to_rgb(COLORS["text_gray"]))
+                      font=lay["font_step_desc"], fill=hex_to_rgb(COLORS["text_gray"]))
 
         step_y = card_bottom + gap
 
@@ -770,59 +997,56 @@ def generate_slide_howto(course_data, output_path):
                        radius=15, fill=hex_to_rgb("#FEF9E7"),
                        outline=hex_to_rgb(COLORS["accent"]), width=2)
 
-    font_info_title = get_font(FONT_BOLD, 27)
-    font_info_line = get_font(FONT_BOLD, 24)
-
     draw.text((78, info_y + 12), "■ 궁금한 점은",
-              font=font_info_title, fill=hex_to_rgb(COLORS["accent"]))
-
-    institution = course_data.get("institution", "")
-    contact = course_data.get("contact", "제주고용센터 064-728-7201")
-    contact = contact.replace("☎", "").replace("📞", "").replace("Tel:", "").replace("  ", " ").strip()
+              font=lay["font_info_title"], fill=hex_to_rgb(COLORS["accent"]))
 
-    info_line_y = info_y + 46
-    # 연락처에 기관명이 포함되어 있으면 연락처만 표시
-    if institution and institution not in contact:
-        draw.text((78, info_line_y), f"{institution} {contact}",
-                  font=font_info_line, fill=hex_to_rgb(COLORS["primary"]))
-    else:
-        draw.text((78, info_line_y), contact,
-                  font=font_info_line, fill=hex_to_rgb(COLORS["primary"]))
-    info_line_y += 32
+    draw.text((78, info_y + 46), lay["contact_line"],
+              font=lay["font_info_line"], fill=hex_to_rgb(COLORS["primary"]))
 
-    address = course_data.get("address", "")
-    if address:
-        addr_short = address[:40] + ("..." if len(address) > 40 else "")
-        draw.text((78, info_y + 84), addr_short,
-                  font=font_info_line, fill=hex_to_rgb(COLORS["primary"]))
+    if lay["addr_short"]:
+        draw.text((78, info_y + 84), lay["addr_short"],
+                  font=lay["font_info_line"], fill=hex_to_rgb(COLORS["primary"]))
 
     # ── 하단 ※ 주석 (footer 위 충분한 여백) ──
     footer_y = H - 80
-    font_footnote = get_font(FONT_REGULAR, 23)
-    footnote = get_benefits_footnote(course_data)
-    draw.text((60, footer_y - 42), footnote,
-              font=font_footnote, fill=hex_to_rgb(COLORS["text_dark"]))
+    draw.text((60, footer_y - 42), lay["footnote"],
+              font=lay["font_footnote"], fill=hex_to_rgb(COLORS["text_dark"]))
 
     # ── 하단 바 ──
     draw.rectangle((0, footer_y, W, H), fill=hex_to_rgb(COLORS["primary"]))
-    font_footer = get_font(FONT_REGULAR, 23)
-    ft_text = "제주지역인적자원개발위원회  |  국민내일배움카드 있으면 누구나 참여할 수 있어요"
-    ft_bbox = draw.textbbox((0, 0), ft_text, font=font_footer)
-    ft_h = ft_bbox[3] - ft_bbox[1]
     footer_bar_h = H - footer_y
-    ft_text_y = footer_y + (footer_bar_h - ft_h) // 2
-    draw.text((60, ft_text_y), ft_text,
-              font=font_footer, fill=hex_to_rgb("#AED6F1"))
+    ft_text_y = footer_y + (footer_bar_h - lay["ft_h"]) // 2
+    draw.text((60, ft_text_y), lay["ft_text"],
+              font=lay["font_footer"], fill=hex_to_rgb("#AED6F1"))
+
+    return img
 
-    img.save(output_path, quality=95)
+
+def generate_slide_howto(course_data, output_path):
+    """
+    슬라이드 3: 신청 방법 안내
+    개선: 타임라인 레이아웃 + 원형 넘버 뱃지 + 연결선 + 문의 정보 강화
+    """
+    img = _paint_howto(_measure_howto(course_context(course_data)))
+    save_slide(img, output_path, flat=True)
     return output_path
 
 
+def generate_howto_formats(course_data, output_path, formats=None):
+    """신청 방법 슬라이드를 여러 화면비로 한 번에 렌더링 → {포맷: 저장 경로}"""
+    formats = formats or CARDNEWS_FORMATS
+    ctx = course_context(course_data)
+    images = render_formats(lambda: _measure_howto(ctx), _paint_howto, formats)
+    return save_formats(images, output_path, flat=True)
+
+
 def generate_cardnews(course_data, output_dir="output"):
     """
-    과정 데이터를 받아 카드뉴스 3장 세트를 생성합니다.
+    과정 데이터(dict 또는 CourseContext)를 받아 카드뉴스 3장 세트를 생성합니다.
     """
     os.makedirs(output_dir, exist_ok=True)
+    ctx = course_context(course_data)
+    course_data = ctx.course
 
     # NTFS 금지 문자(< > : " / \ | ? * 줄바꿈) 모두 제거
     # → GitHub Actions actions/upload-artifact 호환 (콜론 포함 과정명도 안전)
@@ -830,23 +1054,38 @@ def generate_cardnews(course_data, output_dir="output"):
     safe_name = re.sub(r'[<>:"/\\|?*\r\n\t]', "_", course_data["title"][:30]).replace(" ", "_")
 
     paths = []
-
-    # 슬라이드 1: 커버
-    p1 = os.path.join(output_dir, f"{safe_name}_1_cover.png")
-    generate_slide_cover(course_data, p1)
-    paths.append(p1)
-    print(f"  ✅ 커버 이미지 생성: {p1}")
-
-    # 슬라이드 2: 훈련목표/상세 (항상 생성)
-    p2 = os.path.join(output_dir, f"{safe_name}_2_detail.png")
-    generate_slide_detail(course_data, p2)
-    paths.append(p2)
-    print(f"  ✅ 상세 이미지 생성: {p2}")
-
-    # 슬라이드 3: 신청 방법
-    p3 = os.path.join(output_dir, f"{safe_name}_3_howto.png")
-    generate_slide_howto(course_data, p3)
-    paths.append(p3)
-    print(f"  ✅ 신청방법 이미지 생성: {p3}")
-
+    # 슬라이드마다 설정된 화면비(CARDNEWS_FORMATS)를 레이아웃 측정 1회로 함께 렌더링
+    formats = ["feed"] + [f for f in CARDNEWS_FORMATS if f != "feed"]
+
+    # 인코딩은 워커 풀에서 병렬 처리 (블록 종료 시 저장 완료 보장)
+    with encoding_pool():
+        # 슬라이드 1: 커버
+        p1 = os.path.join(output_dir, f"{safe_name}_1_cover.png")
+        cover_paths = generate_cover_formats(ctx, p1, formats=formats)
+        paths.append(p1)
+        print(f"  ✅ 커버 이미지 생성: {p1}")
+        extra_paths = [p for fmt, p in cover_paths.items() if fmt != "feed"]
+        for p in extra_paths:
+            print(f"  ✅ 커버 포맷 생성: {p}")
+
+        # 슬라이드 2: 훈련목표/상세 (항상 생성)
+        p2 = os.path.join(output_dir, f"{safe_name}_2_detail.png")
+        detail_paths = generate_detail_formats(ctx, p2, formats=formats)
+        paths.append(p2)
+        print(f"  ✅ 상세 이미지 생성: {p2}")
+
+        # 슬라이드 3: 신청 방법
+        p3 = os.path.join(output_dir, f"{safe_name}_3_howto.png")
+        howto_paths = generate_howto_formats(ctx, p3, formats=formats)
+        paths.append(p3)
+        print(f"  ✅ 신청방법 이미지 생성: {p3}")
+
+        for slide_paths in (detail_paths, howto_paths):
+            for fmt, p in slide_paths.items():
+                if fmt != "feed":
+                    extra_paths.append(p)
+                    print(f"  ✅ 포맷 생성: {p}")
+
+    # 추가 화면비는 기본 3장 뒤에 기록 (만료 정리·재생성 검사 대상에 포함)
+    paths.extend(extra_paths)
     return paths
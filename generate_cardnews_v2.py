@@ -4,8 +4,13 @@ Gemini API 또는 그라데이션 배경 위에 텍스트를 오버레이합니
 """
 
 from PIL import Image, ImageDraw, ImageFont, ImageFilter
+import math
 import os
-from benefits_helper import get_badge_text, get_benefits_text, get_benefits_footnote, get_total_hours
+from benefits_helper import get_badge_text, get_benefits_text, get_benefits_footnote
+from course_context import course_context
+from image_encoder import save_slide, encoding_pool
+from generate_cardnews import ASPECT_FORMATS, CARDNEWS_FORMATS, render_formats, save_formats
+from text_fit import fit_text
 
 # ── 폰트 ──
 FONT_BOLD = "/usr/share/fonts/opentype/noto/NotoSansCJK-Bold.ttc"
@@ -66,63 +71,241 @@ def wrap_text(text, font, max_width, draw):
     return lines
 
 
-def apply_dark_overlay(img, opacity=140):
-    """이미지 위에 반투명 어두운 오버레이 적용"""
-    overlay = Image.new('RGBA', img.size, (0, 0, 0, opacity))
-    if img.mode != 'RGBA':
-        img = img.convert('RGBA')
-    result = Image.alpha_composite(img, overlay)
-    return result.convert('RGB')
+# ── 오버레이 합성 (작업 버퍼 1장에 직접 적용) ──
+# 배경: 오버레이마다 캔버스 크기 RGBA 오버레이 생성 → 원본 RGBA 변환 → alpha_composite
+# → RGB 재변환으로 단계당 풀사이즈 버퍼가 4장씩 생겨, 렌더 워커를 늘리면 메모리가 먼저 찼습니다.
+# → 단색 오버레이는 img.paste(색, 영역, 마스크)로 작업 버퍼에 바로 섞습니다.
+#   추가 메모리는 영향받는 띠(band)만큼의 1채널(L) 마스크뿐입니다.
 
+def darken_region(img, box=None, opacity=140, color=(0, 0, 0)):
+    """img(RGB)의 box 영역에 반투명 단색을 제자리 합성"""
+    box = box or (0, 0) + img.size
+    mask = Image.new('L', (box[2] - box[0], box[3] - box[1]), opacity)
+    img.paste(color, box, mask)
+    return img
 
-def apply_gradient_overlay(img, direction="bottom"):
-    """하단 또는 상단에서 점점 어두워지는 그라데이션 오버레이"""
-    w, h = img.size
-    gradient = Image.new('RGBA', (w, h), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(gradient)
 
-    for y in range(h):
-        if direction == "bottom":
-            if y < h * 0.35:
-                alpha = 0
-            else:
-                progress = (y - h * 0.35) / (h * 0.65)
-                alpha = int(200 * progress)
-        else:
-            if y > h * 0.65:
-                alpha = 0
-            else:
-                progress = 1 - (y / (h * 0.65))
-                alpha = int(200 * progress)
-        draw.line([(0, y), (w, y)], fill=(0, 0, 0, alpha))
+def gradient_region(img, direction="bottom"):
+    """img(RGB)에 하단/상단 그라데이션을 제자리 합성 (알파가 0인 구간은 건너뜀)"""
+    w, h = img.size
+    if direction == "bottom":
+        start = int(math.ceil(h * 0.35))
+        alphas = [int(200 * ((y - h * 0.35) / (h * 0.65))) for y in range(start, h)]
+        box = (0, start, w, h)
+    else:
+        end = int(h * 0.65) + 1
+        alphas = [int(200 * (1 - (y / (h * 0.65)))) for y in range(end)]
+        box = (0, 0, w, end)
+    if not alphas:
+        return img
+    # 행마다 알파가 일정 → 1px 폭 열을 만든 뒤 가로로 늘려 띠 마스크 구성
+    column = Image.new('L', (1, len(alphas)))
+    column.putdata(alphas)
+    img.paste((0, 0, 0), box, column.resize((w, len(alphas)), Image.NEAREST))
+    return img
 
-    if img.mode != 'RGBA':
-        img = img.convert('RGBA')
-    result = Image.alpha_composite(img, gradient)
-    return result.convert('RGB')
 
+def apply_dark_overlay(img, opacity=140):
+    """이미지 위에 반투명 어두운 오버레이 적용 (새 이미지 반환)"""
+    return darken_region(img.convert('RGB') if img.mode != 'RGB' else img.copy(), opacity=opacity)
 
-def generate_cover_v2(course_data, bg_image, credit, output_path):
-    """커버 이미지 v2: 배경 이미지 + 텍스트 오버레이
 
-    다회차 과정: 캔버스 높이를 회차당 40px씩 확장하여 정보 카드·혜택 박스·주석
-    영역이 모두 충분한 공간을 확보하게 함 (140시간 이상 과정에서 텍스트 겹침 방지)
+def apply_gradient_overlay(img, direction="bottom"):
+    """하단 또는 상단에서 점점 어두워지는 그라데이션 오버레이 (새 이미지 반환)"""
+    return gradient_region(img.convert('RGB') if img.mode != 'RGB' else img.copy(), direction)
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 과정별 배경 준비 단계
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 배경: 커버는 bg_image.copy().resize() → GaussianBlur → 그라데이션 → 상단 오버레이,
+# 상세는 같은 배경을 처음부터 다시 copy().resize() 해서 과정당 풀사이즈 사본이
+# 여러 장 생겼습니다.
+# → prepare_background()로 과정당 한 번 가로 1080 맞춤 리사이즈를 해 두고
+#   (커버 feed·상세 헤더 공용), 같은 크기의 블러 변형도 한 번만 만들어 둡니다.
+#   준비된 버퍼는 읽기 전용 — 슬라이드는 합성 결과(새 이미지)에만 그립니다.
+#   그 외 크기(세로/스토리 포맷, 다회차 확장 높이)는 임시로 만들고 캐시하지 않아
+#   과정당 상주 버퍼를 비블러·블러 2장으로 제한합니다.
+
+def prepare_background(bg_image, W=1080):
+    """배경 이미지를 슬라이드 공용 준비 객체(dict)로 감쌉니다.
+
+    Returns:
+        dict: source(원본), fit_size, resized{size: 비블러}, blurred{size: 블러},
+              detail_header{(W, h): 헤더 배경}
     """
+    fit_size = (W, int(W * bg_image.size[1] / bg_image.size[0]))
+    fit = bg_image if bg_image.size == fit_size else bg_image.resize(fit_size, Image.LANCZOS)
+    return {"source": bg_image, "fit_size": fit_size,
+            "resized": {fit_size: fit}, "blurred": {}, "detail_header": {}}
+
+
+def _as_prepared(bg):
+    """원본 Image 또는 prepare_background() 결과를 모두 허용"""
+    if isinstance(bg, dict):
+        return bg
+    return prepare_background(bg)
+
+
+def prepared_resized(prep, size):
+    """size로 리사이즈한 비블러 배경 (준비된 크기면 공유 버퍼, 아니면 임시 리사이즈)"""
+    if size in prep["resized"]:
+        return prep["resized"][size]
+    return prep["source"].resize(size, Image.LANCZOS)
+
+
+def prepared_blurred(prep, size):
+    """리사이즈 + GaussianBlur(2) 변형 (준비된 크기만 캐시)"""
+    cache = prep["blurred"]
+    if size in cache:
+        return cache[size]
+    blurred = prepared_resized(prep, size).filter(ImageFilter.GaussianBlur(radius=2))
+    if size == prep["fit_size"]:
+        cache[size] = blurred
+    return blurred
+
+
+def compose_cover_base(prep, size):
+    """커버 배경: 블러 + 하단 그라데이션 + 상단 오버레이 (매번 새 이미지 반환)"""
+    W, H = size
+    # 블러 버퍼는 공유 캐시일 수 있으므로 사본 1장을 작업 버퍼로 사용
+    img = apply_gradient_overlay(prepared_blurred(prep, size), direction="bottom")
+
+    # 상단 추가 오버레이 (상단 200px 띠만)
+    return darken_region(img, (0, 0, W, 201), opacity=100)
+
+
+def prepared_detail_header(prep, W, header_h):
+    """상세 슬라이드 상단 헤더 배경: 가로 W 맞춤 → 상단 크롭 → 어두운 오버레이"""
+    key = (W, header_h)
+    cache = prep["detail_header"]
+    if key not in cache:
+        src = prep["source"]
+        bg = prepared_resized(prep, (W, int(W * src.size[1] / src.size[0])))
+        if bg.size[1] >= header_h:
+            bg_crop = bg.crop((0, 0, W, header_h))
+        else:
+            bg_crop = bg.resize((W, header_h), Image.LANCZOS)
+        # crop/resize 결과는 새 버퍼 → 복사 없이 제자리 합성
+        cache[key] = darken_region(bg_crop.convert('RGB'), opacity=150)
+    return cache[key]
+
+
+def _measure_cover_v2(ctx):
+    """커버 v2 레이아웃 측정 (폰트·줄바꿈·textbbox 1회, 배경과 무관)"""
+    course_data = ctx.course
+    W = 1080
+    draw = ImageDraw.Draw(Image.new('RGB', (1, 1)))
+
     # 다회차 과정이면 캔버스 높이 확장 (회차당 40px)
     period = course_data.get("period", "")
-    extra_h = period.count(" | ") * 40
-    W, H = 1080, 1080 + extra_h
+    lay = {"W": W, "base_h": 1080 + period.count(" | ") * 40}
+
+    # ── 상단 태그 / 뱃지 / NCS ──
+    lay["font_tag"] = get_font(FONT_BOLD, 29)
+    lay["tag_text"] = "제주지역 특화훈련"
+    tag_bbox = draw.textbbox((0, 0), lay["tag_text"], font=lay["font_tag"])
+    lay["tag_w"] = tag_bbox[2] - tag_bbox[0] + 40
+    lay["tag_h"] = tag_bbox[3] - tag_bbox[1] + 22
+
+    lay["font_badge"] = get_font(FONT_BOLD, 27)
+    lay["badge_text"] = get_badge_text(course_data)
+    badge_bbox = draw.textbbox((0, 0), lay["badge_text"], font=lay["font_badge"])
+    lay["badge_w"] = badge_bbox[2] - badge_bbox[0] + 40
+    lay["badge_h"] = badge_bbox[3] - badge_bbox[1] + 22
 
-    bg = bg_image.copy().resize((W, H), Image.LANCZOS)
-    bg = bg.filter(ImageFilter.GaussianBlur(radius=2))
-    img = apply_gradient_overlay(bg, direction="bottom")
+    ncs_name = course_data.get("ncsName", "")
+    lay["ncs_label"] = f"NCS {ncs_name}" if ncs_name else ""
+    if ncs_name:
+        lay["font_ncs"] = get_font(FONT_BOLD, 30)
+        ncs_bbox = draw.textbbox((0, 0), lay["ncs_label"], font=lay["font_ncs"])
+        lay["ncs_text_w"] = ncs_bbox[2] - ncs_bbox[0]
+        lay["ncs_text_h"] = ncs_bbox[3] - ncs_bbox[1]
+
+    # ── 과정명 / 기관명 ──
+    # 49px·3줄(줄 간격 65) 상자에 들어가는 가장 큰 크기 (긴 제목은 최소 36px까지 축소)
+    lay["font_title"], lay["title_lines"], lay["title_line_h"] = fit_text(
+        course_data["title"], FONT_BLACK, W - 120, 3 * 65,
+        min_size=36, max_size=49, line_ratio=65 / 49, max_lines=3, ellipsis="...")
+    lay["font_inst"] = get_font(FONT_REGULAR, 27)
+    lay["institution"] = course_data["institution"]
+
+    # ── 정보 카드 ──
+    # 다회차 과정: period의 " | " 구분자를 줄바꿈으로 변환
+    period_val = course_data.get("period", "").replace(" | ", "\n")
+    info_items = []
+    if period_val:
+        info_items.append(("배움 기간", period_val, 1.4))
+    hours = ctx.hours
+    if hours > 0:
+        info_items.append(("배움 시간", f"{hours}시간", 0.8))
+    if course_data.get("capacity"):
+        info_items.append(("모집 인원", course_data["capacity"], 0.8))
+    lay["info_items"] = info_items
+
+    # 다회차 줄바꿈 → 카드 높이 동적 확장 (회차당 +30px)
+    info_card_h = 90
+    for _, value, _ in info_items:
+        extra_lines = value.count("\n")
+        if extra_lines > 0:
+            info_card_h = max(info_card_h, 90 + extra_lines * 30)
+    lay["info_card_h"] = info_card_h
+    lay["font_info_label"] = get_font(FONT_BOLD, 24)
+    lay["font_info_value"] = get_font(FONT_BOLD, 24)
+
+    # ── 비용 강조 ──
+    lay["self_cost"] = course_data.get("selfCost", "")
+    lay["course_cost"] = course_data.get("courseCost", "")
+    if lay["self_cost"] or lay["course_cost"]:
+        lay["font_cost_label"] = get_font(FONT_BOLD, 24)
+        lay["font_cost_prefix"] = get_font(FONT_BOLD, 29)
+        lay["font_cost_big"] = get_font(FONT_BLACK, 44)
+        lay["font_cost_small"] = get_font(FONT_REGULAR, 19)
+        lay["cost_label_text"] = "■ 훈련에 참여할 때 내는 자부담금"
+        label_bbox = draw.textbbox((0, 0), lay["cost_label_text"], font=lay["font_cost_label"])
+        lay["cost_label_h"] = label_bbox[3] - label_bbox[1]
+        cost_line_bbox = draw.textbbox((0, 0), "단, 000,000원", font=lay["font_cost_big"])
+        lay["cost_line_h"] = cost_line_bbox[3] - cost_line_bbox[1]
+        prefix_bbox = draw.textbbox((0, 0), "단,", font=lay["font_cost_prefix"])
+        lay["cost_prefix_w"] = prefix_bbox[2] - prefix_bbox[0]
+        if lay["self_cost"]:
+            cost_bbox = draw.textbbox((0, 0), lay["self_cost"], font=lay["font_cost_big"])
+            lay["self_cost_w"] = cost_bbox[2] - cost_bbox[0]
+
+    # ── 혜택 배너 ──
+    benefits = course_data.get("benefits", "") or get_benefits_text(course_data)
+    lay["benefit_lines"] = [l.strip() for l in benefits.split('\n') if l.strip()][:3]
+    lay["font_benefit_icon"] = get_font(FONT_BOLD, 25)
+    lay["font_benefit"] = get_font(FONT_REGULAR, 21)
+
+    # ── 주석 / 하단 바 / 크레딧 ──
+    lay["font_footnote"] = get_font(FONT_REGULAR, 22)
+    lay["footnote"] = get_benefits_footnote(course_data)
+    lay["font_footer"] = get_font(FONT_REGULAR, 21)
+    lay["font_cta"] = get_font(FONT_BOLD, 23)
+    lay["org_text"] = "제주지역인적자원개발위원회"
+    org_bbox = draw.textbbox((0, 0), lay["org_text"], font=lay["font_footer"])
+    lay["org_h"] = org_bbox[3] - org_bbox[1]
+    lay["cta_text"] = "신청은 work24.go.kr"
+    cta_bbox = draw.textbbox((0, 0), lay["cta_text"], font=lay["font_cta"])
+    lay["cta_w"] = cta_bbox[2] - cta_bbox[0]
+    lay["cta_h"] = cta_bbox[3] - cta_bbox[1]
+    lay["font_credit"] = get_font(FONT_REGULAR, 17)
+    return lay
+
+
+def _paint_cover_v2(lay, bg, credit, H=None):
+    """
+    측정된 커버 v2 레이아웃을 높이 H 캔버스에 그립니다.
+
+    H가 기본 높이(base_h)보다 크면 늘어난 만큼의 절반을 하단 카드 시작 위치에
+    더해 배경 이미지가 더 많이 보이게 하고, 주석·하단 바는 캔버스 하단에 고정합니다.
+    """
+    W = lay["W"]
+    H = max(H or 0, lay["base_h"])
+    card_y = 440 + (H - lay["base_h"]) // 2
 
-    # 상단 추가 오버레이
-    overlay_top = Image.new('RGBA', (W, H), (0, 0, 0, 0))
-    draw_top = ImageDraw.Draw(overlay_top)
-    draw_top.rectangle((0, 0, W, 200), fill=(0, 0, 0, 100))
-    img = img.convert('RGBA')
-    img = Image.alpha_composite(img, overlay_top).convert('RGB')
+    img = compose_cover_base(_as_prepared(bg), (W, H))
 
     draw = ImageDraw.Draw(img)
 
@@ -130,37 +313,23 @@ def generate_cover_v2(course_data, bg_image, credit, output_path):
     draw.rectangle((0, 0, W, 6), fill=hex_to_rgb(ACCENT))
 
     # ── 상단 태그 ──
-    font_tag = get_font(FONT_BOLD, 29)
-    tag_text = "제주지역 특화훈련"
-    tag_bbox = draw.textbbox((0, 0), tag_text, font=font_tag)
-    tag_w = tag_bbox[2] - tag_bbox[0] + 40
-    tag_h = tag_bbox[3] - tag_bbox[1] + 22
+    tag_w, tag_h = lay["tag_w"], lay["tag_h"]
     draw_rounded_rect(draw, (50, 38, 50 + tag_w, 38 + tag_h),
                        radius=18, fill=hex_to_rgb(ACCENT))
-    draw.text((70, 44), tag_text, font=font_tag, fill=(255, 255, 255))
+    draw.text((70, 44), lay["tag_text"], font=lay["font_tag"], fill=(255, 255, 255))
 
     # ── 상단 뱃지 ──
-    font_badge = get_font(FONT_BOLD, 27)
-    badge_text = get_badge_text(course_data)
-    badge_bbox = draw.textbbox((0, 0), badge_text, font=font_badge)
-    badge_w = badge_bbox[2] - badge_bbox[0] + 40
-    badge_h = badge_bbox[3] - badge_bbox[1] + 22
+    badge_w, badge_h = lay["badge_w"], lay["badge_h"]
     badge_x = W - badge_w - 50
     draw_rounded_rect(draw, (badge_x, 38, badge_x + badge_w, 38 + badge_h),
                        radius=18, fill=hex_to_rgb(SUCCESS))
-    draw.text((badge_x + 20, 44), badge_text, font=font_badge, fill=(255, 255, 255))
+    draw.text((badge_x + 20, 44), lay["badge_text"], font=lay["font_badge"], fill=(255, 255, 255))
 
     # ── NCS직종명 (태그-뱃지 사이 중앙, 태그 스타일) ──
-    ncs_name = course_data.get("ncsName", "")
-    if ncs_name:
-        font_ncs = get_font(FONT_BOLD, 30)
-        ncs_label = f"NCS {ncs_name}"
-        ncs_bbox = draw.textbbox((0, 0), ncs_label, font=font_ncs)
-        ncs_text_w = ncs_bbox[2] - ncs_bbox[0]
-        ncs_text_h = ncs_bbox[3] - ncs_bbox[1]
+    if lay["ncs_label"]:
         ncs_pad_x, ncs_pad_y = 21, 12
-        ncs_pill_w = ncs_text_w + ncs_pad_x * 2
-        ncs_pill_h = ncs_text_h + ncs_pad_y * 2
+        ncs_pill_w = lay["ncs_text_w"] + ncs_pad_x * 2
+        ncs_pill_h = lay["ncs_text_h"] + ncs_pad_y * 2
         gap_left = 50 + tag_w
         gap_right = badge_x
         ncs_pill_x = gap_left + (gap_right - gap_left - ncs_pill_w) // 2
@@ -169,58 +338,37 @@ def generate_cover_v2(course_data, bg_image, credit, output_path):
                            (ncs_pill_x, ncs_pill_y,
                             ncs_pill_x + ncs_pill_w, ncs_pill_y + ncs_pill_h),
                            radius=18, fill=(30, 60, 95), outline=(255, 255, 255), width=2)
-        draw.text((ncs_pill_x + ncs_pad_x, ncs_pill_y + ncs_pad_y), ncs_label,
-                  font=font_ncs, fill=(255, 255, 255))
+        draw.text((ncs_pill_x + ncs_pad_x, ncs_pill_y + ncs_pad_y), lay["ncs_label"],
+                  font=lay["font_ncs"], fill=(255, 255, 255))
 
     # ── 하단 콘텐츠 영역 (반투명 카드) ──
-    card_y = 440
-    card_img = Image.new('RGBA', (W, H), (0, 0, 0, 0))
-    card_draw = ImageDraw.Draw(card_img)
-
-    card_draw.rounded_rectangle(
-        (30, card_y, W - 30, H - 30),
+    # 카드가 차지하는 띠 크기의 마스크만 만들어 흰색을 제자리 합성
+    card_box = (30, card_y, W - 29, H - 29)
+    card_mask = Image.new('L', (card_box[2] - card_box[0], card_box[3] - card_box[1]), 0)
+    ImageDraw.Draw(card_mask).rounded_rectangle(
+        (0, 0, card_mask.size[0] - 1, card_mask.size[1] - 1),
         radius=20,
-        fill=(255, 255, 255, 230)
+        fill=230
     )
-
-    img = img.convert('RGBA')
-    img = Image.alpha_composite(img, card_img).convert('RGB')
-    draw = ImageDraw.Draw(img)
+    img.paste((255, 255, 255), card_box, card_mask)
 
     # ── 과정명 ──
-    font_title = get_font(FONT_BLACK, 49)
-    title_lines = wrap_text(course_data["title"], font_title, W - 120, draw)
-    if len(title_lines) > 3:
-        title_lines = title_lines[:3]
-        title_lines[-1] = title_lines[-1][:-1] + "..."
-
     title_y = card_y + 28
-    for line in title_lines:
-        draw.text((60, title_y), line, font=font_title, fill=hex_to_rgb(PRIMARY))
-        title_y += 65
+    for line in lay["title_lines"]:
+        draw.text((60, title_y), line, font=lay["font_title"], fill=hex_to_rgb(PRIMARY))
+        title_y += lay["title_line_h"]
 
     # ── 기관명 ──
-    font_inst = get_font(FONT_REGULAR, 27)
     inst_y = title_y + 6
-    draw.text((60, inst_y), course_data["institution"],
-              font=font_inst, fill=(100, 100, 100))
+    draw.text((60, inst_y), lay["institution"],
+              font=lay["font_inst"], fill=(100, 100, 100))
 
     # ── 구분선 ──
     line_y = inst_y + 48
     draw.line((60, line_y, W - 60, line_y), fill=(220, 220, 220), width=2)
 
     # ── 정보 카드 (가로 배치, 배움기간 넓게) ──
-    # 다회차 과정: period의 " | " 구분자를 줄바꿈으로 변환
-    period_val = course_data.get("period", "").replace(" | ", "\n")
-    info_items = []
-    if period_val:
-        info_items.append(("배움 기간", period_val, 1.4))
-    hours = get_total_hours(course_data)
-    if hours > 0:
-        info_items.append(("배움 시간", f"{hours}시간", 0.8))
-    if course_data.get("capacity"):
-        info_items.append(("모집 인원", course_data["capacity"], 0.8))
-
+    info_items = lay["info_items"]
     item_y = line_y + 14
     n_items = len(info_items)
 
@@ -229,16 +377,9 @@ def generate_cover_v2(course_data, bg_image, credit, output_path):
         total_gap = info_gap * (n_items - 1)
         usable_w = W - 120 - total_gap
         total_weight = sum(item[2] for item in info_items)
-
-        # 다회차 줄바꿈 → 카드 높이 동적 확장 (회차당 +30px)
-        info_card_h = 90
-        for _, value, _ in info_items:
-            extra_lines = value.count("\n")
-            if extra_lines > 0:
-                info_card_h = max(info_card_h, 90 + extra_lines * 30)
-
-        font_info_label = get_font(FONT_BOLD, 24)
-        font_info_value = get_font(FONT_BOLD, 24)
+        info_card_h = lay["info_card_h"]
+        font_info_label = lay["font_info_label"]
+        font_info_value = lay["font_info_value"]
 
         cx = 60
         for i, (label, value, weight) in enumerate(info_items):
@@ -270,204 +411,257 @@ def generate_cover_v2(course_data, bg_image, credit, output_path):
         item_y += 8
 
     # ── 비용 강조 영역 (박스 확대 + 세로 중앙 정렬) ──
-    self_cost = course_data.get("selfCost", "")
-    course_cost = course_data.get("courseCost", "")
+    self_cost = lay["self_cost"]
+    course_cost = lay["course_cost"]
     if self_cost or course_cost:
         cost_y = item_y + 4
         cost_box_h = 112
         draw_rounded_rect(draw,
                            (50, cost_y, W - 50, cost_y + cost_box_h),
                            radius=12, fill=(235, 245, 251))
-        font_cost_label = get_font(FONT_BOLD, 24)
-        font_cost_prefix = get_font(FONT_BOLD, 29)
-        font_cost_big = get_font(FONT_BLACK, 44)
-        font_cost_small = get_font(FONT_REGULAR, 19)
 
         # 콘텐츠 높이 계산
-        label_text = "■ 훈련에 참여할 때 내는 자부담금"
-        label_bbox = draw.textbbox((0, 0), label_text, font=font_cost_label)
-        label_h = label_bbox[3] - label_bbox[1]
-        cost_line_bbox = draw.textbbox((0, 0), "단, 000,000원", font=font_cost_big)
-        cost_line_h = cost_line_bbox[3] - cost_line_bbox[1]
+        label_h = lay["cost_label_h"]
         content_gap = 10
-        total_content_h = label_h + content_gap + cost_line_h
+        total_content_h = label_h + content_gap + lay["cost_line_h"]
         content_top = cost_y + (cost_box_h - total_content_h) // 2
 
-        draw.text((72, content_top), label_text,
-                  font=font_cost_label, fill=hex_to_rgb(PRIMARY))
+        draw.text((72, content_top), lay["cost_label_text"],
+                  font=lay["font_cost_label"], fill=hex_to_rgb(PRIMARY))
 
         cost_row_y = content_top + label_h + content_gap
         if self_cost:
-            prefix_text = "단,"
-            draw.text((72, cost_row_y), prefix_text,
-                      font=font_cost_prefix, fill=(44, 62, 80))
-            prefix_bbox = draw.textbbox((0, 0), prefix_text, font=font_cost_prefix)
-            prefix_w = prefix_bbox[2] - prefix_bbox[0]
+            draw.text((72, cost_row_y), "단,",
+                      font=lay["font_cost_prefix"], fill=(44, 62, 80))
+            prefix_w = lay["cost_prefix_w"]
 
             draw.text((72 + prefix_w + 10, cost_row_y - 5), self_cost,
-                      font=font_cost_big, fill=hex_to_rgb(ACCENT))
+                      font=lay["font_cost_big"], fill=hex_to_rgb(ACCENT))
 
             if course_cost:
-                cost_bbox = draw.textbbox((0, 0), self_cost, font=font_cost_big)
-                cost_w = cost_bbox[2] - cost_bbox[0]
-                small_x = 72 + prefix_w + 10 + cost_w + 12
+                small_x = 72 + prefix_w + 10 + lay["self_cost_w"] + 12
                 draw.text((small_x, cost_row_y + 8),
                           f"(원래 수강료 {course_cost})",
-                          font=font_cost_small, fill=(136, 136, 136))
+                          font=lay["font_cost_small"], fill=(136, 136, 136))
         elif course_cost:
             draw.text((72, cost_row_y), course_cost,
-                      font=font_cost_big, fill=hex_to_rgb(ACCENT))
+                      font=lay["font_cost_big"], fill=hex_to_rgb(ACCENT))
         item_y = cost_y + cost_box_h + 8
 
     # ── 혜택 배너 (세로 중앙 정렬) ──
     benefit_y = item_y + 4
-    benefits = course_data.get("benefits", "") or get_benefits_text(course_data)
-    benefit_lines = [l.strip() for l in benefits.split('\n') if l.strip()]
-    visible_lines = benefit_lines[:3]
+    visible_lines = lay["benefit_lines"]
     line_h = 30
     benefit_box_h = max(52, len(visible_lines) * line_h + 20)
     draw_rounded_rect(draw,
                        (50, benefit_y, W - 50, benefit_y + benefit_box_h),
                        radius=12, fill=(255, 248, 230))
 
-    font_benefit_icon = get_font(FONT_BOLD, 25)
-    font_benefit = get_font(FONT_REGULAR, 21)
-
     total_text_h = len(visible_lines) * line_h
     text_start_y = benefit_y + (benefit_box_h - total_text_h) // 2
 
     draw.text((72, text_start_y), "★",
-              font=font_benefit_icon, fill=hex_to_rgb(ACCENT))
+              font=lay["font_benefit_icon"], fill=hex_to_rgb(ACCENT))
     for bi, bline in enumerate(visible_lines):
         draw.text((100, text_start_y + bi * line_h), bline,
-                  font=font_benefit, fill=(60, 60, 60))
+                  font=lay["font_benefit"], fill=(60, 60, 60))
 
     # ── 하단 ※ 주석 (footer bar 위 충분한 여백) ──
-    font_footnote = get_font(FONT_REGULAR, 22)
-    footnote = get_benefits_footnote(course_data)
     footnote_y = H - 75 - 35  # footer bar 시작(H-75) 위 35px
-    draw.text((50, footnote_y), footnote,
-              font=font_footnote, fill=(44, 62, 80))
+    draw.text((50, footnote_y), lay["footnote"],
+              font=lay["font_footnote"], fill=(44, 62, 80))
 
     # ── 하단 바 ──
     footer_y = H - 75
     footer_bar_bottom = H - 30
     footer_bar_h = footer_bar_bottom - footer_y
     draw.rectangle((30, footer_y, W - 30, footer_bar_bottom), fill=hex_to_rgb(PRIMARY))
-    font_footer = get_font(FONT_REGULAR, 21)
-    font_cta = get_font(FONT_BOLD, 23)
 
     # 기관명 수직 중앙
-    org_text = "제주지역인적자원개발위원회"
-    org_bbox = draw.textbbox((0, 0), org_text, font=font_footer)
-    org_h = org_bbox[3] - org_bbox[1]
-    org_y = footer_y + (footer_bar_h - org_h) // 2
-    draw.text((55, org_y), org_text, font=font_footer, fill=(174, 214, 241))
+    org_y = footer_y + (footer_bar_h - lay["org_h"]) // 2
+    draw.text((55, org_y), lay["org_text"], font=lay["font_footer"], fill=(174, 214, 241))
 
     # CTA 수직 중앙
-    cta_text = "신청은 work24.go.kr"
-    cta_bbox = draw.textbbox((0, 0), cta_text, font=font_cta)
-    cta_w = cta_bbox[2] - cta_bbox[0]
-    cta_h = cta_bbox[3] - cta_bbox[1]
-    cta_y = footer_y + (footer_bar_h - cta_h) // 2
-    draw.text((W - cta_w - 55, cta_y), cta_text,
-              font=font_cta, fill=hex_to_rgb(ACCENT_BRIGHT))
+    cta_y = footer_y + (footer_bar_h - lay["cta_h"]) // 2
+    draw.text((W - lay["cta_w"] - 55, cta_y), lay["cta_text"],
+              font=lay["font_cta"], fill=hex_to_rgb(ACCENT_BRIGHT))
 
     # ── 이미지 크레딧 ──
     if credit:
-        font_credit = get_font(FONT_REGULAR, 17)
         credit_text = f"Image: {credit.get('source', 'AI Generated')}"
         draw.text((50, card_y - 25), credit_text,
-                  font=font_credit, fill=(200, 200, 200, 180))
+                  font=lay["font_credit"], fill=(200, 200, 200, 180))
 
-    img.save(output_path, quality=95)
-    return output_path
+    return img
 
 
-def generate_detail_v2(course_data, bg_image, output_path):
-    """
-    상세 슬라이드 v2: 배경 이미지 상단 + 하단 콘텐츠
+def generate_cover_v2(course_data, bg_image, credit, output_path):
+    """커버 이미지 v2: 배경 이미지 + 텍스트 오버레이
 
-    데이터 우선순위:
-    1. trainingGoal → 훈련목표 레이아웃
-    2. curriculum → 커리큘럼 카드 레이아웃
-    3. fallback → 과정 기본정보 요약
+    다회차 과정: 캔버스 높이를 회차당 40px씩 확장하여 정보 카드·혜택 박스·주석
+    영역이 모두 충분한 공간을 확보하게 함 (140시간 이상 과정에서 텍스트 겹침 방지)
+
+    bg_image: 원본 Image 또는 prepare_background() 결과 (상세 슬라이드와 공유)
     """
-    W, H = 1080, 1080
+    img = _paint_cover_v2(_measure_cover_v2(course_context(course_data)), bg_image, credit)
+    save_slide(img, output_path)
+    return output_path
 
-    header_h = 280
-    bg = bg_image.copy().resize((W, int(W * bg_image.size[1] / bg_image.size[0])), Image.LANCZOS)
 
-    if bg.size[1] >= header_h:
-        bg_crop = bg.crop((0, 0, W, header_h))
-    else:
-        bg_crop = bg.resize((W, header_h), Image.LANCZOS)
+def generate_cover_v2_formats(course_data, bg_image, credit, output_path, formats=None):
+    """
+    커버 v2를 여러 화면비로 한 번에 렌더링 (feed/portrait/story/thumbnail)
 
-    bg_crop = apply_dark_overlay(bg_crop, opacity=150)
+    feed는 기존과 동일한 높이(1080 + 회차당 40px), 나머지 포맷은 해당 높이와
+    기본 높이 중 큰 값을 씁니다. 텍스트 측정은 1회만 수행합니다.
 
-    img = Image.new('RGB', (W, H), (248, 249, 250))
-    img.paste(bg_crop, (0, 0))
+    Returns:
+        dict: {포맷: 저장 경로}
+    """
+    formats = formats or CARDNEWS_FORMATS
+    ctx = course_context(course_data)
+    prepared = _as_prepared(bg_image)
 
-    draw = ImageDraw.Draw(img)
+    def paint(lay, h):
+        # feed는 정사각 대신 다회차 확장 높이를 유지
+        return _paint_cover_v2(lay, prepared, credit, None if h == ASPECT_FORMATS["feed"][1] else h)
+
+    images = render_formats(lambda: _measure_cover_v2(ctx), paint, formats)
+    return save_formats(images, output_path)
 
-    draw.rectangle((0, 0, W, 5), fill=hex_to_rgb(ACCENT))
 
-    font_header = get_font(FONT_BOLD, 39)
-    draw.text((60, 38), "이런 걸 배워요", font=font_header, fill=(255, 255, 255))
+def _measure_detail_v2(ctx):
+    """
+    상세 v2 레이아웃 측정 (폰트·줄바꿈·textbbox 1회, 배경과 무관)
 
-    font_subtitle = get_font(FONT_REGULAR, 25)
-    title_full = course_data["title"]
-    title_lines = wrap_text(title_full, font_subtitle, W - 120, draw)
+    훈련목표 본문 폰트 크기는 feed(1080) 카드 높이로 맞추고, 더 긴 포맷에서는
+    같은 폰트·줄바꿈을 늘어난 카드 안에 수직 중앙 정렬만 다시 합니다.
+    """
+    course_data = ctx.course
+    W = 1080
+    draw = ImageDraw.Draw(Image.new('RGB', (1, 1)))
+    lay = {"W": W}
+
+    lay["font_header"] = get_font(FONT_BOLD, 39)
+    lay["font_subtitle"] = get_font(FONT_REGULAR, 25)
+    title_lines = wrap_text(course_data["title"], lay["font_subtitle"], W - 120, draw)
     title_display = " ".join(title_lines[:2])  # 최대 2줄 합쳐서 1줄 표시
     if len(title_lines) > 2:
         title_display = title_display[:60] + "..."
-    draw.text((60, 88), title_display, font=font_subtitle, fill=(200, 210, 220))
+    lay["title_display"] = title_display
 
-    training_goal = (course_data.get("trainingGoal", "")
-                     or course_data.get("traingGoal", "")
-                     or course_data.get("training_goal", ""))
+    training_goal = ctx.training_goal
     curriculum = course_data.get("curriculum", [])
 
     if training_goal:
-        _draw_v2_detail_goal(draw, W, H, header_h, course_data, training_goal)
+        lay["mode"] = "goal"
+        lay["body"] = _measure_v2_detail_goal(draw, W, ctx, training_goal)
     elif curriculum:
-        _draw_v2_detail_curriculum(draw, W, H, header_h, course_data, curriculum)
+        lay["mode"] = "curriculum"
+        lay["body"] = _measure_v2_detail_curriculum(draw, W, course_data, curriculum)
     else:
-        _draw_v2_detail_fallback(draw, W, H, header_h, course_data)
+        lay["mode"] = "fallback"
+        lay["body"] = _measure_v2_detail_fallback(draw)
+
+    lay["font_footnote"] = get_font(FONT_REGULAR, 22)
+    lay["footnote"] = get_benefits_footnote(course_data)
+
+    lay["font_footer"] = get_font(FONT_REGULAR, 21)
+    lay["ft_text"] = "제주지역인적자원개발위원회  |  신청: work24.go.kr"
+    ft_bbox = draw.textbbox((0, 0), lay["ft_text"], font=lay["font_footer"])
+    lay["ft_h"] = ft_bbox[3] - ft_bbox[1]
+    return lay
+
+
+def _paint_detail_v2(lay, bg, H=1080):
+    """
+    측정된 상세 v2 레이아웃을 높이 H 캔버스에 그립니다.
+
+    늘어난 높이(extra)의 2/5는 상단 배경 헤더에, 나머지는 본문 영역에 줍니다.
+    주석·하단 바는 캔버스 하단에 고정합니다.
+    """
+    W = lay["W"]
+    extra = max(0, H - 1080)
+
+    header_h = 280 + extra * 2 // 5
+    bg_crop = prepared_detail_header(_as_prepared(bg), W, header_h)
+
+    img = Image.new('RGB', (W, H), (248, 249, 250))
+    img.paste(bg_crop, (0, 0))
+
+    draw = ImageDraw.Draw(img)
+
+    draw.rectangle((0, 0, W, 5), fill=hex_to_rgb(ACCENT))
+
+    draw.text((60, 38), "이런 걸 배워요", font=lay["font_header"], fill=(255, 255, 255))
+    draw.text((60, 88), lay["title_display"], font=lay["font_subtitle"], fill=(200, 210, 220))
+
+    if lay["mode"] == "goal":
+        _paint_v2_detail_goal(draw, W, H, header_h, lay["body"])
+    elif lay["mode"] == "curriculum":
+        _paint_v2_detail_curriculum(draw, W, H, header_h, lay["body"])
+    else:
+        _paint_v2_detail_fallback(draw, W, H, header_h, lay["body"])
 
     # ── 하단 ※ 주석 (footer 위 충분한 여백) ──
     footer_y = H - 60
-    font_footnote = get_font(FONT_REGULAR, 22)
-    footnote = get_benefits_footnote(course_data)
-    draw.text((50, footer_y - 50), footnote,
-              font=font_footnote, fill=(44, 62, 80))
+    draw.text((50, footer_y - 50), lay["footnote"],
+              font=lay["font_footnote"], fill=(44, 62, 80))
 
     # ── 하단 바 ──
     footer_bar_h = H - footer_y
     draw.rectangle((0, footer_y, W, H), fill=hex_to_rgb(PRIMARY))
-    font_footer = get_font(FONT_REGULAR, 21)
-    ft_text = "제주지역인적자원개발위원회  |  신청: work24.go.kr"
-    ft_bbox = draw.textbbox((0, 0), ft_text, font=font_footer)
-    ft_h = ft_bbox[3] - ft_bbox[1]
-    ft_y = footer_y + (footer_bar_h - ft_h) // 2
-    draw.text((50, ft_y), ft_text,
-              font=font_footer, fill=(174, 214, 241))
-
-    img.save(output_path, quality=95)
+    ft_y = footer_y + (footer_bar_h - lay["ft_h"]) // 2
+    draw.text((50, ft_y), lay["ft_text"],
+              font=lay["font_footer"], fill=(174, 214, 241))
+
+    return img
+
+
+def generate_detail_v2(course_data, bg_image, output_path):
+    """
+    상세 슬라이드 v2: 배경 이미지 상단 + 하단 콘텐츠
+
+    데이터 우선순위:
+    1. trainingGoal → 훈련목표 레이아웃
+    2. curriculum → 커리큘럼 카드 레이아웃
+    3. fallback → 과정 기본정보 요약
+
+    bg_image: 원본 Image 또는 prepare_background() 결과 (커버와 공유)
+    """
+    img = _paint_detail_v2(_measure_detail_v2(course_context(course_data)), bg_image)
+    save_slide(img, output_path)
     return output_path
 
 
-def _draw_v2_detail_goal(draw, W, H, header_h, course_data, training_goal):
-    """v2 훈련목표 레이아웃 (카드 UI + 과정정보 태그, 자동 폰트 조정)"""
-    from benefits_helper import get_total_hours, get_course_type
+def generate_detail_v2_formats(course_data, bg_image, output_path, formats=None):
+    """상세 v2를 여러 화면비로 한 번에 렌더링 → {포맷: 저장 경로}"""
+    formats = formats or CARDNEWS_FORMATS
+    ctx = course_context(course_data)
+    prepared = _as_prepared(bg_image)
+    images = render_formats(lambda: _measure_detail_v2(ctx),
+                            lambda lay, h: _paint_detail_v2(lay, prepared, h), formats)
+    return save_formats(images, output_path)
+
 
+def _v2_goal_text_box(H, header_h, lay):
+    """v2 훈련목표 카드 본문 영역 → (text_top, available_h)"""
     footer_reserve = 100  # 주석 + footer 바
+    card_bottom = H - footer_reserve - lay["info_area_h"] - 16
+    text_top = header_h + 18 + 20 + 44 + 14  # card_top + 라벨 + 구분선 + 여백
+    return text_top, (card_bottom - 20) - text_top
+
+
+def _measure_v2_detail_goal(draw, W, ctx, training_goal):
+    """v2 훈련목표 레이아웃 측정 — 본문 폰트는 feed(H=1080, 헤더 280) 카드 기준"""
+    course_data = ctx.course
+    lay = {}
 
     # ── 하단 과정정보 태그 데이터 ──
-    hours = get_total_hours(course_data)
+    hours = ctx.hours
     institution = course_data.get("institution", "")
     ncs_name = course_data.get("ncsName", "")
-    ctype = get_course_type(course_data)
+    ctype = ctx.ctype
 
     info_tags = []
     if institution:
@@ -480,14 +674,30 @@ def _draw_v2_detail_goal(draw, W, H, header_h, course_data, training_goal):
     if ctype in ctype_labels:
         info_tags.append(ctype_labels[ctype])
 
-    info_area_h = 100 if info_tags else 0
+    lay["info_area_h"] = 100 if info_tags else 0
+    lay["font_tag"] = get_font(FONT_BOLD, 26)
+    lay["tags"] = [(tag_label, draw.textbbox((0, 0), tag_label, font=lay["font_tag"]))
+                   for tag_label in info_tags]
+
+    lay["font_goal_label"] = get_font(FONT_BOLD, 30)
+
+    # ── 본문 (자동 폰트 크기 조정: 19~30px 이진 탐색) ──
+    card_inner_w = (W - 35) - 35 - 80
+    lay["font_goal_body"], lay["lines"], lay["line_spacing"] = fit_text(
+        training_goal, FONT_REGULAR, card_inner_w, _v2_goal_text_box(1080, 280, lay)[1],
+        min_size=19, max_size=30, line_ratio=1.73)
+    return lay
+
+
+def _paint_v2_detail_goal(draw, W, H, header_h, lay):
+    """v2 훈련목표 레이아웃 (카드 UI + 과정정보 태그, 자동 폰트 조정)"""
+    footer_reserve = 100  # 주석 + footer 바
 
     # ── 카드 영역 계산 ──
     card_top = header_h + 18
-    card_bottom = H - footer_reserve - info_area_h - 16
+    card_bottom = H - footer_reserve - lay["info_area_h"] - 16
     card_left = 35
     card_right = W - 35
-    card_inner_w = card_right - card_left - 80
 
     # 카드 그림자 + 본체
     draw_rounded_rect(draw, (card_left + 3, card_top + 3, card_right + 3, card_bottom + 3),
@@ -502,61 +712,34 @@ def _draw_v2_detail_goal(draw, W, H, header_h, course_data, training_goal):
 
     # 카드 라벨
     label_y = card_top + 20
-    font_goal_label = get_font(FONT_BOLD, 30)
     draw.text((card_left + 28, label_y), "■  훈련목표",
-              font=font_goal_label, fill=hex_to_rgb(PRIMARY))
+              font=lay["font_goal_label"], fill=hex_to_rgb(PRIMARY))
 
     # 구분선
     sep_y = label_y + 44
     draw.line((card_left + 28, sep_y, card_right - 28, sep_y),
               fill=hex_to_rgb("#EBF5FB"), width=2)
 
-    # ── 본문 (자동 폰트 크기 조정 + 수직 중앙 정렬) ──
-    text_top = sep_y + 14
-    text_bottom = card_bottom - 20
-    available_h = text_bottom - text_top
-
-    font_sizes = [30, 27, 24, 22, 19]
-    line_spacings = [52, 48, 44, 41, 37]
-
-    chosen_idx = 0
-    for idx, (fsize, lspace) in enumerate(zip(font_sizes, line_spacings)):
-        test_font = get_font(FONT_REGULAR, fsize)
-        test_lines = wrap_text(training_goal, test_font, card_inner_w, draw)
-        total_h = len(test_lines) * lspace
-        if total_h <= available_h:
-            chosen_idx = idx
-            break
-        chosen_idx = idx
-
-    font_size = font_sizes[chosen_idx]
-    line_spacing = line_spacings[chosen_idx]
-    font_goal_body = get_font(FONT_REGULAR, font_size)
-    goal_lines = wrap_text(training_goal, font_goal_body, card_inner_w, draw)
-
-    max_visible = int(available_h / line_spacing)
-    visible_lines = goal_lines[:max_visible]
-    total_text_h = len(visible_lines) * line_spacing
+    # ── 본문 (수직 중앙 정렬) ──
+    text_top, available_h = _v2_goal_text_box(H, header_h, lay)
+    line_spacing = lay["line_spacing"]
+    total_text_h = len(lay["lines"]) * line_spacing
     y = text_top + max(0, (available_h - total_text_h) // 2)
 
-    for line in visible_lines:
-        if y + line_spacing > text_bottom + 5:
-            break
+    for line in lay["lines"]:
         draw.text((card_left + 38, y), line,
-                  font=font_goal_body, fill=(44, 62, 80))
+                  font=lay["font_goal_body"], fill=(44, 62, 80))
         y += line_spacing
 
     # ── 하단 과정정보 태그 ──
-    if info_tags:
+    if lay["tags"]:
         tag_y = card_bottom + 16
-        font_tag = get_font(FONT_BOLD, 26)
         tag_x = card_left
         tag_h = 40
         tag_gap = 10
         tag_pad_x = 16
 
-        for tag_label in info_tags:
-            bbox = draw.textbbox((0, 0), tag_label, font=font_tag)
+        for tag_label, bbox in lay["tags"]:
             tw = bbox[2] - bbox[0]
             tag_w = tw + tag_pad_x * 2
 
@@ -570,18 +753,45 @@ def _draw_v2_detail_goal(draw, W, H, header_h, course_data, training_goal):
                               fill=hex_to_rgb("#EBF5FB"))
             text_y_inner = tag_y + (tag_h - (bbox[3] - bbox[1])) // 2
             draw.text((tag_x + tag_pad_x, text_y_inner), tag_label,
-                      font=font_tag, fill=hex_to_rgb(PRIMARY))
+                      font=lay["font_tag"], fill=hex_to_rgb(PRIMARY))
             tag_x += tag_w + tag_gap
 
 
-def _draw_v2_detail_curriculum(draw, W, H, header_h, course_data, curriculum):
-    """v2 커리큘럼 카드 레이아웃 (기존 로직)"""
-    font_item_title = get_font(FONT_BOLD, 29)
-    font_item_desc = get_font(FONT_REGULAR, 25)
+def _measure_v2_detail_curriculum(draw, W, course_data, curriculum):
+    """v2 커리큘럼 레이아웃 측정 (항목별 번호 폭·설명 줄바꿈, 수료 후 문구)"""
+    lay = {}
+    lay["font_item_title"] = get_font(FONT_BOLD, 29)
+    font_item_desc = lay["font_item_desc"] = get_font(FONT_REGULAR, 25)
+    font_num = lay["font_num"] = get_font(FONT_BOLD, 23)
+
+    items = []
+    for i, item in enumerate(curriculum[:5]):
+        num_bbox = draw.textbbox((0, 0), str(i + 1), font=font_num)
+
+        if isinstance(item, dict):
+            title_text = item.get("title", "")
+            desc_text = item.get("desc", "")
+        else:
+            title_text = str(item)
+            desc_text = ""
+
+        desc_lines = wrap_text(desc_text, font_item_desc, W - 190, draw) if desc_text else []
+        items.append({"num": str(i + 1), "num_w": num_bbox[2] - num_bbox[0],
+                      "title": title_text, "desc_lines": desc_lines})
+    lay["items"] = items
+
+    lay["font_outcome_title"] = get_font(FONT_BOLD, 27)
+    lay["font_outcome"] = get_font(FONT_REGULAR, 25)
+    outcome = course_data.get("outcome", "관련 분야 취업 연계")
+    lay["outcome_lines"] = wrap_text(outcome, lay["font_outcome"], W - 150, draw)
+    return lay
 
+
+def _paint_v2_detail_curriculum(draw, W, H, header_h, lay):
+    """v2 커리큘럼 카드 레이아웃 (기존 로직)"""
     y = header_h + 22
 
-    for i, item in enumerate(curriculum[:5]):
+    for item in lay["items"]:
         card_h = 115
         draw_rounded_rect(draw, (40, y, W - 40, y + card_h),
                            radius=12, fill=(255, 255, 255))
@@ -592,26 +802,14 @@ def _draw_v2_detail_curriculum(draw, W, H, header_h, course_data, curriculum):
         cr = 20
         draw_rounded_rect(draw, (cx - cr, cy - cr, cx + cr, cy + cr),
                            radius=cr, fill=hex_to_rgb(PRIMARY))
-        font_num = get_font(FONT_BOLD, 23)
-        num_bbox = draw.textbbox((0, 0), str(i + 1), font=font_num)
-        num_w = num_bbox[2] - num_bbox[0]
-        draw.text((cx - num_w // 2, cy - 13), str(i + 1),
-                  font=font_num, fill=(255, 255, 255))
+        draw.text((cx - item["num_w"] // 2, cy - 13), item["num"],
+                  font=lay["font_num"], fill=(255, 255, 255))
 
-        if isinstance(item, dict):
-            title_text = item.get("title", "")
-            desc_text = item.get("desc", "")
-        else:
-            title_text = str(item)
-            desc_text = ""
-
-        draw.text((115, y + 14), title_text,
-                  font=font_item_title, fill=(44, 62, 80))
-        if desc_text:
-            desc_lines = wrap_text(desc_text, font_item_desc, W - 190, draw)
-            for j, dl in enumerate(desc_lines[:2]):
-                draw.text((115, y + 52 + j * 30), dl,
-                          font=font_item_desc, fill=(127, 140, 141))
+        draw.text((115, y + 14), item["title"],
+                  font=lay["font_item_title"], fill=(44, 62, 80))
+        for j, dl in enumerate(item["desc_lines"][:2]):
+            draw.text((115, y + 52 + j * 30), dl,
+                      font=lay["font_item_desc"], fill=(127, 140, 141))
 
         y += card_h + 12
 
@@ -620,72 +818,103 @@ def _draw_v2_detail_curriculum(draw, W, H, header_h, course_data, curriculum):
     draw_rounded_rect(draw, (40, outcome_y, W - 40, outcome_y + 108),
                        radius=12, fill=hex_to_rgb(PRIMARY))
 
-    font_outcome_title = get_font(FONT_BOLD, 27)
-    font_outcome = get_font(FONT_REGULAR, 25)
     draw.text((65, outcome_y + 14), "배우고 나면",
-              font=font_outcome_title, fill=hex_to_rgb(ACCENT_BRIGHT))
-    outcome = course_data.get("outcome", "관련 분야 취업 연계")
-    outcome_lines = wrap_text(outcome, font_outcome, W - 150, draw)
-    for i, line in enumerate(outcome_lines[:2]):
+              font=lay["font_outcome_title"], fill=hex_to_rgb(ACCENT_BRIGHT))
+    for i, line in enumerate(lay["outcome_lines"][:2]):
         draw.text((65, outcome_y + 50 + i * 32), line,
-                  font=font_outcome, fill=(255, 255, 255))
-
-
-def _draw_v2_detail_fallback(draw, W, H, header_h, course_data):
-    """v2 fallback: 훈련목표/커리큘럼 없을 때 간결한 안내"""
+                  font=lay["font_outcome"], fill=(255, 255, 255))
 
-    font_msg = get_font(FONT_REGULAR, 28)
-    font_url = get_font(FONT_BOLD, 26)
 
-    msg_y = header_h + (H - header_h - 100) // 2 - 40
+def _measure_v2_detail_fallback(draw):
+    """v2 안내 레이아웃 측정 (가운데 정렬 문구 폭)"""
+    lay = {}
+    lay["font_msg"] = get_font(FONT_REGULAR, 28)
+    lay["font_url"] = get_font(FONT_BOLD, 26)
     msg_lines = [
         "훈련과정의 상세 내용은",
         "고용24에서 확인할 수 있어요.",
     ]
+    lay["msg_lines"] = []
     for line in msg_lines:
-        bbox = draw.textbbox((0, 0), line, font=font_msg)
-        lw = bbox[2] - bbox[0]
+        bbox = draw.textbbox((0, 0), line, font=lay["font_msg"])
+        lay["msg_lines"].append((line, bbox[2] - bbox[0]))
+    lay["url_text"] = "work24.go.kr"
+    url_bbox = draw.textbbox((0, 0), lay["url_text"], font=lay["font_url"])
+    lay["url_w"] = url_bbox[2] - url_bbox[0]
+    return lay
+
+
+def _paint_v2_detail_fallback(draw, W, H, header_h, lay):
+    """v2 fallback: 훈련목표/커리큘럼 없을 때 간결한 안내"""
+    msg_y = header_h + (H - header_h - 100) // 2 - 40
+    for line, lw in lay["msg_lines"]:
         draw.text(((W - lw) // 2, msg_y), line,
-                  font=font_msg, fill=(127, 140, 141))
+                  font=lay["font_msg"], fill=(127, 140, 141))
         msg_y += 44
 
     msg_y += 16
-    url_text = "work24.go.kr"
-    url_bbox = draw.textbbox((0, 0), url_text, font=font_url)
-    url_w = url_bbox[2] - url_bbox[0]
-    draw.text(((W - url_w) // 2, msg_y), url_text,
-              font=font_url, fill=hex_to_rgb(ACCENT))
+    draw.text(((W - lay["url_w"]) // 2, msg_y), lay["url_text"],
+              font=lay["font_url"], fill=hex_to_rgb(ACCENT))
 
 
-def generate_cardnews_v2(course_data, output_dir="output"):
-    """이미지 포함 카드뉴스 생성 (v2)"""
+def generate_cardnews_v2(course_data, output_dir="output", background=None):
+    """이미지 포함 카드뉴스 생성 (v2)
+
+    course_data: 과정 dict 또는 CourseContext
+    background: 미리 받아 둔 (bg_image, credit) — 파이프라인 prefetch 결과.
+                None이면 여기서 get_course_image()를 호출합니다.
+    """
     from fetch_images import get_course_image
-    from generate_cardnews import generate_slide_howto
+    from generate_cardnews import generate_howto_formats
 
+    ctx = course_context(course_data)
+    course_data = ctx.course
     os.makedirs(output_dir, exist_ok=True)
     # NTFS 금지 문자(< > : " / \ | ? * 줄바꿈) 모두 제거
     # → GitHub Actions actions/upload-artifact 호환 (콜론 포함 과정명도 안전)
     import re
     safe_name = re.sub(r'[<>:"/\\|?*\r\n\t]', "_", course_data["title"][:30]).replace(" ", "_")
 
-    bg_image, credit = get_course_image(course_data)
+    if background is not None:
+        bg_image, credit = background
+    else:
+        bg_image, credit = get_course_image(course_data)
+    # 배경은 과정당 한 번만 준비해 커버(모든 포맷)·상세 슬라이드가 공유
+    prepared = prepare_background(bg_image)
 
     paths = []
-
-    p1 = os.path.join(output_dir, f"{safe_name}_v2_1_cover.png")
-    generate_cover_v2(course_data, bg_image, credit, p1)
-    paths.append(p1)
-    print(f"  [v2] 커버 생성: {p1}")
-
-    # 슬라이드 2: 훈련목표/상세 (항상 생성)
-    p2 = os.path.join(output_dir, f"{safe_name}_v2_2_detail.png")
-    generate_detail_v2(course_data, bg_image, p2)
-    paths.append(p2)
-    print(f"  [v2] 상세 생성: {p2}")
-
-    p3 = os.path.join(output_dir, f"{safe_name}_v2_3_howto.png")
-    generate_slide_howto(course_data, p3)
-    paths.append(p3)
-    print(f"  [v2] 신청방법 생성: {p3}")
+    # 슬라이드마다 설정된 화면비(CARDNEWS_FORMATS)를 레이아웃 측정 1회로 함께 렌더링
+    formats = ["feed"] + [f for f in CARDNEWS_FORMATS if f != "feed"]
+
+    # 인코딩은 워커 풀에서 병렬 처리 (블록 종료 시 저장 완료 보장)
+    with encoding_pool():
+        # 커버
+        p1 = os.path.join(output_dir, f"{safe_name}_v2_1_cover.png")
+        cover_paths = generate_cover_v2_formats(ctx, prepared, credit, p1, formats=formats)
+        paths.append(p1)
+        print(f"  [v2] 커버 생성: {p1}")
+        extra_paths = [p for fmt, p in cover_paths.items() if fmt != "feed"]
+        for p in extra_paths:
+            print(f"  [v2] 커버 포맷 생성: {p}")
+
+        # 슬라이드 2: 훈련목표/상세 (항상 생성)
+        p2 = os.path.join(output_dir, f"{safe_name}_v2_2_detail.png")
+        detail_paths = generate_detail_v2_formats(ctx, prepared, p2, formats=formats)
+        paths.append(p2)
+        print(f"  [v2] 상세 생성: {p2}")
+
+        p3 = os.path.join(output_dir, f"{safe_name}_v2_3_howto.png")
+        howto_paths = generate_howto_formats(ctx, p3, formats=formats)
+        paths.append(p3)
+        print(f"  [v2] 신청방법 생성: {p3}")
+
+        for slide_paths in (detail_paths, howto_paths):
+            for fmt, p in slide_paths.items():
+                if fmt != "feed":
+                    extra_paths.append(p)
+                    print(f"  [v2] 포맷 생성: {p}")
+
+    # 추가 화면비는 기본 3장 뒤에 기록 (만료 정리·재생성 검사 대상에 포함)
+    paths.extend(extra_paths)
 
     return paths
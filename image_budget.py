@@ -0,0 +1,196 @@
+"""
+Grok 이미지 생성 예산·쿼터 스케줄러
+
+배경: XAI_API_KEY만 있으면 generate_image_with_grok()이 무조건 호출돼, 신규 과정이
+몰린 날에는 몇 달 뒤 시작하는 과정에 쿼터를 다 써 버릴 수 있었습니다.
+(일일 비용 상한·분당 요청 제한·우선순위 개념 없음)
+
+→ 동작:
+  1. 신규 과정을 긴급도(traStartDate가 가까운 순)로 정렬
+  2. 캐시 적중 과정은 비용이 없으므로 항상 통과
+  3. 나머지는 실행당 상한 / 일일 상한 안에서만 Grok 요청, 초과분은 그라데이션으로
+     생성하고 대기열(deferred)에 올려 다음 실행에서 이미지 포함으로 재생성
+  4. 실제 요청 직전 acquire_image_slot()으로 분당 요청 수를 제한하고 사용량을 기록
+  5. 대기열에는 슬롯을 못 받은 과정만 올림 — Grok 자체 실패(거절·오류)는 다시 시도해도
+     같은 결과일 가능성이 높아 올리지 않고, 대기열 과정도 IMAGE_DEFER_MAX_ATTEMPTS번 미뤄지면 포기
+
+상태 파일: output/.image_budget.json (일별 사용량 + 대기열, 워크플로가 함께 커밋)
+
+설정 (환경변수):
+  IMAGE_BUDGET_PER_RUN   실행당 최대 Grok 요청 수 (기본: 20)
+  IMAGE_BUDGET_PER_DAY   일일 최대 Grok 요청 수 (기본: 40)
+  IMAGE_RATE_PER_MIN     분당 최대 Grok 요청 수 (기본: 10)
+  IMAGE_DEFER_MAX_ATTEMPTS  대기열 과정당 최대 재시도 횟수 (기본: 3)
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+
+BUDGET_FILE = os.path.join("output", ".image_budget.json")
+IMAGE_BUDGET_PER_RUN = int(os.environ.get("IMAGE_BUDGET_PER_RUN", "20") or 20)
+IMAGE_BUDGET_PER_DAY = int(os.environ.get("IMAGE_BUDGET_PER_DAY", "40") or 40)
+IMAGE_RATE_PER_MIN = int(os.environ.get("IMAGE_RATE_PER_MIN", "10") or 10)
+IMAGE_DEFER_MAX_ATTEMPTS = int(os.environ.get("IMAGE_DEFER_MAX_ATTEMPTS", "3") or 3)
+
+# 일별 사용량 보관 기간 (이보다 오래된 날짜는 정리)
+_KEEP_DAYS = 7
+
+_lock = threading.Lock()
+_state = None
+_run_used = 0
+_recent_calls = deque()
+
+
+def _today():
+    return datetime.now().strftime("%Y-%m-%d")
+
+
+def load_budget_state():
+    """상태 파일 로드 (없거나 손상되면 빈 상태)"""
+    global _state
+    if _state is None:
+        try:
+            with open(BUDGET_FILE, "r", encoding="utf-8") as f:
+                _state = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            _state = {}
+        _state.setdefault("days", {})
+        _state.setdefault("deferred", {})
+    return _state
+
+
+def save_budget_state():
+    state = load_budget_state()
+    cutoff = (datetime.now() - timedelta(days=_KEEP_DAYS)).strftime("%Y-%m-%d")
+    state["days"] = {d: n for d, n in state["days"].items() if d >= cutoff}
+    os.makedirs(os.path.dirname(BUDGET_FILE), exist_ok=True)
+    with open(BUDGET_FILE, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+
+
+def used_today():
+    return load_budget_state()["days"].get(_today(), 0)
+
+
+def remaining_budget():
+    """이번 실행에서 더 쓸 수 있는 Grok 요청 수"""
+    return max(0, min(IMAGE_BUDGET_PER_RUN - _run_used, IMAGE_BUDGET_PER_DAY - used_today()))
+
+
+def is_deferred(course_key):
+    return course_key in load_budget_state()["deferred"]
+
+
+def prune_deferred(known_keys):
+    """처리 기록에서 사라진(만료 정리 등) 과정을 대기열에서 제거 → 제거 건수"""
+    with _lock:
+        deferred = load_budget_state()["deferred"]
+        stale = [key for key in deferred if key not in known_keys]
+        for key in stale:
+            del deferred[key]
+        if stale:
+            save_budget_state()
+    return len(stale)
+
+
+def _urgency_key(course):
+    """traStartDate가 가까울수록 먼저 (파싱 실패는 맨 뒤)"""
+    raw = str(course.get("traStartDate", "")).replace("-", "").replace(".", "")[:8]
+    try:
+        return datetime.strptime(raw, "%Y%m%d")
+    except ValueError:
+        return datetime.max
+
+
+def schedule_image_jobs(new_courses, is_cached=None):
+    """
+    이미지 생성 대상을 긴급도 순으로 정렬하고 예산 안에서 배정합니다.
+
+    Args:
+        new_courses: [(course, course_key), ...]
+        is_cached: course → bool (캐시 적중이면 예산 소모 없음)
+    Returns:
+        tuple(list, list): (이미지 생성 대상, 그라데이션으로 미룰 대상) — 둘 다 긴급도 순
+    """
+    ordered = sorted(new_courses, key=lambda ck: _urgency_key(ck[0]))
+    budget = remaining_budget()
+    scheduled, deferred = [], []
+    for course, key in ordered:
+        if is_cached and is_cached(course):
+            scheduled.append((course, key))
+        elif budget > 0:
+            scheduled.append((course, key))
+            budget -= 1
+        else:
+            deferred.append((course, key))
+
+    if deferred:
+        print(f"  💰 이미지 예산 소진: {len(deferred)}건은 그라데이션으로 생성 후 다음 실행 대기열에 추가")
+        print(f"      (실행당 {IMAGE_BUDGET_PER_RUN}건 / 일일 {IMAGE_BUDGET_PER_DAY}건, 오늘 사용 {used_today()}건)")
+    return scheduled, deferred
+
+
+def acquire_image_slot(cancel=None):
+    """
+    Grok 요청 직전 호출. 예산이 남아 있으면 사용량을 기록하고 True,
+    분당 제한에 걸리면 자리가 날 때까지 대기합니다.
+
+    Args:
+        cancel: threading.Event — 대기 중 설정되면 슬롯을 잡지 않고 False
+    Returns:
+        bool: False면 예산 소진(또는 취소) → 호출부는 그라데이션으로 폴백
+    """
+    global _run_used
+    while True:
+        if cancel is not None and cancel.is_set():
+            return False
+        with _lock:
+            if remaining_budget() <= 0:
+                return False
+            now = time.monotonic()
+            while _recent_calls and now - _recent_calls[0] >= 60:
+                _recent_calls.popleft()
+            if len(_recent_calls) < IMAGE_RATE_PER_MIN:
+                _recent_calls.append(now)
+                _run_used += 1
+                state = load_budget_state()
+                state["days"][_today()] = state["days"].get(_today(), 0) + 1
+                save_budget_state()
+                return True
+            wait = 60 - (now - _recent_calls[0])
+        print(f"  ⏳ 분당 요청 제한({IMAGE_RATE_PER_MIN}건) → {wait:.0f}초 대기")
+        if cancel is not None:
+            cancel.wait(max(wait, 0.1))
+        else:
+            time.sleep(max(wait, 0.1))
+
+
+def record_image_outcome(course_key, course, got_image, slot_denied=False):
+    """
+    과정별 결과 기록.
+
+    · 이미지를 받았으면 대기열에서 제거
+    · 슬롯을 못 받았으면(예산 소진·취소) 대기열에 올리고 시도 횟수 +1
+      → IMAGE_DEFER_MAX_ATTEMPTS번째면 포기하고 제거 (그라데이션 유지)
+    · 슬롯을 받고도 실패했으면 다시 시도하지 않음 (대기열에서 제거)
+    """
+    with _lock:
+        deferred = load_budget_state()["deferred"]
+        if got_image or not slot_denied:
+            deferred.pop(course_key, None)
+        else:
+            entry = deferred.setdefault(course_key, {
+                "title": course.get("title", ""),
+                "traStartDate": course.get("traStartDate", ""),
+                "queued_at": datetime.now().isoformat(),
+            })
+            entry["attempts"] = entry.get("attempts", 0) + 1
+            if entry["attempts"] >= IMAGE_DEFER_MAX_ATTEMPTS:
+                del deferred[course_key]
+                print(f"  🛑 이미지 대기열 {IMAGE_DEFER_MAX_ATTEMPTS}회 미뤄짐 → 포기하고 그라데이션 유지: "
+                      f"{course.get('title', '')[:40]}")
+        save_budget_state()
@@ -0,0 +1,154 @@
+"""
+Grok 배경 이미지 로컬 캐시 (content-addressed)
+
+배경: get_course_image()는 _build_image_prompt() 결과가 이전 실행과 같아도
+매번 generate_image_with_grok()을 호출했습니다. 산출물 유실로 인한 재생성,
+merge_multi_degr로 회차가 추가된 과정, 중단 후 재실행 모두 유료 호출(최대 60초)이
+반복되던 문제.
+→ (프롬프트, 모델, 목표 크기)의 해시를 키로, 중앙 크롭까지 끝난 이미지와
+  메타데이터를 디스크에 저장합니다. 총 용량 상한을 넘으면 가장 오래 쓰지 않은
+  항목부터 삭제합니다 (LRU, 파일 mtime 기준).
+
+저장 구조:
+  .image_cache/{key}.png   크롭된 배경 이미지
+  .image_cache/{key}.json  메타데이터 (prompt, model, size, credit, created_at)
+
+설정:
+  IMAGE_CACHE_DIR        캐시 디렉토리 (기본: .image_cache)
+  IMAGE_CACHE_MAX_MB     용량 상한 MB (기본: 300)
+  pipeline.py --no-image-cache   이번 실행에서 캐시 조회/저장 모두 끔
+"""
+
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+
+IMAGE_CACHE_DIR = os.environ.get("IMAGE_CACHE_DIR", ".image_cache")
+IMAGE_CACHE_MAX_BYTES = int(os.environ.get("IMAGE_CACHE_MAX_MB", "300") or 300) * 1024 * 1024
+
+_enabled = True
+
+
+def set_enabled(enabled):
+    """캐시 사용 여부 전환 (--no-image-cache)"""
+    global _enabled
+    _enabled = bool(enabled)
+
+
+def is_enabled():
+    return _enabled
+
+
+def cache_key(prompt, model, size):
+    """프롬프트·모델·목표 크기로 content-addressed 키 생성"""
+    payload = json.dumps([prompt, model, list(size)], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def _paths(key):
+    return (os.path.join(IMAGE_CACHE_DIR, f"{key}.png"),
+            os.path.join(IMAGE_CACHE_DIR, f"{key}.json"))
+
+
+def has_cached_image(key):
+    """이미지를 읽지 않고 적중 여부만 확인 (예산 스케줄링용)"""
+    return _enabled and all(os.path.exists(p) for p in _paths(key))
+
+
+def get_cached_image(key):
+    """
+    캐시 조회. 적중 시 LRU 순서 갱신(mtime touch).
+
+    Returns:
+        tuple(PIL.Image, dict) | (None, None)
+    """
+    if not _enabled:
+        return None, None
+    img_path, meta_path = _paths(key)
+    if not (os.path.exists(img_path) and os.path.exists(meta_path)):
+        return None, None
+    try:
+        from PIL import Image
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        img = Image.open(img_path)
+        img.load()
+    except (OSError, ValueError) as e:
+        # 손상된 항목은 지우고 미스로 처리
+        print(f"  ⚠️ 이미지 캐시 손상 → 삭제: {key} ({e})")
+        _remove(key)
+        return None, None
+
+    now = time.time()
+    for p in (img_path, meta_path):
+        try:
+            os.utime(p, (now, now))
+        except OSError:
+            pass
+    return img.convert("RGB"), meta
+
+
+def put_cached_image(key, img, meta):
+    """캐시 저장 후 용량 상한 적용. 실패해도 파이프라인은 계속 진행."""
+    if not _enabled:
+        return
+    img_path, meta_path = _paths(key)
+    try:
+        os.makedirs(IMAGE_CACHE_DIR, exist_ok=True)
+        meta = dict(meta, created_at=datetime.now().isoformat())
+        # 임시 파일에 쓴 뒤 교체 → 중단돼도 반쪽 파일이 적중하지 않음
+        tmp_img = img_path + ".tmp"
+        img.save(tmp_img, format="PNG")
+        os.replace(tmp_img, img_path)
+        with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        os.replace(meta_path + ".tmp", meta_path)
+    except OSError as e:
+        print(f"  ⚠️ 이미지 캐시 저장 실패: {e}")
+        return
+    evict_to_limit()
+
+
+def _remove(key):
+    for p in _paths(key):
+        try:
+            os.remove(p)
+        except OSError:
+            pass
+
+
+def evict_to_limit(max_bytes=None):
+    """총 용량이 상한을 넘으면 마지막 사용(mtime)이 오래된 항목부터 삭제
+
+    Returns:
+        int: 삭제한 항목 수
+    """
+    max_bytes = IMAGE_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    if not os.path.isdir(IMAGE_CACHE_DIR):
+        return 0
+
+    entries = {}
+    for name in os.listdir(IMAGE_CACHE_DIR):
+        key, ext = os.path.splitext(name)
+        if ext not in (".png", ".json"):
+            continue
+        try:
+            st = os.stat(os.path.join(IMAGE_CACHE_DIR, name))
+        except OSError:
+            continue
+        size, mtime = entries.get(key, (0, 0))
+        entries[key] = (size + st.st_size, max(mtime, st.st_mtime))
+
+    total = sum(size for size, _ in entries.values())
+    removed = 0
+    for key, (size, _) in sorted(entries.items(), key=lambda kv: kv[1][1]):
+        if total <= max_bytes:
+            break
+        _remove(key)
+        total -= size
+        removed += 1
+    if removed:
+        print(f"  🧹 이미지 캐시 정리: {removed}개 삭제 (상한 {max_bytes // (1024 * 1024)}MB)")
+    return removed
@@ -0,0 +1,319 @@
+"""
+웹용 반응형 이미지 파생본 생성 (폭별 AVIF/WebP/JPEG + 블러 플레이스홀더 + srcset 매니페스트)
+
+배경: training-courses.html이 images/course_*.jpg/png 원본(최대 4MB)을 그대로 불러와,
+카드 높이 100px짜리 썸네일에도 모바일이 수 MB를 받았습니다. output/의 카드뉴스 PNG도
+웹에 올릴 크기의 파일이 따로 없었음.
+
+→ 원본마다 DERIVATIVE_WIDTHS 폭(원본보다 큰 폭은 원본 폭으로 대체) × 포맷별 파생본 생성
+  · 포맷: AVIF(Pillow 빌드가 지원할 때만) → WebP → JPEG(대체용, 투명 영역은 흰 배경)
+  · EXIF 회전을 적용한 뒤 축소 (원본 <img>가 브라우저에서 보이던 방향 그대로)
+  · JPEG 원본은 draft()로 필요한 크기 근처까지만 디코딩 (4000px 사진도 빠르게)
+  · 16px 폭 WebP 플레이스홀더(data URI, 100바이트 남짓 — 같은 크기 JPEG는 헤더만 수백 바이트)
+    — 큰 이미지가 오기 전 배경으로 표시
+→ 파일명에 (원본 + 설정) 해시 포함: course_1.3fa9c2d1.640w.webp
+  · 내용이 같으면 URL도 같으니 브라우저 캐시를 계속 씀, 바뀌면 새 URL
+  · 매니페스트의 해시와 같고 파생본이 모두 있으면 원본 디코딩 없이 건너뜀
+  · 원본이 사라졌거나 바뀌어 더 이상 가리키지 않는 파생본은 삭제
+→ 원본별 처리는 스레드 풀에서 병렬 (Pillow는 디코딩·리사이즈·인코딩 중 GIL 해제)
+
+원본 묶음 → 파생본 폴더 (매니페스트: 폴더의 srcset.json):
+  images/course_*   → images/derived/
+  output/*.png      → output/web/        (--output 지정 시, 카드뉴스 슬라이드 — 로컬 확인용)
+  output/web/은 .gitignore 대상이며 워크플로도 만들지 않음 (읽는 페이지가 없고 output/보다 커짐).
+  cleanup_expired가 원본을 지우면 drop_sources()로 해당 파생본도 함께 지움.
+
+srcset.json: {"settings", "images": {원본 경로: {hash, width, height, placeholder,
+              srcset: {"image/avif": "... 320w, ... 640w", ...}, fallback}}}
+페이지 반영: DERIVATIVE_PAGES의 /* IMAGE_SRCSET:BEGIN */ … /* IMAGE_SRCSET:END */ 구간을
+  images 매니페스트로 교체 (추가 요청 없이 첫 렌더부터 srcset 사용)
+
+설정 (환경변수):
+  DERIVATIVE_WIDTHS    생성 폭, 쉼표 구분 (기본: 320,640,960,1280)
+  DERIVATIVE_FORMATS   생성 포맷, 쉼표 구분 (기본: avif,webp,jpeg)
+  DERIVATIVE_WORKERS   병렬 처리 스레드 수 (기본: CPU 수)
+
+사용법:
+  python image_derivatives.py            # images/ 파생본 + 페이지 반영
+  python image_derivatives.py --output   # output/ 카드뉴스 PNG도 함께
+  python image_derivatives.py --force    # 해시가 같아도 모두 다시 생성
+"""
+
+import base64
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+from PIL import Image, ImageOps
+
+from image_encoder import is_preset_available
+
+DERIVATIVE_WIDTHS = sorted({int(w) for w in os.environ.get("DERIVATIVE_WIDTHS", "320,640,960,1280").split(",")
+                            if w.strip()})
+DERIVATIVE_FORMATS = [f.strip() for f in os.environ.get("DERIVATIVE_FORMATS", "avif,webp,jpeg").split(",")
+                      if f.strip()]
+DERIVATIVE_WORKERS = int(os.environ.get("DERIVATIVE_WORKERS", "0") or 0) or (os.cpu_count() or 2)
+
+PLACEHOLDER_WIDTH = 16
+MANIFEST_NAME = "srcset.json"
+
+# 포맷 → (image_encoder 프리셋 이름, MIME, 확장자, 저장 인자) — 웹 썸네일용이라 카드뉴스 저장보다 품질을 낮춤
+WEB_FORMATS = {
+    "avif": ("avif", "image/avif", ".avif", {"quality": 55, "speed": 8}),
+    "webp": ("webp", "image/webp", ".webp", {"quality": 80, "method": 4}),
+    "jpeg": ("jpeg", "image/jpeg", ".jpg", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+# 원본 묶음: (원본 폴더, 파일명 패턴, 파생본 폴더)
+SOURCE_SETS = {
+    "images": ("images", re.compile(r"^course_.+\.(jpe?g|png|webp)$", re.IGNORECASE), os.path.join("images", "derived")),
+    "output": ("output", re.compile(r"^[^.].*\.png$", re.IGNORECASE), os.path.join("output", "web")),
+}
+
+# images 매니페스트를 끼워 넣을 페이지
+DERIVATIVE_PAGES = ["training-courses.html"]
+_PAGE_BLOCK_RE = re.compile(r"(/\* IMAGE_SRCSET:BEGIN \*/).*?(/\* IMAGE_SRCSET:END \*/)", re.DOTALL)
+
+
+def _settings():
+    formats = [f for f in DERIVATIVE_FORMATS if f in WEB_FORMATS and is_preset_available(WEB_FORMATS[f][0])]
+    return {
+        "widths": DERIVATIVE_WIDTHS,
+        "formats": formats,
+        "params": {f: WEB_FORMATS[f][3] for f in formats},
+        "placeholder": PLACEHOLDER_WIDTH,
+    }
+
+
+def _digest(path, settings_key):
+    h = hashlib.sha256(settings_key)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()[:8]
+
+
+def _url(path):
+    return path.replace(os.sep, "/")
+
+
+def _href(path):
+    """srcset용 — 공백·쉼표·괄호가 든 파일명(카드뉴스)도 후보 구분을 깨지 않게 인코딩"""
+    return quote(_url(path), safe="/")
+
+
+def _target_widths(width):
+    """원본 폭 이하의 설정 폭 + (원본이 최대 설정 폭보다 작으면) 원본 폭"""
+    widths = [w for w in DERIVATIVE_WIDTHS if w < width]
+    if not widths or width <= DERIVATIVE_WIDTHS[-1]:
+        widths.append(min(width, DERIVATIVE_WIDTHS[-1]))
+    return widths
+
+
+def _open(path):
+    img = Image.open(path)
+    if img.format in ("JPEG", "MPO"):   # MPO: 휴대폰 사진 (JPEG + 미리보기 프레임)
+        # EXIF 회전 전이라 가로·세로 어느 쪽이 폭이 될지 모름 → 두 변 모두 최대 폭 이상으로
+        target = DERIVATIVE_WIDTHS[-1]
+        img.draft("RGB", (target, target))
+    img = ImageOps.exif_transpose(img)
+    if img.mode not in ("RGB", "RGBA"):
+        img = img.convert("RGBA" if "A" in img.getbands() or "transparency" in img.info else "RGB")
+    return img
+
+
+def _flatten(img):
+    """JPEG용 — 투명 영역을 흰 배경으로"""
+    if img.mode != "RGBA":
+        return img
+    background = Image.new("RGB", img.size, (255, 255, 255))
+    background.paste(img, mask=img.getchannel("A"))
+    return background
+
+
+def _placeholder(img):
+    height = max(1, round(img.height * PLACEHOLDER_WIDTH / img.width))
+    small = _flatten(img).resize((PLACEHOLDER_WIDTH, height), Image.Resampling.BOX)
+    buf = io.BytesIO()
+    small.save(buf, format="WEBP", quality=40)
+    return "data:image/webp;base64," + base64.b64encode(buf.getvalue()).decode("ascii")
+
+
+def derive(src, digest, dest_dir, settings):
+    """
+    원본 1개의 파생본을 모두 만들고 매니페스트 항목을 반환합니다.
+
+    Returns:
+        dict: {hash, width, height, placeholder, srcset: {MIME: srcset 문자열}, fallback, files}
+    """
+    img = _open(src)
+    width, height = img.size
+    stem = os.path.splitext(os.path.basename(src))[0]
+    widths = _target_widths(width)
+
+    resized = {}
+    for w in widths:
+        h = max(1, round(height * w / width))
+        resized[w] = img if w == width else img.resize((w, h), Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+    srcset, files = {}, []
+    fallback = None
+    for fmt in settings["formats"]:
+        _, mime, ext, params = WEB_FORMATS[fmt]
+        candidates = []
+        for w in widths:
+            out = resized[w] if fmt != "jpeg" else _flatten(resized[w])
+            path = os.path.join(dest_dir, f"{stem}.{digest}.{w}w{ext}")
+            out.save(path, format=fmt.upper(), **params)
+            files.append(_url(path))
+            candidates.append(f"{_href(path)} {w}w")
+        srcset[mime] = ", ".join(candidates)
+        # <img src>: 가장 넓게 지원되는 포맷(목록 뒤쪽 = JPEG)의 중간 폭
+        fallback = candidates[len(candidates) // 2].rsplit(" ", 1)[0]
+
+    return {
+        "hash": digest,
+        "width": width,
+        "height": height,
+        "placeholder": _placeholder(img),
+        "srcset": srcset,
+        "fallback": fallback or _href(src),
+        "files": files,
+    }
+
+
+def _load_manifest(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if isinstance(manifest.get("images"), dict):
+            return manifest
+    except (OSError, ValueError, AttributeError):
+        pass
+    return {"settings": None, "images": {}}
+
+
+def _is_current(entry, digest):
+    return (entry and entry.get("hash") == digest
+            and all(os.path.exists(p) for p in entry.get("files", [])))
+
+
+def build(set_name, force=False):
+    """
+    원본 묶음 1개의 파생본을 갱신합니다.
+
+    Returns:
+        dict: 매니페스트 ({"settings", "images"})
+    """
+    src_dir, pattern, dest_dir = SOURCE_SETS[set_name]
+    settings = _settings()
+    settings_key = json.dumps(settings, sort_keys=True).encode("utf-8")
+    manifest_path = os.path.join(dest_dir, MANIFEST_NAME)
+    manifest = _load_manifest(manifest_path)
+    os.makedirs(dest_dir, exist_ok=True)
+
+    sources = []
+    if os.path.isdir(src_dir):
+        with os.scandir(src_dir) as it:
+            sources = sorted(_url(de.path) for de in it if de.is_file() and pattern.match(de.name))
+
+    t0 = time.perf_counter()
+    images, todo = {}, []
+    for src in sources:
+        digest = _digest(src, settings_key)
+        entry = manifest["images"].get(src)
+        if not force and _is_current(entry, digest):
+            images[src] = entry
+        else:
+            todo.append((src, digest))
+
+    failed = []
+    if todo:
+        with ThreadPoolExecutor(max_workers=DERIVATIVE_WORKERS) as pool:
+            futures = [(src, pool.submit(derive, src, digest, dest_dir, settings)) for src, digest in todo]
+            for src, fut in futures:
+                try:
+                    images[src] = fut.result()
+                except (OSError, ValueError, Image.DecompressionBombError) as e:
+                    failed.append((src, e))
+    for src, e in failed:
+        print(f"  ❌ 파생본 생성 실패: {src} ({e})")
+
+    # 어떤 항목도 가리키지 않는 파생본 정리 (원본 삭제·변경, 폭·포맷 설정 변경)
+    keep = {os.path.normpath(p) for entry in images.values() for p in entry["files"]}
+    removed = 0
+    with os.scandir(dest_dir) as it:
+        for de in it:
+            if de.is_file() and de.name != MANIFEST_NAME and os.path.normpath(de.path) not in keep:
+                os.remove(de.path)
+                removed += 1
+
+    manifest = {"settings": settings, "images": dict(sorted(images.items()))}
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+    elapsed = time.perf_counter() - t0
+    print(f"  🖼️  {src_dir}/ → {dest_dir}/: 원본 {len(sources)}개, 새로 생성 {len(todo) - len(failed)}개, "
+          f"건너뜀 {len(sources) - len(todo)}개, 오래된 파생본 {removed}개 삭제 ({elapsed:.1f}초)")
+    return manifest
+
+
+def drop_sources(set_name, sources):
+    """지워진 원본의 파생본·매니페스트 항목 제거 (cleanup_expired에서 호출) → 삭제한 파일 수"""
+    dest_dir = SOURCE_SETS[set_name][2]
+    manifest_path = os.path.join(dest_dir, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        return 0
+    manifest = _load_manifest(manifest_path)
+    removed = 0
+    for src in sources:
+        entry = manifest["images"].pop(_url(src), None)
+        for path in (entry or {}).get("files", []):
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+    if removed:
+        tmp_path = manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, manifest_path)
+    return removed
+
+
+def page_srcset(manifest):
+    """페이지용 매니페스트 — 파일 목록·해시 제외"""
+    return {src: {key: entry[key] for key in ("width", "height", "placeholder", "srcset", "fallback")}
+            for src, entry in manifest["images"].items()}
+
+
+def update_pages(manifest, pages=None):
+    """페이지의 IMAGE_SRCSET 구간을 매니페스트로 교체 (구간이 없는 페이지는 그대로)"""
+    data = json.dumps(page_srcset(manifest), ensure_ascii=False, separators=(",", ":"))
+    for page in pages or DERIVATIVE_PAGES:
+        try:
+            with open(page, "r", encoding="utf-8") as f:
+                html = f.read()
+        except OSError:
+            continue
+        new_html, n = _PAGE_BLOCK_RE.subn(lambda m: f"{m.group(1)}{data}{m.group(2)}", html, count=1)
+        if n and new_html != html:
+            with open(page, "w", encoding="utf-8") as f:
+                f.write(new_html)
+            print(f"  📝 {page}: srcset 데이터 갱신")
+
+
+if __name__ == "__main__":
+    force = "--force" in sys.argv
+    update_pages(build("images", force=force))
+    if "--output" in sys.argv:
+        build("output", force=force)
@@ -0,0 +1,186 @@
+"""
+카드뉴스 이미지 인코더 설정 - v1/v2 공용 저장 레이어
+
+배경: 슬라이드를 img.save(output_path, quality=95)로 저장해 왔는데, PNG에는
+quality 인자가 무시되므로 압축 설정 없이 큰 PNG가 output/에 쌓였습니다.
+→ 프리셋 단위로 PNG compress_level/optimize, 팔레트 양자화(v1 단색 슬라이드),
+  WebP/AVIF/JPEG 변형 파일을 설정하고, 인코딩은 스레드 풀에서 병렬로 처리합니다.
+
+설정 (환경변수):
+  CARDNEWS_ENCODER   기본 파일 프리셋, PNG 계열만 (기본: png)
+  CARDNEWS_VARIANTS  함께 저장할 변형 프리셋, 쉼표 구분 (예: "webp,avif")
+  CARDNEWS_ENCODE_WORKERS  인코딩 스레드 수 (기본: 3 = 슬라이드 수)
+
+프리셋별 용량/시간 비교: python scripts/bench_encoder.py
+"""
+
+import io
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from PIL import Image, features
+
+# ── 인코더 프리셋 ──
+# ext: 변형 파일 확장자 / quantize: 팔레트 색 수 (flat 슬라이드에만 적용)
+ENCODER_PRESETS = {
+    "png": {"format": "PNG", "ext": ".png", "params": {"compress_level": 6}},
+    "png_fast": {"format": "PNG", "ext": ".png", "params": {"compress_level": 1}},
+    "png_max": {"format": "PNG", "ext": ".png", "params": {"compress_level": 9, "optimize": True}},
+    "png_pal": {"format": "PNG", "ext": ".png", "params": {"compress_level": 9}, "quantize": 256},
+    "webp": {"format": "WEBP", "ext": ".webp", "params": {"quality": 90, "method": 4}},
+    "webp_lossless": {"format": "WEBP", "ext": ".webp", "params": {"lossless": True, "method": 4}},
+    "avif": {"format": "AVIF", "ext": ".avif", "params": {"quality": 70, "speed": 6}},
+    "jpeg": {"format": "JPEG", "ext": ".jpg", "params": {"quality": 90, "optimize": True, "progressive": True}},
+}
+
+DEFAULT_PRESET = os.environ.get("CARDNEWS_ENCODER", "png")
+VARIANT_PRESETS = [p.strip() for p in os.environ.get("CARDNEWS_VARIANTS", "").split(",") if p.strip()]
+ENCODE_WORKERS = int(os.environ.get("CARDNEWS_ENCODE_WORKERS", "3") or 3)
+
+# 포맷별 Pillow 지원 여부 (AVIF는 libavif 빌드에만 존재)
+_FORMAT_FEATURES = {"WEBP": "webp", "AVIF": "avif"}
+
+
+def is_preset_available(name):
+    """현재 Pillow 빌드에서 프리셋 포맷을 인코딩할 수 있는지 확인"""
+    preset = ENCODER_PRESETS.get(name)
+    if preset is None:
+        return False
+    feature = _FORMAT_FEATURES.get(preset["format"])
+    if feature is None:
+        return True
+    try:
+        return bool(features.check(feature))
+    except ValueError:
+        return False
+
+
+def _prepare(img, preset, flat):
+    """프리셋에 맞게 모드 변환 / 팔레트 양자화"""
+    if preset.get("quantize") and flat:
+        # 단색 위주 v1 슬라이드: 256색 팔레트로도 텍스트 안티앨리어싱이 유지됨
+        return img.quantize(colors=preset["quantize"],
+                            method=Image.Quantize.FASTOCTREE,
+                            dither=Image.Dither.NONE)
+    if preset["format"] == "JPEG" and img.mode != "RGB":
+        return img.convert("RGB")
+    return img
+
+
+def encode_image(img, preset_name, flat=False):
+    """프리셋으로 인코딩한 bytes 반환 (벤치마크·캐시용)"""
+    preset = ENCODER_PRESETS[preset_name]
+    buf = io.BytesIO()
+    _prepare(img, preset, flat).save(buf, format=preset["format"], **preset["params"])
+    return buf.getvalue()
+
+
+def variant_path(output_path, preset_name):
+    """기본 경로(…_1_cover.png)에 대응하는 변형 파일 경로 (…_1_cover.webp)"""
+    base, _ = os.path.splitext(output_path)
+    return base + ENCODER_PRESETS[preset_name]["ext"]
+
+
+def variant_paths(output_path):
+    """설정된 변형 프리셋 중 실제로 저장된 파일 경로 목록"""
+    paths = []
+    for name in VARIANT_PRESETS:
+        if name in ENCODER_PRESETS:
+            p = variant_path(output_path, name)
+            if p != output_path and os.path.exists(p):
+                paths.append(p)
+    return paths
+
+
+def _write(img, output_path, preset_name, flat):
+    preset = ENCODER_PRESETS[preset_name]
+    _prepare(img, preset, flat).save(output_path, format=preset["format"], **preset["params"])
+
+
+def _encode_all(img, output_path, preset_name, variants, flat):
+    """기본 파일 + 변형 파일 저장 (풀 워커에서 실행)"""
+    _write(img, output_path, preset_name, flat)
+    for name in variants:
+        if name not in ENCODER_PRESETS:
+            print(f"  ⚠️ 알 수 없는 인코더 프리셋: {name}")
+            continue
+        if not is_preset_available(name):
+            print(f"  ⚠️ {name} 인코딩 미지원 (Pillow 빌드 확인) — 건너뜀")
+            continue
+        path = variant_path(output_path, name)
+        if path == output_path:
+            continue
+        _write(img, path, name, flat)
+    return output_path
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 인코딩 워커 풀
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Pillow는 zlib/libwebp 인코딩 중 GIL을 해제하므로 스레드 풀로 충분합니다.
+# encoding_pool() 블록 안에서 저장하면 다음 슬라이드 렌더링과 인코딩이 겹칩니다.
+# 블록 밖에서 호출하면 기존처럼 즉시(동기) 저장합니다.
+
+_pool_lock = threading.Lock()
+_pool = None
+_pool_depth = 0
+_pending = []
+
+
+@contextmanager
+def encoding_pool(workers=None):
+    """슬라이드 인코딩을 병렬화하는 블록. 블록 종료 시 모든 저장 완료를 보장.
+
+    중첩 호출(v2 → v1 generate_slide_howto)은 바깥 풀을 그대로 공유합니다.
+    """
+    global _pool, _pool_depth, _pending
+    with _pool_lock:
+        if _pool_depth == 0:
+            _pool = ThreadPoolExecutor(max_workers=workers or ENCODE_WORKERS)
+            _pending = []
+        _pool_depth += 1
+    try:
+        yield
+    finally:
+        # 바깥 블록 종료: 풀·대기 목록을 잠금 안에서 떼어 내고 완료 대기는 잠금 밖에서
+        pool = futures = None
+        with _pool_lock:
+            _pool_depth -= 1
+            if _pool_depth == 0:
+                pool, futures = _pool, _pending
+                _pool, _pending = None, []
+        if pool is not None:
+            errors = []
+            for fut in futures:
+                try:
+                    fut.result()
+                except Exception as e:
+                    errors.append(e)
+            pool.shutdown(wait=True)
+            if errors:
+                raise errors[0]
+
+
+def save_slide(img, output_path, preset=None, variants=None, flat=False):
+    """슬라이드 이미지 저장 (기본 프리셋 + 변형 프리셋)
+
+    Args:
+        preset: 기본 파일 프리셋 (None이면 CARDNEWS_ENCODER)
+        variants: 변형 프리셋 목록 (None이면 CARDNEWS_VARIANTS)
+        flat: 단색 위주 슬라이드 여부 — True일 때만 팔레트 양자화 적용
+    """
+    preset = preset or DEFAULT_PRESET
+    if ENCODER_PRESETS.get(preset, {}).get("format") != "PNG":
+        # 기본 파일은 파이프라인·게시 가이드가 .png로 참조하므로 PNG 계열만 허용
+        print(f"  ⚠️ 기본 파일에 쓸 수 없는 인코더 프리셋 '{preset}' → png 사용")
+        preset = "png"
+    variants = VARIANT_PRESETS if variants is None else variants
+
+    with _pool_lock:
+        if _pool is not None:
+            # 슬라이드 함수는 저장 직후 반환하므로 img를 더 수정하지 않음
+            _pending.append(_pool.submit(_encode_all, img, output_path, preset, variants, flat))
+            return output_path
+    return _encode_all(img, output_path, preset, variants, flat)
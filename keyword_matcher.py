@@ -0,0 +1,119 @@
+"""
+다중 키워드 매처 (import 시 1회 컴파일 → 텍스트 1회 스캔으로 전체 매칭)
+
+배경: 키워드 매칭이 모듈마다 따로 돌았습니다.
+  · summarize_training_goal: 호출마다 패턴 30여 개를 하나씩 re.search
+  · detect_course_field: 분야 × 키워드 이중 루프로 대문자 변환·부분 문자열 검사
+  · extract_seo_keywords: KEYWORD_MAP 트리거마다 title.upper() 재계산
+  · fetch_images._get_field_visual_guide: 플래그마다 any(k in haystack ...) 반복
+  과정 하나를 처리할 때 같은 제목·훈련목표를 수백 번 다시 훑은 셈.
+
+→ compile_keywords()가 키워드 전체를 하나의 정규식으로 묶어 컴파일합니다.
+  · 공통 접두사를 트리로 묶은 교대(alternation) — 위치마다 트리 한 갈래만 따라감 (Aho-Corasick 대용)
+  · (?=(...)) 전방탐색이라 위치마다 매칭을 시도하고 문자를 소비하지 않음 → 겹친 키워드도 탐지
+  · 같은 위치에서는 가장 긴 키워드가 잡히므로, 키워드마다 '포함된 더 짧은 키워드' 목록을
+    미리 계산해 함께 복원 ("드론정비" 매칭 → "드론"·"정비"도 매칭)
+  · 결과는 (priority, group, label) 목록 — 우선순위 규칙은 호출하는 쪽이 priority로 표현
+
+키워드 표기: 공백 1칸은 '공백 있음/없음' 둘 다 허용 (정규식 \\s* 대응, expand_spaces).
+"""
+
+import re
+
+
+def _identity(text):
+    return text
+
+
+def expand_spaces(keyword):
+    """공백마다 있음/없음 두 변형 ("영상 편집" → "영상 편집", "영상편집")"""
+    parts = keyword.split(" ")
+    variants = [parts[0]]
+    for part in parts[1:]:
+        variants = [v + sep + part for v in variants for sep in (" ", "")]
+    return variants
+
+
+def _trie_pattern(keywords):
+    """키워드 목록 → 공통 접두사를 묶은 정규식 (위치마다 트리를 한 갈래로만 내려감)
+
+    한 위치에서 시작하는 키워드들은 모두 트리의 한 경로 위에 있으므로,
+    탐욕적 ?로 더 깊은 노드를 먼저 시도하면 그 위치의 가장 긴 키워드가 잡힙니다.
+    """
+    trie = {}
+    for kw in keywords:
+        node = trie
+        for ch in kw:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node):
+        alts = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:%s)" % "|".join(alts)
+        return "(?:%s)?" % body if "" in node else body
+
+    return build(trie)
+
+
+def compile_keywords(entries, fold=None):
+    """
+    Args:
+        entries: (keyword, group, label, priority) 목록
+        fold: 키워드와 검사 텍스트에 똑같이 적용할 정규화 함수 (예: str.lower)
+    Returns:
+        dict: 매처 (keyword_hits 등에 전달)
+    """
+    fold = fold or _identity
+    table = {}
+    for keyword, group, label, priority in entries:
+        kw = fold(keyword)
+        if kw:
+            table.setdefault(kw, []).append((priority, group, label))
+
+    keywords = sorted(table)
+    return {
+        "fold": fold,
+        "table": table,
+        # 키워드 → 그 안에 포함된 키워드(자기 자신 포함)
+        "contained": {kw: tuple(k for k in keywords if k in kw) for kw in keywords},
+        "regex": re.compile("(?=(%s))" % _trie_pattern(keywords)) if keywords else None,
+    }
+
+
+def matched_keywords(matcher, text):
+    """텍스트에 등장하는 (정규화된) 키워드 집합"""
+    found = set()
+    if not text or matcher["regex"] is None:
+        return found
+    contained = matcher["contained"]
+    for m in matcher["regex"].finditer(matcher["fold"](text)):
+        kw = m.group(1)
+        if kw not in found:
+            found.update(contained[kw])
+    return found
+
+
+def keyword_hits(matcher, text):
+    """
+    Returns:
+        list: (priority, group, label) — priority 오름차순, 중복 없음
+    """
+    table = matcher["table"]
+    hits = set()
+    for kw in matched_keywords(matcher, text):
+        hits.update(table[kw])
+    return sorted(hits)
+
+
+def matched_groups(matcher, text):
+    """매칭된 group 집합"""
+    table = matcher["table"]
+    return {group for kw in matched_keywords(matcher, text) for _, group, _ in table[kw]}
+
+
+def first_hit(matcher, text):
+    """priority가 가장 높은(값이 작은) 매칭 1건, 없으면 None"""
+    hits = keyword_hits(matcher, text)
+    return hits[0] if hits else None
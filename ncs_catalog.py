@@ -0,0 +1,78 @@
+"""
+NCS 직무분류 카탈로그 (대·중·소·세분류 → 2자리 단위 접두사 트리)
+
+배경: NCS 분야 감지가 seo_helper의 수작업 dict 3개(NCS_CODE_EXACT·NCS_FIELD_MAP·
+NCS_SUB_KEYWORDS)를 8/6/4/2자리 접두사로 하나씩 조회했습니다.
+dict에 없는 코드는 분류명조차 알 수 없어 전부 제목 키워드 폴백으로 넘어간 셈.
+
+→ 로컬 분류표(data/ncs_classification.csv)를 읽어 접두사 트리로 컴파일합니다.
+  · NCS 코드는 2자리씩 대(2)·중(4)·소(6)·세분류(8) → 트리 한 단계 = 2자리
+  · 조회는 코드를 앞에서부터 2자리씩 1회 따라 내려감 (최대 4단계, 길이에 비례)
+  · 노드는 dict — 분류명(name) 외에 호출하는 쪽이 필드를 얹어 씀 (수작업 보정 등)
+
+분류표 형식: code,name 두 열 CSV (UTF-8, '#'으로 시작하는 줄은 주석)
+  저장소에는 대분류 전체와 기존 보정 dict가 다루던 코드만 들어 있습니다.
+  전체 분류표는 NCS 누리집(ncs.go.kr)의 분류체계 자료를 같은 두 열로 저장해 교체하세요.
+
+설정:
+  NCS_CATALOG_FILE   분류표 경로 (기본: data/ncs_classification.csv)
+"""
+
+import csv
+import os
+
+NCS_CATALOG_FILE = (os.environ.get("NCS_CATALOG_FILE")
+                    or os.path.join(os.path.dirname(__file__), "data", "ncs_classification.csv"))
+
+NCS_LEVELS = (2, 4, 6, 8)   # 대·중·소·세분류 코드 길이
+
+
+def load_catalog(path=None):
+    """분류표 CSV → {code: name} (파일이 없으면 빈 dict)"""
+    path = path or NCS_CATALOG_FILE
+    catalog = {}
+    if not os.path.exists(path):
+        return catalog
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        rows = csv.reader(line for line in f if line.strip() and not line.startswith("#"))
+        for row in rows:
+            if len(row) < 2:
+                continue
+            code, name = row[0].strip(), row[1].strip()
+            if code.isdigit() and len(code) in NCS_LEVELS and name:
+                catalog[code] = name
+    return catalog
+
+
+def new_trie():
+    return {"children": {}}
+
+
+def insert(trie, code, **fields):
+    """코드 경로의 노드를 만들고(없으면) fields를 덮어씀 → 해당 노드"""
+    node = trie
+    for i in range(0, len(code), 2):
+        node = node["children"].setdefault(code[i:i + 2], {"children": {}})
+    node.update(fields)
+    return node
+
+
+def walk(trie, code):
+    """코드를 2자리씩 따라 내려가며 지나는 노드 목록 (대분류 → 가장 깊은 노드)"""
+    path = []
+    node = trie
+    for i in range(0, len(code) - 1, 2):
+        node = node["children"].get(code[i:i + 2])
+        if node is None:
+            break
+        path.append(node)
+    return path
+
+
+def build_trie(catalog):
+    """{code: name} → 접두사 트리 (노드마다 name)"""
+    trie = new_trie()
+    # 상위 분류부터 넣어야 하위 코드가 상위 노드를 덮어쓰지 않음 (길이순 정렬)
+    for code in sorted(catalog, key=lambda c: (len(c), c)):
+        insert(trie, code, name=catalog[code])
+    return trie
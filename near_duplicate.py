@@ -0,0 +1,317 @@
+"""
+생성 글 유사문서 색인 (MinHash + LSH 밴딩)
+
+배경: 네이버 유사문서 필터는 서로 비슷한 글을 저품질로 묶는데, 지금까지의 방어는
+get_varied_section_title·get_varied_closing·도입부 훅을 무작위로 바꾸는 것뿐이었습니다.
+새 글이 이미 발행된 글과 얼마나 겹치는지는 아무도 측정하지 않은 셈.
+(글이 수천 개로 쌓이면 새 글 1건을 전체와 쌍으로 비교하는 방식은 감당이 안 됨)
+
+→ *_blog_naver.txt·*_instagram_caption.txt를 MinHash 서명으로 색인해 두고,
+  새 글은 LSH 밴딩으로 후보만 골라 비교합니다 (전체 비교 없음).
+  · 특징: [태그]·공백을 정리한 본문의 4글자 shingle 집합 — 서명 일치율 ≈ Jaccard 유사도
+  · 서명: one-permutation MinHash (shingle마다 해시 1회 → 칸 번호 + 칸별 최솟값,
+    빈 칸은 오른쪽 칸 값으로 채움) — 순열 126개를 따로 돌리는 것보다 수십 배 빠름
+  · LSH: 서명을 밴드(기본 21개 × 6칸)로 나눠 밴드 값이 같은 글만 후보
+    → 유사도 0.7인 글은 약 93% 확률로 후보가 되고, 0.35 안팎(같은 템플릿의 다른 과정)은 약 5%
+  · 후보는 서명 일치율로 다시 걸러 NEAR_DUP_THRESHOLD 이상만 보고
+  · 파일이 지워진 항목(cleanup_expired 등)은 비교에서 건너뛰고, 색인을 저장할 때 뺌
+    (조회는 색인을 바꾸지 않음)
+
+색인 파일: {출력 폴더}/.near_duplicate_index.json (워크플로가 output/과 함께 커밋)
+  {"version", "bands", "rows", "shingle", "docs": {문서 ID(파일명): {kind, path, sig, indexed_at}}}
+  밴드·칸·shingle 설정이 바뀌면 이전 서명과 비교할 수 없으므로 빈 색인으로 시작합니다
+  (python near_duplicate.py --rebuild 로 output 폴더 전체를 다시 색인).
+
+설정 (환경변수):
+  NEAR_DUP_INDEX_FILE   색인 파일 경로 (기본: 출력 폴더의 .near_duplicate_index.json)
+  NEAR_DUP_THRESHOLD    경고 기준 유사도 (기본: 0.7)
+  NEAR_DUP_REROLLS      유사 글 발견 시 가변 섹션 재생성 횟수 (기본: 0 = 경고만)
+
+사용법:
+  python near_duplicate.py --rebuild [output]   # 폴더의 블로그·캡션 전체 재색인
+  python near_duplicate.py --check FILE         # 파일 1개와 비슷한 색인 글 출력
+"""
+
+import base64
+import hashlib
+import json
+import os
+import re
+import sys
+from array import array
+from datetime import datetime
+
+NEAR_DUP_INDEX_FILE = os.environ.get("NEAR_DUP_INDEX_FILE", "")
+NEAR_DUP_THRESHOLD = float(os.environ.get("NEAR_DUP_THRESHOLD", "0.7") or 0.7)
+NEAR_DUP_REROLLS = int(os.environ.get("NEAR_DUP_REROLLS", "0") or 0)
+
+INDEX_VERSION = 1
+LSH_BANDS = 21
+LSH_ROWS = 6
+NUM_BINS = LSH_BANDS * LSH_ROWS
+SHINGLE = 4
+
+# 색인 대상 파일 → 종류 (같은 종류끼리만 비교)
+KIND_SUFFIXES = {
+    "_blog_naver.txt": "blog",
+    "_instagram_caption.txt": "caption",
+}
+
+# 블로그 파일은 작업 가이드 뒤에 본문이 옴 (generate_blog의 작업 가이드 마지막 줄)
+_BODY_MARKER = "===== 여기부터 본문 ====="
+_MARK_RE = re.compile(r"\[.*?\]")
+_SPACE_RE = re.compile(r"\s+")
+_EMPTY = (1 << 64) - 1
+
+_loaded = {}   # 색인 파일 경로 → 메모리 색인 (실행 중 과정마다 다시 읽지 않음)
+
+
+def index_file(output_dir="output"):
+    return NEAR_DUP_INDEX_FILE or os.path.join(output_dir, ".near_duplicate_index.json")
+
+
+def kind_of(path):
+    """파일명 → 색인 종류 (대상이 아니면 None)"""
+    for suffix, kind in KIND_SUFFIXES.items():
+        if path.endswith(suffix):
+            return kind
+    return None
+
+
+def _body(text):
+    """작업 가이드를 떼고 본문만 (마커가 없으면 전체)"""
+    i = text.rfind(_BODY_MARKER)   # 작업 가이드 안내문에도 같은 문구가 있어 마지막 것을 씀
+    if i < 0:
+        return text
+    return text[i + len(_BODY_MARKER):].lstrip("\n=")   # 마커 다음 구분선 줄까지 건너뜀
+
+
+def _shingles(text):
+    text = _SPACE_RE.sub(" ", _MARK_RE.sub("", _body(text))).strip()
+    if len(text) <= SHINGLE:
+        return {text} if text else set()
+    return {text[i:i + SHINGLE] for i in range(len(text) - SHINGLE + 1)}
+
+
+def minhash(text):
+    """텍스트 → MinHash 서명 (NUM_BINS개 정수, 빈 텍스트는 None)"""
+    sig = [_EMPTY] * NUM_BINS
+    for sh in _shingles(text):
+        h = int.from_bytes(hashlib.blake2b(sh.encode("utf-8"), digest_size=8).digest(), "little")
+        b = h % NUM_BINS
+        v = h // NUM_BINS
+        if v < sig[b]:
+            sig[b] = v
+    if all(v == _EMPTY for v in sig):
+        return None
+    # 빈 칸 채우기 (densification): 오른쪽으로 가장 가까운 칸 값 + 거리만큼 구분값
+    for b in range(NUM_BINS):
+        if sig[b] == _EMPTY:
+            step = 1
+            while sig[(b + step) % NUM_BINS] == _EMPTY:
+                step += 1
+            sig[b] = (sig[(b + step) % NUM_BINS] + step * 0x9E3779B97F4A7C15) & (_EMPTY >> 1)
+    return sig
+
+
+def similarity(sig_a, sig_b):
+    """서명 일치율 (Jaccard 유사도 추정치)"""
+    return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / NUM_BINS
+
+
+def _band_keys(kind, sig):
+    return [(kind, i, tuple(sig[i * LSH_ROWS:(i + 1) * LSH_ROWS])) for i in range(LSH_BANDS)]
+
+
+def _encode(sig):
+    return base64.b64encode(array("Q", sig).tobytes()).decode("ascii")
+
+
+def _decode(text):
+    sig = array("Q")
+    sig.frombytes(base64.b64decode(text))
+    return list(sig)
+
+
+# ── 색인 (메모리: 문서 + 밴드 버킷) ──
+
+def new_index(path=None):
+    return {"path": path, "docs": {}, "sigs": {}, "buckets": {}, "dirty": False}
+
+
+def _add(index, doc_id, kind, path, sig, indexed_at):
+    remove_document(index, doc_id)
+    index["docs"][doc_id] = {"kind": kind, "path": path, "indexed_at": indexed_at}
+    index["sigs"][doc_id] = sig
+    for key in _band_keys(kind, sig):
+        index["buckets"].setdefault(key, set()).add(doc_id)
+
+
+def remove_document(index, doc_id):
+    doc = index["docs"].pop(doc_id, None)
+    if doc is None:
+        return
+    sig = index["sigs"].pop(doc_id)
+    for key in _band_keys(doc["kind"], sig):
+        bucket = index["buckets"].get(key)
+        if bucket:
+            bucket.discard(doc_id)
+            if not bucket:
+                del index["buckets"][key]
+    index["dirty"] = True
+
+
+def get_index(output_dir="output"):
+    """출력 폴더의 색인 (실행 중 1회만 로드, 색인 파일이 없으면 폴더의 기존 글로 새로 만듦)"""
+    path = index_file(output_dir)
+    if path not in _loaded:
+        if os.path.exists(path):
+            _loaded[path] = load_index(path)
+        else:
+            _loaded[path] = _scan(new_index(path), output_dir)
+            if _loaded[path]["docs"]:
+                print(f"  🧬 유사문서 색인 생성: 기존 글 {len(_loaded[path]['docs'])}건")
+    return _loaded[path]
+
+
+def load_index(path=None):
+    """색인 파일 로드 (없거나 손상·설정 변경 시 빈 색인)"""
+    path = path or index_file()
+    index = new_index(path)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return index
+    params = (data.get("version"), data.get("bands"), data.get("rows"), data.get("shingle"))
+    if params != (INDEX_VERSION, LSH_BANDS, LSH_ROWS, SHINGLE):
+        print("  ⚠️ 유사문서 색인 설정이 바뀌어 빈 색인으로 시작합니다 "
+              "(python near_duplicate.py --rebuild 로 재색인)")
+        return index
+    for doc_id, doc in data.get("docs", {}).items():
+        try:
+            sig = _decode(doc["sig"])
+        except (KeyError, ValueError, TypeError):
+            continue
+        if len(sig) == NUM_BINS:
+            _add(index, doc_id, doc.get("kind"), doc.get("path"), sig, doc.get("indexed_at"))
+    index["dirty"] = False
+    return index
+
+
+def prune_missing(index):
+    """파일이 지워진 글(만료 정리 등)을 색인에서 뺌 → 뺀 건수"""
+    missing = [doc_id for doc_id, doc in index["docs"].items()
+               if doc["path"] and not os.path.exists(doc["path"])]
+    for doc_id in missing:
+        remove_document(index, doc_id)
+    return len(missing)
+
+
+def save_index(index, path=None):
+    """지워진 글을 정리하고, 변경이 있을 때만 저장 (임시 파일 → os.replace)"""
+    prune_missing(index)
+    if not index["dirty"]:
+        return
+    path = path or index["path"] or index_file()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    docs = {
+        doc_id: dict(doc, sig=_encode(index["sigs"][doc_id]))
+        for doc_id, doc in sorted(index["docs"].items())
+    }
+    data = {"version": INDEX_VERSION, "bands": LSH_BANDS, "rows": LSH_ROWS,
+            "shingle": SHINGLE, "docs": docs}
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+    index["dirty"] = False
+
+
+def add_document(index, path, text, kind=None):
+    """파일(경로·내용)을 색인에 추가/갱신 — 문서 ID는 파일명"""
+    kind = kind or kind_of(path)
+    sig = minhash(text)
+    if not kind or sig is None:
+        return
+    _add(index, os.path.basename(path), kind, path, sig, datetime.now().isoformat(timespec="seconds"))
+    index["dirty"] = True
+
+
+def find_similar(index, text, kind, exclude=None, threshold=None):
+    """
+    색인에서 text와 비슷한 같은 종류의 글을 찾습니다.
+
+    Args:
+        exclude: 제외할 문서 ID (같은 과정을 다시 생성하는 경우 자기 자신)
+    Returns:
+        list: [(문서 ID, 유사도)] 유사도 내림차순, threshold 이상만
+    """
+    threshold = NEAR_DUP_THRESHOLD if threshold is None else threshold
+    sig = minhash(text)
+    if sig is None:
+        return []
+    candidates = set()
+    for key in _band_keys(kind, sig):
+        candidates |= index["buckets"].get(key, set())
+    candidates.discard(exclude)
+
+    found = []
+    for doc_id in candidates:
+        path = index["docs"][doc_id]["path"]
+        if path and not os.path.exists(path):
+            continue   # 만료 정리 등으로 지워진 글 — 색인 정리는 save_index에서
+        score = similarity(sig, index["sigs"][doc_id])
+        if score >= threshold:
+            found.append((doc_id, score))
+    found.sort(key=lambda item: -item[1])
+    return found
+
+
+def similarity_report(matches, kind_label):
+    """작업 가이드용 한 줄 리포트"""
+    if not matches:
+        return f"  ✅ {kind_label}: 기존 글과 유사도 {NEAR_DUP_THRESHOLD:.0%} 이상 없음"
+    lines = [f"  ⚠️ {kind_label}: 기존 글 {len(matches)}건과 비슷합니다 (유사도 {NEAR_DUP_THRESHOLD:.0%} 이상)"]
+    for doc_id, score in matches[:3]:
+        lines.append(f"     · {score:.0%}  {doc_id}")
+    lines.append("     → 도입부·추천 대상·마무리를 본인 경험 위주로 더 많이 고쳐 쓰세요.")
+    return "\n".join(lines)
+
+
+def _scan(index, output_dir):
+    """폴더의 블로그·캡션 파일을 모두 색인에 추가"""
+    names = sorted(os.listdir(output_dir)) if os.path.isdir(output_dir) else []
+    for name in names:
+        if kind_of(name):
+            file_path = os.path.join(output_dir, name)
+            with open(file_path, "r", encoding="utf-8") as f:
+                add_document(index, file_path, f.read())
+    return index
+
+
+def rebuild(output_dir="output", path=None):
+    """폴더의 블로그·캡션 파일 전체로 색인을 새로 만듭니다 → 색인 건수"""
+    path = path or index_file(output_dir)
+    index = _scan(new_index(path), output_dir)
+    index["dirty"] = True
+    save_index(index)
+    _loaded[path] = index
+    return len(index["docs"])
+
+
+if __name__ == "__main__":
+    if "--rebuild" in sys.argv:
+        i = sys.argv.index("--rebuild")
+        target = sys.argv[i + 1] if len(sys.argv) > i + 1 else "output"
+        n = rebuild(target)
+        print(f"  ✅ 유사문서 색인 재생성: {n}건 → {index_file(target)}")
+    elif "--check" in sys.argv:
+        file_path = sys.argv[sys.argv.index("--check") + 1]
+        with open(file_path, "r", encoding="utf-8") as f:
+            text = f.read()
+        kind = kind_of(file_path) or "blog"
+        matches = find_similar(get_index(os.path.dirname(file_path) or "."), text, kind, exclude=os.path.basename(file_path))
+        print(similarity_report(matches, os.path.basename(file_path)))
+    else:
+        print(__doc__)
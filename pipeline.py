@@ -4,12 +4,15 @@
 사용법:
   python pipeline.py                    # 전체 실행 (API 호출 + 콘텐츠 생성)
   python pipeline.py --json data.json   # JSON 파일에서 데이터 로드
+  python pipeline.py --no-image-cache   # Grok 배경 이미지 캐시 사용 안 함
+  python pipeline.py --reels            # 카드뉴스 3장으로 세로 릴스 클립(WebP/MP4)도 생성
+  python pipeline.py --reroll           # 이번 실행에서 생성하는 과정의 훅·해시태그·소제목을 다시 뽑기
 
 v3 개선사항 (스마트에디터 최적화):
 - 블로그 포스트: 네이버 스마트에디터 복사-붙여넣기 최적화 텍스트 (.txt)
 - 마크다운/HTML 출력 제거 → 에디터 작업 가이드 포함 단일 텍스트
 - 인스타그램: 캡션 + 해시태그(20개) 자동 생성
-- 릴스: 별도 수동 제작 (파이프라인 미포함)
+- 릴스: --reels 지정 시 카드뉴스 슬라이드로 세로 클립 자동 생성 (reels_renderer)
 - 게시 가이드: 타이밍, 시리즈 전략, 체크리스트
 """
 
@@ -19,7 +22,9 @@ import sys
 from datetime import datetime
 
 from generate_cardnews import generate_cardnews
+from course_context import content_fingerprint
 from generate_blog import generate_blog_post
+from image_encoder import variant_paths
 
 # v2 카드뉴스 (이미지 배경) 사용 가능 여부 확인
 try:
@@ -31,6 +36,7 @@ except ImportError:
 # ── 설정 ──
 OUTPUT_DIR = "output"
 PROCESSED_FILE = "output/.processed_courses.json"
+RENDER_REELS = False  # --reels
 
 
 def load_processed_ids():
@@ -597,20 +603,28 @@ def parse_api_course(api_item):
         return None
 
 
-def generate_content_for_course(course, output_dir):
-    """단일 과정에 대해 카드뉴스 + 블로그 + 인스타 캡션 + 게시 가이드를 생성"""
+def generate_content_for_course(course, output_dir, background=None, reuse_texts=None):
+    """단일 과정에 대해 카드뉴스 + 블로그 + 인스타 캡션 + 게시 가이드를 생성
+
+    background: run_pipeline이 준비한 (배경 이미지, credit) (없으면 v2 내부에서 생성)
+    reuse_texts: 이전 처리 기록의 files — 과정 입력이 그대로라 텍스트가 같은 바이트로 나올 때
+                 블로그·캡션·가이드를 다시 만들지 않고 그대로 씀 (카드뉴스만 재생성하는 경우)
+    분야·유형·훈련목표 키워드 등은 CourseContext로 1회 계산해 모든 생성기에 전달
+    """
+    from course_context import CourseContext
     print(f"\n{'─' * 50}")
     print(f"  📌 {course['title']}")
     if course.get("period"):
         print(f"  📅 ({course['period']})")
     print(f"{'─' * 50}")
+    ctx = CourseContext(course)
 
     # 카드뉴스 생성 (Grok API 키가 있으면 v2, 없으면 v1)
     use_v2 = HAS_V2 and os.environ.get("XAI_API_KEY", "")
     if use_v2:
-        cardnews_paths = generate_cardnews_v2(course, output_dir)
+        cardnews_paths = generate_cardnews_v2(ctx, output_dir, background=background)
     else:
-        cardnews_paths = generate_cardnews(course, output_dir)
+        cardnews_paths = generate_cardnews(ctx, output_dir)
 
     # 카드뉴스 생성 결과 검증 (부분 실패 조기 감지)
     # 배경: 이미지 생성 실패·API rate limit 시 빈 리스트/부분 결과가 반환돼도
@@ -623,7 +637,13 @@ def generate_content_for_course(course, output_dir):
         print(f"  ⚠️ 카드뉴스가 생성되지 않았습니다 (API 키/네트워크 확인 필요)")
 
     # 블로그 포스트 생성 (인스타 캡션, 게시 가이드도 함께 생성됨)
-    blog_txt, _ = generate_blog_post(course, output_dir)
+    # 입력이 이전과 같고 파일이 남아 있으면 재사용 (최종 수정일·D-day만 바뀐 재생성으로 커밋이 생기지 않게)
+    text_files = [(reuse_texts or {}).get(k) for k in ("blog_txt", "instagram_caption", "posting_guide")]
+    if reuse_texts and all(p and os.path.exists(p) for p in text_files):
+        blog_txt = text_files[0]
+        print(f"  ⏭️  과정 입력 변경 없음 → 블로그·캡션·가이드 재사용")
+    else:
+        blog_txt, _ = generate_blog_post(ctx, output_dir)
 
     # 생성된 부가 파일 경로 조합
     # NTFS 금지 문자(< > : " / \ | ? * 줄바꿈) 모두 제거 → GitHub Actions
@@ -633,8 +653,25 @@ def generate_content_for_course(course, output_dir):
     caption_path = os.path.join(output_dir, f"{safe_name}_instagram_caption.txt")
     guide_path = os.path.join(output_dir, f"{safe_name}_posting_guide.txt")
 
+    # WebP/AVIF 등 변형 파일도 기록해 두어야 만료 정리 시 함께 삭제됨
+    variants = [v for p in (cardnews_paths or []) if p for v in variant_paths(p)]
+
+    # 릴스 클립 (--reels): 커버·상세·신청방법 3장으로 세로 영상 생성
+    reels_paths = []
+    if RENDER_REELS and cardnews_paths:
+        from reels_renderer import render_reels
+        try:
+            reels_paths = render_reels(ctx, cardnews_paths[:3],
+                                       os.path.join(output_dir, f"{safe_name}_reels"))
+            for p in reels_paths:
+                print(f"  🎬 릴스 생성: {p}")
+        except Exception as e:
+            print(f"  ⚠️ 릴스 생성 실패: {e}")
+
     return {
         "cardnews": cardnews_paths,
+        "cardnews_variants": variants,
+        "reels": reels_paths,
         "blog_txt": blog_txt,
         "instagram_caption": caption_path if os.path.exists(caption_path) else None,
         "posting_guide": guide_path if os.path.exists(guide_path) else None,
@@ -672,6 +709,21 @@ def run_pipeline(courses):
         else:
             new_courses.append((course, course_key))
 
+    # 이전 실행에서 이미지 예산 소진으로 그라데이션 생성된 과정 → 이미지 포함 재생성
+    if HAS_V2 and os.environ.get("XAI_API_KEY", ""):
+        from image_budget import is_deferred, prune_deferred
+        # 처리 기록에서 사라진 과정(만료 정리 등)은 대기열에서도 제거
+        prune_deferred(processed)
+        queued = {key for _, key in new_courses}
+        for course in courses:
+            course_key = make_course_key(course)
+            if course_key in processed and course_key not in queued and is_deferred(course_key):
+                print(f"  🖼️  이미지 대기열 → 재생성: {course['title'][:40]} ({course.get('period', '')})")
+                new_courses.append((course, course_key))
+                queued.add(course_key)
+                regen_count += 1
+                skip_count -= 1
+
     if not new_courses:
         print(f"\n  ✅ 새로운 과정 없음 (전체 {len(courses)}건 중 {skip_count}건 중복)")
         print(f"  💰 카드뉴스·이미지 생성 건너뜀 (API 비용 절감)")
@@ -683,15 +735,46 @@ def run_pipeline(courses):
         print(f"\n  📊 전체 {len(courses)}건 중 신규 {len(new_courses)}건, 중복 {skip_count}건")
     print(f"  🎨 {len(new_courses)}건에 대해 콘텐츠 생성 시작\n")
 
+    # ── 배경 이미지 예산 배정 + 선행 요청 (v2) ──
+    # 시작일이 가까운 과정부터 예산 안에서 Grok 요청을 먼저 보내고,
+    # 예산을 넘는 과정은 그라데이션으로 생성한 뒤 다음 실행 대기열에 올림
+    use_v2 = HAS_V2 and os.environ.get("XAI_API_KEY", "")
+    image_futures = {}
+    if use_v2:
+        from fetch_images import (generate_gradient_background, is_course_image_cached,
+                                  prefetch_course_images, prefetch_slot_denied, resolve_prefetched_image)
+        from image_budget import record_image_outcome, schedule_image_jobs
+        new_courses, deferred = schedule_image_jobs(new_courses, is_cached=is_course_image_cached)
+        image_futures = prefetch_course_images([(key, course) for course, key in new_courses])
+        new_courses += deferred
+
     # ── 신규 과정만 콘텐츠 생성 ──
     new_count = 0
     for course, course_key in new_courses:
-        result = generate_content_for_course(course, OUTPUT_DIR)
+        background = None
+        if use_v2:
+            if course_key in image_futures:
+                background = resolve_prefetched_image(image_futures[course_key], course)
+                slot_denied = prefetch_slot_denied(image_futures[course_key])
+            else:
+                background = (generate_gradient_background(course), None)
+                slot_denied = True
+            # credit이 없으면 그라데이션 폴백 → 슬롯을 못 받은 경우만 다음 실행에서 이미지 포함 재생성
+            record_image_outcome(course_key, course, got_image=background[1] is not None,
+                                 slot_denied=slot_denied)
+        # 과정 입력(+시드 솔트)이 이전 기록과 같으면 텍스트 산출물은 재사용
+        fingerprint = content_fingerprint(course)
+        previous = processed.get(course_key)
+        reuse = None
+        if isinstance(previous, dict) and previous.get("text_fingerprint") == fingerprint:
+            reuse = previous.get("files")
+        result = generate_content_for_course(course, OUTPUT_DIR, background=background, reuse_texts=reuse)
 
         processed[course_key] = {
             "title": course["title"],
             "period": course.get("period", ""),
             "generated_at": datetime.now().isoformat(),
+            "text_fingerprint": fingerprint,
             "files": result,
         }
         new_count += 1
@@ -722,6 +805,21 @@ if __name__ == "__main__":
     print(f"  📅 실행 시각: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
     print("=" * 60)
 
+    if "--no-image-cache" in sys.argv:
+        from image_cache import set_enabled
+        set_enabled(False)
+        print("  ℹ️  이미지 캐시 사용 안 함 (--no-image-cache)")
+
+    if "--reels" in sys.argv:
+        RENDER_REELS = True
+
+    if "--reroll" in sys.argv:
+        # 솔트가 바뀌면 과정 시드·입력 지문이 모두 바뀜 → 이번에 생성하는 과정은 새로 뽑음
+        from course_context import set_seed_salt
+        salt = datetime.now().strftime("%Y%m%d%H%M%S")
+        set_seed_salt(salt)
+        print(f"  🎲 다시 뽑기 (--reroll): 시드 솔트 {salt} — 같은 결과를 재현하려면 CONTENT_SEED_SALT={salt}")
+
     if "--json" in sys.argv:
         json_idx = sys.argv.index("--json") + 1
         json_path = sys.argv[json_idx]
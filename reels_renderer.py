@@ -0,0 +1,311 @@
+"""
+카드뉴스 슬라이드 → 세로형 릴스 클립 렌더러
+
+배경: seo_helper.generate_reels_package()는 Grok 영상 가이드(텍스트)만 만들고
+실제 릴스는 사람이 편집했습니다. 카드뉴스 3장(커버·상세·신청방법)은 이미 있으니
+이를 9:16 세로 영상으로 엮어 바로 올릴 수 있는 짧은 클립을 만듭니다.
+
+구성:
+  · 장면 = _build_segments()의 3세그먼트 ↔ 슬라이드 3장 (커버 / 상세 / 신청방법)
+  · 장면 길이 = 과정 유형별 템포 (단기 빠른 컷 3초 / 일반 4초 / 장기 5초)
+  · 장면마다 천천히 확대·이동(Ken Burns) + 장면 사이 크로스페이드
+  · 자막: 1장 과정명, 2장 실습 장면(action_kr), 3장 CTA(_generate_cta) — 장면 중간에 페이드 인/아웃
+
+메모리: 프레임은 제너레이터로 한 장씩 만들어 ffmpeg로 바로 보내고, WebP용으로는 조각(TIFF) 단위로
+  디스크에 모았다가 인코딩합니다 (전체 프레임을 메모리에 보관 ❌).
+  프레임 합성(확대 샘플링·크로스페이드·자막 블렌딩)은 NumPy 벡터 연산으로 처리합니다.
+
+출력:
+  {이름}_reels.webp  애니메이션 WebP (외부 도구 불필요, Pillow만 사용)
+  {이름}_reels.mp4   로컬에 ffmpeg가 있으면 함께 생성 (H.264, yuv420p)
+
+설정 (환경변수):
+  REELS_SIZE   출력 크기 "가로x세로" (기본: 540x960)
+  REELS_FPS    초당 프레임 (기본: 15)
+  REELS_SPOOL_CHUNK  WebP 인코딩용 프레임 조각 크기 (기본: 8장)
+"""
+
+import itertools
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFilter
+
+REELS_SIZE = tuple(int(v) for v in os.environ.get("REELS_SIZE", "540x960").split("x"))
+REELS_FPS = int(os.environ.get("REELS_FPS", "15") or 15)
+# WebP 인코딩 전 프레임을 디스크에 모아 두는 TIFF 조각 크기 (장 수)
+SPOOL_CHUNK_FRAMES = int(os.environ.get("REELS_SPOOL_CHUNK", "8") or 8)
+
+# 과정 유형별 장면 길이(초) — seo_helper의 "단기 빠른 컷 / 장기 성장 서사" 템포
+SEGMENT_SECONDS = {"short": 3.0, "general": 4.0, "long": 5.0}
+CROSSFADE_SECONDS = 0.6
+ZOOM_RANGE = 0.08            # 장면 동안 1.0 → 1.08배 확대
+CAPTION_FADE_SECONDS = 0.3
+
+
+# ── 타임라인 ──
+
+def build_timeline(course_data):
+    """
+    _build_segments() 기반 장면 목록
+
+    Returns:
+        list[dict]: [{duration, caption}, ...] (슬라이드 순서와 같음)
+    """
+    from course_context import course_context
+    from seo_helper import _build_segments, _generate_cta
+
+    ctx = course_context(course_data)
+    ctype = ctx.ctype
+    segments = _build_segments(ctx, ctype)
+    seconds = SEGMENT_SECONDS.get(ctype, SEGMENT_SECONDS["general"])
+
+    cta_text, _, _ = _generate_cta(ctx.course)
+    cta = (cta_text or "신청 ▸ work24.go.kr")
+    cta = re.sub(r"[\u2600-\u27BF\U0001F000-\U0001FFFF]", "", cta).strip()  # 이모지 제외 (폰트 미지원)
+    captions = [
+        ctx.clean_title,
+        segments[1]["action_kr"] if len(segments) > 1 else "",
+        cta,
+    ]
+    return [{"duration": seconds, "caption": captions[i] if i < len(captions) else ""}
+            for i in range(len(segments))]
+
+
+# ── 장면 준비 (장면당 1회) ──
+
+def _prepare_scene(slide_path, caption, size):
+    """슬라이드 1장 → 배경(블러)·전경(float 배열)·자막(RGBA 배열) 준비"""
+    from generate_cardnews import FONT_BOLD
+    from text_fit import fit_text
+
+    W, H = size
+    with Image.open(slide_path) as im:
+        slide = im.convert("RGB")
+
+    # 배경: 세로 캔버스를 채우도록 확대 → 강한 블러 → 어둡게
+    scale = max(W / slide.width, H / slide.height)
+    bg = slide.resize((int(slide.width * scale) + 1, int(slide.height * scale) + 1), Image.BILINEAR)
+    left, top = (bg.width - W) // 2, (bg.height - H) // 2
+    bg = bg.crop((left, top, left + W, top + H)).filter(ImageFilter.GaussianBlur(radius=18))
+    bg_arr = (np.asarray(bg, dtype=np.float32) * 0.55)
+
+    # 전경: 가로 W에 맞춘 슬라이드 (확대 샘플링은 프레임마다 NumPy로)
+    fg_h = min(H, int(W * slide.height / slide.width))
+    fg = np.asarray(slide.resize((W, fg_h), Image.LANCZOS), dtype=np.float32)
+
+    scene = {"bg": bg_arr, "fg": fg, "fg_top": (H - fg_h) // 2, "caption": None}
+
+    if caption:
+        font, lines, line_h = fit_text(caption, FONT_BOLD, W - 80, int(H * 0.14),
+                                       min_size=max(16, W // 36), max_size=W // 18,
+                                       line_ratio=1.35, max_lines=2)
+        box_h = len(lines) * line_h + 36
+        cap = Image.new("RGBA", (W, box_h), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(cap)
+        draw.rounded_rectangle((24, 0, W - 24, box_h - 1), radius=18, fill=(0, 0, 0, 170))
+        for i, line in enumerate(lines):
+            draw.text((40, 18 + i * line_h), line, font=font, fill=(255, 255, 255, 255))
+        cap_arr = np.asarray(cap, dtype=np.float32)
+        scene["caption"] = (cap_arr[..., :3], cap_arr[..., 3:] / 255.0,
+                            H - box_h - int(H * 0.08))
+    return scene
+
+
+# ── 프레임 합성 (NumPy) ──
+
+def _sample_zoomed(fg, zoom, pan_y):
+    """전경을 중심 기준 zoom배 확대한 같은 크기 배열 (분리형 bilinear 샘플링)"""
+    h, w, _ = fg.shape
+    ys = (np.arange(h, dtype=np.float32) - h / 2) / zoom + h / 2 + pan_y
+    xs = (np.arange(w, dtype=np.float32) - w / 2) / zoom + w / 2
+    ys = np.clip(ys, 0, h - 1)
+    xs = np.clip(xs, 0, w - 1)
+    y0 = ys.astype(np.int32)
+    x0 = xs.astype(np.int32)
+    y1 = np.minimum(y0 + 1, h - 1)
+    x1 = np.minimum(x0 + 1, w - 1)
+    wy = (ys - y0)[:, None, None]
+    wx = (xs - x0)[None, :, None]
+    rows = fg[y0] * (1 - wy) + fg[y1] * wy
+    return rows[:, x0] * (1 - wx) + rows[:, x1] * wx
+
+
+def _scene_frame(scene, p, t, duration):
+    """장면 진행률 p(0~1), 장면 내 시각 t(초)의 프레임 (float32 H×W×3)"""
+    frame = scene["bg"].copy()
+    fg = scene["fg"]
+    zoom = 1.0 + ZOOM_RANGE * p
+    pan_y = fg.shape[0] * 0.02 * (p - 0.5)
+    top = scene["fg_top"]
+    frame[top:top + fg.shape[0]] = _sample_zoomed(fg, zoom, pan_y)
+
+    if scene["caption"] is not None:
+        # 장면 10%~90% 구간 노출, 양 끝 CAPTION_FADE_SECONDS 동안 페이드
+        start, end = duration * 0.1, duration * 0.9
+        fade = min(1.0, max(0.0, (t - start) / CAPTION_FADE_SECONDS),
+                   max(0.0, (end - t) / CAPTION_FADE_SECONDS))
+        if fade > 0:
+            rgb, alpha, y = scene["caption"]
+            a = alpha * fade
+            region = frame[y:y + rgb.shape[0]]
+            region *= 1 - a
+            region += rgb * a
+    return frame
+
+
+def iter_frames(slide_paths, timeline, size=None, fps=None):
+    """
+    프레임 제너레이터 (uint8 H×W×3). 장면 준비는 필요한 시점에 한 장면씩만.
+
+    장면 i의 마지막 CROSSFADE_SECONDS 동안 장면 i+1의 시작 프레임과 섞습니다.
+    """
+    size = size or REELS_SIZE
+    fps = fps or REELS_FPS
+    scenes = list(zip(slide_paths, timeline))
+    cur = _prepare_scene(scenes[0][0], scenes[0][1]["caption"], size)
+    for i, (_, seg) in enumerate(scenes):
+        nxt = None
+        if i + 1 < len(scenes):
+            nxt = _prepare_scene(scenes[i + 1][0], scenes[i + 1][1]["caption"], size)
+            nxt_dur = scenes[i + 1][1]["duration"]
+        duration = seg["duration"]
+        # 크로스페이드 구간은 다음 장면 시간과 겹치므로, 다음 장면은 그만큼 늦게 시작한 것으로 계산
+        offset = CROSSFADE_SECONDS if i > 0 else 0.0
+        n = int(round((duration - offset) * fps))
+        for f in range(n):
+            t = offset + f / fps
+            frame = _scene_frame(cur, t / duration, t, duration)
+            fade_start = duration - CROSSFADE_SECONDS
+            if nxt is not None and t >= fade_start:
+                k = (t - fade_start) / CROSSFADE_SECONDS
+                t2 = t - fade_start
+                frame *= 1 - k
+                frame += _scene_frame(nxt, t2 / nxt_dur, t2, nxt_dur) * k
+            yield np.clip(frame, 0, 255).astype(np.uint8)
+        cur = nxt
+
+
+# ── 인코딩 ──
+
+def _spool_frames(frames, tmp_dir, chunk=None):
+    """
+    프레임 제너레이터 → 다중 프레임 TIFF 조각 파일 목록
+
+    WebP 애니메이션 저장은 append_images를 list()로 펼치므로 프레임 이미지를 그대로 넘기면
+    전 프레임이 메모리에 올라갑니다. 대신 SPOOL_CHUNK_FRAMES장씩 무손실 TIFF 조각으로
+    디스크에 쓰고, 조각 파일을 열어(n_frames·seek 지원) append_images로 넘기면
+    인코더가 조각 안에서 seek할 때마다 해당 프레임만 읽습니다.
+    → 메모리: 쓰는 중인 조각 1개 + 인코딩 후 조각마다 마지막 프레임 1장
+      (540x960·15fps·약 11초 기준 최대 RSS 약 145MB — 전 프레임 보관 시 약 500MB)
+    """
+    chunk = chunk or SPOOL_CHUNK_FRAMES
+    paths = []
+    while True:
+        batch = [Image.fromarray(f) for f in itertools.islice(frames, chunk)]
+        if not batch:
+            return paths
+        path = os.path.join(tmp_dir, f"frames_{len(paths):04d}.tif")
+        batch[0].save(path, save_all=True, append_images=batch[1:], compression="tiff_adobe_deflate")
+        paths.append(path)
+
+
+def _ffmpeg_writer(path, size, fps):
+    """로컬 ffmpeg가 있으면 rawvideo를 stdin으로 받는 프로세스 반환"""
+    ffmpeg = shutil.which("ffmpeg")
+    if not ffmpeg:
+        return None
+    W, H = size
+    return subprocess.Popen(
+        [ffmpeg, "-y", "-loglevel", "error",
+         "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{W}x{H}", "-r", str(fps), "-i", "-",
+         "-c:v", "libx264", "-pix_fmt", "yuv420p", "-movflags", "+faststart", path],
+        stdin=subprocess.PIPE,
+    )
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def render_reels(course_data, slide_paths, output_base, size=None, fps=None):
+    """
+    슬라이드 3장으로 릴스 클립 생성.
+
+    Args:
+        slide_paths: [커버, 상세, 신청방법] 이미지 경로
+        output_base: 확장자 제외 출력 경로 (…/{이름}_reels)
+    Returns:
+        list: 생성된 파일 경로 (.webp [, .mp4])
+    중간에 실패하면 ffmpeg 프로세스를 정리하고 쓰다 만 .webp·.mp4를 지운 뒤 예외를 다시 올립니다.
+    """
+    size = size or REELS_SIZE
+    fps = fps or REELS_FPS
+    slide_paths = [p for p in slide_paths if p and os.path.exists(p)][:3]
+    if not slide_paths:
+        return []
+    timeline = build_timeline(course_data)[:len(slide_paths)]
+    frames = iter_frames(slide_paths, timeline, size, fps)
+
+    webp_path = output_base + ".webp"
+    mp4_path = output_base + ".mp4"
+    ffmpeg = _ffmpeg_writer(mp4_path, size, fps)
+    mp4_ok = False
+    webp_ok = False
+    if ffmpeg is not None:
+        # 같은 프레임을 MP4 인코더에도 흘려보냄 (프레임 생성 1회)
+        # ffmpeg가 먼저 죽어도(BrokenPipe) WebP용 프레임은 계속 만듦
+        def tee(src):
+            for frame in src:
+                if not ffmpeg.stdin.closed:
+                    try:
+                        ffmpeg.stdin.write(frame.tobytes())
+                    except OSError:
+                        ffmpeg.stdin.close()
+                yield frame
+        frames = tee(frames)
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            chunks = [Image.open(p) for p in _spool_frames(frames, tmp)]
+            try:
+                if ffmpeg is not None:
+                    # 프레임을 다 보냈으므로 MP4 마무리는 WebP 인코딩과 동시에 진행
+                    ffmpeg.stdin.close()
+                chunks[0].save(webp_path, save_all=True, append_images=chunks[1:],
+                               duration=int(1000 / fps), loop=0, quality=80, method=4)
+                webp_ok = True
+            finally:
+                for chunk in chunks:
+                    chunk.close()
+        paths = [webp_path]
+
+        if ffmpeg is not None:
+            mp4_ok = ffmpeg.wait() == 0
+            if mp4_ok:
+                paths.append(mp4_path)
+            else:
+                print("  ⚠️ MP4 인코딩 실패 (ffmpeg) → WebP만 사용")
+        return paths
+    finally:
+        if ffmpeg is not None:
+            if not ffmpeg.stdin.closed:
+                try:
+                    ffmpeg.stdin.close()
+                except OSError:
+                    pass
+            if ffmpeg.poll() is None and not webp_ok:
+                # 예외로 빠져나온 경우: 입력이 끊긴 인코더를 기다리지 않고 종료
+                ffmpeg.kill()
+            ffmpeg.wait()
+            if not mp4_ok:
+                _remove(mp4_path)
+        if not webp_ok:
+            _remove(webp_path)
@@ -0,0 +1,134 @@
+"""
+v2 배경 준비 단계 벤치마크 - 시간과 최대 메모리(peak RSS)
+
+사용법:
+  python scripts/bench_background.py                 # separate vs shared 비교
+  python scripts/bench_background.py --formats feed,portrait,story
+  python scripts/bench_background.py --json out.json
+
+비교 모드:
+  separate  슬라이드·포맷마다 원본을 copy().resize()부터 다시 처리 (기존 방식)
+  shared    prepare_background()로 과정당 1회 준비한 버퍼를 공유
+
+Pillow 이미지 버퍼는 tracemalloc에 잡히지 않으므로, 모드별로 별도 프로세스를
+띄워 ru_maxrss(최대 RSS) 증가량을 측정합니다. 텍스트 페인트와 인코딩은
+두 모드가 같으므로 배경 처리 단계만 측정합니다.
+"""
+
+import json
+import subprocess
+import sys
+import time
+
+from bench_fixtures import SAMPLE_COURSES
+
+
+def _peak_rss_kb():
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _legacy_cover_base(v2, bg_image, size):
+    """기존 generate_cover_v2의 배경 처리 (비교 기준)"""
+    from PIL import Image, ImageDraw, ImageFilter
+    W, H = size
+    bg = bg_image.copy().resize((W, H), Image.LANCZOS)
+    bg = bg.filter(ImageFilter.GaussianBlur(radius=2))
+    img = v2.apply_gradient_overlay(bg, direction="bottom")
+    overlay_top = Image.new('RGBA', (W, H), (0, 0, 0, 0))
+    ImageDraw.Draw(overlay_top).rectangle((0, 0, W, 200), fill=(0, 0, 0, 100))
+    img = img.convert('RGBA')
+    return Image.alpha_composite(img, overlay_top).convert('RGB')
+
+
+def _legacy_detail_header(v2, bg_image, W=1080, header_h=280):
+    """기존 generate_detail_v2의 배경 처리 (비교 기준)"""
+    from PIL import Image
+    bg = bg_image.copy().resize((W, int(W * bg_image.size[1] / bg_image.size[0])), Image.LANCZOS)
+    if bg.size[1] >= header_h:
+        bg_crop = bg.crop((0, 0, W, header_h))
+    else:
+        bg_crop = bg.resize((W, header_h), Image.LANCZOS)
+    return v2.apply_dark_overlay(bg_crop, opacity=150)
+
+
+def run_mode(mode, formats, repeat):
+    """한 프로세스 안에서 한 모드만 실행하고 결과 dict 반환
+
+    텍스트 페인트는 두 모드가 동일하므로 배경 처리 단계만 측정합니다.
+    """
+    import generate_cardnews_v2 as v2
+    from fetch_images import generate_gradient_background
+
+    backgrounds = [generate_gradient_background(c) for c in SAMPLE_COURSES]
+    sizes = []
+    for course in SAMPLE_COURSES:
+        base_h = v2._measure_cover_v2(course)["base_h"]
+        sizes.append([(1080, base_h if fmt == "feed" else max(base_h, v2.ASPECT_FORMATS[fmt][1]))
+                      for fmt in formats])
+
+    base_rss = _peak_rss_kb()
+    t0 = time.perf_counter()
+    slides = 0
+    for _ in range(repeat):
+        for bg, course_sizes in zip(backgrounds, sizes):
+            if mode == "shared":
+                prep = v2.prepare_background(bg)
+                for size in course_sizes:
+                    v2.compose_cover_base(prep, size)
+                v2.prepared_detail_header(prep, 1080, 280)
+                del prep
+            else:
+                for size in course_sizes:
+                    _legacy_cover_base(v2, bg, size)
+                _legacy_detail_header(v2, bg)
+            slides += len(course_sizes) + 1
+    elapsed = time.perf_counter() - t0
+
+    return {
+        "mode": mode,
+        "slides": slides,
+        "total_ms": round(elapsed * 1000, 1),
+        "ms_per_course": round(elapsed * 1000 / (repeat * len(SAMPLE_COURSES)), 1),
+        "peak_rss_delta_kb": _peak_rss_kb() - base_rss,
+    }
+
+
+def main():
+    formats = ["feed", "portrait", "story"]
+    if "--formats" in sys.argv:
+        formats = sys.argv[sys.argv.index("--formats") + 1].split(",")
+    repeat = 3
+    if "--repeat" in sys.argv:
+        repeat = int(sys.argv[sys.argv.index("--repeat") + 1])
+
+    results = []
+    for mode in ("separate", "shared"):
+        out = subprocess.run(
+            [sys.executable, __file__, "--run", mode, "--formats", ",".join(formats),
+             "--repeat", str(repeat)],
+            capture_output=True, text=True, check=True,
+        )
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    print(f"\n  포맷: {', '.join(formats)} | 과정 {len(SAMPLE_COURSES)}건 × 반복 {repeat}회")
+    print(f"  {'모드':<10}{'과정당 ms':>12}{'peak RSS 증가(KB)':>20}")
+    print(f"  {'─' * 42}")
+    for r in results:
+        print(f"  {r['mode']:<10}{r['ms_per_course']:>12.1f}{r['peak_rss_delta_kb']:>20,}")
+
+    if "--json" in sys.argv:
+        json_path = sys.argv[sys.argv.index("--json") + 1]
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n  ✅ JSON 저장: {json_path}")
+
+
+if __name__ == "__main__":
+    if "--run" in sys.argv:
+        mode = sys.argv[sys.argv.index("--run") + 1]
+        formats = sys.argv[sys.argv.index("--formats") + 1].split(",")
+        repeat = int(sys.argv[sys.argv.index("--repeat") + 1])
+        print(json.dumps(run_mode(mode, formats, repeat)))
+    else:
+        main()
@@ -0,0 +1,106 @@
+"""
+블로그 텍스트 생성 벤치마크 - 게시물당 시간 (과정 1,000건)
+
+사용법:
+  python scripts/bench_blog_text.py                 # 1,000건, 섹션 메모이즈 on/off 비교
+  python scripts/bench_blog_text.py --courses 5000
+  python scripts/bench_blog_text.py --json out.json
+
+코퍼스: bench_fixtures.REGRESSION_COURSES를 회차·시작일만 바꿔 --courses 건으로 복제
+측정 (파일 저장 제외):
+  context  CourseContext 생성 (분야·유형·시간·리서치 1회 계산)
+  texts    generate_blog_texts — 블로그 본문 + 작업 가이드 + 인스타 캡션 + 게시 가이드
+
+비교 모드:
+  cold  과정마다 섹션 캐시를 비움 (메모이즈 없이 매번 조립하는 것과 같은 비용)
+  memo  섹션 캐시 유지 (파이프라인 실제 동작)
+"""
+
+import io
+import json
+import random
+import sys
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+
+from bench_fixtures import REGRESSION_COURSES
+
+
+def _courses(n):
+    base = datetime.now() + timedelta(days=10)
+    courses = []
+    for i in range(n):
+        c = dict(REGRESSION_COURSES[i % len(REGRESSION_COURSES)])
+        c["title"] = f"{c['title']} {i // len(REGRESSION_COURSES) + 1}회차"
+        c["traStartDate"] = (base + timedelta(days=i % 60)).strftime("%Y%m%d")
+        courses.append(c)
+    return courses
+
+
+def _section_caches():
+    import generate_blog as blog
+    import seo_helper as seo
+    return [blog._build_seo_section, blog._build_benefit_text, blog._build_recommend_section,
+            seo._caption_keyword_sentence, seo._posting_schedule]
+
+
+def run_mode(mode, courses):
+    from course_context import CourseContext
+    from generate_blog import generate_blog_texts
+
+    caches = _section_caches()
+    for fn in caches:
+        fn.cache_clear()
+    random.seed(0)
+    t_ctx = t_text = 0.0
+    total_chars = 0
+    with redirect_stdout(io.StringIO()):
+        for course in courses:
+            if mode == "cold":
+                for fn in caches:
+                    fn.cache_clear()
+            t0 = time.perf_counter()
+            ctx = CourseContext(course)
+            t1 = time.perf_counter()
+            blog_text, caption, guide = generate_blog_texts(ctx)
+            t2 = time.perf_counter()
+            t_ctx += t1 - t0
+            t_text += t2 - t1
+            total_chars += len(blog_text) + len(caption) + len(guide)
+    n = len(courses)
+    return {
+        "mode": mode,
+        "courses": n,
+        "context_us": round(t_ctx * 1e6 / n, 1),
+        "texts_us": round(t_text * 1e6 / n, 1),
+        "per_post_us": round((t_ctx + t_text) * 1e6 / n, 1),
+        "avg_chars": total_chars // n,
+    }
+
+
+def main():
+    n = 1000
+    if "--courses" in sys.argv:
+        n = int(sys.argv[sys.argv.index("--courses") + 1])
+    courses = _courses(n)
+
+    run_mode("memo", courses[:50])   # 워밍업 (import·리서치 로드·정규식 컴파일)
+    results = [run_mode(mode, courses) for mode in ("cold", "memo")]
+
+    print(f"\n  과정 {n}건 (게시물당 µs, 파일 저장 제외)")
+    print(f"  {'모드':<8}{'context':>10}{'texts':>10}{'합계':>10}{'평균 글자수':>14}")
+    print(f"  {'─' * 52}")
+    for r in results:
+        print(f"  {r['mode']:<8}{r['context_us']:>10.1f}{r['texts_us']:>10.1f}"
+              f"{r['per_post_us']:>10.1f}{r['avg_chars']:>14,}")
+
+    if "--json" in sys.argv:
+        json_path = sys.argv[sys.argv.index("--json") + 1]
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n  ✅ JSON 저장: {json_path}")
+
+
+if __name__ == "__main__":
+    main()
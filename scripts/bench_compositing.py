@@ -0,0 +1,164 @@
+"""
+v2 오버레이 합성 벤치마크 - 최대 메모리(peak RSS / tracemalloc)와 시간
+
+사용법:
+  python scripts/bench_compositing.py                  # rgba vs inplace 비교
+  python scripts/bench_compositing.py --size 1080x1920 # 캔버스 크기 (기본: 스토리 1080x1920)
+  python scripts/bench_compositing.py --json out.json
+
+비교 모드:
+  rgba     오버레이마다 풀사이즈 RGBA 생성 → alpha_composite → RGB 변환 (기존 방식)
+  inplace  작업 버퍼 1장에 띠 크기 L 마스크로 paste (generate_cardnews_v2 현재 방식)
+
+측정 단계: 블러 배경 → 하단 그라데이션 → 상단 오버레이 → 반투명 카드 (커버),
+          헤더 크롭 → 어두운 오버레이 (상세).
+
+tracemalloc은 Python 힙만 추적하므로 Pillow 이미지 버퍼(C 메모리)는 잡히지 않습니다.
+실제 차이는 모드별 별도 프로세스의 peak RSS 증가량으로 확인하고,
+tracemalloc 최대치는 Python 쪽 임시 객체(마스크 행 데이터 등)가 늘지 않았는지 보는 용도입니다.
+"""
+
+import json
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from bench_fixtures import SAMPLE_COURSES
+
+
+def _peak_rss_kb():
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+# ── 기존 방식 재현 (비교 기준) ──
+
+def _rgba_gradient(img, direction="bottom"):
+    from PIL import Image, ImageDraw
+    w, h = img.size
+    gradient = Image.new('RGBA', (w, h), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(gradient)
+    for y in range(h):
+        if direction == "bottom":
+            alpha = 0 if y < h * 0.35 else int(200 * ((y - h * 0.35) / (h * 0.65)))
+        else:
+            alpha = 0 if y > h * 0.65 else int(200 * (1 - (y / (h * 0.65))))
+        draw.line([(0, y), (w, y)], fill=(0, 0, 0, alpha))
+    return Image.alpha_composite(img.convert('RGBA'), gradient).convert('RGB')
+
+
+def _rgba_cover(blurred, card_y):
+    from PIL import Image, ImageDraw
+    W, H = blurred.size
+    img = _rgba_gradient(blurred)
+    overlay_top = Image.new('RGBA', (W, H), (0, 0, 0, 0))
+    ImageDraw.Draw(overlay_top).rectangle((0, 0, W, 200), fill=(0, 0, 0, 100))
+    img = Image.alpha_composite(img.convert('RGBA'), overlay_top).convert('RGB')
+    card_img = Image.new('RGBA', (W, H), (0, 0, 0, 0))
+    ImageDraw.Draw(card_img).rounded_rectangle((30, card_y, W - 30, H - 30), radius=20,
+                                               fill=(255, 255, 255, 230))
+    return Image.alpha_composite(img.convert('RGBA'), card_img).convert('RGB')
+
+
+def _rgba_header(fit, header_h=280):
+    from PIL import Image
+    crop = fit.crop((0, 0, fit.size[0], header_h))
+    overlay = Image.new('RGBA', crop.size, (0, 0, 0, 150))
+    return Image.alpha_composite(crop.convert('RGBA'), overlay).convert('RGB')
+
+
+# ── 현재 방식 ──
+
+def _inplace_cover(v2, blurred, card_y):
+    from PIL import Image, ImageDraw
+    W, H = blurred.size
+    img = v2.apply_gradient_overlay(blurred)
+    v2.darken_region(img, (0, 0, W, 201), opacity=100)
+    card_box = (30, card_y, W - 29, H - 29)
+    mask = Image.new('L', (card_box[2] - card_box[0], card_box[3] - card_box[1]), 0)
+    ImageDraw.Draw(mask).rounded_rectangle((0, 0, mask.size[0] - 1, mask.size[1] - 1),
+                                           radius=20, fill=230)
+    img.paste((255, 255, 255), card_box, mask)
+    return img
+
+
+def _inplace_header(v2, fit, header_h=280):
+    return v2.darken_region(fit.crop((0, 0, fit.size[0], header_h)), opacity=150)
+
+
+def run_mode(mode, size, repeat):
+    """한 프로세스 안에서 한 모드만 실행하고 결과 dict 반환"""
+    from PIL import ImageFilter
+    import generate_cardnews_v2 as v2
+    from fetch_images import generate_gradient_background
+
+    W, H = size
+    card_y = 440 + (H - 1080) // 2
+    inputs = []
+    for course in SAMPLE_COURSES:
+        bg = generate_gradient_background(course)
+        inputs.append((bg.resize((W, H)).filter(ImageFilter.GaussianBlur(radius=2)), bg))
+
+    base_rss = _peak_rss_kb()
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for blurred, fit in inputs:
+            if mode == "rgba":
+                _rgba_cover(blurred, card_y)
+                _rgba_header(fit)
+            else:
+                _inplace_cover(v2, blurred, card_y)
+                _inplace_header(v2, fit)
+    elapsed = time.perf_counter() - t0
+    _, py_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "mode": mode,
+        "size": f"{W}x{H}",
+        "ms_per_course": round(elapsed * 1000 / (repeat * len(inputs)), 1),
+        "peak_rss_delta_kb": _peak_rss_kb() - base_rss,
+        "tracemalloc_peak_kb": py_peak // 1024,
+    }
+
+
+def main():
+    size = "1080x1920"
+    if "--size" in sys.argv:
+        size = sys.argv[sys.argv.index("--size") + 1]
+    repeat = 3
+    if "--repeat" in sys.argv:
+        repeat = int(sys.argv[sys.argv.index("--repeat") + 1])
+
+    results = []
+    for mode in ("rgba", "inplace"):
+        out = subprocess.run(
+            [sys.executable, __file__, "--run", mode, "--size", size, "--repeat", str(repeat)],
+            capture_output=True, text=True, check=True,
+        )
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    print(f"\n  캔버스: {size} | 과정 {len(SAMPLE_COURSES)}건 × 반복 {repeat}회")
+    print(f"  {'모드':<10}{'과정당 ms':>12}{'peak RSS 증가(KB)':>20}{'tracemalloc(KB)':>18}")
+    print(f"  {'─' * 60}")
+    for r in results:
+        print(f"  {r['mode']:<10}{r['ms_per_course']:>12.1f}{r['peak_rss_delta_kb']:>20,}"
+              f"{r['tracemalloc_peak_kb']:>18,}")
+
+    if "--json" in sys.argv:
+        json_path = sys.argv[sys.argv.index("--json") + 1]
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n  ✅ JSON 저장: {json_path}")
+
+
+if __name__ == "__main__":
+    if "--run" in sys.argv:
+        mode = sys.argv[sys.argv.index("--run") + 1]
+        W, H = (int(v) for v in sys.argv[sys.argv.index("--size") + 1].split("x"))
+        repeat = int(sys.argv[sys.argv.index("--repeat") + 1])
+        print(json.dumps(run_mode(mode, (W, H), repeat)))
+    else:
+        main()
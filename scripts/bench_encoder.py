@@ -0,0 +1,111 @@
+"""
+카드뉴스 인코더 프리셋 벤치마크 - 슬라이드당 용량(bytes)과 인코딩 시간(ms)
+
+사용법:
+  python scripts/bench_encoder.py                 # 전체 프리셋 비교
+  python scripts/bench_encoder.py --repeat 5      # 프리셋당 반복 횟수 (기본 3)
+  python scripts/bench_encoder.py --json out.json # 결과를 JSON으로도 저장
+
+v1(단색 위주)과 v2(배경 이미지) 슬라이드를 메모리에서 렌더링한 뒤
+image_encoder.ENCODER_PRESETS의 각 설정으로 인코딩해 비교합니다.
+v2 배경은 네트워크 없이 그라데이션 배경(generate_gradient_background)을 사용합니다.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+from bench_fixtures import SAMPLE_COURSES
+
+from PIL import Image
+
+from image_encoder import ENCODER_PRESETS, encode_image, is_preset_available
+
+
+def render_slides():
+    """샘플 과정의 v1/v2 슬라이드를 렌더링해 (이름, Image, flat) 목록 반환"""
+    import generate_cardnews as v1
+    import generate_cardnews_v2 as v2
+    from fetch_images import generate_gradient_background
+
+    slides = []
+    with tempfile.TemporaryDirectory() as tmp:
+        course = SAMPLE_COURSES[0]
+        bg = generate_gradient_background(course)
+        jobs = [
+            ("v1_cover", True, lambda p: v1.generate_slide_cover(course, p)),
+            ("v1_detail", True, lambda p: v1.generate_slide_detail(course, p)),
+            ("v1_howto", True, lambda p: v1.generate_slide_howto(course, p)),
+            ("v2_cover", False, lambda p: v2.generate_cover_v2(course, bg, None, p)),
+            ("v2_detail", False, lambda p: v2.generate_detail_v2(course, bg, p)),
+        ]
+        for name, flat, render in jobs:
+            path = os.path.join(tmp, f"{name}.png")
+            # 렌더링 결과를 무손실로 받아온 뒤 메모리에서만 재인코딩
+            render(path)
+            img = Image.open(path)
+            img.load()
+            slides.append((name, img.convert("RGB"), flat))
+    return slides
+
+
+def bench(slides, repeat=3):
+    """프리셋 × 슬라이드 조합별 평균 bytes / ms 측정"""
+    results = []
+    for preset_name in ENCODER_PRESETS:
+        if not is_preset_available(preset_name):
+            print(f"  ⚠️ {preset_name}: 현재 Pillow 빌드에서 미지원 — 건너뜀")
+            continue
+        for slide_name, img, flat in slides:
+            size = 0
+            elapsed = []
+            for _ in range(repeat):
+                t0 = time.perf_counter()
+                data = encode_image(img, preset_name, flat=flat)
+                elapsed.append((time.perf_counter() - t0) * 1000)
+                size = len(data)
+            results.append({
+                "preset": preset_name,
+                "slide": slide_name,
+                "bytes": size,
+                "ms": round(min(elapsed), 2),
+            })
+    return results
+
+
+def print_table(results):
+    print(f"\n  {'프리셋':<15}{'슬라이드':<12}{'bytes':>12}{'ms':>10}")
+    print(f"  {'─' * 49}")
+    for r in results:
+        print(f"  {r['preset']:<15}{r['slide']:<12}{r['bytes']:>12,}{r['ms']:>10.1f}")
+
+    # 프리셋별 합계 (슬라이드 평균)
+    print(f"\n  {'프리셋':<15}{'평균 bytes':>14}{'평균 ms':>10}")
+    print(f"  {'─' * 39}")
+    by_preset = {}
+    for r in results:
+        by_preset.setdefault(r["preset"], []).append(r)
+    for name, rows in by_preset.items():
+        avg_bytes = sum(r["bytes"] for r in rows) / len(rows)
+        avg_ms = sum(r["ms"] for r in rows) / len(rows)
+        print(f"  {name:<15}{avg_bytes:>14,.0f}{avg_ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    repeat = 3
+    if "--repeat" in sys.argv:
+        repeat = int(sys.argv[sys.argv.index("--repeat") + 1])
+
+    print("  🖼️  슬라이드 렌더링 중...")
+    slides = render_slides()
+    print(f"  ⏱️  프리셋 {len(ENCODER_PRESETS)}종 × 슬라이드 {len(slides)}장 (반복 {repeat}회)")
+    results = bench(slides, repeat=repeat)
+    print_table(results)
+
+    if "--json" in sys.argv:
+        json_path = sys.argv[sys.argv.index("--json") + 1]
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n  ✅ JSON 저장: {json_path}")
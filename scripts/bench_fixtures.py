@@ -0,0 +1,169 @@
+"""
+벤치마크용 샘플 과정 데이터 (scripts/bench_*.py 공용)
+
+실제 API 응답(parse_api_course + L02 상세) 형태를 그대로 따르며,
+레이아웃 분기(훈련목표 / 커리큘럼 / fallback, 단일·다회차)를 모두 포함합니다.
+"""
+
+import os
+import sys
+
+# 루트 모듈(generate_cardnews 등) import 경로
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+
+SAMPLE_COURSES = [
+    {
+        "trprId": "AIG20263001247924",
+        "trprDegr": "1",
+        "traStartDate": "20260518",
+        "traEndDate": "20260617",
+        "ncsCd": "08030205",
+        "title": "드론을 활용한 제주관광영상콘텐츠제작 실무자양성과정",
+        "ncsName": "영상촬영",
+        "institution": "제주한라대학교",
+        "period": "1회: 2026.05.18 ~ 2026.06.17 | 2회: 2026.06.22 ~ 2026.07.22",
+        "courseCost": "1,250,000원",
+        "selfCost": "125,000원",
+        "totalHours": 160,
+        "capacity": "20명",
+        "trainingGoal": (
+            "드론 항공촬영 기초부터 제주 관광지 현장 촬영, 프리미어 프로·다빈치 리졸브를 활용한 "
+            "편집과 색보정까지 관광 홍보 영상 제작 전 과정을 실습합니다. 수료 후 관광업체·"
+            "지자체 홍보영상 제작 실무에 바로 투입될 수 있는 역량을 갖추는 것을 목표로 합니다."
+        ),
+        "address": "제주특별자치도 제주시 한라대학로 38",
+        "curriculum": [],
+        "contact": "제주한라대학교 Tel: 064-741-7400",
+    },
+    {
+        "trprId": "AIG20263001301005",
+        "trprDegr": "1",
+        "traStartDate": "20260824",
+        "traEndDate": "20260915",
+        "ncsCd": "23010101",
+        "title": "(산대특)기계설비유지관리자 (에너지 관리)양성",
+        "ncsName": "설비관리",
+        "institution": "제주폴리텍",
+        "period": "2026.08.24 ~ 2026.09.15",
+        "courseCost": "880,000원",
+        "selfCost": "88,000원",
+        "totalHours": 120,
+        "capacity": "15명",
+        "trainingGoal": "",
+        "address": "제주특별자치도 제주시 연삼로 1",
+        "curriculum": [
+            {"title": "기계설비 기초", "desc": "냉난방·급배수 설비 구조와 점검 항목 이해"},
+            {"title": "에너지 진단", "desc": "건물 에너지 사용량 분석과 절감 포인트 도출"},
+            {"title": "유지관리 실무", "desc": "정기 점검표 작성, 고장 진단 및 조치 실습"},
+        ],
+        "contact": "제주폴리텍 Tel: 064-754-0200",
+    },
+    {
+        "trprId": "AIG20263001399999",
+        "trprDegr": "2",
+        "traStartDate": "20260907",
+        "traEndDate": "20261030",
+        "ncsCd": "",
+        "title": "(산대특) AI 마케팅 자동화 실무 향상과정 - ChatGPT로 만드는 상세페이지와 SNS 콘텐츠",
+        "ncsName": "",
+        "institution": "제주상공회의소 인력개발원",
+        "period": "2026.09.07 ~ 2026.10.30",
+        "courseCost": "",
+        "selfCost": "",
+        "totalHours": 0,
+        "capacity": "?명",
+        "trainingGoal": "",
+        "address": "",
+        "curriculum": [],
+        "contact": "",
+    },
+]
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 렌더링 회귀 테스트용 코퍼스 (scripts/render_regression.py)
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# SAMPLE_COURSES 3건 + 분야(seo_helper.TITLE_FIELD_KEYWORDS)마다 1건.
+# 분야 과정은 순서대로 훈련시간(단기/일반/장기/미상)·회차(단일/다회차)·
+# 본문 분기(훈련목표/커리큘럼/없음)를 돌려 가며 배정해 조합이 고르게 섞이도록 함.
+
+# (분야 라벨, 과정명) — 라벨은 파일명용, 과정명은 해당 분야로 감지되는 실제형 제목
+_FIELD_TITLES = [
+    ("ai", "생성형 AI 업무자동화 실무자 양성과정"),
+    ("drone_maint", "(산대특) 소형무인기 드론정비 전문인력 양성"),
+    ("drone", "드론배송·드론관제 운영 전문가 양성과정"),
+    ("bakery", "제주 특산물 호텔디저트 제과제빵 실무과정"),
+    ("tour_data", "관광데이터 분석·시각화 실무자 양성"),
+    ("ai_commerce", "AI커머스 나만의브랜드 상세페이지 제작 과정"),
+    ("digital_content", "캔바로 시작하는 디지털콘텐츠 AI워커 양성"),
+    ("video", "유튜브 숏폼 영상 촬영·편집 크리에이터 과정"),
+    ("arch_ai", "건축CAD+AI 융합설계 실무 향상과정"),
+    ("arch", "실내건축 인테리어 설계 BIM 실무자 양성과정"),
+    ("design", "UI/UX 웹디자인 피그마 실무 양성과정"),
+    ("publishing", "전자책 출판 EPUB·오디오북 제작 실무"),
+    ("ecommerce", "스마트스토어 라이브커머스 셀러 양성과정"),
+    ("safety", "중대재해 예방 산업안전 위험성평가 실무"),
+    ("multimedia", "멀티미디어 콘텐츠 제작 기초과정"),
+    ("content", "1인 크리에이터 콘텐츠 기획 과정"),
+    ("marketing_mix", "(산대특) AI마케팅 자동화 퍼포먼스 실무"),
+    ("marketing", "소상공인 광고·마케팅 실무 향상과정"),
+    ("data", "빅데이터 분석 실무자 양성과정"),
+    ("coding", "파이썬 프로그래밍 웹개발 입문"),
+    ("logistics", "지게차 운전기능사 물류 하역 실무과정"),
+    ("landscape", "제주 정원 조경기능사 수목관리 양성과정"),
+    ("energy", "냉동공조 보일러 에너지관리 시설관리자 양성"),
+    ("default", "웨딩 이벤트 플래너 양성과정"),
+]
+
+_HOURS_CYCLE = [80, 200, 400, 0]            # short / general / long / unknown
+_BODY_CYCLE = ["goal", "curriculum", "none"]
+
+
+def _fixture_course(idx, label, title):
+    hours = _HOURS_CYCLE[idx % len(_HOURS_CYCLE)]
+    body = _BODY_CYCLE[idx % len(_BODY_CYCLE)]
+    multi = idx % 2 == 1
+    period = "2026.09.01 ~ 2026.10.15"
+    if multi:
+        period += " | 2회: 2026.10.20 ~ 2026.12.01"
+        if idx % 4 == 3:
+            period += " | 3회: 2027.01.05 ~ 2027.02.16"
+    return {
+        "fixture": label,
+        "trprId": f"AIG2026FIXTURE{idx:04d}",
+        "trprDegr": "1",
+        "traStartDate": "20260901",
+        "traEndDate": "20261015",
+        "ncsCd": "",
+        "title": title,
+        "ncsName": "",
+        "institution": "제주 훈련기관",
+        "period": period,
+        "courseCost": f"{hours * 7000:,}원" if hours else "",
+        "selfCost": f"{hours * 700:,}원" if hours else "",
+        "totalHours": hours,
+        "capacity": "20명",
+        "trainingGoal": (
+            f"{title}의 핵심 실무를 현장 중심으로 익히고, 수료 후 관련 업체에 바로 "
+            f"투입될 수 있는 역량을 갖추는 것을 목표로 합니다. 기초 이론부터 "
+            f"프로젝트 실습까지 단계별로 진행합니다."
+        ) if body == "goal" else "",
+        "address": "제주특별자치도 제주시 중앙로 1" if idx % 3 != 2 else "",
+        "curriculum": [
+            {"title": "기초 이론", "desc": "분야 개요와 필수 용어, 장비·도구 이해"},
+            {"title": "실무 실습", "desc": "현장 사례 기반 단계별 실습"},
+            {"title": "프로젝트", "desc": "포트폴리오용 결과물 제작과 피드백"},
+        ] if body == "curriculum" else [],
+        "contact": "제주 훈련기관 Tel: 064-000-0000",
+    }
+
+
+_SAMPLE_LABELS = ["sample_drone_multi", "sample_energy_curriculum", "sample_long_title"]
+
+REGRESSION_COURSES = (
+    [dict(c, fixture=label) for label, c in zip(_SAMPLE_LABELS, SAMPLE_COURSES)]
+    + [_fixture_course(i, label, title) for i, (label, title) in enumerate(_FIELD_TITLES)]
+)
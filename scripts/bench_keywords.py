@@ -0,0 +1,151 @@
+"""
+키워드 매칭 벤치마크 - 과정당 시간 (기존 루프 vs 컴파일 매처)
+
+사용법:
+  python scripts/bench_keywords.py               # legacy vs compiled 비교
+  python scripts/bench_keywords.py --repeat 200
+  python scripts/bench_keywords.py --json out.json
+
+코퍼스: bench_fixtures.REGRESSION_COURSES (제목 + 훈련목표)
+측정 항목 (과정 1건 = 아래 4개 호출):
+  goal     summarize_training_goal(훈련목표)
+  field    detect_course_field(제목, NCS)
+  seo      extract_seo_keywords 의 KEYWORD_MAP 트리거 매칭
+  visual   _get_field_visual_guide 의 분야 플래그 계산
+
+legacy는 리팩터링 전 루프(패턴별 re.search / 분야 × 키워드 이중 루프 / 플래그별 any())를
+그대로 재현한 비교 기준입니다. 실행 시 두 방식의 결과가 모두 같은지도 확인합니다.
+"""
+
+import json
+import re
+import sys
+import time
+
+from bench_fixtures import REGRESSION_COURSES
+
+
+# ── 기존 방식 재현 (비교 기준) ──
+
+def _legacy_goal(seo, text, max_keywords=3):
+    # 리팩터링 전 정규식 목록과 같은 의미 (공백 1칸 → \s*)
+    found, labels = [], set()
+    for max_count, patterns in seo._GOAL_KEYWORD_GROUPS:
+        cnt = 0
+        for keywords, label in patterns:
+            if cnt >= max_count or len(found) >= max_keywords:
+                break
+            pattern = "|".join(re.escape(k).replace(r"\ ", r"\s*") for k in keywords)
+            if label not in labels and re.search(pattern, text, re.IGNORECASE):
+                found.append(label)
+                labels.add(label)
+                cnt += 1
+    return " · ".join(found[:max_keywords]) if found else ""
+
+
+def _legacy_field(seo, title, ncs_cd):
+    title_upper = title.upper()
+    title_normalized = title_upper.replace(" ", "").replace("(", "").replace(")", "")
+
+    def _match(keyword):
+        kw_upper = keyword.upper()
+        return kw_upper in title_upper or kw_upper.replace(" ", "") in title_normalized
+
+    for field in seo._PRIORITY_FIELDS:
+        if any(_match(kw) for kw in seo.TITLE_FIELD_KEYWORDS.get(field, [])):
+            return seo._PRIORITY_LABEL_TO_KEY.get(field, field)
+    ncs_field, _ = seo._detect_field_by_ncs(ncs_cd)
+    if ncs_field:
+        return ncs_field
+    for field, keywords in seo.TITLE_FIELD_KEYWORDS.items():
+        if any(_match(kw) for kw in keywords):
+            return field
+    return "default"
+
+
+def _legacy_seo(seo, title):
+    return {t for t in seo.KEYWORD_MAP if t.upper() in title.upper()}
+
+
+def _legacy_visual(fi, haystack):
+    return {flag for flag, keywords in fi._VISUAL_KEYWORDS.items()
+            if any(k in haystack for k in keywords)}
+
+
+def _inputs():
+    rows = []
+    for c in REGRESSION_COURSES:
+        goal = c.get("trainingGoal", "") or ""
+        rows.append((c["title"], goal, c.get("ncsCd"), (c["title"] + " " + goal).lower()))
+    return rows
+
+
+def run_mode(mode, rows, repeat):
+    import fetch_images as fi
+    import seo_helper as seo
+    from keyword_matcher import matched_groups
+
+    if mode == "legacy":
+        calls = {
+            "goal": lambda r: _legacy_goal(seo, r[1]) if r[1].strip() else "",
+            "field": lambda r: _legacy_field(seo, r[0], r[2]),
+            "seo": lambda r: _legacy_seo(seo, r[0]),
+            "visual": lambda r: _legacy_visual(fi, r[3]),
+        }
+    else:
+        calls = {
+            "goal": lambda r: seo.summarize_training_goal(r[1]),
+            "field": lambda r: seo.detect_course_field(r[0], r[2]),
+            "seo": lambda r: matched_groups(seo._SEO_TRIGGER_MATCHER, r[0]),
+            "visual": lambda r: matched_groups(fi._VISUAL_MATCHER, r[3]),
+        }
+
+    timings, outputs = {}, {}
+    for name, call in calls.items():
+        outputs[name] = [call(r) for r in rows]
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            for r in rows:
+                call(r)
+        timings[name] = (time.perf_counter() - t0) * 1e6 / (repeat * len(rows))
+    return timings, outputs
+
+
+def main():
+    repeat = 100
+    if "--repeat" in sys.argv:
+        repeat = int(sys.argv[sys.argv.index("--repeat") + 1])
+
+    rows = _inputs()
+    results, outputs = {}, {}
+    for mode in ("legacy", "compiled"):
+        results[mode], outputs[mode] = run_mode(mode, rows, repeat)
+    mismatched = [name for name in outputs["legacy"]
+                  if outputs["legacy"][name] != outputs["compiled"][name]]
+
+    print(f"\n  과정 {len(rows)}건 × 반복 {repeat}회 (과정당 µs)")
+    print(f"  {'항목':<10}{'legacy':>10}{'compiled':>12}{'배속':>8}")
+    print(f"  {'─' * 40}")
+    for name in results["legacy"]:
+        old, new = results["legacy"][name], results["compiled"][name]
+        print(f"  {name:<10}{old:>10.1f}{new:>12.1f}{old / new:>7.1f}x")
+    total_old, total_new = sum(results["legacy"].values()), sum(results["compiled"].values())
+    print(f"  {'합계':<10}{total_old:>10.1f}{total_new:>12.1f}{total_old / total_new:>7.1f}x")
+    if mismatched:
+        print(f"\n  ❌ 결과 불일치: {', '.join(mismatched)}")
+    else:
+        print("\n  ✅ 두 방식 결과 동일")
+
+    if "--json" in sys.argv:
+        json_path = sys.argv[sys.argv.index("--json") + 1]
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump({"courses": len(rows), "repeat": repeat, "us_per_course": results,
+                       "mismatched": mismatched}, f, ensure_ascii=False, indent=2)
+        print(f"  ✅ JSON 저장: {json_path}")
+
+    if mismatched:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
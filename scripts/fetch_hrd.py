@@ -1,14 +1,47 @@
 """
 고용24 훈련과정 API → JSON 변환 스크립트
 GitHub Actions에서 30분마다 실행되어 data/programs.json을 갱신합니다.
+
+배포용 버전 파일 (jeju_program.html이 읽음):
+  배경: 페이지가 programs.json을 ?t=Date.now()로 불러와, 조회마다 HTTP 캐시를 건너뛰고
+  들여쓰기된 JSON 전체를 새로 받았습니다.
+  → data/programs.<해시>.json  압축 JSON(공백 없음) — 내용 해시가 파일명이라 한 번 받으면 계속 캐시
+     · .gz / .br 형제 파일도 함께 생성 (gzip_static·brotli_static을 쓰는 서버·CDN용,
+       brotli 모듈이 없으면 .br 생략)
+     · 해시는 과정 목록만으로 계산 → 갱신 시각만 바뀐 실행은 같은 파일을 그대로 씀
+  → data/programs.latest.json  {갱신 시각, 건수, 현재 버전 파일명} 포인터 (수십 바이트)
+     → 재방문은 포인터 재검증 1회 + 캐시된 버전 파일
+  · 이전 포인터가 가리키던 버전 1개는 남김 (포인터를 먼저 받은 방문자가 404를 보지 않게),
+    그보다 오래된 버전 파일은 삭제
+  · programs.json(들여쓰기)은 ?data= 로 직접 지정하는 기존 임베드용으로 계속 갱신
+
+검색 색인 (data/programs.<해시>.index.json, 포인터의 "index"):
+  배경: 페이지가 전체 행을 표 하나에 innerHTML로 그릴 뿐 검색·필터가 없어,
+  지역·분야가 늘어 수천 건이 되면 원하는 과정을 찾을 수 없습니다.
+  → 과정명·훈련기관·주소의 2글자 n-gram 역색인 + 시작월·지역 버킷
+     · 문서 번호 = 같은 해시 버전 파일의 data 행 순서
+     · 게시 목록은 오름차순 번호의 차분(delta) 배열 — JSON이 작고 gzip이 잘 먹음
+     · 정규화(NFKC·소문자·글자/숫자만)는 페이지의 norm()과 같아야 함
+  → 페이지는 질의의 n-gram 게시 목록 교집합 → 후보만 부분 문자열로 확인
+     (n-gram 교집합은 순서를 보지 않으므로 확인 단계가 필요)
 """
 
+import gzip
+import hashlib
+import unicodedata
 import urllib.request
 import xml.etree.ElementTree as ET
 import json
 import os
+import re
 from datetime import datetime, timezone, timedelta
 
+try:
+    import brotli
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
 API_URL = (
     "https://www.work24.go.kr/cm/openApi/call/hr/callOpenApiSvcInfo310L01.do"
     "?authKey=24e8735a-f4b5-4537-9527-73759314444a"
@@ -29,6 +62,16 @@ FIELDS = [
 
 OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
 OUTPUT_FILE = os.path.join(OUTPUT_DIR, "programs.json")
+LATEST_FILE = os.path.join(OUTPUT_DIR, "programs.latest.json")
+
+# programs.<해시>.json / programs.<해시>.index.json 및 .gz/.br 형제 파일
+_VERSIONED_RE = re.compile(r"^programs\.([0-9a-f]{12})(\.index)?\.json(\.gz|\.br)?$")
+
+# 검색 색인 대상 필드 / n-gram 길이
+SEARCH_FIELDS = ("title", "subTitle", "address")
+SEARCH_GRAM = 2
+_NON_WORD_RE = re.compile(r"[\W_]+")
+_DIGITS_RE = re.compile(r"\d")
 
 
 def fetch_and_parse():
@@ -106,6 +149,147 @@ def fetch_and_parse():
     return rows
 
 
+def _read_latest():
+    try:
+        with open(LATEST_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_bytes(path, data):
+    """내용이 같으면 다시 쓰지 않음 (git 변경·mtime 유지)"""
+    try:
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return
+    except OSError:
+        pass
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def normalize(text):
+    """검색 정규화 — NFKC(전각·호환 문자 통일) + 소문자 + 글자·숫자만 (페이지 norm()과 동일)"""
+    return _NON_WORD_RE.sub("", unicodedata.normalize("NFKC", text or "").lower())
+
+
+def region_of(row):
+    """주소 앞 두 토큰 ("제주 서귀포시") — 시·도만 있으면 그 토큰 (페이지 regionOf()와 동일)"""
+    return " ".join((row.get("address") or "").split()[:2])
+
+
+def month_of(row):
+    """시작일 → "YYYY-MM" (YYYY-MM-DD·YYYYMMDD 모두) (페이지 monthOf()와 동일)"""
+    digits = "".join(_DIGITS_RE.findall(row.get("traStartDate") or ""))
+    return f"{digits[:4]}-{digits[4:6]}" if len(digits) >= 6 else ""
+
+
+def _delta(ids):
+    prev, out = 0, []
+    for i in ids:
+        out.append(i - prev)
+        prev = i
+    return out
+
+
+def build_search_index(rows):
+    """
+    행 목록 → 검색 색인 (n-gram 역색인 + 시작월·지역 버킷)
+
+    Returns:
+        dict: {"v", "gram", "count", "grams": {n-gram: 차분 배열},
+               "facets": {"month": {YYYY-MM: 차분 배열}, "region": {지역: 차분 배열}}}
+    """
+    grams, months, regions = {}, {}, {}
+    for doc_id, row in enumerate(rows):
+        seen = set()
+        for field in SEARCH_FIELDS:
+            text = normalize(row.get(field))
+            # 필드끼리 이어 붙이지 않음 → 필드 경계를 넘는 n-gram 없음
+            for i in range(len(text) - SEARCH_GRAM + 1):
+                seen.add(text[i:i + SEARCH_GRAM])
+        for gram in seen:
+            grams.setdefault(gram, []).append(doc_id)
+        month = month_of(row)
+        if month:
+            months.setdefault(month, []).append(doc_id)
+        region = region_of(row)
+        if region:
+            regions.setdefault(region, []).append(doc_id)
+
+    return {
+        "v": 1,
+        "gram": SEARCH_GRAM,
+        "count": len(rows),
+        "grams": {g: _delta(ids) for g, ids in sorted(grams.items())},
+        "facets": {
+            "month": {k: _delta(ids) for k, ids in sorted(months.items())},
+            "region": {k: _delta(ids) for k, ids in sorted(regions.items())},
+        },
+    }
+
+
+def _write_compressed(path, body):
+    """본문 + .gz(+.br) 저장 → 크기 요약 문자열"""
+    _write_bytes(path, body)
+    # mtime=0: 같은 내용이면 .gz도 바이트 단위로 같음
+    _write_bytes(path + ".gz", gzip.compress(body, compresslevel=9, mtime=0))
+    sizes = [f"json {len(body):,}B", f"gz {os.path.getsize(path + '.gz'):,}B"]
+    if HAS_BROTLI:
+        _write_bytes(path + ".br", brotli.compress(body, quality=11))
+        sizes.append(f"br {os.path.getsize(path + '.br'):,}B")
+    return ", ".join(sizes)
+
+
+def publish_versioned(output):
+    """
+    압축 JSON을 내용 해시 파일명으로 저장하고 포인터를 갱신합니다.
+
+    Returns:
+        str: 현재 버전 파일명 (programs.<해시>.json)
+    """
+    payload = {"count": output["count"], "data": output["data"]}
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    digest = hashlib.sha256(body).hexdigest()[:12]
+    name = f"programs.{digest}.json"
+    index_name = f"programs.{digest}.index.json"
+
+    data_sizes = _write_compressed(os.path.join(OUTPUT_DIR, name), body)
+    index = build_search_index(output["data"])
+    index_body = json.dumps(index, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    index_sizes = _write_compressed(os.path.join(OUTPUT_DIR, index_name), index_body)
+
+    previous = _read_latest().get("file")
+    latest = {
+        "updated": output["updated"],
+        "count": output["count"],
+        "file": name,
+        "index": index_name,
+    }
+    tmp_path = LATEST_FILE + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(latest, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, LATEST_FILE)
+
+    keep = {digest}
+    match = _VERSIONED_RE.match(previous or "")
+    if match:
+        keep.add(match.group(1))
+    removed = 0
+    for entry in os.listdir(OUTPUT_DIR):
+        match = _VERSIONED_RE.match(entry)
+        if match and match.group(1) not in keep:
+            os.remove(os.path.join(OUTPUT_DIR, entry))
+            removed += 1
+
+    print(f"📦 버전 파일: {name} ({data_sizes})")
+    print(f"🔎 검색 색인: {index_name} ({index_sizes}, n-gram {len(index['grams']):,}개)")
+    if removed:
+        print(f"   이전 버전 파일 {removed}개 삭제")
+    return name
+
+
 def main():
     os.makedirs(OUTPUT_DIR, exist_ok=True)
 
@@ -115,6 +299,9 @@ def main():
         print(f"❌ API 호출 실패: {e}")
         if os.path.exists(OUTPUT_FILE):
             print("ℹ️  기존 데이터를 유지합니다.")
+            if not os.path.exists(LATEST_FILE):
+                with open(OUTPUT_FILE, "r", encoding="utf-8") as f:
+                    publish_versioned(json.load(f))
             return
         rows = []
 
@@ -133,6 +320,8 @@ def main():
     print(f"✅ {len(rows)}건 저장 완료 → {OUTPUT_FILE}")
     print(f"   갱신 시각: {output['updated']}")
 
+    publish_versioned(output)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,275 @@
+"""
+카드뉴스 렌더링 회귀 테스트 - 골든 이미지 비교 + 슬라이드별 시간·메모리
+
+사용법:
+  python scripts/render_regression.py                   # 골든 이미지와 비교
+  python scripts/render_regression.py --update          # 현재 렌더링으로 골든 이미지 갱신
+  python scripts/render_regression.py --json out.json   # 결과를 JSON으로도 저장
+  python scripts/render_regression.py --only drone,ai   # 일부 fixture만
+  python scripts/render_regression.py --diff-dir diffs  # 불일치 슬라이드의 차이 이미지 저장
+  python scripts/render_regression.py --allow-missing   # 골든이 없는 슬라이드는 통과 (fixture 추가 중)
+  python scripts/render_regression.py --require-goldens # 골든 폴더가 비어 있으면 건너뛰지 않고 실패 (코드 2)
+
+코퍼스: bench_fixtures.REGRESSION_COURSES (전 분야 + 단기/일반/장기 + 다회차 + 긴 제목
++ 훈련목표 없음). 과정마다 v1 커버·상세·신청방법, v2 커버·상세를 렌더링합니다.
+v2 배경은 네트워크 없이 그라데이션 배경(generate_gradient_background)을 사용합니다.
+
+비교 기준:
+  채널 차이가 --tolerance(기본 8)를 넘는 픽셀 비율이 --max-ratio(기본 0.001) 이하면 통과.
+  크기가 다르면 실패. 골든이 없는 슬라이드도 실패 (--allow-missing이면 missing으로 통과).
+  골든 폴더가 아예 비어 있으면(골든 준비 전) 비교를 건너뛰고 안내만 남김 (코드 0, CI에는 notice)
+  → 준비 전에도 CI가 빨간불로 남지 않게. --require-goldens면 코드 2로 실패.
+
+메모리:
+  peak_rss_kb  슬라이드 렌더링 중 최대 RSS 증가분 (Linux: /proc/self/clear_refs로
+               슬라이드마다 최대치 초기화, 그 외 OS는 누적 ru_maxrss 기준)
+  py_peak_kb   tracemalloc 최대치 (Python 객체만 — Pillow 이미지 버퍼는 잡히지 않음)
+
+골든 이미지 준비 (최초 1회, fixture·레이아웃을 의도적으로 바꾼 뒤에도):
+  골든 이미지는 폰트에 따라 달라지므로 CI와 같은 폰트(fonts-noto-cjk)에서 만들어야 합니다.
+  → Actions의 '카드뉴스 렌더링 회귀 테스트' 워크플로를 update=true로 수동 실행하면
+    CI 환경에서 --update 후 scripts/golden/을 커밋합니다.
+  로컬에서 같은 폰트가 설치돼 있다면: python scripts/render_regression.py --update
+
+종료 코드: 실패(diff/size/골든 없음)가 있으면 1, 골든 폴더가 비어 있고 --require-goldens면 2
+"""
+
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from bench_fixtures import REGRESSION_COURSES
+
+from PIL import Image, ImageChops
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+GOLDEN_DIR = os.path.join(SCRIPT_DIR, "golden")
+
+
+def _arg(name, default=None):
+    if name in sys.argv:
+        return sys.argv[sys.argv.index(name) + 1]
+    return default
+
+
+# ── 메모리 측정 ──
+
+def _reset_peak_rss():
+    """Linux: VmHWM(최대 RSS)을 현재 RSS로 초기화. 실패하면 False."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _status_kb(field):
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    return 0
+
+
+def _measure(render, path):
+    """render(path) 실행 → (ms, peak_rss_kb, py_peak_kb)"""
+    per_slide = _reset_peak_rss()
+    if per_slide:
+        base_rss = _status_kb("VmRSS")
+    else:
+        import resource
+        base_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    render(path)
+    elapsed = time.perf_counter() - t0
+    _, py_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    if per_slide:
+        peak_rss = _status_kb("VmHWM") - base_rss
+    else:
+        import resource
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - base_rss
+    return round(elapsed * 1000, 1), max(peak_rss, 0), py_peak // 1024
+
+
+# ── 픽셀 비교 ──
+
+def compare_images(actual_path, golden_path, tolerance, diff_path=None):
+    """
+    Returns:
+        dict: {status, diff_ratio, max_delta}
+    """
+    if not os.path.exists(golden_path):
+        return {"status": "missing", "diff_ratio": None, "max_delta": None}
+    with Image.open(actual_path) as a, Image.open(golden_path) as g:
+        a, g = a.convert("RGB"), g.convert("RGB")
+        if a.size != g.size:
+            return {"status": "size", "diff_ratio": 1.0, "max_delta": None,
+                    "size": list(a.size), "golden_size": list(g.size)}
+        diff = ImageChops.difference(a, g)
+    # 채널별 최대 차이 → 허용치 초과 픽셀 수
+    delta = _channel_max(diff)
+    max_delta = delta.getextrema()[1]
+    over = sum(delta.point(lambda v: 255 if v > tolerance else 0).histogram()[255:])
+    ratio = over / (delta.size[0] * delta.size[1])
+    if over and diff_path:
+        os.makedirs(os.path.dirname(diff_path), exist_ok=True)
+        delta.point(lambda v: 255 if v > tolerance else v).save(diff_path)
+    return {"status": "ok", "diff_ratio": round(ratio, 6), "max_delta": max_delta}
+
+
+def _channel_max(diff):
+    r, g, b = diff.split()
+    return ImageChops.lighter(ImageChops.lighter(r, g), b)
+
+
+# ── 렌더링 ──
+
+def slide_jobs(course):
+    """(슬라이드 이름, render(path)) 목록"""
+    import generate_cardnews as v1
+    import generate_cardnews_v2 as v2
+    from fetch_images import generate_gradient_background
+
+    bg = generate_gradient_background(course)
+    credit = {"source": "AI Generated"}
+    return [
+        ("v1_cover", lambda p: v1.generate_slide_cover(course, p)),
+        ("v1_detail", lambda p: v1.generate_slide_detail(course, p)),
+        ("v1_howto", lambda p: v1.generate_slide_howto(course, p)),
+        ("v2_cover", lambda p: v2.generate_cover_v2(course, bg, credit, p)),
+        ("v2_detail", lambda p: v2.generate_detail_v2(course, bg, p)),
+    ]
+
+
+def run(courses, golden_dir, tolerance, max_ratio, update=False, diff_dir=None, strict=True):
+    import shutil
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for course in courses:
+            for slide, render in slide_jobs(course):
+                name = f"{course['fixture']}_{slide}.png"
+                out_path = os.path.join(tmp, name)
+                ms, peak_rss, py_peak = _measure(render, out_path)
+                golden_path = os.path.join(golden_dir, name)
+
+                if update:
+                    os.makedirs(golden_dir, exist_ok=True)
+                    shutil.copyfile(out_path, golden_path)
+                    cmp = {"status": "updated", "diff_ratio": None, "max_delta": None}
+                else:
+                    cmp = compare_images(out_path, golden_path, tolerance,
+                                         os.path.join(diff_dir, name) if diff_dir else None)
+                    if cmp["status"] == "ok" and cmp["diff_ratio"] > max_ratio:
+                        cmp["status"] = "diff"
+                    if cmp["status"] == "missing" and strict:
+                        cmp["status"] = "fail_missing"
+
+                results.append({
+                    "fixture": course["fixture"],
+                    "slide": slide,
+                    "ms": ms,
+                    "peak_rss_kb": peak_rss,
+                    "py_peak_kb": py_peak,
+                    **cmp,
+                })
+    return results
+
+
+def summarize(results):
+    by_slide = {}
+    for r in results:
+        by_slide.setdefault(r["slide"], []).append(r)
+    summary = {"slides": len(results), "status": {}, "by_slide": {}}
+    for r in results:
+        summary["status"][r["status"]] = summary["status"].get(r["status"], 0) + 1
+    for slide, rows in by_slide.items():
+        times = sorted(r["ms"] for r in rows)
+        summary["by_slide"][slide] = {
+            "mean_ms": round(sum(times) / len(times), 1),
+            "p95_ms": times[min(len(times) - 1, int(len(times) * 0.95))],
+            "max_peak_rss_kb": max(r["peak_rss_kb"] for r in rows),
+        }
+    summary["failed"] = sum(summary["status"].get(s, 0) for s in ("diff", "size", "fail_missing"))
+    return summary
+
+
+def _has_goldens(golden_dir):
+    """골든 폴더에 PNG가 하나라도 있는지"""
+    try:
+        return any(name.endswith(".png") for name in os.listdir(golden_dir))
+    except OSError:
+        return False
+
+
+def main():
+    golden_dir = _arg("--golden-dir", GOLDEN_DIR)
+    tolerance = int(_arg("--tolerance", "8"))
+    max_ratio = float(_arg("--max-ratio", "0.001"))
+    only = _arg("--only")
+    update = "--update" in sys.argv
+    courses = REGRESSION_COURSES
+    if only:
+        wanted = set(only.split(","))
+        courses = [c for c in courses if c["fixture"] in wanted]
+
+    if not update and not _has_goldens(golden_dir):
+        required = "--require-goldens" in sys.argv
+        print(f"  {'❌' if required else '⏭️ '} 골든 이미지가 없습니다: {os.path.relpath(golden_dir)}")
+        print("     비교할 기준이 없어 회귀 테스트를 건너뜁니다.")
+        print("     CI 폰트 환경에서 --update로 골든을 먼저 만드세요 (스크립트 상단 '골든 이미지 준비' 참고).")
+        if os.environ.get("GITHUB_ACTIONS"):
+            print("::notice title=렌더링 회귀 테스트 건너뜀::골든 이미지가 없습니다. "
+                  "워크플로를 update=true로 수동 실행해 scripts/golden/을 만드세요.")
+        sys.exit(2 if required else 0)
+
+    results = run(courses, golden_dir, tolerance, max_ratio,
+                  update=update, diff_dir=_arg("--diff-dir"),
+                  strict="--allow-missing" not in sys.argv)
+    summary = summarize(results)
+
+    print(f"\n  fixture {len(courses)}건 × 슬라이드 {len(results) // max(len(courses), 1)}장 "
+          f"| 허용치 {tolerance} / 최대 비율 {max_ratio}")
+    print(f"  {'슬라이드':<12}{'평균 ms':>10}{'p95 ms':>10}{'peak RSS(KB)':>15}")
+    print(f"  {'─' * 47}")
+    for slide, s in summary["by_slide"].items():
+        print(f"  {slide:<12}{s['mean_ms']:>10.1f}{s['p95_ms']:>10.1f}{s['max_peak_rss_kb']:>15,}")
+    print()
+    for r in results:
+        if r["status"] in ("diff", "size", "fail_missing"):
+            print(f"  ❌ {r['fixture']}_{r['slide']}: {r['status']} "
+                  f"(비율 {r['diff_ratio']}, 최대 차이 {r['max_delta']})")
+    print(f"  결과: {summary['status']}")
+
+    if _arg("--json"):
+        payload = {
+            "meta": {
+                "python": platform.python_version(),
+                "pillow": Image.__version__,
+                "platform": platform.platform(),
+                "tolerance": tolerance,
+                "max_ratio": max_ratio,
+                "golden_dir": os.path.relpath(golden_dir),
+            },
+            "summary": summary,
+            "slides": results,
+        }
+        with open(_arg("--json"), "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+        print(f"\n  ✅ JSON 저장: {_arg('--json')}")
+
+    if summary["failed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,15 +11,24 @@ v4 전면 개편 (과정별 차별화):
   7) NCS 직무분류 코드 기반 정밀 분야 감지
 """
 
+import bisect
 import re
 import random
 from datetime import datetime, timedelta
 
+from course_context import course_context, course_rng, research_version, stable_hash
+from keyword_matcher import compile_keywords, expand_spaces, first_hit, keyword_hits, matched_groups
+from ncs_catalog import build_trie, insert, load_catalog, walk
+from text_template import compile_template, render, section
+
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # [아이디어 7] NCS 코드 기반 분야 감지
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
+# 분류명은 ncs_catalog(data/ncs_classification.csv)에서 읽고,
+# 아래 dict 3개는 그 위에 얹는 수작업 보정입니다 (분류명만으로 맞지 않는 분야·키워드).
+
 # NCS 8자리 세분류 정확매칭 (최우선 조회)
 # 배경: 4자리 접두사만으로는 세분류를 구분할 수 없어 오분류가 발생했습니다.
 #   예) 20010105(빅데이터분석) → "2001" 매칭 → "코딩"으로 잘못 분류
@@ -76,33 +85,64 @@ NCS_SUB_KEYWORDS = {
 }
 
 
+_ncs_trie = None
+
+
+def _catalog_field(name):
+    """분류명 → 분야 (제목 키워드 매칭과 같은 규칙: 고유 복합 키워드 우선)"""
+    hits = keyword_hits(_TITLE_FIELD_MATCHER, name)
+    priority_hits = [field for _, field, _ in hits if field in _PRIORITY_RANK]
+    if priority_hits:
+        field = min(priority_hits, key=_PRIORITY_RANK.get)
+        return _PRIORITY_LABEL_TO_KEY.get(field, field)
+    return hits[0][1] if hits else None
+
+
+def _get_ncs_trie():
+    """NCS 분류표 + 수작업 보정 → 접두사 트리 (첫 호출 시 1회 구축)
+
+    노드 필드:
+      name      분류표의 분류명
+      field     분류명에서 감지한 분야 (제목 키워드 규칙)
+      override  NCS_FIELD_MAP·NCS_CODE_EXACT 지정 분야 (경로에 하나라도 있으면 field보다 우선)
+      sub       NCS_SUB_KEYWORDS 지정 세부 키워드 (같은 단계에서 name보다 우선)
+    """
+    global _ncs_trie
+    if _ncs_trie is not None:
+        return _ncs_trie
+    catalog = load_catalog()
+    trie = build_trie(catalog)
+    for code, name in catalog.items():
+        insert(trie, code, field=_catalog_field(name))
+    for overrides in (NCS_FIELD_MAP, NCS_CODE_EXACT):
+        for code, field in overrides.items():
+            insert(trie, code, override=field)
+    for code, sub in NCS_SUB_KEYWORDS.items():
+        insert(trie, code, sub=sub)
+    _ncs_trie = trie
+    return trie
+
+
 def _detect_field_by_ncs(ncs_cd):
     """NCS 코드에서 분야를 감지합니다.
 
-    조회 순서 (v5): 8자리 정확매칭 → 6자리 → 4자리 → 2자리
-      · 8자리 세분류가 등록되어 있으면 최우선으로 사용합니다.
-      · 세부 키워드(sub_keyword)도 8자리 → 6자리 순으로 조회합니다.
+    조회 (v6): 분류표 접두사 트리를 대분류부터 2자리씩 1회 따라 내려감
+      · 분야: 지나온 경로에 수작업 보정(override)이 있으면 가장 깊은 보정값
+        → 보정이 하나도 없을 때만 분류명에서 감지한 가장 깊은 분야로 채움
+        (예: 20010105 → 세분류 보정 "데이터", 080205 실내디자인 → 0802 보정 "디자인" 유지)
+      · 세부 키워드(sub_keyword): 소·세분류(6·8자리) 중 가장 깊은 단계의 보정값 또는 분류명
     """
     if not ncs_cd or len(str(ncs_cd).strip()) < 2:
         return None, None
     ncs_cd = str(ncs_cd).strip()
 
-    # 세부 키워드: 8자리 우선, 없으면 6자리
-    sub_keyword = None
-    if len(ncs_cd) >= 8:
-        sub_keyword = NCS_SUB_KEYWORDS.get(ncs_cd[:8])
-    if sub_keyword is None and len(ncs_cd) >= 6:
-        sub_keyword = NCS_SUB_KEYWORDS.get(ncs_cd[:6])
-
-    # 분야: 8자리 정확매칭 최우선
-    if len(ncs_cd) >= 8 and ncs_cd[:8] in NCS_CODE_EXACT:
-        return NCS_CODE_EXACT[ncs_cd[:8]], sub_keyword
-
-    for length in (6, 4, 2):
-        prefix = ncs_cd[:length]
-        if prefix in NCS_FIELD_MAP:
-            return NCS_FIELD_MAP[prefix], sub_keyword
-    return None, sub_keyword
+    override = catalog_field = sub_keyword = None
+    for depth, node in enumerate(walk(_get_ncs_trie(), ncs_cd), 1):
+        override = node.get("override") or override
+        catalog_field = node.get("field") or catalog_field
+        if depth >= 3:
+            sub_keyword = node.get("sub") or node.get("name") or sub_keyword
+    return override or catalog_field, sub_keyword
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -150,6 +190,35 @@ _PRIORITY_LABEL_TO_KEY = {
 }
 
 
+# 1단계 우선 분야 (NCS보다 먼저 제목으로 판정)
+# ⚠️ 순서 중요:
+#   · "드론정비"는 "드론"보다 앞 — 뒤에 두면 정비 과정이 드론(배송)으로 흡수됨
+#   · "제과제빵"·"관광데이터"·"AI커머스"·"디지털콘텐츠"·"마케팅복합"은 "AI"보다 앞
+#     (제목에 'AI 활용'이 붙는 과정이 전부 AI 분야로 흡수되는 것을 방지)
+#   · "마케팅복합"은 "영상"·"콘텐츠"보다도 앞 — "AI 유튜브 크리에이터",
+#     "유튜브 크리에이터 마케팅" 등이 영상/콘텐츠로 새는 것을 방지
+_PRIORITY_FIELDS = [
+    "드론정비", "드론",
+    "제과제빵", "관광데이터", "AI커머스", "디지털콘텐츠", "마케팅복합",
+    "건축AI", "건축/설계", "물류/운송", "조경", "에너지/시설관리",
+]
+_PRIORITY_RANK = {field: i for i, field in enumerate(_PRIORITY_FIELDS)}
+
+
+def _fold_title(text):
+    """대문자 + 공백·괄호 제거 ("에너지 관리", "냉동 공조" 같은 공백 변형도 매칭)"""
+    return text.upper().replace(" ", "").replace("(", "").replace(")", "")
+
+
+# 분야 키워드 매처 (priority = TITLE_FIELD_KEYWORDS 순서 = 3단계 폴백 순서)
+_TITLE_FIELD_MATCHER = compile_keywords(
+    [(kw, field, field, i)
+     for i, (field, keywords) in enumerate(TITLE_FIELD_KEYWORDS.items())
+     for kw in keywords],
+    fold=_fold_title,
+)
+
+
 def detect_course_field(title, ncs_cd=None):
     """과정 분야를 감지합니다.
     
@@ -161,43 +230,24 @@ def detect_course_field(title, ncs_cd=None):
       · 제목과 키워드 모두 공백·괄호 제거 후 비교하여
         "에너지 관리", "냉동 공조" 같은 공백 변형도 자동 매칭
       · 원본 제목에 대한 매칭도 함께 시도하여 기존 동작 보존
+        (정규화본 매칭이 원본 매칭을 포함하므로 정규화본 1회 스캔으로 충분)
     """
-    # 원본(대문자) + 공백/괄호 제거 정규화본 모두 준비
-    title_upper = title.upper()
-    title_normalized = title_upper.replace(" ", "").replace("(", "").replace(")", "")
-
-    def _match(keyword):
-        kw_upper = keyword.upper()
-        kw_normalized = kw_upper.replace(" ", "")
-        return (kw_upper in title_upper) or (kw_normalized in title_normalized)
-
-    # 1단계: 고유 복합 키워드 우선 체크 (NCS 오분류 방지)
-    # ⚠️ 순서 중요:
-    #   · "드론정비"는 "드론"보다 앞 — 뒤에 두면 정비 과정이 드론(배송)으로 흡수됨
-    #   · "제과제빵"·"관광데이터"·"AI커머스"·"디지털콘텐츠"·"마케팅복합"은 "AI"보다 앞
-    #     (제목에 'AI 활용'이 붙는 과정이 전부 AI 분야로 흡수되는 것을 방지)
-    #   · "마케팅복합"은 "영상"·"콘텐츠"보다도 앞 — "AI 유튜브 크리에이터",
-    #     "유튜브 크리에이터 마케팅" 등이 영상/콘텐츠로 새는 것을 방지
-    _priority_fields = [
-        "드론정비", "드론",
-        "제과제빵", "관광데이터", "AI커머스", "디지털콘텐츠", "마케팅복합",
-        "건축AI", "건축/설계", "물류/운송", "조경", "에너지/시설관리",
-    ]
-    for field in _priority_fields:
-        if field in TITLE_FIELD_KEYWORDS:
-            for kw in TITLE_FIELD_KEYWORDS[field]:
-                if _match(kw):
-                    # 복합 라벨은 실제 리서치 JSON 키로 환원
-                    return _PRIORITY_LABEL_TO_KEY.get(field, field)
+    # 제목 1회 스캔 → 매칭된 분야 전체 (TITLE_FIELD_KEYWORDS 순서)
+    hits = keyword_hits(_TITLE_FIELD_MATCHER, title)
+
+    # 1단계: 고유 복합 키워드 우선 체크 (NCS 오분류 방지, _PRIORITY_FIELDS 순서)
+    priority_hits = [field for _, field, _ in hits if field in _PRIORITY_RANK]
+    if priority_hits:
+        field = min(priority_hits, key=_PRIORITY_RANK.get)
+        # 복합 라벨은 실제 리서치 JSON 키로 환원
+        return _PRIORITY_LABEL_TO_KEY.get(field, field)
     # 2단계: NCS 코드 매핑
     ncs_field, _ = _detect_field_by_ncs(ncs_cd)
     if ncs_field:
         return ncs_field
     # 3단계: 제목 일반 키워드 폴백
-    for field, keywords in TITLE_FIELD_KEYWORDS.items():
-        for kw in keywords:
-            if _match(kw):
-                return field
+    if hits:
+        return hits[0][1]
     return "default"
 
 
@@ -445,7 +495,7 @@ def _generate_dynamic_hook(title, field, goal_summary=""):
     short_candidates = field_hooks.get(field, field_hooks["default"]) + goal_hooks
     long_candidates = dynamic_templates
 
-    idx = hash(title) % max(len(short_candidates), 1)
+    idx = stable_hash(title) % max(len(short_candidates), 1)
     if short_candidates:
         hook = short_candidates[idx % len(short_candidates)]
     else:
@@ -518,68 +568,84 @@ def _generate_benefit_line(course_data, ctype, hours):
 # 훈련목표 핵심 키워드 요약
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
+# (그룹당 최대 개수, [(키워드 목록, 라벨)]) — 그룹·키워드 순서가 곧 우선순위
+# 키워드는 대소문자 무시, 공백 1칸은 '공백 있음/없음' 모두 매칭 ("영상 편집" = 영상\s*편집)
+_GOAL_KEYWORD_GROUPS = [
+    (2, [
+        (["프리미어 프로", "Premiere Pro"], "프리미어 프로"),
+        (["에프터 이펙트", "After Effects"], "에프터 이펙트"),
+        (["다빈치 리졸브"], "다빈치 리졸브"),
+        (["피그마", "Figma"], "피그마"),
+        (["인디자인", "InDesign"], "인디자인"),
+        (["포토샵", "Photoshop"], "포토샵"),
+        (["일러스트레이터", "Illustrator"], "일러스트레이터"),
+        (["파이썬", "Python"], "파이썬"),
+        (["블렌더", "Blender"], "블렌더"),
+        (["유니티", "Unity"], "유니티"),
+    ]),
+    (1, [
+        (["생성형 AI"], "생성형 AI"),
+        (["ChatGPT", "챗GPT"], "ChatGPT"),
+        (["미드저니", "Midjourney"], "미드저니"),
+        (["Stable Diffusion"], "Stable Diffusion"),
+        (["머신러닝"], "머신러닝"),
+        (["딥러닝"], "딥러닝"),
+        (["AI", "인공지능"], "AI 활용"),
+    ]),
+    (2, [
+        (["영상 편집"], "영상 편집"),
+        (["영상 제작", "영상 촬영"], "영상 제작"),
+        (["숏폼"], "숏폼 제작"),
+        (["UI/UX 디자인", "UIUX 디자인", "UI 설계"], "UI/UX 디자인"),
+        (["편집 디자인"], "편집디자인"),
+        (["웹 디자인"], "웹디자인"),
+        (["전자책", "ebook", "e-book", "EPUB"], "전자책 제작"),
+        (["콘텐츠 제작"], "콘텐츠 제작"),
+        (["콘텐츠 기획"], "콘텐츠 기획"),
+        (["빅데이터", "데이터 분석"], "데이터 분석"),
+        (["디지털 마케팅", "SNS 마케팅"], "디지털 마케팅"),
+    ]),
+    (1, [
+        (["포트폴리오"], "포트폴리오 완성"),
+        (["실무 프로젝트", "현장 실습"], "실무 프로젝트"),
+        (["취업"], "취업 연계"),
+        (["자격증"], "자격증 취득"),
+        (["창업"], "창업 준비"),
+    ]),
+]
+
+
+def _fold_goal(text):
+    """소문자 + 연속 공백(줄바꿈 포함)을 1칸으로"""
+    return " ".join(text.lower().split())
+
+
+# priority = (그룹 번호, 그룹 내 순서)
+_GOAL_MATCHER = compile_keywords(
+    [(variant, g, label, (g, i))
+     for g, (_, patterns) in enumerate(_GOAL_KEYWORD_GROUPS)
+     for i, (keywords, label) in enumerate(patterns)
+     for keyword in keywords
+     for variant in expand_spaces(keyword)],
+    fold=_fold_goal,
+)
+
+
 def summarize_training_goal(training_goal, max_keywords=3):
     """훈련목표 텍스트에서 핵심 키워드를 추출합니다."""
     if not training_goal or not training_goal.strip():
         return ""
-    text = training_goal.strip()
-
-    keyword_groups = [
-        {"patterns": [
-            (r'프리미어\s*프로|Premiere\s*Pro', "프리미어 프로"),
-            (r'에프터\s*이펙트|After\s*Effects', "에프터 이펙트"),
-            (r'다빈치\s*리졸브', "다빈치 리졸브"),
-            (r'피그마|Figma', "피그마"),
-            (r'인디자인|InDesign', "인디자인"),
-            (r'포토샵|Photoshop', "포토샵"),
-            (r'일러스트레이터|Illustrator', "일러스트레이터"),
-            (r'파이썬|Python', "파이썬"),
-            (r'블렌더|Blender', "블렌더"),
-            (r'유니티|Unity', "유니티"),
-        ], "max": 2},
-        {"patterns": [
-            (r'생성형\s*AI', "생성형 AI"),
-            (r'ChatGPT|챗GPT', "ChatGPT"),
-            (r'미드저니|Midjourney', "미드저니"),
-            (r'Stable\s*Diffusion', "Stable Diffusion"),
-            (r'머신러닝', "머신러닝"),
-            (r'딥러닝', "딥러닝"),
-            (r'AI|인공지능', "AI 활용"),
-        ], "max": 1},
-        {"patterns": [
-            (r'영상\s*편집', "영상 편집"),
-            (r'영상\s*제작|영상\s*촬영', "영상 제작"),
-            (r'숏폼', "숏폼 제작"),
-            (r'UI/?UX\s*디자인|UI\s*설계', "UI/UX 디자인"),
-            (r'편집\s*디자인|편집디자인', "편집디자인"),
-            (r'웹\s*디자인', "웹디자인"),
-            (r'전자책|e-?book|EPUB', "전자책 제작"),
-            (r'콘텐츠\s*제작', "콘텐츠 제작"),
-            (r'콘텐츠\s*기획', "콘텐츠 기획"),
-            (r'빅데이터|데이터\s*분석', "데이터 분석"),
-            (r'디지털\s*마케팅|SNS\s*마케팅', "디지털 마케팅"),
-        ], "max": 2},
-        {"patterns": [
-            (r'포트폴리오', "포트폴리오 완성"),
-            (r'실무\s*프로젝트|현장\s*실습', "실무 프로젝트"),
-            (r'취업', "취업 연계"),
-            (r'자격증', "자격증 취득"),
-            (r'창업', "창업 준비"),
-        ], "max": 1},
-    ]
 
     found = []
-    labels = set()
-    for group in keyword_groups:
-        cnt = 0
-        for pattern, label in group["patterns"]:
-            if cnt >= group["max"] or len(found) >= max_keywords:
-                break
-            if label not in labels and re.search(pattern, text, re.IGNORECASE):
-                found.append(label)
-                labels.add(label)
-                cnt += 1
-    return " · ".join(found[:max_keywords]) if found else ""
+    group_counts = {}
+    for _, g, label in keyword_hits(_GOAL_MATCHER, training_goal.strip()):
+        if len(found) >= max_keywords:
+            break
+        if group_counts.get(g, 0) >= _GOAL_KEYWORD_GROUPS[g][0] or label in found:
+            continue
+        found.append(label)
+        group_counts[g] = group_counts.get(g, 0) + 1
+    return " · ".join(found) if found else ""
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -621,6 +687,12 @@ COMMON_SEARCH_KEYWORDS = [
     "제주디지털전환", "제주AI교육",
 ]
 
+# KEYWORD_MAP 트리거 매처 (대소문자 무시)
+_SEO_TRIGGER_MATCHER = compile_keywords(
+    [(trigger, trigger, trigger, i) for i, trigger in enumerate(KEYWORD_MAP)],
+    fold=str.upper,
+)
+
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # 공감형 도입부
@@ -735,12 +807,11 @@ EMPATHY_INTROS = {
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
 def extract_seo_keywords(course_data):
-    """과정 데이터에서 SEO 키워드를 추출합니다."""
-    title = course_data.get("title", "")
+    """과정 데이터(dict 또는 CourseContext)에서 SEO 키워드를 추출합니다."""
+    title = course_context(course_data).title
     keywords = set()
-    for trigger, mapped in KEYWORD_MAP.items():
-        if trigger.upper() in title.upper():
-            keywords.update(mapped)
+    for trigger in matched_groups(_SEO_TRIGGER_MATCHER, title):
+        keywords.update(KEYWORD_MAP[trigger])
     keywords.update(COMMON_SEARCH_KEYWORDS)
     year = datetime.now().year
     keywords.add(f"{year}국비지원")
@@ -753,8 +824,9 @@ def extract_seo_keywords(course_data):
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
 # 수치 토큰 패턴: 숫자 + (단위)
+# 첫 글자를 [0-9] 한 글자로 분리해 두면 정규식 엔진이 숫자 위치로 바로 건너뜀 ([0-9]+와 같은 매칭, 약 2배 빠름)
 _NUM_TOKEN_RE = re.compile(
-    r'[0-9]+(?:[.,][0-9]+)*\s*(?:%|배|만|억|조|시간|분|초|건|개|년|월|일|p|가구|곳|명|위|㎢|km)?'
+    r'[0-9][0-9]*(?:[.,][0-9]+)*\s*(?:%|배|만|억|조|시간|분|초|건|개|년|월|일|p|가구|곳|명|위|㎢|km)?'
 )
 
 
@@ -768,7 +840,7 @@ def extract_number_tokens(text):
     return {t.strip() for t in _NUM_TOKEN_RE.findall(text) if t.strip()}
 
 
-def _pick_non_overlapping_hook(hooks, seo_body):
+def _pick_non_overlapping_hook(hooks, seo_body, rng=random):
     """SEO 섹션과 수치가 겹치지 않는 도입부 훅을 우선 선택합니다.
 
     선택 기준 (우선순위):
@@ -782,7 +854,7 @@ def _pick_non_overlapping_hook(hooks, seo_body):
     if not hooks:
         return None
     if not seo_body:
-        return random.choice(hooks)
+        return rng.choice(hooks)
 
     seo_nums = extract_number_tokens(seo_body)
     scored = []
@@ -794,7 +866,7 @@ def _pick_non_overlapping_hook(hooks, seo_body):
     best = [s for s in scored if s[0] == min_overlap]
     min_nums = min(s[1] for s in best)
     finalists = [s[2] for s in best if s[1] == min_nums]
-    return random.choice(finalists)
+    return rng.choice(finalists)
 
 
 def get_overlap_report(intro_text, seo_text):
@@ -802,7 +874,11 @@ def get_overlap_report(intro_text, seo_text):
 
     작업 가이드 상단에 출력해 발행 전 육안 검수를 돕습니다.
     """
-    dup = sorted(extract_number_tokens(intro_text) & extract_number_tokens(seo_text))
+    return _overlap_message(extract_number_tokens(intro_text) & extract_number_tokens(seo_text))
+
+
+def _overlap_message(dup_tokens):
+    dup = sorted(dup_tokens)
     if not dup:
         return "  ✅ 도입부 ↔ '왜 배워야 할까요?' 수치 중복 없음"
     return (
@@ -821,11 +897,11 @@ def generate_seo_title(course_data):
     - 연도 포함으로 최신성 확보
     - 예: "제주 AI영상편집 국비교육 2026"
     """
-    from benefits_helper import get_course_type
-    title = course_data.get("title", "")
-    ctype = get_course_type(course_data)
+    ctx = course_context(course_data)
+    title = ctx.title
+    ctype = ctx.ctype
     year = datetime.now().year
-    field = detect_course_field(title, course_data.get("ncsCd"))
+    field = ctx.field
 
     # 과정명에서 핵심 키워드 추출 (괄호, 접두사 제거)
     core = _extract_title_core(title)
@@ -922,7 +998,7 @@ def generate_seo_title(course_data):
     return seo_title
 
 
-def generate_empathy_intro(course_data):
+def generate_empathy_intro(course_data, variant=0):
     """
     과정별로 차별화된 공감형 도입부를 생성합니다.
 
@@ -930,29 +1006,32 @@ def generate_empathy_intro(course_data):
     - field_research.json 캐시가 있으면 연구 기반 도입부 우선 사용
     - 첫 200자 안에 핵심 키워드(제주, 국비지원, 분야) 반드시 포함
     - 대화체(~거든요, ~이에요) 혼용으로 AI 패턴 회피
-    """
-    from benefits_helper import get_course_type, get_total_hours
 
-    title = course_data.get("title", "")
-    field = detect_course_field(title, course_data.get("ncsCd"))
-    ctype = get_course_type(course_data)
-    hours = get_total_hours(course_data)
+    variant: 유사 글 재생성 회차 (과정 시드에 섞어 다른 훅을 고름)
+    """
+    ctx = course_context(course_data)
+    rng = course_rng(ctx, "empathy", variant)
+    course_data = ctx.course
+    title = ctx.title
+    field = ctx.field
+    ctype = ctx.ctype
+    hours = ctx.hours
     self_cost = course_data.get("selfCost", "")
 
     # 1순위: field_research.json 캐시에서 연구 기반 도입부 로드
     # v5: SEO 섹션과 수치가 겹치지 않는 훅을 우선 선택 (중복 방지)
     try:
         from field_research_helper import get_empathy_hooks, get_seo_section
-        cached_hooks = get_empathy_hooks(field, title=title)
+        cached_hooks = get_empathy_hooks(field, title=title, research=ctx.research)
         if cached_hooks:
-            seo_body = get_seo_section(field, title=title) or ""
-            intro = _pick_non_overlapping_hook(cached_hooks, seo_body)
+            seo_body = get_seo_section(field, title=title, research=ctx.research) or ""
+            intro = _pick_non_overlapping_hook(cached_hooks, seo_body, rng)
         else:
             intros = EMPATHY_INTROS.get(field, EMPATHY_INTROS["default"])
-            intro = random.choice(intros)
+            intro = rng.choice(intros)
     except ImportError:
         intros = EMPATHY_INTROS.get(field, EMPATHY_INTROS["default"])
-        intro = random.choice(intros)
+        intro = rng.choice(intros)
 
     # ── 확장 단락 1: 분야별 맥락 (intro_context) ──
     # 도입부와 'SEO 섹션'의 역할을 분리합니다.
@@ -961,7 +1040,7 @@ def generate_empathy_intro(course_data):
     context_para = ""
     try:
         from field_research_helper import get_intro_context
-        context_para = get_intro_context(field, title=title) or ""
+        context_para = get_intro_context(field, title=title, research=ctx.research) or ""
     except ImportError:
         pass
 
@@ -976,7 +1055,7 @@ def generate_empathy_intro(course_data):
         "이 글에서는 산업 현황부터 커리큘럼, 신청 방법까지 순서대로 짚어볼게요.",
         "그래서 이 과정이 어떤 배경에서 만들어졌는지, 실제로 무엇을 배우는지 차근차근 살펴보려고 해요.",
     ]
-    intro += f"\n\n{bridges[abs(hash(title)) % len(bridges)]}"
+    intro += f"\n\n{bridges[ctx.seed % len(bridges)]}"
 
     # SEO: 첫 200자 안에 "제주" 키워드가 없으면 보강
     first_200 = intro[:200]
@@ -992,8 +1071,7 @@ def generate_empathy_intro(course_data):
 
 def generate_blog_hashtags(course_data):
     """네이버 블로그용 해시태그를 생성합니다."""
-    title = course_data.get("title", "")
-    field = detect_course_field(title, course_data.get("ncsCd"))
+    field = course_context(course_data).field
     year = datetime.now().year
     common = [
         f"#{year}국비지원", "#내일배움카드", "#제주국비지원교육",
@@ -1043,8 +1121,9 @@ def generate_instagram_hashtags(course_data):
     2025년 해시태그 팔로우 폐지 이후, 소수 정예 해시태그가 더 효과적.
     대형 1~2개 + 중소형(지역+분야) 4~5개 = 총 5~8개
     """
-    title = course_data.get("title", "")
-    field = detect_course_field(title, course_data.get("ncsCd"))
+    ctx = course_context(course_data)
+    field = ctx.field
+    rng = course_rng(ctx, "instagram_hashtags")
     year = datetime.now().year
 
     # 대형 태그 (1~2개)
@@ -1082,9 +1161,9 @@ def generate_instagram_hashtags(course_data):
 
     # 조합: 대형 1~2 + 지역 1~2 + 분야 2~3 = 5~7개
     all_tags = []
-    all_tags.extend(random.sample(big_tags, min(1, len(big_tags))))
-    all_tags.extend(random.sample(local_tags, min(2, len(local_tags))))
-    all_tags.extend(random.sample(specific, min(3, len(specific))))
+    all_tags.extend(rng.sample(big_tags, min(1, len(big_tags))))
+    all_tags.extend(rng.sample(local_tags, min(2, len(local_tags))))
+    all_tags.extend(rng.sample(specific, min(3, len(specific))))
     all_tags.append("#제주특화훈련")
 
     # 중복 제거
@@ -1098,41 +1177,45 @@ def generate_instagram_hashtags(course_data):
     return "\n\n.\n.\n.\n" + " ".join(unique_tags[:8])
 
 
-def generate_instagram_caption(course_data):
-    """
-    인스타그램 캡션을 생성합니다.
+# 분야별 캡션 첫 줄 이모지
+_CAPTION_EMOJI = {
+    "AI": "🤖", "영상": "🎬", "디자인": "🎨", "출판": "📚",
+    "멀티미디어": "🖥️", "콘텐츠": "📱", "마케팅": "📊",
+    "데이터": "📈", "코딩": "💻",
+    "이커머스": "🛒", "산업안전": "🦺",
+    "제과제빵": "🧁", "드론정비": "🛠️", "AI커머스": "🛍️",
+    "디지털콘텐츠": "🖌️", "관광데이터": "📊",
+}
 
-    개선사항:
-    - 첫 문단에 자연어 키워드 삽입 (해시태그 팔로우 폐지 대응)
-    - 저장·공유 유도 CTA 추가 (알고리즘 최우선 신호)
-    - 캡션 키워드: 제주 + 분야 + 국비지원 + 연도
-    """
-    from benefits_helper import get_course_type, get_benefits_text
-    title = course_data.get("title", "")
-    institution = course_data.get("institution", "")
-    period = course_data.get("period", "")
-    time_info = course_data.get("time", "")
-    ctype = get_course_type(course_data)
-    benefits = get_benefits_text(course_data)
-    field = detect_course_field(title, course_data.get("ncsCd"))
-    year = datetime.now().year
-    field_emoji = {
-        "AI": "🤖", "영상": "🎬", "디자인": "🎨", "출판": "📚",
-        "멀티미디어": "🖥️", "콘텐츠": "📱", "마케팅": "📊",
-        "데이터": "📈", "코딩": "💻",
-        "이커머스": "🛒", "산업안전": "🦺",
-        "제과제빵": "🧁", "드론정비": "🛠️", "AI커머스": "🛍️",
-        "디지털콘텐츠": "🖌️", "관광데이터": "📊",
-    }
-    emoji = field_emoji.get(field, "📌")
-    hook = _generate_dynamic_hook(title, field)
+# 캡션 템플릿 (선택 줄은 값이 ""이면 생략된 것과 같음)
+_CAPTION_TEMPLATE = compile_template("""{emoji} {hook}
+
+{keyword_sentence}
+
+📍 {title}
+🏫 {institution}{period_line}{time_line}
 
-    # 자연어 키워드 문장 (검색·추천 알고리즘용, 분야별 트렌드 반영)
-    # 1순위: field_research.json 캐시, 2순위: 하드코딩
+💰 {benefits}
+✅ 내일배움카드 있으면 누구나 신청 가능!
+{allowance_line}{cta_line}
+👉 신청 방법이 궁금하다면?
+프로필 링크에서 바로 확인하세요!{goal_block}
+
+💾 나중에 신청하려면 이 게시물을 저장해두세요!
+📩 제주에서 교육 찾는 친구에게 공유해주세요{hashtags}""")
+
+
+@section
+def _caption_keyword_sentence(field, year, research, research_file_version):
+    """자연어 키워드 문장 (검색·추천 알고리즘용, 분야별 트렌드 반영)
+
+    1순위: field_research.json 캐시, 2순위: 하드코딩
+    research_file_version은 메모 키 전용 (research가 None이면 전역 저장소를 조회하므로)
+    """
     keyword_sentence = None
     try:
         from field_research_helper import get_instagram_keyword_sentence
-        keyword_sentence = get_instagram_keyword_sentence(field, year, title=title)
+        keyword_sentence = get_instagram_keyword_sentence(field, year, research=research)
     except ImportError:
         pass
 
@@ -1151,54 +1234,61 @@ def generate_instagram_caption(course_data):
         }
         keyword_sentence = field_keyword_sentence.get(field,
             f"{year}년 제주에서 국비지원으로 배울 수 있는 직업훈련 과정을 소개합니다.")
+    return keyword_sentence
 
-    caption = f"""{emoji} {hook}
-
-{keyword_sentence}
 
-📍 {title}
-🏫 {institution}"""
-    if period:
-        caption += f"\n🗓️ {period}"
-    if time_info:
-        caption += f"\n⏰ {time_info}"
-    caption += f"""
+def generate_instagram_caption(course_data):
+    """
+    인스타그램 캡션을 생성합니다.
 
-💰 {benefits}
-✅ 내일배움카드 있으면 누구나 신청 가능!
-"""
-    if ctype in ("general", "long"):
-        caption += "🎁 훈련장려금 월 최대 20만원까지 받을 수 있어요\n"
+    개선사항:
+    - 첫 문단에 자연어 키워드 삽입 (해시태그 팔로우 폐지 대응)
+    - 저장·공유 유도 CTA 추가 (알고리즘 최우선 신호)
+    - 캡션 키워드: 제주 + 분야 + 국비지원 + 연도
+    """
+    from benefits_helper import get_benefits_text
+    ctx = course_context(course_data)
+    course_data = ctx.course
+    title = ctx.title
+    period = course_data.get("period", "")
+    time_info = course_data.get("time", "")
+    ctype = ctx.ctype
+    field = ctx.field
+    hook = _generate_dynamic_hook(title, field)
+    keyword_sentence = _caption_keyword_sentence(field, datetime.now().year, ctx.research, research_version())
 
     cta_text, cta_sub, urgency = _generate_cta(course_data)
+    cta_line = ""
     if urgency == "urgent":
-        caption += f"\n🔥 {cta_text}\n"
+        cta_line = f"\n🔥 {cta_text}\n"
     elif urgency == "soon":
-        caption += f"\n⏰ {cta_text}\n"
-
-    caption += """
-👉 신청 방법이 궁금하다면?
-프로필 링크에서 바로 확인하세요!"""
+        cta_line = f"\n⏰ {cta_text}\n"
 
     # 훈련목표 요약 (있을 때만)
+    goal_block = ""
     training_goal = course_data.get("trainingGoal", "")
     if training_goal:
-        import re
         text = re.sub(r'\d+\.\s*', '', training_goal)
         goal_sentences = [s.strip() for s in text.replace("\n", ".").split(".")
                           if s.strip() and len(s.strip()) > 15]
         if goal_sentences:
-            caption += "\n\n📋 이 과정을 배우면?"
-            for s in goal_sentences[:2]:
-                caption += f"\n→ {s}"
-
-    # 저장·공유 유도 CTA (알고리즘 최우선 신호)
-    caption += "\n\n💾 나중에 신청하려면 이 게시물을 저장해두세요!"
-    caption += "\n📩 제주에서 교육 찾는 친구에게 공유해주세요"
-
-    hashtags = generate_instagram_hashtags(course_data)
-    caption += hashtags
-    return caption
+            goal_block = "\n\n📋 이 과정을 배우면?" + "".join(f"\n→ {s}" for s in goal_sentences[:2])
+
+    return render(_CAPTION_TEMPLATE, {
+        "emoji": _CAPTION_EMOJI.get(field, "📌"),
+        "hook": hook,
+        "keyword_sentence": keyword_sentence,
+        "title": title,
+        "institution": course_data.get("institution", ""),
+        "period_line": f"\n🗓️ {period}" if period else "",
+        "time_line": f"\n⏰ {time_info}" if time_info else "",
+        "benefits": get_benefits_text(course_data),
+        "allowance_line": ("🎁 훈련장려금 월 최대 20만원까지 받을 수 있어요\n"
+                           if ctype in ("general", "long") else ""),
+        "cta_line": cta_line,
+        "goal_block": goal_block,
+        "hashtags": generate_instagram_hashtags(ctx),
+    })
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -1349,14 +1439,15 @@ FIELD_SETTING = {
 }
 
 
+# 과정명 키워드 매처 (priority = 딕셔너리 순서, 앞 키워드 우선)
+_SETTING_MATCHER = compile_keywords(
+    [(kw, kw, kw, i) for i, kw in enumerate(FIELD_SETTING) if kw != "default"])
+
+
 def _get_setting(title):
     """과정명에서 키워드 매칭하여 (배경, 복장) 반환."""
-    for keyword in FIELD_SETTING:
-        if keyword == "default":
-            continue
-        if keyword in title:
-            return FIELD_SETTING[keyword]
-    return FIELD_SETTING["default"]
+    hit = first_hit(_SETTING_MATCHER, title)
+    return FIELD_SETTING[hit[1] if hit else "default"]
 
 
 # 과정 키워드 → 영문 행동 묘사 (seg2, seg3)
@@ -1472,14 +1563,14 @@ FIELD_ACTIONS_EN = {
 }
 
 
+_ACTIONS_MATCHER = compile_keywords(
+    [(kw, kw, kw, i) for i, kw in enumerate(FIELD_ACTIONS_EN) if kw != "default"])
+
+
 def _get_actions_en(title):
     """과정명에서 구체적 키워드를 먼저 매칭하여 영문 행동 2개를 반환."""
-    for keyword in FIELD_ACTIONS_EN:
-        if keyword == "default":
-            continue
-        if keyword in title:
-            return FIELD_ACTIONS_EN[keyword]
-    return FIELD_ACTIONS_EN["default"]
+    hit = first_hit(_ACTIONS_MATCHER, title)
+    return FIELD_ACTIONS_EN[hit[1] if hit else "default"]
 
 
 def _build_segments(course_data, ctype):
@@ -1489,11 +1580,10 @@ def _build_segments(course_data, ctype):
     seg2: 훈련목표 실습 장면 1개, 나레이션 없음
     seg3: 마무리 (카메라 보며 CTA) + 나레이션
     """
-    title = course_data.get("title", "")
-    clean = _clean_title(title)
-    training_goal = (course_data.get("trainingGoal", "")
-                     or course_data.get("traingGoal", "")
-                     or course_data.get("training_goal", ""))
+    ctx = course_context(course_data)
+    course_data = ctx.course
+    clean = ctx.clean_title
+    training_goal = ctx.training_goal
     kr1, _ = _goal_to_actions_kr(training_goal)
     en1, _ = _get_actions_en(clean)
     bg, outfit = _get_setting(clean)
@@ -1558,20 +1648,17 @@ def generate_reels_package(course_data):
             성공 시 {"grok": str}
             만료 과정이면 "[SKIP] ..." 문자열
     """
-    from benefits_helper import get_course_type, get_total_hours
-
-    title = course_data.get("title", "")
-    ncs_cd = course_data.get("ncsCd", "")
-    field = detect_course_field(title, ncs_cd)
-    ctype = get_course_type(course_data)
-    hours = get_total_hours(course_data)
+    ctx = course_context(course_data)
+    course_data = ctx.course
+    title = ctx.title
+    field = ctx.field
+    ctype = ctx.ctype
+    hours = ctx.hours
     institution = course_data.get("institution", "")
     period = course_data.get("period", "")
 
     # 훈련목표 키워드
-    training_goal = (course_data.get("trainingGoal", "")
-                     or course_data.get("training_goal", ""))
-    goal_summary = summarize_training_goal(training_goal)
+    goal_summary = ctx.goal_keywords
     if not goal_summary:
         fallback = {
             "AI": "AI 활용 · 실무 프로젝트", "영상": "영상 편집 · 콘텐츠 제작",
@@ -1601,7 +1688,7 @@ def generate_reels_package(course_data):
     structure_label = structure_labels.get(ctype, structure_labels["general"])
 
     # 3세그먼트 장면 생성 (과정명+훈련목표 기반)
-    segments = _build_segments(course_data, ctype)
+    segments = _build_segments(ctx, ctype)
 
     # ═══════════════════════════════════════════════════
     # 나레이션 원고 (Vrew TTS용, 30초)
@@ -1762,44 +1849,14 @@ def generate_reels_script(course_data):
 # 게시 가이드
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-def generate_posting_guide(course_data):
-    """게시 타이밍 및 시리즈 전략 가이드를 생성합니다."""
-    title = course_data.get("title", "")
-    start_date_str = course_data.get("traStartDate", "")
-    if start_date_str and len(start_date_str) >= 8:
-        try:
-            start_date = datetime.strptime(start_date_str[:8], "%Y%m%d")
-        except ValueError:
-            start_date = None
-    else:
-        start_date = None
-
-    guide = f"""
+# 게시 가이드 템플릿 (일정 블록만 과정마다 다름)
+_POSTING_GUIDE_TEMPLATE = compile_template("""
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 📋 게시 가이드 - {title}
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
 📅 권장 게시 일정
-"""
-    if start_date:
-        d1 = start_date - timedelta(days=21)
-        d2 = start_date - timedelta(days=14)
-        d3 = start_date - timedelta(days=7)
-        d4 = start_date - timedelta(days=3)
-        guide += f"""
-  1차 (D-21, {d1.strftime('%m/%d')}): 블로그 "혜택 정리편" + 인스타 카드뉴스
-  2차 (D-14, {d2.strftime('%m/%d')}): 블로그 "커리큘럼 상세편" + Grok AI 릴스 영상
-  3차 (D-7,  {d3.strftime('%m/%d')}): 인스타 스토리 "마감 D-7" 긴급성 강조
-  4차 (D-3,  {d4.strftime('%m/%d')}): 블로그+인스타 "마감 임박" 리마인드
-"""
-    else:
-        guide += """
-  1차: 과정 공개 후 즉시 → 블로그 "혜택 정리편" + 인스타 카드뉴스
-  2차: 1주일 후 → 블로그 "커리큘럼 상세편" + Grok AI 릴스 영상
-  3차: 마감 7일 전 → 인스타 스토리 "마감 D-7" 긴급성 강조
-  4차: 마감 3일 전 → 블로그+인스타 "마감 임박" 리마인드
-"""
-    guide += """
+{schedule}
 ⏰ 권장 게시 시간 (반드시 불규칙하게!)
   ⚠️ 매일 같은 시간 게시 = 자동화(매크로) 의심 → 저품질 위험
   - 네이버 블로그: 오전 8~10시 또는 오후 12~2시 (±1~3시간 변동)
@@ -1845,8 +1902,44 @@ def generate_posting_guide(course_data):
   - 기관 소식 15%: 협약식, 신규 프로그램 론칭
   - 시즌 콘텐츠 5%: 채용 시즌, 자격증 시험 일정
   ※ 과정 안내 외에도 위 비율을 참고하여 다양한 콘텐츠를 직접 기획해주세요
+""")
+
+_DEFAULT_POSTING_SCHEDULE = """
+  1차: 과정 공개 후 즉시 → 블로그 "혜택 정리편" + 인스타 카드뉴스
+  2차: 1주일 후 → 블로그 "커리큘럼 상세편" + Grok AI 릴스 영상
+  3차: 마감 7일 전 → 인스타 스토리 "마감 D-7" 긴급성 강조
+  4차: 마감 3일 전 → 블로그+인스타 "마감 임박" 리마인드
 """
-    return guide
+
+
+@section
+def _posting_schedule(start_date_str):
+    """훈련 시작일 기준 1~4차 게시 일정 (시작일이 없거나 잘못되면 상대 일정)"""
+    if not start_date_str or len(start_date_str) < 8:
+        return _DEFAULT_POSTING_SCHEDULE
+    try:
+        start_date = datetime.strptime(start_date_str[:8], "%Y%m%d")
+    except ValueError:
+        return _DEFAULT_POSTING_SCHEDULE
+    d1 = start_date - timedelta(days=21)
+    d2 = start_date - timedelta(days=14)
+    d3 = start_date - timedelta(days=7)
+    d4 = start_date - timedelta(days=3)
+    return f"""
+  1차 (D-21, {d1.strftime('%m/%d')}): 블로그 "혜택 정리편" + 인스타 카드뉴스
+  2차 (D-14, {d2.strftime('%m/%d')}): 블로그 "커리큘럼 상세편" + Grok AI 릴스 영상
+  3차 (D-7,  {d3.strftime('%m/%d')}): 인스타 스토리 "마감 D-7" 긴급성 강조
+  4차 (D-3,  {d4.strftime('%m/%d')}): 블로그+인스타 "마감 임박" 리마인드
+"""
+
+
+def generate_posting_guide(course_data):
+    """게시 타이밍 및 시리즈 전략 가이드를 생성합니다."""
+    ctx = course_context(course_data)
+    return render(_POSTING_GUIDE_TEMPLATE, {
+        "title": ctx.title,
+        "schedule": _posting_schedule(ctx.course.get("traStartDate", "")),
+    })
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -1866,18 +1959,112 @@ def check_keyword_density(text, keyword, max_count=6):
 
 def get_keyword_density_report(text, primary_keyword, field_keywords=None):
     """키워드 밀도 리포트를 생성합니다."""
+    keywords = [primary_keyword] + list(field_keywords or [])[:3]
+    return density_report_from(analyze_post(text, keywords), primary_keyword, field_keywords)
+
+
+# ── 본문 1회 분석 ──
+# 배경: 밀도 리포트가 키워드마다 text.upper()로 본문 전체를 새로 복사해 세었고,
+#   글자 수(estimate_char_count)·수치 중복(get_overlap_report)도 각자 본문을 다시 훑었습니다.
+#   결과는 횟수뿐이라 작업 가이드는 '과다'만 알리고 어디서 과다인지는 알려주지 못한 셈.
+# → analyze_post()가 본문을 1회 정규화(대문자)해 키워드 위치·수치 토큰·글자 수를
+#   한 결과로 모으고, 리포트는 모두 그 결과에서 만듭니다.
+#   · 범주마다 C 수준 스캔(str.find·정규식 finditer) 1회 — 범주를 정규식 하나로 합친
+#     전방탐색 스캐너는 글자마다 파이썬 정규식 엔진을 돌아 오히려 몇 배 느렸음
+#   · 키워드는 각자 '직전 매칭 끝' 이후만 채택 → check_keyword_density(str.count)와 같은 횟수
+#   · spans(구간 라벨)를 넘기면 위치를 '도입부'·'해시태그' 같은 섹션 이름으로 풀 수 있음
+
+_MARK_RE = re.compile(r"\[.*?\]")
+
+
+def _find_all(haystack, needle):
+    """비중첩 매칭 시작 위치 목록 (str.count와 같은 기준)"""
+    positions = []
+    i = haystack.find(needle)
+    while i >= 0:
+        positions.append(i)
+        i = haystack.find(needle, i + len(needle))
+    return positions
+
+
+def analyze_post(text, keywords=(), spans=None):
+    """블로그 본문을 1회 분석해 밀도·중복·글자 수 리포트의 재료를 모읍니다.
+
+    Args:
+        text: 본문
+        keywords: 위치를 셀 키워드 목록 (대소문자 무시)
+        spans: [(라벨, 시작, 끝)] — 위치를 섹션 이름으로 풀 때 사용 (render_spans 결과 등)
+    Returns:
+        dict:
+          keywords    {키워드: [시작 위치]} — check_keyword_density와 같은 횟수
+          numbers     [(위치, 수치 토큰)] — extract_number_tokens와 같은 토큰
+          char_count  estimate_char_count와 같은 값
+          spans       시작 위치순 spans
+    """
+    text = text or ""
+    upper = text.upper()
+    marks = sum(len(m.group()) - m.group().count(" ") for m in _MARK_RE.finditer(text))
+    return {
+        "keywords": {kw: _find_all(upper, kw.upper()) for kw in keywords if kw},
+        "numbers": [(m.start(), m.group().strip()) for m in _NUM_TOKEN_RE.finditer(text)
+                    if m.group().strip()],
+        "char_count": len(text) - text.count(" ") - text.count("\n") - marks,
+        "spans": sorted(spans or [], key=lambda sp: sp[1]),
+    }
+
+
+def _span_label(analysis, pos):
+    """위치 → 그 위치를 포함하는 span 라벨 (없으면 None)"""
+    spans = analysis["spans"]
+    i = bisect.bisect_right([sp[1] for sp in spans], pos) - 1
+    if i >= 0 and pos < spans[i][2]:
+        return spans[i][0]
+    return None
+
+
+def numbers_in_span(analysis, label):
+    """라벨이 붙은 구간 안의 수치 토큰 집합"""
+    ranges = [(start, end) for name, start, end in analysis["spans"] if name == label]
+    return {tok for pos, tok in analysis["numbers"]
+            if any(start <= pos < end for start, end in ranges)}
+
+
+def density_report_from(analysis, primary_keyword, field_keywords=None, max_count=6):
+    """analyze_post 결과 → 키워드 밀도 리포트 (과다 키워드는 많이 나온 구간도 표시)"""
     report = []
-    cnt, safe = check_keyword_density(text, primary_keyword)
+    hits = analysis["keywords"].get(primary_keyword, [])
+    cnt = len(hits)
+    safe = cnt <= max_count
     status = "✅" if safe else "⚠️ 과다"
     report.append(f"  {status} '{primary_keyword}': {cnt}회 (권장 5~6회)")
+    if not safe and analysis["spans"]:
+        # 라벨 없는 위치 = 템플릿 고정 문구 → 고칠 수 있는 구간과 따로 표시
+        by_label, fixed = {}, 0
+        for pos in hits:
+            label = _span_label(analysis, pos)
+            if label is None:
+                fixed += 1
+            else:
+                by_label[label] = by_label.get(label, 0) + 1
+        where = sorted(by_label.items(), key=lambda kv: -kv[1])[:3]
+        if where:
+            report.append("     → 많이 나온 곳: " + " · ".join(f"{label} {n}회" for label, n in where))
+        if fixed:
+            report.append(f"     → 템플릿 고정 문구 {fixed}회 (수정 대상 아님)")
     if field_keywords:
         for kw in field_keywords[:3]:
-            cnt2, _ = check_keyword_density(text, kw)
+            cnt2 = len(analysis["keywords"].get(kw, []))
             if cnt2 > 0:
                 report.append(f"  ✅ '{kw}': {cnt2}회")
     return "\n".join(report)
 
 
+def overlap_report_from(analysis, intro_label, seo_label):
+    """analyze_post 결과 → 도입부 ↔ SEO 섹션 수치 중복 리포트 (get_overlap_report와 같은 문구)"""
+    return _overlap_message(numbers_in_span(analysis, intro_label)
+                            & numbers_in_span(analysis, seo_label))
+
+
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # 블로그 구조 다양화 (유사문서 필터링 회피)
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
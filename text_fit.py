@@ -0,0 +1,133 @@
+"""
+텍스트 자동 맞춤 (이진 탐색 폰트 크기 + 글자 폭 캐시)
+
+배경: 커버 과정명은 고정 크기(55/49px)로 3줄을 넘으면 잘렸고, 상세 훈련목표는
+정해진 5단계 크기를 큰 것부터 하나씩 줄바꿈해 보며 줄였습니다. 단계마다 전체
+textbbox 측정이 반복되고, 5단계 사이 크기는 쓰지 못했습니다.
+
+→ fit_text()가 [min_size, max_size] 범위에서 상자(가로 × 세로, 최대 줄 수)에 들어가는
+  가장 큰 정수 크기를 이진 탐색합니다 (측정 횟수 log2(범위)).
+  · 글자 폭: 폰트별 글자 advance 폭을 캐시해 줄바꿈 폭을 합산으로 계산 (textbbox 호출 없음)
+  · 결과는 (텍스트, 상자, 폰트, 크기 범위)로 메모이즈 → 커버 여러 포맷·재실행 시 재사용
+  · 최소 크기로도 넘치면 최소 크기에서 줄 수를 자르고 마지막 줄 끝을 "…"로 표시
+"""
+
+from functools import lru_cache
+
+from PIL import ImageFont
+
+# (폰트 경로, 크기, index) → {글자: advance 폭}
+_advance_cache = {}
+
+
+@lru_cache(maxsize=128)
+def load_font(path, size, index=1):
+    """폰트 로드 캐시 (index=1 = KR, 실패 시 index 0)"""
+    try:
+        return ImageFont.truetype(path, size, index=index)
+    except Exception:
+        return ImageFont.truetype(path, size, index=0)
+
+
+def text_width(text, path, size, index=1):
+    """글자별 advance 폭 합 (글자 폭은 폰트·크기별로 한 번만 측정)"""
+    widths = _advance_cache.setdefault((path, size, index), {})
+    total = 0.0
+    for ch in text:
+        w = widths.get(ch)
+        if w is None:
+            w = widths[ch] = load_font(path, size, index).getlength(ch)
+        total += w
+    return total
+
+
+def wrap_lines(text, path, size, max_width, index=1):
+    """어절(공백) 단위 줄바꿈, 한 어절이 max_width보다 넓으면 글자 단위로 분할
+
+    generate_cardnews.wrap_text_to_lines와 같은 규칙을 글자 폭 캐시로 계산합니다.
+    """
+    space_w = text_width(" ", path, size, index)
+    lines = []
+    for paragraph in text.split("\n"):
+        if not paragraph.strip():
+            lines.append("")
+            continue
+        cur, cur_w = "", 0.0
+        for word in paragraph.split(" "):
+            if not word:
+                continue
+            word_w = text_width(word, path, size, index)
+            test_w = cur_w + space_w + word_w if cur else word_w
+            if test_w <= max_width:
+                cur = f"{cur} {word}" if cur else word
+                cur_w = test_w
+                continue
+            if cur:
+                lines.append(cur)
+            if word_w > max_width:
+                sub, sub_w = "", 0.0
+                for ch in word:
+                    ch_w = text_width(ch, path, size, index)
+                    if sub and sub_w + ch_w > max_width:
+                        lines.append(sub)
+                        sub, sub_w = ch, ch_w
+                    else:
+                        sub, sub_w = sub + ch, sub_w + ch_w
+                cur, cur_w = sub, sub_w
+            else:
+                cur, cur_w = word, word_w
+        if cur:
+            lines.append(cur)
+    return lines
+
+
+def _truncate(lines, max_lines, path, size, max_width, index, ellipsis):
+    lines = lines[:max_lines]
+    last = lines[-1]
+    while last and text_width(last + ellipsis, path, size, index) > max_width:
+        last = last[:-1]
+    lines[-1] = last.rstrip() + ellipsis
+    return lines
+
+
+@lru_cache(maxsize=1024)
+def _fit(text, path, box_w, box_h, min_size, max_size, line_ratio, max_lines, index, ellipsis):
+    def layout(size):
+        line_h = round(size * line_ratio)
+        lines = wrap_lines(text, path, size, box_w, index)
+        limit = min(max_lines or len(lines), box_h // line_h)
+        return lines, line_h, len(lines) <= limit, limit
+
+    lo, hi = min_size, max_size
+    best = None
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        lines, line_h, fits, _ = layout(mid)
+        if fits:
+            best = (mid, tuple(lines), line_h)
+            lo = mid + 1
+        else:
+            hi = mid - 1
+    if best:
+        return best
+
+    lines, line_h, _, limit = layout(min_size)
+    lines = _truncate(lines, max(limit, 1), path, min_size, box_w, index, ellipsis)
+    return min_size, tuple(lines), line_h
+
+
+def fit_text(text, path, box_w, box_h, min_size, max_size, line_ratio=1.4,
+             max_lines=None, index=1, ellipsis="…"):
+    """
+    상자에 들어가는 가장 큰 폰트 크기를 이진 탐색으로 찾습니다.
+
+    Args:
+        box_w, box_h: 텍스트 영역 가로·세로 (px)
+        line_ratio: 줄 간격 = round(크기 × line_ratio)
+        max_lines: 최대 줄 수 (None이면 세로 높이로만 제한)
+    Returns:
+        tuple: (font, lines(list), line_height)
+    """
+    size, lines, line_h = _fit(text, path, int(box_w), int(box_h), min_size, max_size,
+                               line_ratio, max_lines, index, ellipsis)
+    return load_font(path, size, index), list(lines), line_h
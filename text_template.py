@@ -0,0 +1,99 @@
+"""
+텍스트 템플릿 (1회 컴파일 → join 1회로 조립) + 섹션 메모이즈
+
+배경: 블로그 본문(수 KB)·인스타 캡션·게시 가이드를 과정마다 f-string과 += 연결로 새로 만들었습니다.
+'이런 분에게 추천해요'·혜택 블록·'왜 배워야 할까요?'처럼 (분야, 유형, 연도)만으로 정해지는
+섹션도 과정마다 다시 만들었고, 캡션·가이드는 += 때마다 앞부분 전체를 다시 복사한 셈.
+
+→ compile_template(): "{슬롯}" 자리표시를 정적 조각·슬롯 목록으로 1회 분해
+  · 고정값(구분선 등)은 컴파일 시 채워 정적 조각에 합침
+  · render()는 슬롯 값을 끼워 "".join 1회로 조립
+  · render_spans()는 슬롯별 위치도 함께 반환 (본문 분석 결과를 섹션 이름으로 풀 때 사용)
+→ @section: 섹션 빌더의 인자가 곧 섹션 입력 — 입력이 같으면 이전 결과를 재사용
+  · dict 같은 unhashable 입력(리서치 항목)은 객체 동일성으로 구분
+    (캐시가 인자 참조를 쥐고 있어 id 재사용으로 엉뚱한 결과가 나오지 않음)
+  · SECTION_CACHE_SIZE를 넘으면 통째로 비움 (장기 실행 워커 메모리 상한)
+
+템플릿 표기: {이름} (영문·숫자·밑줄). 템플릿 안에서 다른 용도의 중괄호는 쓰지 않습니다.
+"""
+
+import functools
+import os
+import re
+
+SECTION_CACHE_SIZE = int(os.environ.get("SECTION_CACHE_SIZE", "512") or 512)
+
+_SLOT_RE = re.compile(r"\{(\w+)\}")
+_BY_ID = object()
+
+
+def compile_template(text, **constants):
+    """
+    Args:
+        text: {이름} 자리표시가 들어간 템플릿
+        constants: 컴파일 시 채울 고정 슬롯 값
+    Returns:
+        dict: {"static": 정적 조각 (슬롯 수 + 1), "slots": 슬롯 이름}
+    """
+    pieces = _SLOT_RE.split(text)
+    static, slots = [pieces[0]], []
+    for name, text_after in zip(pieces[1::2], pieces[2::2]):
+        if name in constants:
+            static[-1] += str(constants[name]) + text_after
+        else:
+            slots.append(name)
+            static.append(text_after)
+    return {"static": tuple(static), "slots": tuple(slots)}
+
+
+def render(template, values):
+    """슬롯 값(dict)을 끼워 넣어 문자열 1개로 조립 (누락 슬롯은 KeyError)"""
+    static = template["static"]
+    out = [static[0]]
+    for name, text_after in zip(template["slots"], static[1:]):
+        out.append(str(values[name]))
+        out.append(text_after)
+    return "".join(out)
+
+
+def render_spans(template, values):
+    """render()와 같은 문자열 + 슬롯 위치 목록 [(슬롯, 시작, 끝)] (같은 슬롯이 여러 번이면 여러 항목)"""
+    static = template["static"]
+    out = [static[0]]
+    spans = []
+    pos = len(static[0])
+    for name, text_after in zip(template["slots"], static[1:]):
+        value = str(values[name])
+        spans.append((name, pos, pos + len(value)))
+        out.append(value)
+        out.append(text_after)
+        pos += len(value) + len(text_after)
+    return "".join(out), spans
+
+
+def _arg_key(arg):
+    try:
+        hash(arg)
+    except TypeError:
+        return (_BY_ID, id(arg))
+    return arg
+
+
+def section(func):
+    """섹션 빌더를 인자값으로 메모이즈합니다 (빌더는 인자 외 상태에 의존하지 않아야 함)."""
+    cache = {}
+
+    @functools.wraps(func)
+    def wrapper(*args):
+        key = tuple(_arg_key(arg) for arg in args)
+        hit = cache.get(key)
+        if hit is not None:
+            return hit[1]
+        if len(cache) >= SECTION_CACHE_SIZE:
+            cache.clear()
+        value = func(*args)
+        cache[key] = (args, value)
+        return value
+
+    wrapper.cache_clear = cache.clear
+    return wrapper